@@ -0,0 +1,225 @@
+"""Handlers for runtime diagnostics endpoints."""
+
+import asyncio
+import logging
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from ols import config
+from ols.app.models.models import (
+    AllocationSiteResponse,
+    BlockingEventResponse,
+    ErrorResponse,
+    EventLoopDiagnosticsResponse,
+    ForbiddenResponse,
+    MemoryReportResponse,
+    UnauthorizedResponse,
+)
+from ols.src.auth.auth import get_auth_dependency
+from ols.src.diagnostics.memory_profiler import AllocationSite
+from ols.src.diagnostics.sampling_profiler import (
+    ProfilerBusyError,
+    to_collapsed,
+    to_speedscope,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+# diagnostics are meant for cluster administrators, not for regular users
+auth_dependency = get_auth_dependency(
+    config.ols_config, virtual_path="/ols-metrics-access"
+)
+
+event_loop_responses: dict[int | str, dict[str, Any]] = {
+    200: {
+        "description": "Event loop lag and recent blocking events",
+        "model": EventLoopDiagnosticsResponse,
+    },
+    401: {
+        "description": "Missing or invalid credentials provided by client",
+        "model": UnauthorizedResponse,
+    },
+    403: {
+        "description": "Client does not have permission to access resource",
+        "model": ForbiddenResponse,
+    },
+}
+
+
+@router.get("/event-loop", responses=event_loop_responses)
+async def get_event_loop_diagnostics(
+    auth: tuple[str, str, bool, str] = Depends(auth_dependency),
+) -> EventLoopDiagnosticsResponse:
+    """Return event loop lag and the most recent event loop stalls."""
+    del auth  # Auth dependency enforces request authentication.
+
+    monitor = config.services.event_loop_monitor
+    if monitor is None:
+        return EventLoopDiagnosticsResponse(monitor_enabled=False)
+    return EventLoopDiagnosticsResponse(
+        monitor_enabled=True,
+        capture_stacks=monitor.capture_stacks,
+        lag_threshold_seconds=monitor.threshold,
+        last_lag_seconds=monitor.last_lag,
+        max_lag_seconds=monitor.max_lag,
+        blocking_events=[
+            BlockingEventResponse(
+                timestamp=event.timestamp,
+                lag_seconds=event.lag,
+                task=event.task,
+                stack=event.stack,
+            )
+            for event in monitor.blocking_events()
+        ],
+    )
+
+
+profiling_error_responses: dict[int | str, dict[str, Any]] = {
+    400: {
+        "description": "Profiling window is longer than allowed",
+        "model": ErrorResponse,
+    },
+    401: {
+        "description": "Missing or invalid credentials provided by client",
+        "model": UnauthorizedResponse,
+    },
+    403: {
+        "description": "Client does not have permission to access resource, "
+        "or profiling is disabled",
+        "model": ForbiddenResponse,
+    },
+    409: {
+        "description": "Another profile is being taken",
+        "model": ErrorResponse,
+    },
+}
+
+profile_responses: dict[int | str, dict[str, Any]] = {
+    200: {
+        "description": "CPU profile as collapsed stacks or speedscope JSON",
+        "content": {
+            "text/plain": {"example": "MainThread;run (asyncio/runners.py:86) 42\n"},
+            "application/json": {"schema": {"type": "object"}},
+        },
+    },
+    **profiling_error_responses,
+}
+
+memory_responses: dict[int | str, dict[str, Any]] = {
+    200: {
+        "description": "Memory attributed to top allocation sites",
+        "model": MemoryReportResponse,
+    },
+    **profiling_error_responses,
+}
+
+
+def _check_profiling_request(profiler: Any, duration_seconds: float) -> None:
+    """Check that profiling is enabled and the window is not too long."""
+    if profiler is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "response": "Profiling is disabled",
+                "cause": "Profiling is disabled in the service configuration",
+            },
+        )
+    max_duration = config.ols_config.profiling.max_duration_seconds
+    if duration_seconds > max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "response": "Profiling window is too long",
+                "cause": f"Maximum profiling window is {max_duration} seconds",
+            },
+        )
+
+
+def _profiler_busy(error: ProfilerBusyError) -> HTTPException:
+    """Return error for a profiling request made while another one runs."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"response": "Profiling is already in progress", "cause": str(error)},
+    )
+
+
+@router.get("/profile", responses=profile_responses, response_class=Response)
+async def get_cpu_profile(
+    duration_seconds: float = Query(
+        default=10, gt=0, description="Length of the profiling window"
+    ),
+    output_format: Literal["collapsed", "speedscope"] = Query(
+        default="collapsed", alias="format", description="Format of the profile"
+    ),
+    auth: tuple[str, str, bool, str] = Depends(auth_dependency),
+) -> Response:
+    """Sample stacks of all service threads for the given number of seconds."""
+    del auth  # Auth dependency enforces request authentication.
+
+    profiler = config.services.sampling_profiler
+    _check_profiling_request(profiler, duration_seconds)
+    try:
+        # sampling runs in a worker thread, so the event loop is profiled too
+        profile = await asyncio.to_thread(
+            profiler.profile, duration_seconds  # type: ignore [union-attr]
+        )
+    except ProfilerBusyError as e:
+        raise _profiler_busy(e) from e
+
+    if output_format == "speedscope":
+        return JSONResponse(to_speedscope(profile))
+    return PlainTextResponse(to_collapsed(profile))
+
+
+def _allocation_sites(sites: list[AllocationSite]) -> list[AllocationSiteResponse]:
+    """Convert allocation sites to the response model."""
+    return [
+        AllocationSiteResponse(
+            site=site.site,
+            size_bytes=site.size,
+            count=site.count,
+            size_diff_bytes=site.size_diff,
+            count_diff=site.count_diff,
+        )
+        for site in sites
+    ]
+
+
+@router.get("/memory", responses=memory_responses)
+async def get_memory_report(
+    duration_seconds: float = Query(
+        default=10,
+        ge=0,
+        description="Length of the window; with zero the snapshot is compared "
+        "to the one taken by the previous request",
+    ),
+    top: int = Query(
+        default=20, ge=1, description="Number of allocation sites in each list"
+    ),
+    auth: tuple[str, str, bool, str] = Depends(auth_dependency),
+) -> MemoryReportResponse:
+    """Attribute memory to the top allocation sites using tracemalloc snapshots."""
+    del auth  # Auth dependency enforces request authentication.
+
+    profiler = config.services.memory_profiler
+    _check_profiling_request(profiler, duration_seconds)
+    top = min(top, config.ols_config.profiling.max_allocation_sites)
+    try:
+        report = await asyncio.to_thread(
+            profiler.report, duration_seconds, top  # type: ignore [union-attr]
+        )
+    except ProfilerBusyError as e:
+        raise _profiler_busy(e) from e
+
+    return MemoryReportResponse(
+        traced_since_startup=report.traced_since_startup,
+        compared_to=report.compared_to,
+        traced_memory_bytes=report.traced_memory,
+        traced_memory_peak_bytes=report.traced_memory_peak,
+        top_sites=_allocation_sites(report.top_sites),
+        top_growth=_allocation_sites(report.top_growth),
+        packages=_allocation_sites(report.packages),
+    )
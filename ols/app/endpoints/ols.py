@@ -29,16 +29,24 @@ from ols.app.models.models import (
     ReferencedDocument,
     SummarizerResponse,
     TokenCounter,
+    TooManyRequestsResponse,
     UnauthorizedResponse,
 )
 from ols.src.auth.auth import get_auth_dependency
 from ols.src.llms.llm_loader import LLMConfigurationError, resolve_provider_config
+from ols.src.query_helpers.admission_controller import (
+    Admission,
+    AdmissionRejectedError,
+)
 from ols.src.query_helpers.attachment_appender import append_attachments_to_query
+from ols.src.query_helpers.attachment_compactor import compact_attachments
 from ols.src.query_helpers.docs_summarizer import DocsSummarizer
-from ols.src.quota.quota_limiter import QuotaLimiter
-from ols.src.quota.token_usage_history import TokenUsageHistory
+from ols.src.query_helpers.history_support import conversation_lock
+from ols.src.quota.quota_service import QuotaService
 from ols.utils import errors_parsing, suid
+from ols.utils.stage_timer import Stage, observe_stage, set_stage_labels
 from ols.utils.token_handler import PromptTooLongError
+from ols.utils.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +70,10 @@ query_responses: dict[int | str, dict[str, Any]] = {
         "description": "Prompt is too long",
         "model": PromptTooLongResponse,
     },
+    429: {
+        "description": "Too many concurrent queries for the provider and model",
+        "model": TooManyRequestsResponse,
+    },
     500: {
         "description": "Query can not be validated, LLM is not accessible or other internal error",
         "model": ErrorResponse,
@@ -116,6 +128,9 @@ def conversation_request(
     Returns:
         Response containing the processed information.
     """
+    set_stage_labels(
+        llm_request.provider or config.ols_config.default_provider, llm_request.mode
+    )
     processed_request = process_request(auth, llm_request)
 
     summarizer_response: SummarizerResponse | Generator
@@ -130,6 +145,7 @@ def conversation_request(
         streaming=False,
         user_token=processed_request.user_token,
         client_headers=client_headers,
+        request_start_time=processed_request.timestamps["start"],
     )
 
     processed_request.timestamps["generate response"] = time.time()
@@ -220,9 +236,8 @@ def conversation_request(
     input_tokens = calc_tokens(summarizer_response.token_counter, "input_tokens")
     output_tokens = calc_tokens(summarizer_response.token_counter, "output_tokens")
 
-    consume_tokens(
-        config.quota_limiters,
-        config.token_usage_history,
+    available_quotas = consume_tokens(
+        config.services.quota_service,
         processed_request.user_id,
         input_tokens,
         output_tokens,
@@ -230,10 +245,6 @@ def conversation_request(
         llm_request.model or config.ols_config.default_model,
     )
 
-    available_quotas = get_available_quotas(
-        config.quota_limiters, processed_request.user_id
-    )
-
     return LLMResponse(
         conversation_id=processed_request.conversation_id,
         response=summarizer_response.response,
@@ -254,46 +265,29 @@ def calc_tokens(token_counter: Optional[TokenCounter], attr: str) -> int:
     return getattr(token_counter, attr)
 
 
-def get_available_quotas(
-    quota_limiters: Optional[list[QuotaLimiter]],
-    user_id: str,
-) -> dict[str, int]:
-    """Get quota available from all quota limiters."""
-    available_quotas: dict[str, int] = {}
-    # check if any quota limiter is configured
-    if quota_limiters is not None:
-        for quota_limiter in quota_limiters:
-            name = quota_limiter.__class__.__name__
-            available_quota = quota_limiter.available_quota(user_id)
-            available_quotas[name] = available_quota
-    return available_quotas
-
-
-def consume_tokens(
-    quota_limiters: Optional[list[QuotaLimiter]],
-    token_usage_history: Optional[TokenUsageHistory],
+def consume_tokens(  # pylint: disable=too-many-arguments
+    quota_service: Optional[QuotaService],
     user_id: str,
     input_tokens: int,
     output_tokens: int,
     provider: str,
     model: str,
-) -> None:
-    """Consume tokens from cluster and/or user quotas."""
-    # check if token usage history is configured
-    if token_usage_history is not None:
-        token_usage_history.consume_tokens(
+) -> dict[str, int]:
+    """Consume tokens from cluster and/or user quotas.
+
+    Returns:
+        Quota available from all quota limiters after the consumption.
+    """
+    if quota_service is None:
+        return {}
+    with start_span(
+        "quota_update",
+        {"tokens.input": input_tokens, "tokens.output": output_tokens},
+    ):
+        return quota_service.consume_tokens(
             user_id, provider, model, input_tokens, output_tokens
         )
 
-    # check if any quota limiter is configured
-    if quota_limiters is not None:
-        for quota_limiter in quota_limiters:
-            quota_limiter.consume_tokens(
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                subject_id=user_id,
-            )
-
 
 def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     """Process incoming request.
@@ -333,7 +327,8 @@ def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     # logging of the query to avoid leaking PII into logs.
 
     # Redact the query
-    llm_request = redact_query(conversation_id, llm_request)
+    with start_span("redact_query"):
+        llm_request = redact_query(conversation_id, llm_request)
     timestamps["redact query"] = time.time()
 
     # Log incoming request (after redaction) in JSON format
@@ -359,12 +354,21 @@ def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     # All attachments should be appended to query - but store original
     # query for later use in transcript storage
     query_without_attachments = llm_request.query
-    llm_request.query = append_attachments_to_query(llm_request.query, attachments)
+    # compacted attachments are used only in the query, the original ones
+    # are stored in transcripts
+    query_attachments = attachments
+    if config.ols_config.attachment_compaction is not None:
+        query_attachments = compact_attachments(
+            attachments, config.ols_config.attachment_compaction
+        )
+    llm_request.query = append_attachments_to_query(
+        llm_request.query, query_attachments
+    )
     timestamps["append attachments"] = time.time()
 
     validate_requested_provider_model(llm_request)
 
-    check_tokens_available(config.quota_limiters, user_id)
+    check_tokens_available(config.services.quota_service, user_id)
     return ProcessedRequest(
         user_id=user_id,
         conversation_id=conversation_id,
@@ -377,17 +381,14 @@ def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     )
 
 
-def check_tokens_available(
-    quota_limiters: Optional[list[QuotaLimiter]], user_id: str
-) -> None:
+def check_tokens_available(quota_service: Optional[QuotaService], user_id: str) -> None:
     """Check if tokens are available for user."""
-    # no quota limiters specified
-    if quota_limiters is None:
+    # no quota storage specified
+    if quota_service is None:
         return
 
     try:
-        for quota_limiter in quota_limiters:
-            quota_limiter.ensure_available_quota(subject_id=user_id)
+        quota_service.ensure_available_quota(user_id)
     except psycopg2.Error as pg_error:
         message = "Error communicating with quota database backend"
         logger.error(message)
@@ -426,6 +427,11 @@ def log_processing_durations(timestamps: dict[str, float]) -> None:
     add_references_duration = duration("store transcripts", "add references")
     total_duration = duration("start", "add references")
 
+    observe_stage(
+        Stage.REQUEST_PROCESSING, duration("retrieve user", "append attachments")
+    )
+    observe_stage(Stage.PERSISTENCE, store_transcripts_duration)
+
     # these messages can be grepped from logs and easily transformed into CSV file
     # for further processing and analysis
     # Note: History retrieval is now part of generate_response duration
@@ -505,6 +511,7 @@ def generate_response(
     streaming: bool = False,
     user_token: Optional[str] = None,
     client_headers: dict[str, dict[str, str]] | None = None,
+    request_start_time: Optional[float] = None,
 ) -> Union[SummarizerResponse, Generator]:
     """Generate response based on validation result and model output.
 
@@ -516,10 +523,12 @@ def generate_response(
         streaming: The flag indicating if the response should be streamed.
         user_token: The user token used for authorization.
         client_headers: Client-provided MCP headers for authentication.
+        request_start_time: Request arrival, used for time to first token metrics.
 
     Returns:
         SummarizerResponse or Generator, depending on the streaming flag.
     """
+    admission = admit_request(llm_request)
     try:
         docs_summarizer = DocsSummarizer(
             provider=llm_request.provider,
@@ -529,15 +538,23 @@ def generate_response(
             user_token=user_token,
             client_headers=client_headers,
             streaming=streaming,
+            has_attachments=bool(llm_request.attachments),
+            request_start_time=request_start_time,
         )
         if streaming:
-            return docs_summarizer.generate_response(
+            stream = docs_summarizer.generate_response(
                 llm_request.query,
                 config.rag_index_loader.get_retriever(),
                 user_id=user_id,
                 conversation_id=conversation_id,
                 skip_user_id_check=skip_user_id_check,
             )
+            if admission is None:
+                return stream
+            # slots are held until the response is streamed completely
+            stream = admission.hold(stream)
+            admission = None
+            return stream
         response = docs_summarizer.create_response(
             llm_request.query,
             config.rag_index_loader.get_retriever(),
@@ -582,6 +599,42 @@ def generate_response(
                 "cause": cause,
             },
         )
+    finally:
+        if admission is not None:
+            admission.release()
+
+
+def admit_request(llm_request: LLMRequest) -> Optional[Admission]:
+    """Wait for admission of the query when admission control is configured.
+
+    Args:
+        llm_request: The request containing provider, model and mode.
+
+    Returns:
+        Admission to be released when the query is processed, or None when
+        admission control is not configured.
+
+    Raises:
+        HTTPException: 429 with Retry-After header when the query is rejected.
+    """
+    admission_controller = config.services.admission_controller
+    if admission_controller is None:
+        return None
+    try:
+        return admission_controller.acquire(
+            llm_request.provider or config.ols_config.default_provider,
+            llm_request.model or config.ols_config.default_model,
+            llm_request.mode,
+        )
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "response": "The service is overloaded",
+                "cause": str(e),
+            },
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
 
 
 def validate_requested_provider_model(llm_request: LLMRequest) -> None:
@@ -645,12 +698,18 @@ def store_conversation_history(
                 tool_calls=tool_calls or [],
                 tool_results=tool_results or [],
             )
-            config.conversation_cache.insert_or_append(
-                user_id,
-                conversation_id,
-                cache_entry,
-                skip_user_id_check,
-            )
+            with (
+                start_span("conversation_cache_write"),
+                conversation_lock(user_id, conversation_id),
+            ):
+                config.conversation_cache.insert_or_append(
+                    user_id,
+                    conversation_id,
+                    cache_entry,
+                    skip_user_id_check,
+                )
+            if config.services.history_compressor is not None:
+                config.services.history_compressor.turn_stored(user_id, conversation_id)
     except Exception as e:
         logger.error(
             "Error storing conversation history for user %s and conversation %s",
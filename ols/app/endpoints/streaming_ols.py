@@ -4,6 +4,7 @@ This module defines the endpoint and supporting functions for handling
 streaming queries.
 """
 
+import asyncio
 import json
 import logging
 import time
@@ -17,7 +18,6 @@ from ols.app.endpoints.ols import (
     calc_tokens,
     consume_tokens,
     generate_response,
-    get_available_quotas,
     log_processing_durations,
     process_request,
     store_conversation_history,
@@ -34,11 +34,13 @@ from ols.app.models.models import (
     StreamedChunk,
     SummarizerResponse,
     TokenCounter,
+    TooManyRequestsResponse,
     UnauthorizedResponse,
 )
 from ols.constants import MEDIA_TYPE_TEXT
 from ols.src.auth.auth import get_auth_dependency
 from ols.utils import errors_parsing
+from ols.utils.stage_timer import set_stage_labels
 from ols.utils.token_handler import PromptTooLongError
 
 logger = logging.getLogger(__name__)
@@ -68,6 +70,10 @@ query_responses: dict[int | str, dict[str, Any]] = {
         "description": "Client does not have permission to access resource",
         "model": ForbiddenResponse,
     },
+    429: {
+        "description": "Too many concurrent queries for the provider and model",
+        "model": TooManyRequestsResponse,
+    },
     500: {
         "description": "Query can not be validated, LLM is not accessible or other internal error",
         "model": ErrorResponse,
@@ -91,6 +97,9 @@ def conversation_request(
     Returns:
         StreamingResponse: The streaming response generated for the query.
     """
+    set_stage_labels(
+        llm_request.provider or config.ols_config.default_provider, llm_request.mode
+    )
     processed_request = process_request(auth, llm_request)
 
     summarizer_response: Union[
@@ -107,6 +116,7 @@ def conversation_request(
         streaming=True,
         user_token=processed_request.user_token,
         client_headers=client_headers,
+        request_start_time=processed_request.timestamps["start"],
     )
 
     return StreamingResponse(
@@ -493,7 +503,10 @@ async def response_processing_wrapper(  # noqa: C901  # pylint: disable=R0912,R0
         )
     )
 
-    store_data(
+    # storing waits for background compression rewriting the conversation,
+    # keep it off the event loop
+    await asyncio.to_thread(
+        store_data,
         user_id,
         conversation_id,
         llm_request,
@@ -511,9 +524,8 @@ async def response_processing_wrapper(  # noqa: C901  # pylint: disable=R0912,R0
     input_tokens = calc_tokens(token_counter, "input_tokens")
     output_tokens = calc_tokens(token_counter, "output_tokens")
 
-    consume_tokens(
-        config.quota_limiters,
-        config.token_usage_history,
+    available_quotas = consume_tokens(
+        config.services.quota_service,
         user_id,
         input_tokens,
         output_tokens,
@@ -521,8 +533,6 @@ async def response_processing_wrapper(  # noqa: C901  # pylint: disable=R0912,R0
         llm_request.model or config.ols_config.default_model,
     )
 
-    available_quotas = get_available_quotas(config.quota_limiters, user_id)
-
     yield stream_end_event(
         build_referenced_docs(rag_chunks),
         history_truncated,
@@ -1,7 +1,8 @@
 """Entry point to FastAPI-based web service."""
 
 import logging
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
 from starlette.datastructures import Headers
@@ -12,7 +13,24 @@ from ols import config, constants, version
 from ols.app import metrics, routers
 from ols.constants import SERVICE_NAME
 from ols.src.config_status import extract_config_status, store_config_status
-from ols.src.tools.offloaded_content import cleanup_offload_storage
+from ols.src.tools.offloaded_content import (
+    cleanup_offload_storage,
+    start_search_workers,
+)
+from ols.utils.tracing import setup_tracing, start_span
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Run background monitoring in the event loop serving requests."""
+    start_search_workers()
+    monitor = config.services.event_loop_monitor
+    if monitor is not None:
+        monitor.start()
+    yield
+    if monitor is not None:
+        await monitor.stop()
+
 
 app = FastAPI(
     title=f"Swagger {SERVICE_NAME} service - OpenAPI",
@@ -22,6 +40,7 @@ app = FastAPI(
         "name": "Apache 2.0",
         "url": "https://www.apache.org/licenses/LICENSE-2.0.html",
     },
+    lifespan=lifespan,
 )
 
 
@@ -58,6 +77,8 @@ else:
 # even for first scraping
 metrics.setup_model_metrics(config)
 
+setup_tracing(config.ols_config.tracing)
+
 
 @app.middleware("")
 async def rest_api_counter(
@@ -70,7 +91,13 @@ async def rest_api_counter(
         return await call_next(request)
 
     # measure time to handle duration + update histogram
-    with metrics.response_duration_seconds.labels(path).time():
+    with (
+        metrics.response_duration_seconds.labels(path).time(),
+        start_span(
+            f"{request.method} {path}",
+            {"http.request.method": request.method, "http.route": path},
+        ),
+    ):
         response = await call_next(request)
 
     # Add security headers to all endpoints except health checks and metrics
@@ -1,26 +1,91 @@
 """Metrics and metric collectors."""
 
+from ols.utils.stage_timer import stage_duration_seconds
+
 from .metrics import (
+    admission_queue_depth,
+    admission_rejections_total,
+    admission_slots_in_use,
+    admission_wait_seconds,
+    attachment_compacted_tokens_total,
+    attachment_original_tokens_total,
+    event_loop_blocked_total,
+    event_loop_lag_seconds,
+    history_summarization_fallbacks_total,
+    history_summarization_tokens_received_total,
+    history_summarization_tokens_sent_total,
     llm_calls_failures_total,
     llm_calls_total,
+    llm_coalesced_requests_total,
+    llm_inter_token_gap_seconds,
+    llm_output_tokens_per_second,
+    llm_request_time_to_first_token_seconds,
+    llm_response_cache_hits_total,
+    llm_response_cache_misses_total,
+    llm_time_to_first_token_seconds,
     llm_token_received_total,
     llm_token_sent_total,
+    mcp_server_circuit_state,
+    mcp_server_failure_rate,
+    mcp_server_rejected_calls_total,
+    offload_compression_ratio,
+    offload_memory_bytes,
+    offload_spills_total,
     provider_model_configuration,
+    quota_scheduler_last_run_affected_rows,
+    quota_scheduler_last_run_duration_seconds,
+    quota_scheduler_leader,
+    rag_retrieval_cache_hits_total,
+    rag_retrieval_cache_misses_total,
     response_duration_seconds,
     rest_api_calls_total,
     setup_model_metrics,
+    tool_result_cache_hits_total,
+    tool_result_cache_misses_total,
 )
 from .token_counter import GenericTokenCounter, TokenMetricUpdater
 
 __all__ = [
     "GenericTokenCounter",
     "TokenMetricUpdater",
+    "admission_queue_depth",
+    "admission_rejections_total",
+    "admission_slots_in_use",
+    "admission_wait_seconds",
+    "attachment_compacted_tokens_total",
+    "attachment_original_tokens_total",
+    "event_loop_blocked_total",
+    "event_loop_lag_seconds",
+    "history_summarization_fallbacks_total",
+    "history_summarization_tokens_received_total",
+    "history_summarization_tokens_sent_total",
     "llm_calls_failures_total",
     "llm_calls_total",
+    "llm_coalesced_requests_total",
+    "llm_inter_token_gap_seconds",
+    "llm_output_tokens_per_second",
+    "llm_request_time_to_first_token_seconds",
+    "llm_response_cache_hits_total",
+    "llm_response_cache_misses_total",
+    "llm_time_to_first_token_seconds",
     "llm_token_received_total",
     "llm_token_sent_total",
+    "mcp_server_circuit_state",
+    "mcp_server_failure_rate",
+    "mcp_server_rejected_calls_total",
+    "offload_compression_ratio",
+    "offload_memory_bytes",
+    "offload_spills_total",
     "provider_model_configuration",
+    "quota_scheduler_last_run_affected_rows",
+    "quota_scheduler_last_run_duration_seconds",
+    "quota_scheduler_leader",
+    "rag_retrieval_cache_hits_total",
+    "rag_retrieval_cache_misses_total",
     "response_duration_seconds",
     "rest_api_calls_total",
     "setup_model_metrics",
+    "stage_duration_seconds",
+    "tool_result_cache_hits_total",
+    "tool_result_cache_misses_total",
 ]
@@ -49,6 +49,163 @@ llm_reasoning_token_total = Counter(
     ["provider", "model"],
 )
 
+llm_time_to_first_token_seconds = Histogram(
+    "ols_llm_time_to_first_token_seconds",
+    "Time from LLM invocation to the first streamed token",
+    ["provider", "model", "round"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 60),
+)
+llm_request_time_to_first_token_seconds = Histogram(
+    "ols_llm_request_time_to_first_token_seconds",
+    "Time from request arrival to the first streamed token",
+    ["provider", "model", "round"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 60, 120),
+)
+llm_inter_token_gap_seconds = Histogram(
+    "ols_llm_inter_token_gap_seconds",
+    "Time between consecutive streamed LLM chunks",
+    ["provider", "model", "round"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+llm_output_tokens_per_second = Histogram(
+    "ols_llm_output_tokens_per_second",
+    "LLM output token throughput after the first token",
+    ["provider", "model", "round"],
+    buckets=(1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500),
+)
+
+rag_retrieval_cache_hits_total = Counter(
+    "ols_rag_retrieval_cache_hits_total", "RAG retrieval cache hits"
+)
+rag_retrieval_cache_misses_total = Counter(
+    "ols_rag_retrieval_cache_misses_total", "RAG retrieval cache misses"
+)
+
+llm_response_cache_hits_total = Counter(
+    "ols_llm_response_cache_hits_total",
+    "LLM responses served from response cache",
+    ["provider", "model"],
+)
+llm_response_cache_misses_total = Counter(
+    "ols_llm_response_cache_misses_total",
+    "Response cache lookups without matching response",
+    ["provider", "model"],
+)
+llm_coalesced_requests_total = Counter(
+    "ols_llm_coalesced_requests_total",
+    "Requests served by joining an identical in-flight LLM generation",
+)
+
+tool_result_cache_hits_total = Counter(
+    "ols_tool_result_cache_hits_total",
+    "Read-only tool calls served from tool result cache",
+    ["server"],
+)
+tool_result_cache_misses_total = Counter(
+    "ols_tool_result_cache_misses_total",
+    "Cacheable tool calls without matching cached result",
+    ["server"],
+)
+
+mcp_server_circuit_state = Gauge(
+    "ols_mcp_server_circuit_state",
+    "State of circuit breaker of MCP server, 1 for the current state",
+    ["server", "state"],
+)
+mcp_server_failure_rate = Gauge(
+    "ols_mcp_server_failure_rate",
+    "Rate of failed or slow recent calls to MCP server",
+    ["server"],
+)
+mcp_server_rejected_calls_total = Counter(
+    "ols_mcp_server_rejected_calls_total",
+    "Calls to MCP server rejected by its open circuit breaker",
+    ["server"],
+)
+
+attachment_original_tokens_total = Counter(
+    "ols_attachment_original_tokens_total",
+    "Tokens of attachments before compaction",
+)
+attachment_compacted_tokens_total = Counter(
+    "ols_attachment_compacted_tokens_total",
+    "Tokens of attachments appended to queries after compaction",
+)
+
+offload_memory_bytes = Gauge(
+    "ols_offload_memory_bytes",
+    "Compressed bytes of offloaded tool outputs held in memory",
+)
+offload_spills_total = Counter(
+    "ols_offload_spills_total",
+    "Offloaded tool outputs spilled from memory to disk",
+)
+offload_compression_ratio = Histogram(
+    "ols_offload_compression_ratio",
+    "Ratio of original to compressed size of offloaded tool outputs",
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64),
+)
+
+admission_queue_depth = Gauge(
+    "ols_admission_queue_depth",
+    "Queries waiting for admission",
+    ["provider", "model"],
+)
+admission_slots_in_use = Gauge(
+    "ols_admission_slots_in_use",
+    "Concurrency slots held by admitted queries",
+    ["provider", "model"],
+)
+admission_wait_seconds = Histogram(
+    "ols_admission_wait_seconds",
+    "Time admitted queries waited for a concurrency slot",
+    ["provider", "model"],
+)
+admission_rejections_total = Counter(
+    "ols_admission_rejections_total",
+    "Queries rejected by admission control",
+    ["provider", "model", "reason"],
+)
+
+history_summarization_tokens_sent_total = Counter(
+    "ols_history_summarization_tokens_sent_total",
+    "Tokens sent to the dedicated history summarization model",
+    ["provider", "model"],
+)
+history_summarization_tokens_received_total = Counter(
+    "ols_history_summarization_tokens_received_total",
+    "Tokens received from the dedicated history summarization model",
+    ["provider", "model"],
+)
+history_summarization_fallbacks_total = Counter(
+    "ols_history_summarization_fallbacks_total",
+    "History summaries generated by the request model instead of the dedicated one",
+    ["reason"],
+)
+
+quota_scheduler_leader = Gauge(
+    "ols_quota_scheduler_leader",
+    "Whether this replica holds the quota scheduler lock",
+)
+quota_scheduler_last_run_duration_seconds = Gauge(
+    "ols_quota_scheduler_last_run_duration_seconds",
+    "Duration of the last quota scheduler run",
+)
+quota_scheduler_last_run_affected_rows = Gauge(
+    "ols_quota_scheduler_last_run_affected_rows",
+    "Quota rows reset or increased by the last quota scheduler run",
+)
+
+event_loop_lag_seconds = Histogram(
+    "ols_event_loop_lag_seconds",
+    "Delay of event loop wake-ups caused by blocking calls",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+event_loop_blocked_total = Counter(
+    "ols_event_loop_blocked_total",
+    "Event loop stalls longer than the lag threshold",
+)
+
 # metric that indicates what provider + model customers are using so we can
 # understand what is popular/important
 provider_model_configuration = Gauge(
@@ -4,7 +4,7 @@ import logging
 import os
 import re
 from enum import StrEnum
-from typing import Any, Optional, Self
+from typing import Any, Literal, Optional, Self
 
 from pydantic import (
     AnyHttpUrl,
@@ -360,6 +360,35 @@ class GoogleVertexConfig(BaseModel, extra="forbid"):
     location: str  # required attribute
 
 
+class FakeToolCallConfig(BaseModel, extra="forbid"):
+    """Tool call requested by the simulated fake LLM."""
+
+    name: str
+    args: dict[str, Any] = Field(default_factory=dict)
+
+
+class FakeSimulationConfig(BaseModel, extra="forbid"):
+    """Realistic timing, tool calling and failures of the fake LLM.
+
+    Delays are in seconds. Scripted tool call rounds are used in the given
+    order; when there is no script, the given number of rounds calls
+    randomly chosen bound tools with arguments generated from their schema.
+    """
+
+    time_to_first_token: float = Field(default=0.0, ge=0)
+    token_delay: float = Field(default=0.0, ge=0)
+    delay_distribution: Literal["constant", "uniform", "exponential"] = "constant"
+    response_tokens: int = Field(default=50, ge=1)
+    tool_call_rounds: list[list[FakeToolCallConfig]] = Field(default_factory=list)
+    random_tool_call_rounds: int = Field(default=0, ge=0)
+    random_tool_calls_per_round: int = Field(default=1, ge=1)
+    tool_call_payload_size: int = Field(default=64, ge=0)
+    rate_limit_error_rate: float = Field(default=0.0, ge=0, le=1)
+    timeout_error_rate: float = Field(default=0.0, ge=0, le=1)
+    timeout_seconds: float = Field(default=30.0, ge=0)
+    seed: Optional[int] = None
+
+
 class FakeConfig(ProviderSpecificConfig, extra="forbid"):
     """Configuration specific to fake provider."""
 
@@ -368,6 +397,7 @@ class FakeConfig(ProviderSpecificConfig, extra="forbid"):
     response: Optional[str]
     chunks: Optional[int]
     sleep: Optional[float]
+    simulation: Optional[FakeSimulationConfig] = None
 
 
 class ProviderConfig(BaseModel):
@@ -699,6 +729,16 @@ class MCPServerConfig(BaseModel):
         ),
     )
 
+    cache_read_only_tools: bool = Field(
+        default=False,
+        title="Cache read-only tool results",
+        description=(
+            "Reuse results of tools annotated with readOnlyHint for identical "
+            "calls in the same conversation. Takes effect only when "
+            "ols_config.tool_result_cache is configured."
+        ),
+    )
+
     _resolved_headers: dict[str, str] = PrivateAttr(default_factory=dict)
 
     @property
@@ -799,6 +839,351 @@ class ToolsApprovalConfig(BaseModel):
     )
 
 
+class ToolResultCacheConfig(BaseModel):
+    """Configuration for caching results of read-only MCP tools.
+
+    If this config is present, results of tools annotated with `readOnlyHint`
+    from MCP servers with `cache_read_only_tools` enabled are reused for
+    identical calls made by the same user in the same conversation, until
+    they expire. If absent, every tool call reaches its MCP server.
+    """
+
+    ttl_seconds: float = Field(
+        default=constants.TOOL_RESULT_CACHE_TTL_SECONDS,
+        gt=0,
+        description="Time after which a cached tool result expires",
+    )
+
+    max_size_bytes: int = Field(
+        default=constants.TOOL_RESULT_CACHE_MAX_SIZE_BYTES,
+        ge=0,
+        description="Maximum total size of cached tool results",
+    )
+
+    max_entry_size_bytes: int = Field(
+        default=constants.TOOL_RESULT_CACHE_MAX_ENTRY_SIZE_BYTES,
+        ge=0,
+        description="Maximum size of a tool result to be cached",
+    )
+
+
+class MCPCircuitBreakerConfig(BaseModel):
+    """Configuration for circuit breakers of MCP servers.
+
+    If this config is present, outcomes of tool discovery and tool calls are
+    tracked per MCP server. When too many of the recent calls failed or were
+    slow, the breaker of the server opens and the server is skipped without
+    waiting for its timeout, until a background probe finds it reachable
+    again. If absent, every request reaches every MCP server.
+    """
+
+    window_size: int = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_WINDOW_SIZE,
+        ge=1,
+        description="Number of recent calls the failure rate is computed from",
+    )
+
+    min_calls: int = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_MIN_CALLS,
+        ge=1,
+        description="Minimal number of recent calls before the breaker can open",
+    )
+
+    failure_rate_threshold: float = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD,
+        gt=0,
+        le=1,
+        description="Rate of failed or slow recent calls that opens the breaker",
+    )
+
+    slow_call_seconds: float = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+        gt=0,
+        description="Duration above which a successful call counts as failed",
+    )
+
+    probe_interval_seconds: float = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS,
+        gt=0,
+        description="Interval of background probes of servers with open breaker",
+    )
+
+    probe_timeout_seconds: float = Field(
+        default=constants.MCP_CIRCUIT_BREAKER_PROBE_TIMEOUT_SECONDS,
+        gt=0,
+        description="Timeout of a background probe of a server",
+    )
+
+    @model_validator(mode="after")
+    def check_min_calls_fit_window(self) -> Self:
+        """Check that the minimal number of calls fits into the window."""
+        if self.min_calls > self.window_size:
+            raise ValueError("min_calls must not be greater than window_size")
+        return self
+
+
+class OffloadMemoryStoreConfig(BaseModel):
+    """Configuration for keeping offloaded tool outputs in memory.
+
+    If this config is present, large tool outputs are offloaded into zstd
+    compressed blobs in memory instead of files. When the blobs of all
+    requests exceed the byte budget, the least recently used ones are
+    spilled to files under `offload_storage_path`. If absent, every
+    offloaded output is written to a file.
+    """
+
+    budget_bytes: int = Field(
+        default=constants.DEFAULT_OFFLOAD_MEMORY_BUDGET_BYTES,
+        ge=0,
+        description="Maximum compressed bytes of offloaded outputs held in memory",
+    )
+
+    compression_level: int = Field(
+        default=constants.DEFAULT_OFFLOAD_COMPRESSION_LEVEL,
+        ge=1,
+        le=22,
+        description="Zstandard compression level of offloaded outputs",
+    )
+
+
+class AttachmentCompactionConfig(BaseModel):
+    """Configuration for compaction of attachments appended to queries.
+
+    If this config is present, attachments taking more tokens than the budget
+    are compacted before prompt building, largest first, until they fit. YAML
+    resources lose fields that carry no signal, like `managedFields`, and
+    repeated log lines are collapsed with counts. If absent, attachments are
+    appended unchanged.
+    """
+
+    token_budget: int = Field(
+        default=constants.DEFAULT_ATTACHMENT_TOKEN_BUDGET,
+        ge=0,
+        description="Total tokens of attachments above which they are compacted",
+    )
+
+    compactors: list[str] = Field(
+        default_factory=lambda: sorted(constants.ATTACHMENT_COMPACTORS),
+        description="Names of compactors to apply to attachments",
+    )
+
+    @field_validator("compactors")
+    @classmethod
+    def validate_compactors(cls, value: list[str]) -> list[str]:
+        """Check that all compactors are known."""
+        unknown = set(value) - constants.ATTACHMENT_COMPACTORS
+        if unknown:
+            raise ValueError(
+                f"unknown attachment compactors {sorted(unknown)}, "
+                f"supported: {sorted(constants.ATTACHMENT_COMPACTORS)}"
+            )
+        return value
+
+
+class BackgroundHistoryCompressionConfig(BaseModel):
+    """Configuration for compressing conversation history in background.
+
+    If this config is present, history of a conversation is summarized in
+    background after a turn is stored, once it takes more than
+    `trigger_ratio` of the history budget of the last request, so the next
+    request finds the summary ready. Requests whose history overflows while
+    the conversation is being compressed wait for it. If absent, history is
+    compressed only inline, when it overflows the budget of a request.
+    """
+
+    trigger_ratio: float = Field(
+        default=constants.BACKGROUND_HISTORY_COMPRESSION_TRIGGER_RATIO,
+        gt=0,
+        le=1,
+        description="Fraction of the history budget that triggers compression",
+    )
+
+    wait_timeout_seconds: float = Field(
+        default=constants.BACKGROUND_HISTORY_COMPRESSION_WAIT_TIMEOUT_SECONDS,
+        ge=0,
+        description=(
+            "Time a request waits for compression of its conversation running "
+            "in background before compressing the history inline"
+        ),
+    )
+
+
+class HistorySummarizationConfig(BaseModel):
+    """Configuration of a dedicated model summarizing conversation history.
+
+    If this config is present, overflowing conversation history is summarized
+    by the given provider and model, usually a smaller and cheaper one than
+    the models answering queries. Summarization falls back to the model of
+    the request when all `max_concurrency` slots are taken or when the
+    dedicated model fails. If absent, the model of the request summarizes.
+    """
+
+    provider: str
+    model: str
+
+    max_concurrency: int = Field(
+        default=constants.HISTORY_SUMMARIZATION_MAX_CONCURRENCY,
+        gt=0,
+        description="Maximum number of summaries generated at once",
+    )
+
+    timeout_seconds: float = Field(
+        default=constants.HISTORY_SUMMARIZATION_TIMEOUT_SECONDS,
+        gt=0,
+        description="Timeout of one summarization attempt",
+    )
+
+
+class AdmissionControlConfig(BaseModel):
+    """Configuration for admission control of LLM queries.
+
+    If this config is present, concurrent queries are limited per provider
+    and model. Queries exceeding the limit wait in a bounded queue and are
+    rejected with 429 when the queue is full or the wait times out.
+    """
+
+    max_concurrent_requests: int = Field(
+        default=constants.ADMISSION_MAX_CONCURRENT_REQUESTS,
+        ge=1,
+        description="Maximum weight of queries running at once per provider and model",
+    )
+
+    max_queue_size: int = Field(
+        default=constants.ADMISSION_MAX_QUEUE_SIZE,
+        ge=0,
+        description="Maximum number of queries waiting for a free slot",
+    )
+
+    queue_timeout_seconds: float = Field(
+        default=constants.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        gt=0,
+        description="Maximum time a query waits in the queue before rejection",
+    )
+
+    retry_after_seconds: int = Field(
+        default=constants.ADMISSION_RETRY_AFTER_SECONDS,
+        ge=1,
+        description="Value of the Retry-After header sent with rejections",
+    )
+
+    mode_weights: dict[constants.QueryMode, int] = Field(
+        default_factory=lambda: dict.fromkeys(constants.QueryMode, 1),
+        description="Number of concurrency slots taken by a query in given mode",
+    )
+
+    @field_validator("mode_weights")
+    @classmethod
+    def validate_mode_weights(
+        cls, value: dict[constants.QueryMode, int]
+    ) -> dict[constants.QueryMode, int]:
+        """Check that weights are positive and fill in missing modes."""
+        if any(weight < 1 for weight in value.values()):
+            raise ValueError("mode weights need to be positive integers")
+        return {mode: value.get(mode, 1) for mode in constants.QueryMode}
+
+
+class EventLoopMonitorConfig(BaseModel):
+    """Configuration of the event loop lag monitor."""
+
+    enabled: bool = True
+
+    interval_seconds: float = Field(
+        default=constants.EVENT_LOOP_MONITOR_INTERVAL_SECONDS,
+        gt=0,
+        description="How often the event loop lag is measured",
+    )
+
+    lag_threshold_seconds: float = Field(
+        default=constants.EVENT_LOOP_LAG_THRESHOLD_SECONDS,
+        gt=0,
+        description="Lag above which the event loop is considered blocked",
+    )
+
+    capture_stacks: bool = Field(
+        default=False,
+        description="Capture stack of the code blocking the event loop (debug mode)",
+    )
+
+    max_offenders: int = Field(
+        default=constants.EVENT_LOOP_MAX_OFFENDERS,
+        ge=1,
+        description="Number of most recent blocking events kept for diagnostics",
+    )
+
+
+class ProfilingConfig(BaseModel):
+    """Configuration of on-demand CPU and memory profiling endpoints."""
+
+    enabled: bool = True
+
+    max_duration_seconds: float = Field(
+        default=constants.PROFILING_MAX_DURATION_SECONDS,
+        gt=0,
+        description="Longest profiling window a request can ask for",
+    )
+
+    sampling_interval_seconds: float = Field(
+        default=constants.PROFILING_SAMPLING_INTERVAL_SECONDS,
+        gt=0,
+        description="Interval between stack samples of the CPU profiler",
+    )
+
+    max_stacks: int = Field(
+        default=constants.PROFILING_MAX_STACKS,
+        ge=1,
+        description="Number of distinct stacks kept in a CPU profile",
+    )
+
+    max_stack_depth: int = Field(
+        default=constants.PROFILING_MAX_STACK_DEPTH,
+        ge=1,
+        description="Number of innermost frames kept in each sampled stack",
+    )
+
+    tracemalloc_frames: int = Field(
+        default=constants.PROFILING_TRACEMALLOC_FRAMES,
+        ge=1,
+        description="Number of frames stored by tracemalloc for each allocation",
+    )
+
+    trace_memory_at_startup: bool = Field(
+        default=False,
+        description="Trace memory allocations since the service starts",
+    )
+
+    max_allocation_sites: int = Field(
+        default=constants.PROFILING_MAX_ALLOCATION_SITES,
+        ge=1,
+        description="Maximum number of allocation sites in a memory report",
+    )
+
+
+class TracingConfig(BaseModel):
+    """OpenTelemetry tracing configuration.
+
+    If this config is present, spans are created for the query processing
+    stages and exported either to an OTLP/HTTP collector or to a local file.
+    """
+
+    exporter: Literal["otlp", "file"] = "otlp"
+    otlp_endpoint: str = constants.TRACING_OTLP_ENDPOINT
+    file_path: Optional[str] = None
+    service_name: str = constants.TRACING_SERVICE_NAME
+    sample_ratio: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of requests that are traced",
+    )
+
+    @model_validator(mode="after")
+    def check_file_path_is_set_when_needed(self) -> Self:
+        """Check that file exporter has file path configured."""
+        if self.exporter == constants.TRACING_EXPORTER_FILE and not self.file_path:
+            raise ValueError("file_path is required for file tracing exporter")
+        return self
+
+
 class MCPServers(BaseModel):
     """MCP servers configuration."""
 
@@ -964,6 +1349,79 @@ class ConversationCacheConfig(BaseModel):
                 )
 
 
+class ResponseCacheConfig(BaseModel):
+    """LLM response cache configuration.
+
+    If this config is present, answers to first-turn ask-mode queries without
+    attachments and tool calls are cached and reused for similar queries.
+    """
+
+    type: Optional[str] = None
+    memory: Optional[InMemoryCacheConfig] = None
+    postgres: Optional[PostgresConfig] = None
+    ttl_seconds: PositiveInt = constants.RESPONSE_CACHE_TTL_SECONDS
+    similarity_threshold: float = constants.RESPONSE_CACHE_SIMILARITY_THRESHOLD
+    max_entry_size: PositiveInt = constants.RESPONSE_CACHE_MAX_ENTRY_SIZE
+
+    def __init__(self, data: Optional[dict] = None) -> None:
+        """Initialize configuration and perform basic validation."""
+        super().__init__()
+        if data is None:
+            return
+        self.type = data.get("type", None)
+        match self.type:
+            case constants.CACHE_TYPE_MEMORY:
+                self.memory = InMemoryCacheConfig(
+                    data.get(constants.CACHE_TYPE_MEMORY) or {}
+                )
+            case constants.CACHE_TYPE_POSTGRES:
+                if constants.CACHE_TYPE_POSTGRES not in data:
+                    raise checks.InvalidConfigurationError(
+                        "Postgres response cache type is specified,"
+                        " but Postgres configuration is missing"
+                    )
+                self.postgres = PostgresConfig(
+                    **data.get(constants.CACHE_TYPE_POSTGRES)
+                )
+            case _:
+                raise checks.InvalidConfigurationError(
+                    f"unknown response cache type: {self.type}"
+                )
+        try:
+            self.ttl_seconds = int(
+                data.get("ttl_seconds", constants.RESPONSE_CACHE_TTL_SECONDS)
+            )
+            self.similarity_threshold = float(
+                data.get(
+                    "similarity_threshold",
+                    constants.RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+                )
+            )
+            self.max_entry_size = int(
+                data.get("max_entry_size", constants.RESPONSE_CACHE_MAX_ENTRY_SIZE)
+            )
+        except (TypeError, ValueError) as e:
+            raise checks.InvalidConfigurationError(
+                "ttl_seconds, similarity_threshold and max_entry_size"
+                " need to be numbers"
+            ) from e
+
+    def validate_yaml(self) -> None:
+        """Validate response cache config."""
+        if self.ttl_seconds <= 0:
+            raise checks.InvalidConfigurationError(
+                "ttl_seconds for response cache needs to be a positive integer"
+            )
+        if self.max_entry_size <= 0:
+            raise checks.InvalidConfigurationError(
+                "max_entry_size for response cache needs to be a positive integer"
+            )
+        if not 0.0 < self.similarity_threshold <= 1.0:
+            raise checks.InvalidConfigurationError(
+                "similarity_threshold for response cache needs to be in (0, 1]"
+            )
+
+
 class LoggingConfig(BaseModel):
     """Logging configuration."""
 
@@ -989,6 +1447,7 @@ class ReferenceContentIndex(BaseModel):
     product_docs_index_path: Optional[FilePath] = None
     product_docs_index_id: Optional[str] = None
     product_docs_origin: Optional[str] = None
+    product_docs_search_params: Optional[dict[str, int]] = None
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -998,9 +1457,15 @@ class ReferenceContentIndex(BaseModel):
         self.product_docs_index_path = data.get("product_docs_index_path", None)
         self.product_docs_index_id = data.get("product_docs_index_id", None)
         self.product_docs_origin = data.get("product_docs_origin", None)
+        self.product_docs_search_params = data.get("product_docs_search_params", None)
 
     def validate_yaml(self) -> None:
         """Validate reference content index config."""
+        for name, value in (self.product_docs_search_params or {}).items():
+            if not isinstance(value, int) or value <= 0:
+                raise checks.InvalidConfigurationError(
+                    f"product_docs_search_params.{name} must be a positive integer"
+                )
         if self.product_docs_index_path is not None:
             try:
                 checks.dir_check(
@@ -1027,11 +1492,34 @@ class ReferenceContentIndex(BaseModel):
                 )
 
 
+class RetrievalCacheConfig(BaseModel):
+    """Configuration for caching of RAG retrieval results.
+
+    If this config is present, retrieved node ids and scores are cached per
+    normalized query.
+    """
+
+    enabled: bool = Field(default=True, description="Enable the retrieval cache")
+
+    max_entries: int = Field(
+        default=constants.RETRIEVAL_CACHE_MAX_ENTRIES,
+        ge=1,
+        description="Maximum number of cached queries",
+    )
+
+    ttl_seconds: int = Field(
+        default=constants.RETRIEVAL_CACHE_TTL_SECONDS,
+        ge=1,
+        description="Time in seconds after which cached results expire",
+    )
+
+
 class ReferenceContent(BaseModel):
     """Reference content configuration."""
 
     embeddings_model_path: Optional[FilePath] = None
     indexes: Optional[list[ReferenceContentIndex]] = None
+    retrieval_cache: Optional[RetrievalCacheConfig] = None
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -1044,6 +1532,8 @@ class ReferenceContent(BaseModel):
             self.indexes = [ReferenceContentIndex(i) for i in data["indexes"]]
         else:
             self.indexes = None
+        if data.get("retrieval_cache") is not None:
+            self.retrieval_cache = RetrievalCacheConfig(**data.get("retrieval_cache"))
 
     def validate_yaml(self) -> None:
         """Validate reference content config."""
@@ -1094,6 +1584,13 @@ class SchedulerConfig(BaseModel):
 
     period: int
 
+    jitter: float = Field(
+        default=constants.QUOTA_SCHEDULER_JITTER,
+        ge=0,
+        le=1,
+        description="Ratio by which each period is randomly shortened or prolonged",
+    )
+
 
 class LimiterConfig(BaseModel):
     """Configuration for one quota limiter."""
@@ -1129,6 +1626,10 @@ class QuotaHandlersConfig(BaseModel):
     scheduler: Optional[SchedulerConfig] = None
     limiters: Optional[LimitersConfig] = None
     enable_token_history: Optional[bool] = None
+    available_quota_ttl_seconds: float = constants.QUOTA_AVAILABLE_CACHE_TTL_SECONDS
+    token_history_flush_interval_seconds: float = (
+        constants.TOKEN_HISTORY_FLUSH_INTERVAL_SECONDS
+    )
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -1149,12 +1650,28 @@ class QuotaHandlersConfig(BaseModel):
         self.scheduler = SchedulerConfig(**data.get("scheduler"))
         self.limiters = LimitersConfig(data.get("limiters", None))
         self.enable_token_history = data.get("enable_token_history", False)
+        self.available_quota_ttl_seconds = data.get(
+            "available_quota_ttl_seconds", constants.QUOTA_AVAILABLE_CACHE_TTL_SECONDS
+        )
+        if self.available_quota_ttl_seconds < 0:
+            raise checks.InvalidConfigurationError(
+                "available_quota_ttl_seconds can not be negative"
+            )
+        self.token_history_flush_interval_seconds = data.get(
+            "token_history_flush_interval_seconds",
+            constants.TOKEN_HISTORY_FLUSH_INTERVAL_SECONDS,
+        )
+        if self.token_history_flush_interval_seconds <= 0:
+            raise checks.InvalidConfigurationError(
+                "token_history_flush_interval_seconds must be positive"
+            )
 
 
 class OLSConfig(BaseModel):
     """OLS configuration."""
 
     conversation_cache: Optional[ConversationCacheConfig] = None
+    response_cache: Optional[ResponseCacheConfig] = None
     logging_config: Optional[LoggingConfig] = None
     reference_content: Optional[ReferenceContent] = None
     authentication_config: AuthenticationConfig = AuthenticationConfig()
@@ -1166,6 +1683,10 @@ class OLSConfig(BaseModel):
     default_model: Optional[str] = None
     max_iterations: Optional[PositiveInt] = None
     history_compression_enabled: bool = True
+    background_history_compression: Optional[BackgroundHistoryCompressionConfig] = None
+    history_summarization: Optional[HistorySummarizationConfig] = None
+    request_coalescing_enabled: bool = False
+    stage_metrics_enabled: bool = False
     expire_llm_is_ready_persistent_state: Optional[int] = -1
     max_workers: Optional[int] = None
     query_filters: Optional[list[QueryFilter]] = None
@@ -1183,12 +1704,20 @@ class OLSConfig(BaseModel):
     tool_filtering: Optional[ToolFilteringConfig] = None
 
     tools_approval: Optional[ToolsApprovalConfig] = None
+    tool_result_cache: Optional[ToolResultCacheConfig] = None
+    mcp_circuit_breaker: Optional[MCPCircuitBreakerConfig] = None
+    attachment_compaction: Optional[AttachmentCompactionConfig] = None
+    admission_control: Optional[AdmissionControlConfig] = None
+    tracing: Optional[TracingConfig] = None
+    event_loop_monitor: EventLoopMonitorConfig = EventLoopMonitorConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
 
     skills: Optional[SkillsConfig] = None
 
     tool_round_cap_fraction: float = constants.DEFAULT_TOOL_ROUND_CAP_FRACTION
 
     offload_storage_path: str = constants.DEFAULT_OFFLOAD_STORAGE_PATH
+    offload_memory_store: Optional[OffloadMemoryStoreConfig] = None
 
     def __init__(
         self, data: Optional[dict] = None, ignore_missing_certs: bool = False
@@ -1201,6 +1730,7 @@ class OLSConfig(BaseModel):
         self.conversation_cache = ConversationCacheConfig(
             data.get("conversation_cache", None)
         )
+        self._init_optional_sections(data)
         self.logging_config = LoggingConfig(**data.get("logging_config", {}))
         if data.get("reference_content") is not None:
             self.reference_content = ReferenceContent(data.get("reference_content"))
@@ -1208,6 +1738,8 @@ class OLSConfig(BaseModel):
         self.default_model = data.get("default_model", None)
         self.max_iterations = data.get("max_iterations")
         self.history_compression_enabled = data.get("history_compression_enabled", True)
+        self.request_coalescing_enabled = data.get("request_coalescing_enabled", False)
+        self.stage_metrics_enabled = data.get("stage_metrics_enabled", False)
         self.max_workers = data.get("max_workers", 1)
         self.expire_llm_is_ready_persistent_state = data.get(
             "expire_llm_is_ready_persistent_state", -1
@@ -1248,6 +1780,10 @@ class OLSConfig(BaseModel):
             self.tools_approval = ToolsApprovalConfig(**data.get("tools_approval"))
         if data.get("skills", None) is not None:
             self.skills = SkillsConfig(**data.get("skills"))
+        self.event_loop_monitor = EventLoopMonitorConfig(
+            **data.get("event_loop_monitor", {})
+        )
+        self.profiling = ProfilingConfig(**data.get("profiling", {}))
 
         raw_cap = data.get(
             "tool_round_cap_fraction", constants.DEFAULT_TOOL_ROUND_CAP_FRACTION
@@ -1264,6 +1800,41 @@ class OLSConfig(BaseModel):
             "offload_storage_path", constants.DEFAULT_OFFLOAD_STORAGE_PATH
         )
 
+    def _init_optional_sections(self, data: dict) -> None:
+        """Initialize optional sections, which stay unset when not configured."""
+        if data.get("response_cache") is not None:
+            self.response_cache = ResponseCacheConfig(data.get("response_cache"))
+        if data.get("background_history_compression", None) is not None:
+            self.background_history_compression = BackgroundHistoryCompressionConfig(
+                **data.get("background_history_compression")
+            )
+        if data.get("history_summarization", None) is not None:
+            self.history_summarization = HistorySummarizationConfig(
+                **data.get("history_summarization")
+            )
+        if data.get("tool_result_cache", None) is not None:
+            self.tool_result_cache = ToolResultCacheConfig(
+                **data.get("tool_result_cache")
+            )
+        if data.get("mcp_circuit_breaker", None) is not None:
+            self.mcp_circuit_breaker = MCPCircuitBreakerConfig(
+                **data.get("mcp_circuit_breaker")
+            )
+        if data.get("attachment_compaction", None) is not None:
+            self.attachment_compaction = AttachmentCompactionConfig(
+                **data.get("attachment_compaction")
+            )
+        if data.get("admission_control", None) is not None:
+            self.admission_control = AdmissionControlConfig(
+                **data.get("admission_control")
+            )
+        if data.get("tracing", None) is not None:
+            self.tracing = TracingConfig(**data.get("tracing"))
+        if data.get("offload_memory_store", None) is not None:
+            self.offload_memory_store = OffloadMemoryStoreConfig(
+                **data.get("offload_memory_store")
+            )
+
     def _propagate_tls_profile(self) -> None:
         """Set the TLS security profile on all PostgresConfig instances."""
         if (
@@ -1275,6 +1846,10 @@ class OLSConfig(BaseModel):
             self.conversation_cache.postgres.tls_security_profile = (
                 self.tls_security_profile
             )
+        if self.response_cache and self.response_cache.postgres:
+            self.response_cache.postgres.tls_security_profile = (
+                self.tls_security_profile
+            )
         if self.quota_handlers and self.quota_handlers.storage:
             self.quota_handlers.storage.tls_security_profile = self.tls_security_profile
 
@@ -1282,6 +1857,8 @@ class OLSConfig(BaseModel):
         """Validate OLS config."""
         if self.conversation_cache is not None:
             self.conversation_cache.validate_yaml()
+        if self.response_cache is not None:
+            self.response_cache.validate_yaml()
         if self.reference_content is not None:
             self.reference_content.validate_yaml()
         if self.tls_config:
@@ -1378,6 +1955,20 @@ class Config(BaseModel):
                 f"default_model specifies an unknown model {selected_default_model}"
             )
 
+    def _validate_history_summarization_model(self) -> None:
+        summarization = self.ols_config.history_summarization
+        if summarization is None:
+            return
+        provider_config = self.llm_providers.providers.get(summarization.provider)
+        if provider_config is None:
+            raise checks.InvalidConfigurationError(
+                f"history_summarization specifies an unknown provider {summarization.provider}"
+            )
+        if summarization.model not in provider_config.models:
+            raise checks.InvalidConfigurationError(
+                f"history_summarization specifies an unknown model {summarization.model}"
+            )
+
     def _validate_mcp_servers(self) -> None:
         """Validate MCP servers with auth module context.
 
@@ -1421,3 +2012,4 @@ class Config(BaseModel):
         self.llm_providers.validate_yaml()
         self.ols_config.validate_yaml(self.dev_config.disable_tls)
         self._validate_default_provider_and_model()
+        self._validate_history_summarization_model()
@@ -345,6 +345,169 @@ class PromptTooLongResponse(ErrorResponse):
     }
 
 
+class TooManyRequestsResponse(ErrorResponse):
+    """Model representing error response when the service is overloaded."""
+
+    # provides examples for /docs endpoint
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "detail": {
+                        "response": "The service is overloaded",
+                        "cause": "Query rejected by admission control: queue_full",
+                    },
+                },
+            ]
+        }
+    }
+
+
+class BlockingEventResponse(BaseModel):
+    """Model representing one event loop stall.
+
+    Attributes:
+        timestamp: Time when the stall was detected (seconds since epoch).
+        lag_seconds: How long the event loop was blocked.
+        task: Task holding the event loop, when captured.
+        stack: Stack of the event loop thread, when captured.
+    """
+
+    timestamp: float
+    lag_seconds: float
+    task: Optional[str] = None
+    stack: Optional[list[str]] = None
+
+
+class EventLoopDiagnosticsResponse(BaseModel):
+    """Model representing event loop lag diagnostics.
+
+    Attributes:
+        monitor_enabled: Whether the event loop monitor runs.
+        capture_stacks: Whether stacks of blocking code are captured.
+        lag_threshold_seconds: Lag above which the loop is considered blocked.
+        last_lag_seconds: Most recently measured lag.
+        max_lag_seconds: Maximum lag measured since start.
+        blocking_events: Most recent stalls, oldest first.
+    """
+
+    monitor_enabled: bool
+    capture_stacks: bool = False
+    lag_threshold_seconds: Optional[float] = None
+    last_lag_seconds: Optional[float] = None
+    max_lag_seconds: Optional[float] = None
+    blocking_events: list[BlockingEventResponse] = []
+
+    # provides examples for /docs endpoint
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "monitor_enabled": True,
+                    "capture_stacks": True,
+                    "lag_threshold_seconds": 0.1,
+                    "last_lag_seconds": 0.002,
+                    "max_lag_seconds": 1.3,
+                    "blocking_events": [
+                        {
+                            "timestamp": 1735689600.0,
+                            "lag_seconds": 1.3,
+                            "task": "Task-42 (DocsSummarizer.generate_response)",
+                            "stack": [
+                                '  File "ols/src/cache/postgres_cache.py", '
+                                "line 120, in get\n"
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+    }
+
+
+class AllocationSiteResponse(BaseModel):
+    """Model representing memory allocated at one site.
+
+    Attributes:
+        site: Source line (`file:line`) or package holding the memory.
+        size_bytes: Size of memory blocks allocated at the site.
+        count: Number of memory blocks allocated at the site.
+        size_diff_bytes: Change of the size against the compared snapshot.
+        count_diff: Change of the number of blocks against the compared snapshot.
+    """
+
+    site: str
+    size_bytes: int
+    count: int
+    size_diff_bytes: int = 0
+    count_diff: int = 0
+
+
+class MemoryReportResponse(BaseModel):
+    """Model representing memory attributed to allocation sites.
+
+    Attributes:
+        traced_since_startup: Whether allocations were traced before the request.
+            When not, only allocations made during the window are reported.
+        compared_to: `window` or `previous_snapshot`, what the snapshot was
+            compared to.
+        traced_memory_bytes: Size of traced memory blocks.
+        traced_memory_peak_bytes: Peak size of traced memory blocks.
+        top_sites: Source lines holding the most memory.
+        top_growth: Source lines whose memory changed the most.
+        packages: Packages holding the most memory.
+    """
+
+    traced_since_startup: bool
+    compared_to: str
+    traced_memory_bytes: int
+    traced_memory_peak_bytes: int
+    top_sites: list[AllocationSiteResponse]
+    top_growth: list[AllocationSiteResponse]
+    packages: list[AllocationSiteResponse]
+
+    # provides examples for /docs endpoint
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "traced_since_startup": True,
+                    "compared_to": "window",
+                    "traced_memory_bytes": 734003200,
+                    "traced_memory_peak_bytes": 801112064,
+                    "top_sites": [
+                        {
+                            "site": "llama_index/core/storage/docstore/utils.py:73",
+                            "size_bytes": 157286400,
+                            "count": 61234,
+                            "size_diff_bytes": 0,
+                            "count_diff": 0,
+                        }
+                    ],
+                    "top_growth": [
+                        {
+                            "site": "ols/src/cache/in_memory_cache.py:88",
+                            "size_bytes": 2097152,
+                            "count": 812,
+                            "size_diff_bytes": 524288,
+                            "count_diff": 203,
+                        }
+                    ],
+                    "packages": [
+                        {
+                            "site": "llama_index",
+                            "size_bytes": 314572800,
+                            "count": 402311,
+                            "size_diff_bytes": 0,
+                            "count_diff": 0,
+                        }
+                    ],
+                }
+            ]
+        }
+    }
+
+
 class StatusResponse(BaseModel):
     """Model representing a response to a status request.
 
@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from ols.app.endpoints import (
     authorized,
     conversations,
+    diagnostics,
     feedback,
     health,
     mcp_apps,
@@ -29,6 +30,7 @@ def include_routers(app: FastAPI) -> None:
     app.include_router(tool_approvals.router, prefix="/v1")
     app.include_router(feedback.router, prefix="/v1")
     app.include_router(conversations.router, prefix="/v1")
+    app.include_router(diagnostics.router, prefix="/v1")
     app.include_router(health.router)
     app.include_router(metrics.router)
     app.include_router(authorized.router)
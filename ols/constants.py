@@ -123,6 +123,15 @@ RAG_CONTENT_LIMIT = 5
 # Range: 0 to 1
 RAG_SIMILARITY_CUTOFF = 0.3
 
+# Approximate (HNSW / IVF-PQ) FAISS indexes produced by the offline conversion
+# tool carry their query-time search parameters (efSearch, nprobe) in this
+# file next to the persisted vector store.
+FAISS_SEARCH_PARAMS_FILENAME = "faiss_search_params.json"
+
+# Retrieval result cache (node ids and scores per normalized query)
+RETRIEVAL_CACHE_MAX_ENTRIES = 1000
+RETRIEVAL_CACHE_TTL_SECONDS = 3600
+
 
 # cache constants
 CACHE_TYPE_MEMORY = "memory"
@@ -134,6 +143,39 @@ POSTGRES_CACHE_DBNAME = "cache"
 POSTGRES_CACHE_USER = "postgres"
 POSTGRES_CACHE_MAX_ENTRIES = 1000
 
+# LLM response cache constants
+RESPONSE_CACHE_TTL_SECONDS = 3600
+RESPONSE_CACHE_SIMILARITY_THRESHOLD = 0.95
+# maximum size of one cached response in bytes
+RESPONSE_CACHE_MAX_ENTRY_SIZE = 32 * 1024
+# most recent responses compared by query embedding in one lookup
+RESPONSE_CACHE_MAX_CANDIDATES = 100
+
+# admission control constants
+ADMISSION_MAX_CONCURRENT_REQUESTS = 16
+ADMISSION_MAX_QUEUE_SIZE = 32
+ADMISSION_QUEUE_TIMEOUT_SECONDS = 30.0
+ADMISSION_RETRY_AFTER_SECONDS = 5
+
+# event loop monitor constants
+EVENT_LOOP_MONITOR_INTERVAL_SECONDS = 0.5
+EVENT_LOOP_LAG_THRESHOLD_SECONDS = 0.1
+EVENT_LOOP_MAX_OFFENDERS = 20
+
+# on-demand profiling constants
+PROFILING_MAX_DURATION_SECONDS = 60.0
+PROFILING_SAMPLING_INTERVAL_SECONDS = 0.01
+PROFILING_MAX_STACKS = 2000
+PROFILING_MAX_STACK_DEPTH = 100
+PROFILING_TRACEMALLOC_FRAMES = 10
+PROFILING_MAX_ALLOCATION_SITES = 100
+
+# tracing constants
+TRACING_EXPORTER_OTLP = "otlp"
+TRACING_EXPORTER_FILE = "file"
+TRACING_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+TRACING_SERVICE_NAME = "lightspeed-service"
+
 # look at https://www.postgresql.org/docs/current/libpq-connect.html#LIBPQ-CONNECT-SSLMODE
 # for all possible options
 POSTGRES_CACHE_SSL_MODE = "require"
@@ -183,6 +225,19 @@ ATTACHMENT_CONTENT_TYPES = frozenset(
     {"text/plain", "application/json", "application/yaml", "application/xml"}
 )
 
+# Attachment compactors
+ATTACHMENT_COMPACTOR_YAML = "yaml"
+ATTACHMENT_COMPACTOR_LOG = "log"
+ATTACHMENT_COMPACTORS = frozenset({ATTACHMENT_COMPACTOR_YAML, ATTACHMENT_COMPACTOR_LOG})
+
+# Attachments are compacted only when they take more tokens in total
+DEFAULT_ATTACHMENT_TOKEN_BUDGET = 2000
+
+# Bounds of reading kind and name of resources from YAML attachments,
+# size is in characters, the rest of the attachment is not read
+ATTACHMENT_YAML_SNIFF_MAX_SIZE = 1024 * 1024
+ATTACHMENT_YAML_SNIFF_TIMEOUT_SECONDS = 0.1
+
 # Default name of file containing API token
 API_TOKEN_FILENAME = "apitoken"  # noqa: S105  # nosec: B105
 
@@ -258,6 +313,13 @@ NO_USER_TOKEN = ""
 # quota limiters constants
 USER_QUOTA_LIMITER = "user_limiter"
 CLUSTER_QUOTA_LIMITER = "cluster_limiter"
+QUOTA_AVAILABLE_CACHE_TTL_SECONDS = 5.0
+# key of Postgres advisory lock held by the replica running quota scheduler
+QUOTA_SCHEDULER_LOCK_ID = 0x4F4C535155
+# scheduler period is randomly shortened or prolonged by up to this ratio
+QUOTA_SCHEDULER_JITTER = 0.1
+QUOTA_AVAILABLE_CACHE_MAX_ENTRIES = 10000
+TOKEN_HISTORY_FLUSH_INTERVAL_SECONDS = 10.0
 
 # MCP transport default timeout
 MCP_HTTP_TRANSPORT_DEFAULT_TIMEOUT = 5  # in seconds
@@ -268,6 +330,31 @@ OFFLOAD_MAX_SEARCH_MATCHES = 50
 OFFLOAD_MAX_READ_LINES = 500
 OFFLOAD_MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024  # 50 MB
 OFFLOAD_REGEX_TIMEOUT_SECONDS = 5
+OFFLOAD_SEARCH_MAX_WORKERS = 4
+DEFAULT_OFFLOAD_MEMORY_BUDGET_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_OFFLOAD_COMPRESSION_LEVEL = 3
+
+# Background history compression defaults
+BACKGROUND_HISTORY_COMPRESSION_TRIGGER_RATIO = 0.7
+BACKGROUND_HISTORY_COMPRESSION_WAIT_TIMEOUT_SECONDS = 30.0
+BACKGROUND_HISTORY_COMPRESSION_MAX_PENDING = 1024
+
+# Dedicated history summarization model defaults
+HISTORY_SUMMARIZATION_MAX_CONCURRENCY = 4
+HISTORY_SUMMARIZATION_TIMEOUT_SECONDS = 10.0
+
+# MCP server circuit breaker defaults
+MCP_CIRCUIT_BREAKER_WINDOW_SIZE = 20
+MCP_CIRCUIT_BREAKER_MIN_CALLS = 5
+MCP_CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD = 0.5
+MCP_CIRCUIT_BREAKER_SLOW_CALL_SECONDS = 10.0
+MCP_CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS = 15.0
+MCP_CIRCUIT_BREAKER_PROBE_TIMEOUT_SECONDS = 2.0
+
+# Read-only tool result cache defaults
+TOOL_RESULT_CACHE_TTL_SECONDS = 60
+TOOL_RESULT_CACHE_MAX_SIZE_BYTES = 64 * 1024 * 1024  # 64 MB
+TOOL_RESULT_CACHE_MAX_ENTRY_SIZE_BYTES = 1024 * 1024  # 1 MB
 
 # MCP authorization header placeholders
 MCP_KUBERNETES_PLACEHOLDER = "kubernetes"
@@ -1,9 +1,10 @@
 """User and cluster quota scheduler runner."""
 
 import logging
+import random
 from threading import Thread
-from time import sleep
-from typing import Any, Optional
+from time import monotonic, sleep
+from typing import Any, NamedTuple, Optional
 
 import psycopg2
 
@@ -15,23 +16,51 @@ from ols.utils.ssl import libpq_tls_params
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-INCREASE_QUOTA_STATEMENT = """
+# Limiters are applied in one statement. Every quota row due for revocation
+# is changed by the first limiter (in configuration order) whose period has
+# elapsed, as changing the row starts a new period for all limiters.
+REVOKE_QUOTAS_STATEMENT = """
+    WITH actions AS (
+        SELECT * FROM unnest(%(subjects)s::char(1)[], %(amounts)s::int[],
+                             %(resets)s::boolean[], %(periods)s::interval[])
+                      WITH ORDINALITY
+                      AS actions (subject, amount, reset, period, position)
+    ),
+    due AS (
+        SELECT DISTINCT ON (quota_limits.id, quota_limits.subject)
+               quota_limits.id, quota_limits.subject, actions.amount, actions.reset
+          FROM quota_limits
+          JOIN actions ON quota_limits.subject = actions.subject
+                      AND quota_limits.revoked_at < NOW() - actions.period
+         ORDER BY quota_limits.id, quota_limits.subject, actions.position
+    )
     UPDATE quota_limits
-       SET available=available+%s, revoked_at=NOW()
-     WHERE subject=%s
-       AND revoked_at < NOW() - INTERVAL %s ;
+       SET available=CASE WHEN due.reset THEN due.amount
+                          ELSE quota_limits.available + due.amount END,
+           revoked_at=NOW()
+      FROM due
+     WHERE quota_limits.id = due.id
+       AND quota_limits.subject = due.subject ;
     """
 
-RESET_QUOTA_STATEMENT = """
-    UPDATE quota_limits
-       SET available=%s, revoked_at=NOW()
-     WHERE subject=%s
-       AND revoked_at < NOW() - INTERVAL %s ;
-    """
+TRY_LOCK_STATEMENT = "SELECT pg_try_advisory_lock(%s) ;"
+
+
+class RevocationAction(NamedTuple):
+    """Increase or reset of quota of one subject type."""
+
+    subject: str
+    amount: int
+    reset: bool
+    period: str
 
 
 def quota_scheduler(config: Optional[QuotaHandlersConfig]) -> bool:
-    """Quota scheduler task."""
+    """Quota scheduler task.
+
+    Quota is revoked only by the replica holding the scheduler advisory
+    lock, other replicas try to take over the lock every period.
+    """
     if config is None:
         logger.warning("Quota limiters are not configured, skipping")
         return False
@@ -49,28 +78,47 @@ def quota_scheduler(config: Optional[QuotaHandlersConfig]) -> bool:
         logger.warning("No limiters are setup, skipping")
         return False
 
+    actions = revocation_actions(config.limiters.limiters)
     period = config.scheduler.period
+    jitter = config.scheduler.jitter
 
     logger.info(
         "Quota scheduler started in separated thread with period set to %d seconds",
         period,
     )
 
+    leader = False
     while True:
-        logger.info("Quota scheduler sync started")
-        for name, limiter in config.limiters.limiters.items():
-            try:
-                quota_revocation(connection, name, limiter)
-            except Exception as e:
-                logger.error("Quota revoke error: %s", e)
-        logger.info("Quota scheduler sync finished")
-        sleep(period)
+        try:
+            if connection.closed:
+                # the advisory lock is released with the closed session
+                leader = False
+                connection = connect(config.storage)
+            if not leader:
+                leader = acquire_leadership(connection)
+            if leader:
+                revoke_quotas(connection, actions)
+        except Exception as e:
+            logger.error("Quota revoke error: %s", e)
+        record_leadership(leader)
+        sleep(jittered_period(period, jitter))
     # unreachable code
     connection.close()
     return True
 
 
-def quota_revocation(connection: Any, name: str, quota_limiter: LimiterConfig) -> None:
+def revocation_actions(limiters: dict[str, LimiterConfig]) -> list[RevocationAction]:
+    """Return increases and resets of quota of all valid limiters."""
+    actions = []
+    for name, limiter in limiters.items():
+        try:
+            actions.extend(quota_revocation(name, limiter))
+        except Exception as e:
+            logger.error("Quota revoke error: %s", e)
+    return actions
+
+
+def quota_revocation(name: str, quota_limiter: LimiterConfig) -> list[RevocationAction]:
     """Quota revocation mechanism."""
     logger.info(
         "Quota revocation mechanism for limiter '%s' of type '%s'",
@@ -85,64 +133,91 @@ def quota_revocation(connection: Any, name: str, quota_limiter: LimiterConfig) -
         raise Exception("Limiter period not set, skipping revocation")
 
     subject_id = get_subject_id(quota_limiter.type)
+    actions = []
 
     if quota_limiter.quota_increase is not None:
-        increase_quota(
-            connection, subject_id, quota_limiter.quota_increase, quota_limiter.period
+        actions.append(
+            RevocationAction(
+                subject_id, quota_limiter.quota_increase, False, quota_limiter.period
+            )
         )
 
     if quota_limiter.initial_quota is not None and quota_limiter.initial_quota > 0:
-        reset_quota(
-            connection, subject_id, quota_limiter.initial_quota, quota_limiter.period
+        actions.append(
+            RevocationAction(
+                subject_id, quota_limiter.initial_quota, True, quota_limiter.period
+            )
         )
+    return actions
 
 
-def increase_quota(
-    connection: Any, subject_id: str, increase_by: int, period: str
-) -> None:
-    """Increase quota by specified amount."""
-    logger.info(
-        "Increasing quota for subject '%s' by %d when period %s is reached",
-        subject_id,
-        increase_by,
-        period,
-    )
+def acquire_leadership(connection: Any) -> bool:
+    """Try to take the scheduler advisory lock without waiting.
+
+    The lock is bound to the database session, so it's held until the
+    connection of the leader is closed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(TRY_LOCK_STATEMENT, (constants.QUOTA_SCHEDULER_LOCK_ID,))
+        row = cursor.fetchone()
+    leader = bool(row and row[0])
+    if leader:
+        logger.info("Quota scheduler lock acquired, revoking quota in this replica")
+    return leader
 
-    update_statement = INCREASE_QUOTA_STATEMENT
 
+def revoke_quotas(connection: Any, actions: list[RevocationAction]) -> int:
+    """Increase and reset quota of all limiters in one statement.
+
+    Returns:
+        Number of changed quota rows.
+    """
+    if not actions:
+        record_run(0.0, 0)
+        return 0
+    logger.info("Quota scheduler sync started")
+    started = monotonic()
     with connection.cursor() as cursor:
         cursor.execute(
-            update_statement,
-            (
-                increase_by,
-                subject_id,
-                period,
-            ),
+            REVOKE_QUOTAS_STATEMENT,
+            {
+                "subjects": [action.subject for action in actions],
+                "amounts": [action.amount for action in actions],
+                "resets": [action.reset for action in actions],
+                "periods": [action.period for action in actions],
+            },
         )
-        logger.info("Changed %d rows in database", cursor.rowcount)
+        rows = cursor.rowcount
+    logger.info("Quota scheduler sync finished, changed %d rows in database", rows)
+    record_run(monotonic() - started, rows)
+    return rows
 
 
-def reset_quota(connection: Any, subject_id: str, reset_to: int, period: str) -> None:
-    """Reset quota to specified amount."""
-    logger.info(
-        "Reseting quota for subject '%s' to %d when period %s is reached",
-        subject_id,
-        reset_to,
-        period,
+def jittered_period(period: int, jitter: float) -> float:
+    """Return the period randomly shortened or prolonged by the jitter ratio."""
+    return period * random.uniform(1 - jitter, 1 + jitter)  # noqa: S311
+
+
+def record_leadership(leader: bool) -> None:
+    """Export whether this replica runs the quota scheduler."""
+    # metrics module requires configured authentication, import it only
+    # when the scheduler runs
+    from ols.app.metrics.metrics import (  # pylint: disable=import-outside-toplevel
+        quota_scheduler_leader,
     )
 
-    update_statement = RESET_QUOTA_STATEMENT
+    quota_scheduler_leader.set(1 if leader else 0)
 
-    with connection.cursor() as cursor:
-        cursor.execute(
-            update_statement,
-            (
-                reset_to,
-                subject_id,
-                period,
-            ),
-        )
-        logger.info("Changed %d rows in database", cursor.rowcount)
+
+def record_run(duration: float, rows: int) -> None:
+    """Export duration and changed rows of the last scheduler run."""
+    from ols.app.metrics.metrics import (  # pylint: disable=import-outside-toplevel
+        quota_scheduler_last_run_affected_rows,
+        quota_scheduler_last_run_duration_seconds,
+    )
+
+    quota_scheduler_last_run_duration_seconds.set(duration)
+    quota_scheduler_last_run_affected_rows.set(rows)
 
 
 def get_subject_id(limiter_type: str) -> str:
@@ -16,6 +16,7 @@ from ols.constants import (
     NO_USER_TOKEN,
     RUNNING_IN_CLUSTER,
 )
+from ols.utils.stage_timer import Stage, timed_stage
 
 from .auth_dependency_interface import AuthDependencyInterface
 
@@ -288,6 +289,7 @@ class AuthDependency(AuthDependencyInterface):
         """Initialize the required allowed paths for authorization checks."""
         self.virtual_path = virtual_path
 
+    @timed_stage(Stage.AUTH)
     async def __call__(self, request: Request) -> tuple[str, str, bool, str]:
         """Validate FastAPI Requests for authentication and authorization.
 
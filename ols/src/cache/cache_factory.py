@@ -1,10 +1,13 @@
 """Cache factory class."""
 
 from ols import constants
-from ols.app.models.config import ConversationCacheConfig
+from ols.app.models.config import ConversationCacheConfig, ResponseCacheConfig
 from ols.src.cache.cache import Cache
 from ols.src.cache.in_memory_cache import InMemoryCache
+from ols.src.cache.in_memory_response_cache import InMemoryResponseCache
 from ols.src.cache.postgres_cache import PostgresCache
+from ols.src.cache.postgres_response_cache import PostgresResponseCache
+from ols.src.cache.response_cache import ResponseCache
 
 
 class CacheFactory:
@@ -28,3 +31,23 @@ class CacheFactory:
                     f"Use '{constants.CACHE_TYPE_POSTGRES}' or "
                     f"'{constants.CACHE_TYPE_MEMORY}' options."
                 )
+
+    @staticmethod
+    def response_cache(config: ResponseCacheConfig) -> ResponseCache:
+        """Create an instance of ResponseCache based on loaded configuration.
+
+        Returns:
+            An instance of `ResponseCache` (either `PostgresResponseCache` or
+            `InMemoryResponseCache`).
+        """
+        match config.type:
+            case constants.CACHE_TYPE_MEMORY:
+                return InMemoryResponseCache(config)
+            case constants.CACHE_TYPE_POSTGRES:
+                return PostgresResponseCache(config)
+            case _:
+                raise ValueError(
+                    f"Invalid response cache type: {config.type}. "
+                    f"Use '{constants.CACHE_TYPE_POSTGRES}' or "
+                    f"'{constants.CACHE_TYPE_MEMORY}' options."
+                )
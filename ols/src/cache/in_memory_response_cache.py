@@ -0,0 +1,104 @@
+"""In-memory LRU cache of LLM responses."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ols import constants
+from ols.app.models.config import ResponseCacheConfig
+from ols.src.cache.response_cache import CachedResponse, ResponseCache
+
+
+class InMemoryResponseCache(ResponseCache):
+    """In-memory LRU cache of LLM responses with TTL.
+
+    Responses are looked up by exact query first. Only the most recent
+    `RESPONSE_CACHE_MAX_CANDIDATES` responses of the key are compared by
+    query embedding, expired responses are removed when they are found.
+    """
+
+    def __init__(self, config: ResponseCacheConfig) -> None:
+        """Initialize the in-memory response cache."""
+        super().__init__(config.ttl_seconds, config.similarity_threshold)
+        self.capacity = int(config.memory.max_entries)
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+        # queries of responses stored under each key, oldest first
+        self._queries: dict[str, dict[str, None]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, key: str, query: str, embedding: Optional[list[float]]
+    ) -> Optional[CachedResponse]:
+        """Look up a response similar to the query.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            query: Normalized query text.
+            embedding: Query embedding, or None when not available.
+
+        Returns:
+            The matching cached response, or None if not found or expired.
+        """
+        expire_before = time.time() - self.ttl_seconds
+        with self._lock:
+            match = self._live(key, query, expire_before)
+            if match is None and embedding is not None:
+                recent = list(self._queries.get(key, {}))[
+                    -constants.RESPONSE_CACHE_MAX_CANDIDATES :
+                ]
+                candidates = [
+                    response
+                    for candidate in recent
+                    if (response := self._live(key, candidate, expire_before))
+                    is not None
+                ]
+                match = self.best_match(candidates, query, embedding)
+            if match is not None:
+                self._entries.move_to_end((key, match.query))
+            return match
+
+    def insert(self, key: str, response: CachedResponse) -> None:
+        """Store a response in the cache, evicting least recently used entries.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            response: The response to store.
+        """
+        if response.created_at == 0.0:
+            response.created_at = time.time()
+        with self._lock:
+            if (key, response.query) in self._entries:
+                self._remove(key, response.query)
+            self._entries[(key, response.query)] = response
+            self._queries.setdefault(key, {})[response.query] = None
+            while len(self._entries) > self.capacity:
+                self._remove(*next(iter(self._entries)))
+
+    def ready(self) -> bool:
+        """Check if the cache is ready.
+
+        In-memory cache is always ready.
+
+        Returns:
+            True
+        """
+        return True
+
+    def _live(
+        self, key: str, query: str, expire_before: float
+    ) -> Optional[CachedResponse]:
+        """Return unexpired response for the query, removing expired one."""
+        response = self._entries.get((key, query))
+        if response is not None and response.created_at < expire_before:
+            self._remove(key, query)
+            return None
+        return response
+
+    def _remove(self, key: str, query: str) -> None:
+        """Remove response of the query, must hold the lock."""
+        del self._entries[(key, query)]
+        queries = self._queries[key]
+        del queries[query]
+        if not queries:
+            del self._queries[key]
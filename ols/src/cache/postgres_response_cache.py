@@ -0,0 +1,228 @@
+"""Cache of LLM responses that uses Postgres to store cached values."""
+
+import json
+import logging
+import threading
+from typing import Any, Optional
+
+import psycopg2
+
+from ols import constants
+from ols.app.models.config import ResponseCacheConfig
+from ols.src.cache.cache_error import CacheError
+from ols.src.cache.response_cache import CachedResponse, ResponseCache
+from ols.utils.postgres import PostgresBase, connection
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresResponseCache(ResponseCache, PostgresBase):
+    """Cache of LLM responses that uses Postgres to store cached values.
+
+    Response cache table:
+    ```
+       Column   |            Type             | Nullable |
+    ------------+-----------------------------+----------+
+     cache_key  | text                        | not null |
+     query      | text                        | not null |
+     value      | bytea                       | not null |
+     created_at | timestamp without time zone | not null |
+     embedding  | double precision[]          |          |
+    Indexes:
+        "response_cache_pkey" PRIMARY KEY, btree (cache_key, query)
+        "response_cache_created_at" btree (created_at)
+        "response_cache_key_created_at" btree (cache_key, created_at)
+    ```
+
+    Responses are looked up by exact query first. Only embeddings of the
+    most recent `RESPONSE_CACHE_MAX_CANDIDATES` responses of the key are
+    read for similarity lookup, and only the value of the best match is
+    read and decoded.
+    """
+
+    CREATE_RESPONSE_CACHE_TABLE = """
+        CREATE TABLE IF NOT EXISTS response_cache (
+            cache_key  text NOT NULL,
+            query      text NOT NULL,
+            value      bytea NOT NULL,
+            created_at timestamp NOT NULL,
+            embedding  double precision[],
+            PRIMARY KEY(cache_key, query)
+        );
+        """
+
+    # tables created before embeddings were stored in their own column
+    ADD_EMBEDDING_COLUMN = """
+        ALTER TABLE response_cache
+          ADD COLUMN IF NOT EXISTS embedding double precision[]
+        """
+
+    CREATE_INDEX = """
+        CREATE INDEX IF NOT EXISTS response_cache_created_at
+            ON response_cache (created_at)
+        """
+
+    CREATE_KEY_INDEX = """
+        CREATE INDEX IF NOT EXISTS response_cache_key_created_at
+            ON response_cache (cache_key, created_at)
+        """
+
+    SELECT_RESPONSE_STATEMENT = """
+        SELECT value, embedding
+          FROM response_cache
+         WHERE cache_key=%s
+           AND query=%s
+           AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+        """
+
+    SELECT_EMBEDDINGS_STATEMENT = """
+        SELECT query, embedding
+          FROM response_cache
+         WHERE cache_key=%s
+           AND embedding IS NOT NULL
+           AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+         ORDER BY created_at DESC
+         LIMIT %s
+        """
+
+    UPSERT_RESPONSE_STATEMENT = """
+        INSERT INTO response_cache(cache_key, query, value, created_at, embedding)
+        VALUES (%s, %s, %s, CURRENT_TIMESTAMP, %s)
+        ON CONFLICT (cache_key, query)
+        DO UPDATE SET value=EXCLUDED.value, created_at=EXCLUDED.created_at,
+                      embedding=EXCLUDED.embedding
+        """
+
+    DELETE_EXPIRED_STATEMENT = """
+        DELETE FROM response_cache
+         WHERE created_at <= CURRENT_TIMESTAMP - make_interval(secs => %s)
+        """
+
+    # reads at most capacity + 1 rows, without sorting them
+    OVER_CAPACITY_STATEMENT = """
+        SELECT EXISTS (SELECT 1 FROM response_cache OFFSET %s)
+        """
+
+    DELETE_OLDEST_STATEMENT = """
+        DELETE FROM response_cache
+         WHERE (cache_key, query) IN
+               (SELECT cache_key, query FROM response_cache
+                 ORDER BY created_at DESC OFFSET %s)
+        """
+
+    def __init__(self, config: ResponseCacheConfig) -> None:
+        """Create a new instance of Postgres response cache."""
+        ResponseCache.__init__(self, config.ttl_seconds, config.similarity_threshold)
+        self._tx_lock = threading.Lock()
+        self.capacity = config.postgres.max_entries
+        PostgresBase.__init__(self, config.postgres)
+
+    @property
+    def _ddl_statements(self) -> list[str]:
+        """Return DDL statements for response cache table and indexes."""
+        return [
+            self.CREATE_RESPONSE_CACHE_TABLE,
+            self.ADD_EMBEDDING_COLUMN,
+            self.CREATE_INDEX,
+            self.CREATE_KEY_INDEX,
+        ]
+
+    @connection
+    def get(
+        self, key: str, query: str, embedding: Optional[list[float]]
+    ) -> Optional[CachedResponse]:
+        """Look up a response similar to the query.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            query: Normalized query text.
+            embedding: Query embedding, or None when not available.
+
+        Returns:
+            The matching cached response, or None if not found or expired.
+        """
+        with self._tx_lock:
+            with self.connection.cursor() as cursor:
+                try:
+                    response = self._select_response(cursor, key, query)
+                    if response is not None or embedding is None:
+                        return response
+                    cursor.execute(
+                        self.SELECT_EMBEDDINGS_STATEMENT,
+                        (
+                            key,
+                            self.ttl_seconds,
+                            constants.RESPONSE_CACHE_MAX_CANDIDATES,
+                        ),
+                    )
+                    candidates = [
+                        CachedResponse(query=row[0], embedding=list(row[1]))
+                        for row in cursor.fetchall()
+                    ]
+                    match = self.best_match(candidates, query, embedding)
+                    if match is None:
+                        return None
+                    return self._select_response(cursor, key, match.query)
+                except psycopg2.DatabaseError as e:
+                    logger.error("PostgresResponseCache.get %s", e)
+                    raise CacheError("PostgresResponseCache.get", e) from e
+
+    def _select_response(
+        self, cursor: Any, key: str, query: str
+    ) -> Optional[CachedResponse]:
+        """Read response stored for the exact query."""
+        cursor.execute(self.SELECT_RESPONSE_STATEMENT, (key, query, self.ttl_seconds))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        response = CachedResponse.from_dict(json.loads(str(row[0], "utf-8")))
+        response.embedding = list(row[1]) if row[1] is not None else None
+        return response
+
+    @connection
+    def insert(self, key: str, response: CachedResponse) -> None:
+        """Store a response in the cache and remove expired and oldest entries.
+
+        Oldest entries are removed only when the cache is over its capacity.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            response: The response to store.
+        """
+        # embedding is stored in its own column
+        value = json.dumps({**response.to_dict(), "embedding": None}).encode("utf-8")
+        with self._tx_lock:
+            self.connection.autocommit = False
+            with self.connection.cursor() as cursor:
+                try:
+                    cursor.execute(
+                        self.UPSERT_RESPONSE_STATEMENT,
+                        (key, response.query, value, response.embedding),
+                    )
+                    cursor.execute(self.DELETE_EXPIRED_STATEMENT, (self.ttl_seconds,))
+                    cursor.execute(self.OVER_CAPACITY_STATEMENT, (self.capacity,))
+                    row = cursor.fetchone()
+                    if row is not None and row[0]:
+                        cursor.execute(self.DELETE_OLDEST_STATEMENT, (self.capacity,))
+                    self.connection.commit()
+                except psycopg2.DatabaseError as e:
+                    self.connection.rollback()
+                    logger.error("PostgresResponseCache.insert: %s", e)
+                    raise CacheError("PostgresResponseCache.insert", e) from e
+                finally:
+                    self.connection.autocommit = True
+
+    def ready(self) -> bool:
+        """Check if the cache is ready.
+
+        Postgres cache checks if the connection is alive.
+
+        Returns:
+            True if the cache is ready, False otherwise.
+        """
+        if not self.connection or self.connection.closed == 1:
+            return False
+        try:
+            return self.connection.poll() == psycopg2.extensions.POLL_OK
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
@@ -0,0 +1,132 @@
+"""Abstract class that is parent for all LLM response cache implementations."""
+
+import hashlib
+import json
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class CachedResponse:
+    """LLM response stored in the response cache.
+
+    Attributes:
+        query: Normalized query text the response was generated for.
+        embedding: Query embedding used for similarity lookup (optional).
+        chunks: Streamed response chunks as `{"type": ..., "text": ...}`
+            dictionaries, so the original event sequence can be replayed.
+        created_at: Time (epoch seconds) when the response was stored.
+    """
+
+    query: str
+    embedding: Optional[list[float]]
+    chunks: list[dict[str, str]] = field(default_factory=list)
+    created_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the cached response to a JSON-serializable dictionary."""
+        return {
+            "query": self.query,
+            "embedding": self.embedding,
+            "chunks": self.chunks,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CachedResponse":
+        """Create cached response from a dictionary."""
+        return cls(
+            query=data["query"],
+            embedding=data.get("embedding"),
+            chunks=data.get("chunks", []),
+            created_at=data.get("created_at", 0.0),
+        )
+
+    @property
+    def size(self) -> int:
+        """Size of the cached response text in bytes."""
+        return sum(len(chunk["text"].encode("utf-8")) for chunk in self.chunks)
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    """Compute cosine similarity of two vectors."""
+    norm = math.hypot(*a) * math.hypot(*b)
+    if len(a) != len(b) or norm == 0.0:
+        return 0.0
+    return math.sumprod(a, b) / norm
+
+
+class ResponseCache(ABC):
+    """Abstract class that is parent for all LLM response cache implementations.
+
+    Responses are grouped by a key derived from provider, model, system prompt
+    and retrieved documents. Within one key, a response matches when its query
+    is equal to the requested one or when query embeddings are similar enough.
+    """
+
+    def __init__(self, ttl_seconds: int, similarity_threshold: float) -> None:
+        """Initialize common response cache parameters."""
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+    @staticmethod
+    def construct_key(
+        provider: str, model: str, system_prompt: str, doc_ids: list[str]
+    ) -> str:
+        """Construct cache key for the given generation context."""
+        system_prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        key = json.dumps([provider, model, system_prompt_hash, doc_ids])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def best_match(
+        self,
+        candidates: list[CachedResponse],
+        query: str,
+        embedding: Optional[list[float]],
+    ) -> Optional[CachedResponse]:
+        """Select the most similar cached response for the query, if any."""
+        best: Optional[CachedResponse] = None
+        best_similarity = self.similarity_threshold
+        for candidate in candidates:
+            if candidate.query == query:
+                return candidate
+            if embedding is None or candidate.embedding is None:
+                continue
+            similarity = cosine_similarity(embedding, candidate.embedding)
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    @abstractmethod
+    def get(
+        self, key: str, query: str, embedding: Optional[list[float]]
+    ) -> Optional[CachedResponse]:
+        """Abstract method to look up a response similar to the query.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            query: Normalized query text.
+            embedding: Query embedding, or None when not available.
+
+        Returns:
+            The matching cached response, or None if not found or expired.
+        """
+
+    @abstractmethod
+    def insert(self, key: str, response: CachedResponse) -> None:
+        """Abstract method to store a response in the cache.
+
+        Args:
+            key: Key constructed by `construct_key`.
+            response: The response to store.
+        """
+
+    @abstractmethod
+    def ready(self) -> bool:
+        """Check if the cache is ready.
+
+        Returns:
+            True if the cache is ready, False otherwise.
+        """
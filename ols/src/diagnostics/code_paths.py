@@ -0,0 +1,53 @@
+"""Short names of source files shown in profiles."""
+
+import functools
+from pathlib import PurePath
+from typing import Optional
+
+import ols
+
+# directory containing the `ols` package
+_SOURCE_ROOT = PurePath(ols.__file__).parent.parent
+_INSTALL_DIRS = frozenset(("site-packages", "dist-packages"))
+# depth of `ols` subpackages used to attribute allocations, e.g. `ols.src.cache`
+_OLS_PACKAGE_DEPTH = 3
+
+
+def _relative_parts(filename: str) -> Optional[tuple[str, ...]]:
+    """Return path parts relative to the installation or source root."""
+    path = PurePath(filename)
+    parts = path.parts
+    for index in range(len(parts) - 1, -1, -1):
+        if parts[index] in _INSTALL_DIRS:
+            return parts[index + 1 :]
+    if path.is_relative_to(_SOURCE_ROOT):
+        return path.relative_to(_SOURCE_ROOT).parts
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def short_path(filename: str) -> str:
+    """Return file name relative to the installed packages or the service sources.
+
+    Other files, like the standard library, keep their full path.
+    """
+    parts = _relative_parts(filename)
+    return "/".join(parts) if parts else filename
+
+
+@functools.lru_cache(maxsize=4096)
+def package_name(filename: str) -> Optional[str]:
+    """Return package the file belongs to.
+
+    Installed packages are identified by their top-level name, service
+    sources by their subpackage (e.g. `ols.src.cache`). Files of the
+    standard library do not belong to any package.
+    """
+    parts = _relative_parts(filename)
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return PurePath(parts[0]).stem
+    if parts[0] == "ols":
+        return ".".join(parts[: min(len(parts) - 1, _OLS_PACKAGE_DEPTH)])
+    return parts[0]
@@ -0,0 +1,149 @@
+"""Monitor of event loop lag caused by blocking calls."""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from ols.app.metrics.metrics import event_loop_blocked_total, event_loop_lag_seconds
+from ols.app.models.config import EventLoopMonitorConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockingEvent:
+    """Event loop stall longer than the lag threshold."""
+
+    timestamp: float
+    lag: float
+    task: Optional[str] = None
+    stack: Optional[list[str]] = None
+
+
+class EventLoopMonitor:
+    """Measure how late the event loop wakes up a periodically sleeping task.
+
+    Every lag is observed in a histogram. Lags above the threshold are kept
+    as blocking events. In debug mode (`capture_stacks`) a watchdog thread
+    notices the stall while it is still in progress and captures the stack
+    of the event loop thread together with the task that holds the loop.
+    """
+
+    def __init__(self, config: EventLoopMonitorConfig) -> None:
+        """Initialize the monitor."""
+        self.interval = config.interval_seconds
+        self.threshold = config.lag_threshold_seconds
+        self.capture_stacks = config.capture_stacks
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._events: deque[BlockingEvent] = deque(maxlen=config.max_offenders)
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        # blocking event captured by the watchdog during the ongoing stall
+        self._captured: Optional[BlockingEvent] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        self._heartbeat = time.monotonic()
+        self._task = loop.create_task(self._measure(), name="event-loop-monitor")
+        if self.capture_stacks:
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(loop, threading.get_ident()),
+                name="event-loop-watchdog",
+                daemon=True,
+            )
+            self._watchdog.start()
+        logger.info(
+            "Event loop monitor started, lag threshold %.3fs, stack capture %s",
+            self.threshold,
+            "enabled" if self.capture_stacks else "disabled",
+        )
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval + self.threshold)
+            self._watchdog = None
+
+    def blocking_events(self) -> list[BlockingEvent]:
+        """Return the most recent blocking events, oldest first."""
+        with self._lock:
+            return list(self._events)
+
+    async def _measure(self) -> None:
+        """Sleep periodically and record how late the wake-ups are."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, loop.time() - start - self.interval))
+
+    def record_lag(self, lag: float) -> None:
+        """Record lag of one wake-up.
+
+        Args:
+            lag: Delay of the wake-up after the requested sleep in seconds.
+        """
+        event_loop_lag_seconds.observe(lag)
+        with self._lock:
+            self._heartbeat = time.monotonic()
+            captured, self._captured = self._captured, None
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag < self.threshold:
+                return
+            event = captured or BlockingEvent(timestamp=time.time(), lag=lag)
+            event.lag = lag
+            self._events.append(event)
+        event_loop_blocked_total.inc()
+        logger.warning(
+            "Event loop was blocked for %.3f seconds (task: %s)",
+            lag,
+            event.task or "unknown",
+        )
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        """Capture stack of the event loop thread when it stalls."""
+        while not self._stopped.wait(self.threshold / 2):
+            with self._lock:
+                stalled_for = time.monotonic() - self._heartbeat - self.interval
+                if stalled_for < self.threshold or self._captured is not None:
+                    continue
+                self._captured = self._capture(loop, loop_thread_id, stalled_for)
+
+    @staticmethod
+    def _capture(
+        loop: asyncio.AbstractEventLoop, loop_thread_id: int, stalled_for: float
+    ) -> BlockingEvent:
+        """Capture the task and stack currently holding the event loop."""
+        frame = sys._current_frames().get(loop_thread_id)  # pylint: disable=W0212
+        task = asyncio.current_task(loop)
+        return BlockingEvent(
+            timestamp=time.time(),
+            lag=stalled_for,
+            task=(
+                f"{task.get_name()} ({task.get_coro().__qualname__})"  # type: ignore [union-attr]
+                if task is not None
+                else None
+            ),
+            stack=traceback.format_stack(frame) if frame is not None else None,
+        )
@@ -0,0 +1,186 @@
+"""Attribution of memory to allocation sites using tracemalloc."""
+
+import logging
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ols.app.models.config import ProfilingConfig
+from ols.src.diagnostics.code_paths import package_name, short_path
+from ols.src.diagnostics.sampling_profiler import ProfilerBusyError
+
+logger = logging.getLogger(__name__)
+
+# allocations of tracemalloc itself and of the import machinery are noise
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class AllocationSite:
+    """Memory allocated at one source line, or by one package."""
+
+    site: str
+    size: int
+    count: int
+    size_diff: int = 0
+    count_diff: int = 0
+
+
+@dataclass
+class MemoryReport:
+    """Memory attributed to allocation sites.
+
+    Attributes:
+        traced_since_startup: Whether allocations were traced before the
+            request, otherwise only allocations made during the window are seen.
+        compared_to: `window` when the diff covers the profiling window,
+            `previous_snapshot` when it covers the time since the last report.
+        traced_memory: Size of memory blocks traced at the end of the window.
+        traced_memory_peak: Peak size of traced memory blocks.
+        top_sites: Source lines holding the most memory.
+        top_growth: Source lines whose memory changed the most.
+        packages: Packages holding the most memory.
+    """
+
+    traced_since_startup: bool
+    compared_to: str
+    traced_memory: int
+    traced_memory_peak: int
+    top_sites: list[AllocationSite] = field(default_factory=list)
+    top_growth: list[AllocationSite] = field(default_factory=list)
+    packages: list[AllocationSite] = field(default_factory=list)
+
+
+class MemoryProfiler:
+    """Compare tracemalloc snapshots and report the top allocation sites.
+
+    When tracemalloc is not tracing already (see `trace_memory_at_startup`),
+    it traces allocations only for the profiling window and is stopped
+    afterwards, so the report shows what was allocated during the window.
+    Only one report is made at a time.
+    """
+
+    def __init__(self, config: ProfilingConfig) -> None:
+        """Initialize the profiler."""
+        self.frames = config.tracemalloc_frames
+        self._lock = threading.Lock()
+        # snapshot taken by the last report while tracing continuously
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def report(self, duration: float, top: int) -> MemoryReport:
+        """Report allocation sites holding and gaining memory.
+
+        Args:
+            duration: Length of the window in seconds. With zero duration
+                the snapshot is compared to the one taken by the last report.
+            top: Number of allocation sites in each list of the report.
+
+        Returns:
+            Memory report.
+
+        Raises:
+            ProfilerBusyError: When another memory report is being made.
+        """
+        # the lock is not held in a with block, so that a concurrent request
+        # fails fast instead of waiting
+        # pylint: disable-next=consider-using-with
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Memory report is already being made")
+        try:
+            return self._report(duration, top)
+        finally:
+            self._lock.release()
+
+    def _report(self, duration: float, top: int) -> MemoryReport:
+        """Take snapshots and compare them."""
+        traced_since_startup = tracemalloc.is_tracing()
+        if not traced_since_startup:
+            logger.info("Tracing memory allocations for %.1f seconds", duration)
+            tracemalloc.start(self.frames)
+            self._previous = None
+        try:
+            baseline = self._previous
+            compared_to = "previous_snapshot"
+            if duration > 0 or baseline is None:
+                baseline = self._snapshot()
+                compared_to = "window"
+                time.sleep(duration)
+            snapshot = self._snapshot()
+            traced_memory, traced_memory_peak = tracemalloc.get_traced_memory()
+        finally:
+            if not traced_since_startup:
+                tracemalloc.stop()
+
+        if traced_since_startup:
+            self._previous = snapshot
+        growth = snapshot.compare_to(baseline, "lineno")
+        growth.sort(key=lambda stat: abs(stat.size_diff), reverse=True)
+        return MemoryReport(
+            traced_since_startup=traced_since_startup,
+            compared_to=compared_to,
+            traced_memory=traced_memory,
+            traced_memory_peak=traced_memory_peak,
+            top_sites=[
+                AllocationSite(
+                    site=_site(stat.traceback), size=stat.size, count=stat.count
+                )
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+            top_growth=[
+                AllocationSite(
+                    site=_site(stat.traceback),
+                    size=stat.size,
+                    count=stat.count,
+                    size_diff=stat.size_diff,
+                    count_diff=stat.count_diff,
+                )
+                for stat in growth[:top]
+                if stat.size_diff or stat.count_diff
+            ],
+            packages=_packages(snapshot)[:top],
+        )
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Take snapshot without allocations of the tracing itself."""
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    """Return source line of the most recent frame."""
+    frame = traceback[-1]
+    return f"{short_path(frame.filename)}:{frame.lineno}"
+
+
+def _packages(snapshot: tracemalloc.Snapshot) -> list[AllocationSite]:
+    """Attribute memory to packages, largest first.
+
+    Memory is attributed to the package of the most recent frame outside of
+    the standard library, so e.g. dictionaries created by the JSON decoder
+    for a document store count towards the package loading the store.
+    """
+    sizes: Counter[str] = Counter()
+    counts: Counter[str] = Counter()
+    for stat in snapshot.statistics("traceback"):
+        package = next(
+            (
+                name
+                for frame in reversed(stat.traceback)
+                if (name := package_name(frame.filename)) is not None
+            ),
+            "[stdlib]",
+        )
+        sizes[package] += stat.size
+        counts[package] += stat.count
+    return [
+        AllocationSite(site=package, size=size, count=counts[package])
+        for package, size in sizes.most_common()
+    ]
@@ -0,0 +1,178 @@
+"""In-process sampling profiler of all service threads."""
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Optional
+
+from ols.app.models.config import ProfilingConfig
+from ols.src.diagnostics.code_paths import short_path
+
+logger = logging.getLogger(__name__)
+
+# function name, file and first line of the function
+Frame = tuple[str, str, int]
+# thread name followed by frames from the outermost to the innermost one
+Stack = tuple[str, tuple[Frame, ...]]
+
+TRUNCATED_FRAME: Frame = ("[truncated]", "", 0)
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class ProfilerBusyError(Exception):
+    """Profiling is already in progress."""
+
+
+@dataclass
+class Profile:
+    """Stacks sampled during the profiling window.
+
+    Attributes:
+        duration: Length of the profiling window in seconds.
+        interval: Interval between samples in seconds.
+        stacks: Number of samples of each distinct stack.
+        dropped_samples: Samples of new stacks over the distinct stacks limit.
+    """
+
+    duration: float
+    interval: float
+    stacks: Counter[Stack] = field(default_factory=Counter)
+    dropped_samples: int = 0
+
+
+class SamplingProfiler:
+    """Sample stacks of all threads in regular intervals.
+
+    The profiler measures wall-clock time, so threads waiting for I/O or
+    locks are sampled as well. Only one profile is taken at a time.
+    """
+
+    def __init__(self, config: ProfilingConfig) -> None:
+        """Initialize the profiler."""
+        self.interval = config.sampling_interval_seconds
+        self.max_stacks = config.max_stacks
+        self.max_depth = config.max_stack_depth
+        self._lock = threading.Lock()
+
+    def profile(self, duration: float) -> Profile:
+        """Sample stacks of all other threads for the given duration.
+
+        Args:
+            duration: Length of the profiling window in seconds.
+
+        Returns:
+            Sampled stacks.
+
+        Raises:
+            ProfilerBusyError: When another profile is being taken.
+        """
+        # the lock is not held in a with block, so that a concurrent request
+        # fails fast instead of waiting
+        # pylint: disable-next=consider-using-with
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("CPU profile is already being taken")
+        try:
+            logger.info("Taking CPU profile for %.1f seconds", duration)
+            return self._sample(duration)
+        finally:
+            self._lock.release()
+
+    def _sample(self, duration: float) -> Profile:
+        """Sample stacks until the profiling window ends."""
+        profile = Profile(duration=duration, interval=self.interval)
+        own_thread = threading.get_ident()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            frames = sys._current_frames()  # pylint: disable=W0212
+            for thread_id, frame in frames.items():
+                if thread_id == own_thread:
+                    continue
+                stack = (
+                    thread_names.get(thread_id, f"thread-{thread_id}"),
+                    self._frames(frame),
+                )
+                if stack in profile.stacks or len(profile.stacks) < self.max_stacks:
+                    profile.stacks[stack] += 1
+                else:
+                    profile.dropped_samples += 1
+            time.sleep(self.interval)
+        return profile
+
+    def _frames(self, frame: Optional[FrameType]) -> tuple[Frame, ...]:
+        """Return frames of the stack, the innermost ones up to max depth."""
+        frames: list[Frame] = []
+        while frame is not None:
+            if len(frames) == self.max_depth:
+                frames.append(TRUNCATED_FRAME)
+                break
+            code = frame.f_code
+            frames.append(
+                (code.co_qualname, short_path(code.co_filename), code.co_firstlineno)
+            )
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+
+def _frame_label(frame: Frame) -> str:
+    """Return frame label usable in collapsed stacks."""
+    name, filename, line = frame
+    label = f"{name} ({filename}:{line})" if filename else name
+    # semicolon separates frames in collapsed stacks
+    return label.replace(";", ":")
+
+
+def to_collapsed(profile: Profile) -> str:
+    """Return profile in collapsed stack format used by flame graph tools.
+
+    Each line contains frames separated by semicolons, from the thread
+    name to the innermost frame, followed by the number of samples.
+    """
+    lines = [
+        ";".join([thread, *(_frame_label(frame) for frame in frames)]) + f" {count}"
+        for (thread, frames), count in profile.stacks.most_common()
+    ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def to_speedscope(profile: Profile) -> dict[str, Any]:
+    """Return profile in speedscope JSON format, one profile per thread."""
+    frame_indexes: dict[Frame, int] = {}
+    threads: dict[str, dict[str, Any]] = {}
+    for (thread, frames), count in profile.stacks.most_common():
+        thread_profile = threads.setdefault(
+            thread,
+            {
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": profile.duration,
+                "samples": [],
+                "weights": [],
+            },
+        )
+        thread_profile["samples"].append(
+            [frame_indexes.setdefault(frame, len(frame_indexes)) for frame in frames]
+        )
+        thread_profile["weights"].append(count * profile.interval)
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "exporter": "lightspeed-service",
+        "name": "lightspeed-service CPU profile",
+        "activeProfileIndex": 0,
+        "shared": {
+            "frames": [
+                {"name": name, "file": filename, "line": line}
+                for name, filename, line in frame_indexes
+            ]
+        },
+        "profiles": list(threads.values()),
+    }
@@ -52,6 +52,17 @@ def resolve_provider_config(
     return provider_config
 
 
+def import_configured_providers(providers_config: Optional[LLMProviders]) -> None:
+    """Import modules of the configured provider types only.
+
+    Importing them at startup spares the first query the import time.
+    """
+    if providers_config is None:
+        return
+    for provider_config in providers_config.providers.values():
+        LLMProvidersRegistry.import_provider(provider_config.type)
+
+
 def load_llm(
     provider: str,
     model: str,
@@ -88,6 +99,7 @@ def load_llm(
     llm_providers_reg = LLMProvidersRegistry
 
     provider_config = resolve_provider_config(provider, model, providers_config)
+    llm_providers_reg.import_provider(provider_config.type)
     if provider_config.type not in llm_providers_reg.llm_providers:
         raise UnsupportedProviderError(
             f"Unsupported LLM provider type '{provider_config.type}'."
@@ -1,19 +1,278 @@
 """fake provider implementation."""
 
+import asyncio
+import json
 import logging
-from typing import Any
+import random
+import string
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
 
+import httpx
+import openai
 import requests
 from langchain_community.llms import FakeListLLM
 from langchain_community.llms.fake import FakeStreamingListLLM
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
 from langchain_core.language_models.llms import LLM
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    ToolCallChunk,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
 
 from ols import constants
+from ols.app.models.config import FakeSimulationConfig
 from ols.src.llms.providers.provider import LLMProvider
 from ols.src.llms.providers.registry import register_llm_provider_as
 
 logger = logging.getLogger(__name__)
 
+# tool call arguments are streamed in pieces of this size, like real LLMs do
+TOOL_CALL_ARGS_CHUNK_SIZE = 16
+SIMULATED_URL = "http://fake-provider.invalid/v1/chat/completions"
+
+
+class SimulatedChatModel(BaseChatModel):
+    """Chat model simulating timing, tool calling and failures of a real LLM.
+
+    The model streams `AIMessageChunk`s through the regular chat model
+    interface, including tool call chunks for tools bound by `bind_tools`,
+    so the tool loop and streaming behave as with real providers.
+    Failures are raised as the OpenAI client exceptions.
+    """
+
+    response: str
+    simulation: FakeSimulationConfig
+    _rng: random.Random = PrivateAttr()
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the model and its random generator."""
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.simulation.seed)  # noqa: S311 # nosec: B311
+
+    @property
+    def _llm_type(self) -> str:
+        """Return type of the model."""
+        return "fake-simulated-chat"
+
+    def bind_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        tool_choice: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Runnable[LanguageModelInput, AIMessage]:
+        """Bind tools the model can call."""
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted_tools, tool_choice=tool_choice, **kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Return the whole simulated response after all delays passed."""
+        if failure := self._injected_failure():
+            delay, error = failure
+            time.sleep(delay)
+            raise error
+        message = AIMessageChunk(content="")
+        for delay, chunk in self._simulate(messages, **kwargs):
+            time.sleep(delay)
+            message += chunk  # type: ignore [assignment]
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(
+                        content=message.content,
+                        tool_calls=message.tool_calls,
+                        response_metadata=message.response_metadata,
+                    )
+                )
+            ]
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream the simulated response with delays between chunks."""
+        if failure := self._injected_failure():
+            delay, error = failure
+            await asyncio.sleep(delay)
+            raise error
+        for delay, chunk in self._simulate(messages, **kwargs):
+            await asyncio.sleep(delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager is not None and isinstance(chunk.content, str):
+                await run_manager.on_llm_new_token(chunk.content, chunk=generation)
+            yield generation
+
+    def _injected_failure(self) -> Optional[tuple[float, Exception]]:
+        """Draw injected failure, return delay before it is raised and the error."""
+        draw = self._rng.random()
+        if draw < self.simulation.rate_limit_error_rate:
+            return 0.0, _rate_limit_error()
+        if draw < (
+            self.simulation.rate_limit_error_rate + self.simulation.timeout_error_rate
+        ):
+            return self.simulation.timeout_seconds, openai.APITimeoutError(
+                request=httpx.Request("POST", SIMULATED_URL)
+            )
+        return None
+
+    def _simulate(
+        self,
+        messages: list[BaseMessage],
+        tools: Optional[list[dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[tuple[float, AIMessageChunk]]:
+        """Yield chunks of the response with delay before each chunk.
+
+        Tool calls are requested in the rounds given by the simulation
+        config, otherwise the response text is streamed word by word.
+        """
+        round_index = sum(
+            1
+            for message in messages
+            if isinstance(message, AIMessage) and message.tool_calls
+        )
+        tool_calls = (
+            self._tool_calls(round_index, tools)
+            if tools and tool_choice != "none"
+            else []
+        )
+        delay = self.simulation.time_to_first_token
+        if tool_calls:
+            for index, (name, args) in enumerate(tool_calls):
+                yield delay, _tool_call_chunk(index, name=name, call_id=_call_id())
+                delay = self._token_delay()
+                arguments = json.dumps(args)
+                for start in range(0, len(arguments), TOOL_CALL_ARGS_CHUNK_SIZE):
+                    yield delay, _tool_call_chunk(
+                        index,
+                        args=arguments[start : start + TOOL_CALL_ARGS_CHUNK_SIZE],
+                    )
+                    delay = self._token_delay()
+            yield 0.0, AIMessageChunk(
+                content="", response_metadata={"finish_reason": "tool_calls"}
+            )
+            return
+
+        words = self.response.split() or [self.response]
+        for index in range(self.simulation.response_tokens):
+            word = words[index % len(words)]
+            yield delay, AIMessageChunk(content=word if index == 0 else f" {word}")
+            delay = self._token_delay()
+        yield 0.0, AIMessageChunk(
+            content="", response_metadata={"finish_reason": "stop"}
+        )
+
+    def _token_delay(self) -> float:
+        """Return delay before the next token."""
+        mean = self.simulation.token_delay
+        if mean == 0:
+            return 0.0
+        match self.simulation.delay_distribution:
+            case "uniform":
+                return self._rng.uniform(0, 2 * mean)
+            case "exponential":
+                return self._rng.expovariate(1 / mean)
+            case _:
+                return mean
+
+    def _tool_calls(
+        self, round_index: int, tools: list[dict[str, Any]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Return tool calls of the round, empty when the answer is text."""
+        if self.simulation.tool_call_rounds:
+            if round_index >= len(self.simulation.tool_call_rounds):
+                return []
+            return [
+                (call.name, call.args)
+                for call in self.simulation.tool_call_rounds[round_index]
+            ]
+        if round_index >= self.simulation.random_tool_call_rounds:
+            return []
+        calls = []
+        for _ in range(self.simulation.random_tool_calls_per_round):
+            function = self._rng.choice(tools)["function"]
+            calls.append(
+                (function["name"], self._arguments(function.get("parameters", {})))
+            )
+        return calls
+
+    def _arguments(self, schema: dict[str, Any]) -> dict[str, Any]:
+        """Generate tool call arguments matching the JSON schema."""
+        arguments: dict[str, Any] = {}
+        for name, prop in schema.get("properties", {}).items():
+            if "enum" in prop:
+                arguments[name] = self._rng.choice(prop["enum"])
+                continue
+            match prop.get("type"):
+                case "string":
+                    arguments[name] = "".join(
+                        self._rng.choices(
+                            string.ascii_lowercase,
+                            k=self.simulation.tool_call_payload_size,
+                        )
+                    )
+                case "integer":
+                    arguments[name] = self._rng.randint(0, 100)
+                case "number":
+                    arguments[name] = self._rng.random()
+                case "boolean":
+                    arguments[name] = self._rng.random() < 0.5
+                case "array":
+                    arguments[name] = []
+                case "object":
+                    arguments[name] = {}
+        return arguments
+
+
+def _call_id() -> str:
+    """Return unique tool call ID."""
+    return f"call_{uuid.uuid4().hex[:24]}"
+
+
+def _tool_call_chunk(
+    index: int,
+    name: Optional[str] = None,
+    call_id: Optional[str] = None,
+    args: str = "",
+) -> AIMessageChunk:
+    """Return message chunk with a part of one tool call."""
+    return AIMessageChunk(
+        content="",
+        tool_call_chunks=[ToolCallChunk(name=name, args=args, id=call_id, index=index)],
+    )
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    """Return error raised by the OpenAI client for HTTP 429."""
+    response = httpx.Response(429, request=httpx.Request("POST", SIMULATED_URL))
+    return openai.RateLimitError(
+        "Rate limit reached (simulated)", response=response, body=None
+    )
+
 
 @register_llm_provider_as(constants.PROVIDER_FAKE)
 class FakeProvider(LLMProvider):
@@ -49,8 +308,14 @@ class FakeProvider(LLMProvider):
             "sleep": self.sleep,
         }
 
-    def load(self) -> LLM:
+    def load(self) -> BaseChatModel | LLM:
         """Load the fake LLM with dynamic response property."""
+        fake_provider_config = self.provider_config.fake_provider_config
+        if fake_provider_config is not None and fake_provider_config.simulation:
+            return SimulatedChatModel(
+                response=fake_provider_config.response or self.response,
+                simulation=fake_provider_config.simulation,
+            )
 
         def bind_tools(tools: Any, *args: Any, **kwargs: Any) -> LLM:
             return llm
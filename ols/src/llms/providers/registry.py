@@ -1,13 +1,30 @@
 """LLM providers registry."""
 
+import importlib
 import logging
 from collections.abc import Callable
 from typing import ClassVar
 
+from ols import constants
 from ols.src.llms.providers.provider import LLMProvider
 
 logger = logging.getLogger(__name__)
 
+# Modules implementing the provider types. Importing SDKs of all providers
+# takes several seconds, so a module is imported when its provider type is
+# first needed.
+PROVIDER_MODULES: dict[str, str] = {
+    constants.PROVIDER_OPENAI: "ols.src.llms.providers.openai",
+    constants.PROVIDER_AZURE_OPENAI: "ols.src.llms.providers.azure_openai",
+    constants.PROVIDER_WATSONX: "ols.src.llms.providers.watsonx",
+    constants.PROVIDER_RHOAI_VLLM: "ols.src.llms.providers.rhoai_vllm",
+    constants.PROVIDER_RHELAI_VLLM: "ols.src.llms.providers.rhelai_vllm",
+    constants.PROVIDER_FAKE: "ols.src.llms.providers.fake_provider",
+    constants.PROVIDER_GOOGLE_VERTEX: "ols.src.llms.providers.google_vertex",
+    constants.PROVIDER_GOOGLE_VERTEX_ANTHROPIC: "ols.src.llms.providers.google_vertex",
+    constants.PROVIDER_BEDROCK: "ols.src.llms.providers.bedrock",
+}
+
 
 class LLMProvidersRegistry:
     """Registry for LLM providers."""
@@ -24,6 +41,17 @@ class LLMProvidersRegistry:
         cls.llm_providers[provider_type] = llm_provider
         logger.debug("LLM provider '%s' registered", provider_type)
 
+    @classmethod
+    def import_provider(cls, provider_type: str) -> None:
+        """Import module implementing the provider type, which registers it.
+
+        Unknown provider types and already registered ones are ignored.
+        """
+        if provider_type in cls.llm_providers or provider_type not in PROVIDER_MODULES:
+            return
+        logger.debug("Importing LLM provider '%s'", provider_type)
+        importlib.import_module(PROVIDER_MODULES[provider_type])
+
 
 def register_llm_provider_as(
     provider_type: str,
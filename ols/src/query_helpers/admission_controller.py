@@ -0,0 +1,177 @@
+"""Admission control of LLM queries with per provider and model concurrency limits."""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from ols.app.metrics.metrics import (
+    admission_queue_depth,
+    admission_rejections_total,
+    admission_slots_in_use,
+    admission_wait_seconds,
+)
+from ols.app.models.config import AdmissionControlConfig
+from ols.constants import QueryMode
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+REJECTION_QUEUE_FULL = "queue_full"
+REJECTION_TIMEOUT = "timeout"
+
+
+class AdmissionRejectedError(Exception):
+    """Query was not admitted because the provider and model are saturated."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        """Initialize the error with rejection reason and retry hint."""
+        super().__init__(f"Query rejected by admission control: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Limiter:
+    """Concurrency state of one provider and model."""
+
+    in_use: int = 0
+    queue: deque[object] = field(default_factory=deque)
+
+
+class Admission:
+    """Concurrency slots held by one admitted query.
+
+    The slots are returned by `release`, which is idempotent. It is also
+    called when the admission is garbage collected, so slots are not lost
+    when a streaming response is never consumed.
+    """
+
+    def __init__(
+        self, controller: "AdmissionController", key: tuple[str, str], weight: int
+    ) -> None:
+        """Initialize admission for the given provider and model."""
+        self._controller = controller
+        self._key = key
+        self._weight = weight
+        self._released = False
+
+    def release(self) -> None:
+        """Return the held slots to the controller."""
+        if not self._released:
+            self._released = True
+            self._controller._release(self._key, self._weight)
+
+    def __del__(self) -> None:
+        """Release the slots when the admission is no longer referenced."""
+        self.release()
+
+    async def hold(self, stream: AsyncIterator[T]) -> AsyncGenerator[T, None]:
+        """Hold the slots until the stream is exhausted or closed."""
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            self.release()
+
+
+class AdmissionController:
+    """Limit concurrent queries per provider and model.
+
+    Each query takes as many slots as is the weight of its mode. Queries
+    that do not fit wait in a bounded FIFO queue until slots are released.
+    Queries are rejected right away when the queue is full, or when they
+    do not get slots within the queue timeout.
+    """
+
+    def __init__(self, config: AdmissionControlConfig) -> None:
+        """Initialize the controller."""
+        self.max_concurrent_requests = config.max_concurrent_requests
+        self.max_queue_size = config.max_queue_size
+        self.queue_timeout = config.queue_timeout_seconds
+        self.retry_after = config.retry_after_seconds
+        self.mode_weights = config.mode_weights
+        self._limiters: dict[tuple[str, str], _Limiter] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, provider: str, model: str, mode: QueryMode) -> Admission:
+        """Wait for free slots for a query.
+
+        Args:
+            provider: Provider the query is sent to.
+            model: Model the query is sent to.
+            mode: Query mode used to look up the query weight.
+
+        Returns:
+            Admission holding the slots, to be released when the query ends.
+
+        Raises:
+            AdmissionRejectedError: The queue is full or the wait timed out.
+        """
+        key = (provider, model)
+        weight = min(self.mode_weights.get(mode, 1), self.max_concurrent_requests)
+        start = time.monotonic()
+        with self._condition:
+            limiter = self._limiters.setdefault(key, _Limiter())
+            if limiter.queue or limiter.in_use + weight > self.max_concurrent_requests:
+                self._wait(key, limiter, weight, start)
+            limiter.in_use += weight
+            admission_slots_in_use.labels(provider=provider, model=model).set(
+                limiter.in_use
+            )
+        admission_wait_seconds.labels(provider=provider, model=model).observe(
+            time.monotonic() - start
+        )
+        return Admission(self, key, weight)
+
+    def _wait(
+        self, key: tuple[str, str], limiter: _Limiter, weight: int, start: float
+    ) -> None:
+        """Wait in the queue until the query is first and its slots are free."""
+        provider, model = key
+        if len(limiter.queue) >= self.max_queue_size:
+            self._reject(key, REJECTION_QUEUE_FULL)
+        ticket = object()
+        limiter.queue.append(ticket)
+        queue_depth = admission_queue_depth.labels(provider=provider, model=model)
+        queue_depth.set(len(limiter.queue))
+        deadline = start + self.queue_timeout
+        try:
+            while (
+                limiter.queue[0] is not ticket
+                or limiter.in_use + weight > self.max_concurrent_requests
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reject(key, REJECTION_TIMEOUT)
+                self._condition.wait(remaining)
+        finally:
+            limiter.queue.remove(ticket)
+            queue_depth.set(len(limiter.queue))
+            # the next query in the queue may fit now
+            self._condition.notify_all()
+
+    def _reject(self, key: tuple[str, str], reason: str) -> None:
+        """Count the rejection and raise error."""
+        provider, model = key
+        logger.warning(
+            "Rejecting query for provider %s model %s: %s", provider, model, reason
+        )
+        admission_rejections_total.labels(
+            provider=provider, model=model, reason=reason
+        ).inc()
+        raise AdmissionRejectedError(reason, self.retry_after)
+
+    def _release(self, key: tuple[str, str], weight: int) -> None:
+        """Return slots and wake up waiting queries."""
+        with self._condition:
+            limiter = self._limiters[key]
+            limiter.in_use -= weight
+            admission_slots_in_use.labels(provider=key[0], model=key[1]).set(
+                limiter.in_use
+            )
+            self._condition.notify_all()
@@ -1,9 +1,13 @@
 """Function to append attachments to query."""
 
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from typing import Optional
 
 import yaml
 
+from ols import constants
 from ols.app.models.models import Attachment
 
 # mapping between content-type and language specification in Markdown
@@ -14,6 +18,14 @@ content_type_to_markdown = {
     "application/xml": "xml",
 }
 
+# libyaml based loader is much faster than the pure Python one
+YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# keys leading to kind and name of resource
+KIND_PATH = ("kind",)
+NAME_PATH = ("metadata", "name")
+
 
 def append_attachments_to_query(query: str, attachments: list[Attachment]) -> str:
     """Append all attachments to query."""
@@ -46,18 +58,161 @@ def format_attachment(attachment: Attachment) -> str:
 
 def construct_intro_message(content: str) -> str:
     """Construct intro message for given attachment."""
-    kind, name = retrieve_kind_name_from_yaml(content)
-    if kind is not None and name is not None:
-        return f"For reference, here is the full resource YAML for {kind} '{name}':"
+    resources = retrieve_resources_from_yaml(content)
+    named = [
+        f"{kind} '{name}'"
+        for kind, name in resources
+        if kind is not None and name is not None
+    ]
+    if len(resources) > 1:
+        if named:
+            return (
+                "For reference, here are the full resource YAMLs for "
+                f"{', '.join(named)}:"
+            )
+        return "For reference, here are the full resource YAMLs:"
+    if named:
+        return f"For reference, here is the full resource YAML for {named[0]}:"
     return "For reference, here is the full resource YAML:"
 
 
 def retrieve_kind_name_from_yaml(content: str) -> tuple[Optional[str], Optional[str]]:
     """Try to parse YAML file and retrieve kind and name attributes from it."""
-    try:
-        d = yaml.safe_load(content)
-        kind = d.get("kind")
-        name = d.get("metadata", {}).get("name")
-        return kind, name
-    except Exception:
+    resources = retrieve_resources_from_yaml(content)
+    if not resources:
         return None, None
+    return resources[0]
+
+
+def retrieve_resources_from_yaml(
+    content: str,
+) -> list[tuple[Optional[str], Optional[str]]]:
+    """Retrieve kind and name attributes of all documents in YAML stream.
+
+    Documents are parsed only until their kind and name are found, without
+    constructing Python objects. Only the first
+    `ATTACHMENT_YAML_SNIFF_MAX_SIZE` characters are read and reading stops
+    after `ATTACHMENT_YAML_SNIFF_TIMEOUT_SECONDS`.
+
+    Returns:
+        Kind and name of each document, None for attributes not found
+        and for both attributes of invalid or cut off documents. Empty
+        documents and documents which are not mappings are skipped.
+    """
+    deadline = time.monotonic() + constants.ATTACHMENT_YAML_SNIFF_TIMEOUT_SECONDS
+    resources = []
+    stream = content[: constants.ATTACHMENT_YAML_SNIFF_MAX_SIZE]
+    resource = None
+    for document in _split_documents(stream):
+        try:
+            resource = _sniff_kind_name(yaml.parse(document, YAMLLoader), deadline)
+        except TimeoutError:
+            resources.append((None, None))
+            break
+        except yaml.YAMLError:
+            resource = (None, None)
+        if resource is not None:
+            resources.append(resource)
+    if len(content) > len(stream) and resource is None:
+        # the last document read was cut off, count it as unknown resource
+        resources.append((None, None))
+    return resources
+
+
+def _split_documents(stream: str) -> Iterator[str]:
+    """Split YAML stream into documents at document start markers.
+
+    Document markers can not occur inside scalars, so the stream can be
+    split without parsing it.
+    """
+    start = position = 0
+    while (position := stream.find("\n---", position)) != -1:
+        position += len("\n---")
+        if position == len(stream) or stream[position] in " \t\r\n":
+            yield stream[start : position - len("---")]
+            start = position - len("---")
+    yield stream[start:]
+
+
+def _sniff_kind_name(
+    events: Iterator[yaml.Event], deadline: float
+) -> Optional[tuple[Optional[str], Optional[str]]]:
+    """Read kind and name of the first document from YAML parser events.
+
+    Returns:
+        Kind and name of the document, None if there is no document or its
+        root node is not a mapping.
+
+    Raises:
+        TimeoutError: If the deadline passed before the document was read.
+    """
+    if not _starts_with_mapping(events, deadline):
+        return None
+    # values of kind and metadata.name by their keys
+    found: dict[tuple, str] = {}
+    collections = [_Collection(is_mapping=True)]
+
+    for event in events:
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        if isinstance(event, yaml.CollectionEndEvent):
+            collections.pop()
+        elif isinstance(event, yaml.NodeEvent):
+            path = _value_path(collections, event)
+            if path in (KIND_PATH, NAME_PATH):
+                found[path] = event.value
+            if isinstance(event, yaml.CollectionStartEvent):
+                collections.append(
+                    _Collection(is_mapping=isinstance(event, yaml.MappingStartEvent))
+                )
+        if isinstance(event, yaml.DocumentEndEvent) or len(found) == 2:
+            break
+
+    return found.get(KIND_PATH), found.get(NAME_PATH)
+
+
+def _starts_with_mapping(events: Iterator[yaml.Event], deadline: float) -> bool:
+    """Read events up to the root node, return whether it's a mapping.
+
+    Empty documents and documents which are not mappings are not resources.
+
+    Raises:
+        TimeoutError: If the deadline passed before the root node was read.
+    """
+    for event in events:
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        if isinstance(event, yaml.NodeEvent):
+            return isinstance(event, yaml.MappingStartEvent)
+    return False
+
+
+@dataclass
+class _Collection:
+    """Collection containing the node being parsed."""
+
+    is_mapping: bool
+    # True if the next node in mapping is a key
+    expects_key: bool = True
+    key: Optional[str] = None
+
+
+def _value_path(
+    collections: list[_Collection], event: yaml.NodeEvent
+) -> Optional[tuple]:
+    """Track keys of mappings, return keys leading to scalar mapping value.
+
+    Returns:
+        Keys of mappings containing the node, None if the node is not scalar
+        value in mapping.
+    """
+    if not collections or not collections[-1].is_mapping:
+        return None
+    parent = collections[-1]
+    parent.expects_key = not parent.expects_key
+    if not parent.expects_key:
+        parent.key = event.value if isinstance(event, yaml.ScalarEvent) else None
+        return None
+    if not isinstance(event, yaml.ScalarEvent):
+        return None
+    return tuple(collection.key for collection in collections)
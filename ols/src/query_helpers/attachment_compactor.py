@@ -0,0 +1,217 @@
+"""Compaction of attachments before they are appended to query."""
+
+import itertools
+import logging
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Optional
+
+import yaml
+
+from ols import constants
+from ols.app.metrics.metrics import (
+    attachment_compacted_tokens_total,
+    attachment_original_tokens_total,
+)
+from ols.app.models.config import AttachmentCompactionConfig
+from ols.app.models.models import Attachment
+from ols.utils.token_handler import TokenHandler
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentCompactor(ABC):
+    """Compactor reducing tokens taken by attachments without losing their signal."""
+
+    @abstractmethod
+    def applies_to(self, attachment: Attachment) -> bool:
+        """Return True if the compactor is able to compact the attachment."""
+
+    @abstractmethod
+    def compact(self, content: str) -> str:
+        """Return compacted content of the attachment."""
+
+
+# registered compactors by name, see `register_compactor_as`
+compactors: dict[str, type[AttachmentCompactor]] = {}
+
+
+def register_compactor_as(
+    name: str,
+) -> Callable[[type[AttachmentCompactor]], type[AttachmentCompactor]]:
+    """Register attachment compactor under given name.
+
+    Example:
+    ```python
+    @register_compactor_as("json")
+    class JSONCompactor(AttachmentCompactor):
+       pass
+    ```
+    """
+
+    def decorator(cls: type[AttachmentCompactor]) -> type[AttachmentCompactor]:
+        if not issubclass(cls, AttachmentCompactor):
+            raise TypeError(f"AttachmentCompactor subclass required, got '{cls}'")
+        compactors[name] = cls
+        return cls
+
+    return decorator
+
+
+# metadata fields maintained by the API server, they tell nothing
+# about the state of the resource
+NOISE_METADATA_FIELDS = ("managedFields", "resourceVersion", "uid", "generation")
+NOISE_ANNOTATIONS = ("kubectl.kubernetes.io/last-applied-configuration",)
+
+
+@register_compactor_as(constants.ATTACHMENT_COMPACTOR_YAML)
+class YAMLCompactor(AttachmentCompactor):
+    """Drop noise fields and empty values from Kubernetes resources in YAML."""
+
+    def applies_to(self, attachment: Attachment) -> bool:
+        """Return True for YAML attachments."""
+        return attachment.content_type == "application/yaml"
+
+    def compact(self, content: str) -> str:
+        """Return YAML without noise fields, unchanged content if it is not valid."""
+        try:
+            documents = list(yaml.safe_load_all(content))
+        except yaml.YAMLError:
+            return content
+        documents = [self._compact_resource(document) for document in documents]
+        return yaml.safe_dump_all(
+            documents, sort_keys=False, allow_unicode=True, width=1 << 16
+        ).rstrip()
+
+    def _compact_resource(self, resource: Any) -> Any:
+        """Drop noise fields from resource and resources in its list items."""
+        if not isinstance(resource, dict):
+            return resource
+        metadata = resource.get("metadata")
+        if isinstance(metadata, dict):
+            for field in NOISE_METADATA_FIELDS:
+                metadata.pop(field, None)
+            annotations = metadata.get("annotations")
+            if isinstance(annotations, dict):
+                for annotation in NOISE_ANNOTATIONS:
+                    annotations.pop(annotation, None)
+        if isinstance(resource.get("items"), list):
+            resource["items"] = [
+                self._compact_resource(item) for item in resource["items"]
+            ]
+        return _drop_empty(resource)
+
+
+def _drop_empty(value: Any) -> Any:
+    """Drop null values, empty mappings and empty lists from mappings."""
+    if isinstance(value, dict):
+        compacted = {key: _drop_empty(item) for key, item in value.items()}
+        return {
+            key: item for key, item in compacted.items() if item not in (None, {}, [])
+        }
+    if isinstance(value, list):
+        return [_drop_empty(item) for item in value]
+    return value
+
+
+# variable parts of log lines, replaced by placeholder to get line template;
+# the order matters, timestamps and UUIDs contain numbers
+LOG_VARIABLES = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+    r"|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"
+    r"|\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b"
+    r"|\d+(?:\.\d+)*",
+    re.IGNORECASE,
+)
+
+
+@register_compactor_as(constants.ATTACHMENT_COMPACTOR_LOG)
+class LogCompactor(AttachmentCompactor):
+    """Deduplicate log lines differing only in timestamps, IDs and numbers.
+
+    Only consecutive lines with the same template are collapsed, so the
+    order of events in the log is kept. A run of similar lines is replaced
+    by its first and last line, keeping the time span of the run.
+    """
+
+    def applies_to(self, attachment: Attachment) -> bool:
+        """Return True for plain text logs."""
+        return (
+            attachment.attachment_type == "log"
+            and attachment.content_type == "text/plain"
+        )
+
+    def compact(self, content: str) -> str:
+        """Return log with runs of repeated lines collapsed."""
+        lines: list[str] = []
+        for _, run in itertools.groupby(content.splitlines(), key=_log_template):
+            lines.extend(_collapse_run(list(run)))
+        return "\n".join(lines)
+
+
+def _log_template(line: str) -> str:
+    """Return log line with its variable parts replaced by placeholder."""
+    return LOG_VARIABLES.sub("<*>", line.strip())
+
+
+def _collapse_run(run: list[str]) -> list[str]:
+    """Collapse consecutive log lines having the same template."""
+    first, last = run[0], run[-1]
+    if len(run) == 1:
+        return [first]
+    if all(line == first for line in run):
+        return [f"{first} [repeated {len(run)} times]"]
+    if len(run) == 2:
+        return run
+    return [first, f"[{len(run) - 2} similar lines]", last]
+
+
+def compact_attachments(
+    attachments: list[Attachment],
+    compaction_config: AttachmentCompactionConfig,
+    token_handler: Optional[TokenHandler] = None,
+) -> list[Attachment]:
+    """Compact attachments taking more tokens than the budget.
+
+    Attachments are compacted largest first until all of them fit into
+    the token budget, so small attachments are left unchanged.
+
+    Args:
+        attachments: Attachments to be appended to query.
+        compaction_config: Token budget and compactors to use.
+        token_handler: Tokenizer used to count tokens of attachments.
+
+    Returns:
+        List of attachments, compacted ones replaced by their copies.
+    """
+    token_handler = token_handler or TokenHandler()
+    enabled = [compactors[name]() for name in compaction_config.compactors]
+    tokens = [
+        len(token_handler.text_to_tokens(attachment.content))
+        for attachment in attachments
+    ]
+    original_tokens = total_tokens = sum(tokens)
+    compacted = list(attachments)
+
+    for index in sorted(range(len(attachments)), key=lambda i: -tokens[i]):
+        if total_tokens <= compaction_config.token_budget:
+            break
+        attachment = attachments[index]
+        compactor = next((c for c in enabled if c.applies_to(attachment)), None)
+        if compactor is None:
+            continue
+        content = compactor.compact(attachment.content)
+        content_tokens = len(token_handler.text_to_tokens(content))
+        if content_tokens >= tokens[index]:
+            continue
+        compacted[index] = attachment.model_copy(update={"content": content})
+        total_tokens -= tokens[index] - content_tokens
+
+    attachment_original_tokens_total.inc(original_tokens)
+    attachment_compacted_tokens_total.inc(total_tokens)
+    if total_tokens < original_tokens:
+        logger.info(
+            "Attachments compacted from %d to %d tokens", original_tokens, total_tokens
+        )
+    return compacted
@@ -1,25 +1,33 @@
 """Documentation summarizer with tool-calling support."""
 
 import asyncio
+import copy
+import hashlib
 import json
 import logging
-from typing import Any, AsyncGenerator, Coroutine, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Coroutine, Optional
 
 from langchain_core.globals import set_debug
 from langchain_core.messages import AIMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools.structured import StructuredTool
-from llama_index.core.retrievers import BaseRetriever
 
 from ols import config, constants
+from ols.app.metrics.metrics import (
+    llm_response_cache_hits_total,
+    llm_response_cache_misses_total,
+)
+from ols.app.models.config import ApprovalType
 from ols.app.models.models import (
     RagChunk,
     StreamChunkType,
     StreamedChunk,
     SummarizerResponse,
+    TokenCounter,
 )
 from ols.constants import GenericLLMParameters
 from ols.src.auth.k8s import CLUSTER_VERSION_UNAVAILABLE, K8sClientSingleton
+from ols.src.cache.response_cache import CachedResponse, ResponseCache
 from ols.src.prompts.prompt_generator import GeneratePrompt
 from ols.src.query_helpers.history_support import prepare_history
 from ols.src.query_helpers.llm_execution_agent import (
@@ -27,15 +35,23 @@ from ols.src.query_helpers.llm_execution_agent import (
     log_tool_loop_iteration,
 )
 from ols.src.query_helpers.query_helper import QueryHelper
-from ols.src.skills.skills_rag import create_skill_support_tool
+from ols.src.query_helpers.single_flight import single_flight
+from ols.src.rag_index.retrieval_cache import normalize_query
+from ols.src.skills.skills_rag import Skill, create_skill_support_tool
 from ols.src.tools.offloaded_content import OffloadManager
+from ols.src.tools.tools import set_tool_result_cache_scope
 from ols.utils.mcp_utils import ClientHeaders, build_mcp_config, get_mcp_tools
+from ols.utils.stage_timer import Stage, set_stage_labels, stage_timer
 from ols.utils.token_handler import (
     PromptTooLongError,
     TokenBudgetTracker,
     TokenCategory,
     TokenHandler,
 )
+from ols.utils.tracing import set_span_attributes, start_span
+
+if TYPE_CHECKING:
+    from llama_index.core.retrievers import BaseRetriever
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +76,8 @@ class DocsSummarizer(QueryHelper):
         user_token: Optional[str] = None,
         client_headers: ClientHeaders | None = None,
         streaming: bool = False,
+        has_attachments: bool = False,
+        request_start_time: Optional[float] = None,
         **kwargs: object,
     ) -> None:
         """Initialize the DocsSummarizer.
@@ -68,6 +86,10 @@ class DocsSummarizer(QueryHelper):
             user_token: Optional user authentication token for tool access
             client_headers: Optional client-provided MCP headers for authentication
             streaming: Whether this summarizer is used for the streaming endpoint
+            has_attachments: Whether the query contains attachments (such
+                queries are never answered from the response cache)
+            request_start_time: Request arrival as returned by `time.time()`,
+                used for time to first token metrics
             *args: Additional positional arguments passed to the parent class
             **kwargs: Additional keyword arguments passed to the parent class
         """
@@ -75,6 +97,7 @@ class DocsSummarizer(QueryHelper):
         self._prepare_llm()
         self.verbose = config.ols_config.logging_config.app_log_level == logging.DEBUG
         self.streaming = streaming
+        self._has_attachments = has_attachments
         self._cluster_version = (
             K8sClientSingleton.get_cluster_version()
             if self._mode == constants.QueryMode.TROUBLESHOOTING
@@ -112,6 +135,7 @@ class DocsSummarizer(QueryHelper):
             model_config=self.model_config,
             streaming=self.streaming,
             token_budget_tracker=self._tracker,
+            request_start_time=request_start_time,
         )
 
     def _prepare_llm(self) -> None:
@@ -130,7 +154,7 @@ class DocsSummarizer(QueryHelper):
     async def _prepare_prompt_context(
         self,
         query: str,
-        rag_retriever: Optional[BaseRetriever] = None,
+        rag_retriever: Optional["BaseRetriever"] = None,
     ) -> list[RagChunk]:
         """Prepare RAG context for prompt construction.
 
@@ -162,7 +186,8 @@ class DocsSummarizer(QueryHelper):
         self._tracker.charge(TokenCategory.PROMPT, prompt_tokens)
 
         if rag_retriever:
-            retrieved_nodes = rag_retriever.retrieve(query)
+            with stage_timer(Stage.RAG_RETRIEVAL):
+                retrieved_nodes = rag_retriever.retrieve(query)
             logger.info("Retrieved %d documents from indexes", len(retrieved_nodes))
 
             for i, node in enumerate(retrieved_nodes[:5]):
@@ -258,18 +283,133 @@ class DocsSummarizer(QueryHelper):
 
         return final_prompt, llm_input_values
 
+    def _response_cache_key(
+        self,
+        history: list[BaseMessage],
+        skill_content: Optional[str],
+        rag_chunks: list[RagChunk],
+    ) -> Optional[str]:
+        """Return response cache key if the response can be cached.
+
+        Only first-turn ask-mode queries without attachments and without a
+        skill injected into the prompt are eligible.
+        """
+        if (
+            config.services.response_cache is None
+            or self._mode != constants.QueryMode.ASK
+            or self._has_attachments
+            or history
+            or skill_content is not None
+        ):
+            return None
+        return ResponseCache.construct_key(
+            self.provider,
+            self.model,
+            self._system_prompt,
+            [chunk.doc_url for chunk in rag_chunks],
+        )
+
+    def _single_flight_key(
+        self,
+        query: str,
+        history: list[BaseMessage],
+        skill: Optional[Skill],
+        rag_chunks: list[RagChunk],
+    ) -> Optional[str]:
+        """Return key identifying effective generation inputs for coalescing.
+
+        Only requests without history and attachments are coalesced. With
+        tool calling enabled, the user token and client headers are part of
+        the key, so tool results are never shared across users, and tools
+        requiring approval disable coalescing altogether.
+        """
+        if (
+            not config.ols_config.request_coalescing_enabled
+            or self._has_attachments
+            or history
+        ):
+            return None
+        credentials = None
+        if self._tool_calling_enabled:
+            if config.tools_approval.approval_type != ApprovalType.NEVER:
+                return None
+            credentials = [self.user_token, self.client_headers]
+        key = json.dumps(
+            [
+                self.provider,
+                self.model,
+                self._mode,
+                self._system_prompt,
+                query,
+                skill.name if skill is not None else None,
+                [chunk.doc_url for chunk in rag_chunks],
+                credentials,
+            ],
+            default=str,
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _query_embedding(query: str) -> Optional[list[float]]:
+        """Embed the query for similarity lookup, None without embedding model."""
+        return config.rag_index_loader.query_embedding(query)
+
+    def _get_cached_response(
+        self, cache_key: str, query: str, embedding: Optional[list[float]]
+    ) -> Optional[CachedResponse]:
+        """Look up cached response; cache errors are logged and treated as miss."""
+        try:
+            with start_span("response_cache_read"):
+                cached = config.services.response_cache.get(cache_key, query, embedding)
+                set_span_attributes({"cache.hit": cached is not None})
+        except Exception as e:
+            logger.error("Error reading response cache: %s", e)
+            cached = None
+        if cached is None:
+            llm_response_cache_misses_total.labels(
+                provider=self.provider, model=self.model
+            ).inc()
+        else:
+            llm_response_cache_hits_total.labels(
+                provider=self.provider, model=self.model
+            ).inc()
+            logger.info("Answering query from response cache")
+        return cached
+
+    def _store_cached_response(self, cache_key: str, response: CachedResponse) -> None:
+        """Store response in cache if it fits the size limit."""
+        if not response.chunks:
+            return
+        max_entry_size = config.ols_config.response_cache.max_entry_size
+        if response.size > max_entry_size:
+            logger.debug(
+                "Response of %d bytes exceeds response cache entry limit %d",
+                response.size,
+                max_entry_size,
+            )
+            return
+        try:
+            with start_span(
+                "response_cache_write", {"cache.entry_size": response.size}
+            ):
+                config.services.response_cache.insert(cache_key, response)
+        except Exception as e:
+            logger.error("Error storing response in response cache: %s", e)
+
     def _create_offload_manager(self) -> Optional[OffloadManager]:
         """Create an OffloadManager if tool calling is enabled, else None."""
         if not self._tool_calling_enabled:
             return None
         return OffloadManager(
             storage_path=config.ols_config.offload_storage_path,
+            memory_store=config.services.offload_memory_store,
         )
 
     async def generate_response(  # noqa: C901  # pylint: disable=too-many-branches,too-many-statements
         self,
         query: str,
-        rag_retriever: Optional[BaseRetriever] = None,
+        rag_retriever: Optional["BaseRetriever"] = None,
         user_id: Optional[str] = None,
         conversation_id: Optional[str] = None,
         skip_user_id_check: bool = False,
@@ -286,6 +426,10 @@ class DocsSummarizer(QueryHelper):
         Yields:
             StreamedChunk objects representing parts of the response
         """
+        set_stage_labels(self.provider, self._mode)
+        set_tool_result_cache_scope(
+            user_id, conversation_id, [self.user_token, self.client_headers]
+        )
         rag_chunks = await self._prepare_prompt_context(query, rag_retriever)
 
         skill_content: Optional[str] = None
@@ -364,6 +508,92 @@ class DocsSummarizer(QueryHelper):
                     self._tracker.count_tokens(msg.content),
                 )
 
+        cache_key = self._response_cache_key(history, skill_content, rag_chunks)
+        cached_response: Optional[CachedResponse] = None
+        if cache_key is not None:
+            # embedding is CPU bound when not cached with retrieval
+            embedding = await asyncio.to_thread(self._query_embedding, query)
+            cached_response = CachedResponse(
+                query=normalize_query(query), embedding=embedding
+            )
+            cached = self._get_cached_response(
+                cache_key, cached_response.query, cached_response.embedding
+            )
+            if cached is not None:
+                # replay the same chunk sequence as the original response,
+                # no LLM tokens are consumed
+                for chunk in cached.chunks:
+                    yield StreamedChunk(
+                        type=StreamChunkType(chunk["type"]), text=chunk["text"]
+                    )
+                yield StreamedChunk(
+                    type=StreamChunkType.END,
+                    data={
+                        "rag_chunks": rag_chunks,
+                        "truncated": truncated,
+                        "token_counter": TokenCounter(),
+                    },
+                )
+                return
+
+        llm_response = self._generate_llm_response(
+            query=query,
+            history=history,
+            rag_chunks=rag_chunks,
+            truncated=truncated,
+            skill=skill,
+            skill_content=skill_content,
+            has_support_files=has_support_files,
+            cache_key=cache_key,
+            cached_response=cached_response,
+        )
+        flight_key = self._single_flight_key(query, history, skill, rag_chunks)
+        if flight_key is None:
+            async for response in llm_response:
+                yield response
+            return
+
+        async for response in single_flight.stream(flight_key, llm_response):
+            if response.type != StreamChunkType.END:
+                yield response
+                continue
+            # each coalesced caller consumes quota with its own counter
+            yield StreamedChunk(
+                type=StreamChunkType.END,
+                data={
+                    **response.data,
+                    "token_counter": copy.copy(response.data.get("token_counter")),
+                },
+            )
+
+    async def _generate_llm_response(  # pylint: disable=too-many-arguments
+        self,
+        query: str,
+        history: list[BaseMessage],
+        rag_chunks: list[RagChunk],
+        truncated: bool,
+        skill: Optional[Skill],
+        skill_content: Optional[str],
+        has_support_files: bool,
+        cache_key: Optional[str],
+        cached_response: Optional[CachedResponse],
+    ) -> AsyncGenerator[StreamedChunk, None]:
+        """Discover tools and run the LLM tool-calling loop for prepared context.
+
+        Args:
+            query: The query to be answered
+            history: Conversation history (already charged to the budget)
+            rag_chunks: Retrieved RAG chunks
+            truncated: Whether the history was truncated
+            skill: Selected skill, if any
+            skill_content: Content of the selected skill injected to prompt
+            has_support_files: Whether the skill provides support files
+            cache_key: Response cache key, None when not cacheable
+            cached_response: Response being recorded for the response cache
+
+        Yields:
+            StreamedChunk objects representing parts of the response
+        """
         final_prompt, llm_input_values = self._build_final_prompt(
             query=query,
             history=history,
@@ -412,6 +642,17 @@ class DocsSummarizer(QueryHelper):
                 tool_definitions_tokens=tool_definitions_tokens,
                 offload_manager=offload_manager,
             ):
+                if cached_response is not None:
+                    match response.type:
+                        case StreamChunkType.TEXT | StreamChunkType.REASONING:
+                            cached_response.chunks.append(
+                                {"type": response.type.value, "text": response.text}
+                            )
+                        case StreamChunkType.END:
+                            self._store_cached_response(cache_key, cached_response)
+                        case _:
+                            # responses involving tool calls are never cached
+                            cached_response = None
                 yield response
         finally:
             if offload_manager is not None:
@@ -436,7 +677,7 @@ class DocsSummarizer(QueryHelper):
     def create_response(
         self,
         query: str,
-        rag_retriever: Optional[BaseRetriever] = None,
+        rag_retriever: Optional["BaseRetriever"] = None,
         user_id: Optional[str] = None,
         conversation_id: Optional[str] = None,
         skip_user_id_check: bool = False,
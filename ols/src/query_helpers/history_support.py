@@ -2,16 +2,26 @@
 
 import asyncio
 import logging
+import threading
 import time
-from collections.abc import AsyncGenerator
-from typing import TypeAlias
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, TypeAlias
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
-from ols import config
+from ols import config, constants
+from ols.app.models.config import BackgroundHistoryCompressionConfig
 from ols.app.models.models import CacheEntry, StreamChunkType, StreamedChunk
+from ols.src.llms.llm_loader import load_llm
+from ols.utils.stage_timer import Stage, observe_stage, stage_timer
 from ols.utils.token_handler import TokenHandler
 
+if TYPE_CHECKING:
+    import concurrent.futures
+
 logger = logging.getLogger(__name__)
 
 HistorySplit: TypeAlias = tuple[list[CacheEntry], bool]
@@ -20,6 +30,34 @@ HISTORY_TOKEN_BUDGET_RATIO = 0.85
 DEFAULT_ENTRIES_TO_KEEP = 5
 SUMMARY_ATTEMPT_TIMEOUT_SECONDS = 20.0
 
+# locks serializing writes to the cache of one conversation, with number of
+# their holders and waiters; a lock is dropped when nobody uses it
+_conversation_locks: dict[tuple[str, str], tuple[threading.Lock, int]] = {}
+_conversation_locks_lock = threading.Lock()
+
+
+@contextmanager
+def conversation_lock(user_id: str, conversation_id: str) -> Iterator[None]:
+    """Serialize writes to the cache of the conversation.
+
+    Blocks the calling thread while the conversation is being written, so
+    it must not be entered on an event loop.
+    """
+    key = (user_id, conversation_id)
+    with _conversation_locks_lock:
+        lock, users = _conversation_locks.get(key, (threading.Lock(), 0))
+        _conversation_locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _conversation_locks_lock:
+            lock, users = _conversation_locks[key]
+            if users == 1:
+                del _conversation_locks[key]
+            else:
+                _conversation_locks[key] = (lock, users - 1)
+
 
 def _count_message_tokens(message: BaseMessage, token_handler: TokenHandler) -> int:
     """Estimate token count for one message with newline overhead.
@@ -76,12 +114,13 @@ def _split_entries_by_token_budget(
     return kept_newest_first, False
 
 
-def _rewrite_cache(
+def _rewrite_cache(  # pylint: disable=too-many-arguments
     user_id: str,
     conversation_id: str,
     skip_user_id_check: bool,
     entries: list[CacheEntry],
     context: str,
+    replaced: Optional[list[CacheEntry]] = None,
 ) -> list[CacheEntry]:
     """Replace conversation cache and return next history state.
 
@@ -91,22 +130,41 @@ def _rewrite_cache(
         skip_user_id_check: Whether to bypass user ID validation.
         entries: Full list of entries to persist as replacement history.
         context: Human-readable context label for error logs.
+        replaced: History the entries were made from, read earlier. If set,
+            entries appended to the cache since then are kept after the
+            replacement, and the cache is left intact when it was rewritten
+            since then.
 
     Returns:
         Persisted entries on success, or an empty list on cache update failure.
     """
     rewrite_start = time.perf_counter()
     try:
-        # Replace in two phases: clear previous history first...
-        config.conversation_cache.delete(user_id, conversation_id, skip_user_id_check)
-        # ...then append the replacement history in order.
-        for entry in entries:
-            config.conversation_cache.insert_or_append(
-                user_id,
-                conversation_id,
-                entry,
-                skip_user_id_check,
+        with conversation_lock(user_id, conversation_id):
+            if replaced is not None:
+                current = _retrieve_previous_input(
+                    user_id, conversation_id, skip_user_id_check
+                )
+                if current[: len(replaced)] != replaced:
+                    logger.warning(
+                        "Conversation %s changed during compression, "
+                        "keeping its history",
+                        conversation_id,
+                    )
+                    return []
+                entries = [*entries, *current[len(replaced) :]]
+            # Replace in two phases: clear previous history first...
+            config.conversation_cache.delete(
+                user_id, conversation_id, skip_user_id_check
             )
+            # ...then append the replacement history in order.
+            for entry in entries:
+                config.conversation_cache.insert_or_append(
+                    user_id,
+                    conversation_id,
+                    entry,
+                    skip_user_id_check,
+                )
         return entries
     except Exception as e:
         logger.error("Failed to update cache with %s: %s", context, e)
@@ -155,12 +213,17 @@ def _retrieve_previous_input(
     return previous_input
 
 
-async def summarize_entries(entries: list[CacheEntry], bare_llm: object) -> str | None:
+async def summarize_entries(
+    entries: list[CacheEntry],
+    bare_llm: object,
+    timeout_seconds: float = SUMMARY_ATTEMPT_TIMEOUT_SECONDS,
+) -> str | None:
     """Summarize a list of conversation cache entries.
 
     Args:
         entries: Conversation entries to summarize.
         bare_llm: LLM client with callable async `ainvoke(messages)`.
+        timeout_seconds: Timeout of one summarization attempt.
 
     Returns:
         Summary text on success, otherwise None.
@@ -209,7 +272,7 @@ Summary:"""
             if not callable(ainvoke):
                 raise TypeError("LLM object must provide callable ainvoke(messages)")
             response = await asyncio.wait_for(
-                ainvoke(messages), timeout=SUMMARY_ATTEMPT_TIMEOUT_SECONDS
+                ainvoke(messages), timeout=timeout_seconds
             )
             content = getattr(response, "content", None)
             # Normalize provider-specific response objects to plain string output.
@@ -254,6 +317,22 @@ Summary:"""
     return None
 
 
+async def _summarize(
+    entries: list[CacheEntry], provider: str, model: str, bare_llm: object
+) -> tuple[str | None, str, str]:
+    """Summarize entries by the summarization model, or by the request model.
+
+    Returns:
+        Summary text or None on failure, provider and model of the summary.
+    """
+    summarization_model = config.services.summarization_model
+    if summarization_model is not None:
+        summary = await summarization_model.summarize(entries)
+        if summary is not None:
+            return summary, summarization_model.provider, summarization_model.model
+    return await summarize_entries(entries, bare_llm), provider, model
+
+
 async def compress_conversation_history(
     user_id: str,
     conversation_id: str,
@@ -265,6 +344,7 @@ async def compress_conversation_history(
     full_cache_entries: list[CacheEntry],
     kept_newest_first: list[CacheEntry],
     entries_to_keep: int = DEFAULT_ENTRIES_TO_KEEP,
+    keep_appended: bool = False,
 ) -> list[CacheEntry]:
     """Compress conversation history by summarizing old entries.
 
@@ -272,14 +352,19 @@ async def compress_conversation_history(
         user_id: User ID for cache operations.
         conversation_id: Conversation ID for cache operations.
         skip_user_id_check: Whether to bypass user ID validation.
-        provider: LLM provider name stored in summary metadata.
-        model: LLM model name stored in summary metadata.
-        bare_llm: LLM client used for summarization.
+        provider: LLM provider name of the request, stored in summary
+            metadata unless the summarization model made the summary.
+        model: LLM model name of the request, stored in summary metadata
+            unless the summarization model made the summary.
+        bare_llm: LLM client used for summarization when no summarization
+            model is configured or it fails.
         full_cache_entries: Full history ordered oldest to newest.
         kept_newest_first: Entries that fit budget, ordered newest to oldest.
         entries_to_keep: Maximum number of recent entries to preserve verbatim.
             When the fitting tail is at or below this threshold, the oldest
             fitting entry is folded into the summary instead of kept raw.
+        keep_appended: Whether to keep entries appended to the cache while
+            the history was being summarized.
 
     Returns:
         Compressed persisted history, or fallback entries when summarization fails.
@@ -299,7 +384,9 @@ async def compress_conversation_history(
     )
 
     summarize_start = time.perf_counter()
-    summary_text = await summarize_entries(entries_to_summarize, bare_llm)
+    summary_text, provider, model = await _summarize(
+        entries_to_summarize, provider, model, bare_llm
+    )
     summarize_duration_ms = (time.perf_counter() - summarize_start) * 1000
     logger.info(
         "Summarization finished in %.2f ms for %d entries",
@@ -332,12 +419,15 @@ async def compress_conversation_history(
     )
 
     compressed_entries = [summary_entry, *keep_entries]
-    rewritten_entries = _rewrite_cache(
+    # the rewrite blocks on the conversation lock and on cache I/O
+    rewritten_entries = await asyncio.to_thread(
+        _rewrite_cache,
         user_id,
         conversation_id,
         skip_user_id_check,
         compressed_entries,
         "compressed history",
+        replaced=full_cache_entries if keep_appended else None,
     )
     return rewritten_entries or compressed_entries
 
@@ -356,7 +446,11 @@ async def prepare_history(
     """Retrieve, optionally compress, and truncate history for prompting.
 
     Yields StreamedChunk events for compression progress, then the final
-    ``(history, truncated)`` tuple as the last item.
+    ``(history, truncated)`` tuple as the last item. When background
+    compression is configured, the conversation is prepared for compression
+    after the turn is stored, and history overflowing the budget while the
+    conversation is compressed in background waits for the summary instead
+    of compressing it inline.
 
     Args:
         user_id: User ID for conversation history retrieval.
@@ -376,15 +470,28 @@ async def prepare_history(
         yield ([], False)
         return
 
-    cache_entries = _retrieve_previous_input(
-        user_id,
-        conversation_id,
-        skip_user_id_check,
-    )
+    with stage_timer(Stage.HISTORY_RETRIEVAL):
+        cache_entries = _retrieve_previous_input(
+            user_id,
+            conversation_id,
+            skip_user_id_check,
+        )
     if not config.ols_config.history_compression_enabled:
         history = CacheEntry.cache_entries_to_history(cache_entries)
         yield token_handler.limit_conversation_history(history, available_tokens)
         return
+    compressor = config.services.history_compressor
+    if compressor is not None:
+        compressor.expect_turn(
+            HistoryCompressionJob(
+                user_id=user_id,
+                conversation_id=conversation_id,
+                skip_user_id_check=skip_user_id_check,
+                provider=provider,
+                model=model,
+                available_tokens=available_tokens,
+            )
+        )
     effective_history_budget = max(
         1, int(available_tokens * HISTORY_TOKEN_BUDGET_RATIO)
     )
@@ -393,6 +500,22 @@ async def prepare_history(
         effective_history_budget,
         token_handler,
     )
+    if (
+        overflowed
+        and compressor is not None
+        and await compressor.wait(user_id, conversation_id)
+    ):
+        # the conversation was just compressed in background
+        cache_entries = _retrieve_previous_input(
+            user_id,
+            conversation_id,
+            skip_user_id_check,
+        )
+        kept_newest_first, overflowed = _split_entries_by_token_budget(
+            cache_entries,
+            effective_history_budget,
+            token_handler,
+        )
     if not overflowed:
         yield (CacheEntry.cache_entries_to_history(cache_entries), False)
         return
@@ -412,10 +535,192 @@ async def prepare_history(
         full_cache_entries=cache_entries,
         kept_newest_first=kept_newest_first,
     )
-    duration_ms = (time.perf_counter() - compress_start) * 1000
+    compress_duration = time.perf_counter() - compress_start
+    observe_stage(Stage.HISTORY_COMPRESSION, compress_duration)
+    duration_ms = compress_duration * 1000
     yield StreamedChunk(
         type=StreamChunkType.HISTORY_COMPRESSION_END,
         data={"status": "completed", "duration_ms": round(duration_ms, 2)},
     )
     history = CacheEntry.cache_entries_to_history(cache_entries)
     yield token_handler.limit_conversation_history(history, available_tokens)
+
+
+@dataclass(frozen=True)
+class HistoryCompressionJob:
+    """Background compression of one conversation, prepared by its last request."""
+
+    user_id: str
+    conversation_id: str
+    skip_user_id_check: bool
+    provider: str
+    model: str
+    # token budget for history of the last request
+    available_tokens: int
+
+
+class HistoryCompressor:
+    """Compress conversation histories in background after turns are stored.
+
+    Each request prepares a compression job of its conversation, which is
+    started once the turn of the request is stored. The job summarizes the
+    history when it takes more than `trigger_ratio` of the history budget of
+    the request. At most one job runs per conversation; jobs run on an event
+    loop of a dedicated thread, as requests run on their own event loops.
+    """
+
+    def __init__(self, compressor_config: BackgroundHistoryCompressionConfig) -> None:
+        """Initialize the compressor.
+
+        Args:
+            compressor_config: Trigger ratio and wait timeout.
+        """
+        self.trigger_ratio = compressor_config.trigger_ratio
+        self.wait_timeout_seconds = compressor_config.wait_timeout_seconds
+        self._lock = threading.Lock()
+        # jobs waiting for the turn of their request to be stored
+        self._pending: OrderedDict[tuple[str, str], HistoryCompressionJob] = (
+            OrderedDict()
+        )
+        self._running: dict[tuple[str, str], concurrent.futures.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def expect_turn(self, job: HistoryCompressionJob) -> None:
+        """Prepare compression of the conversation to run after its next turn."""
+        key = (job.user_id, job.conversation_id)
+        with self._lock:
+            self._pending[key] = job
+            self._pending.move_to_end(key)
+            # jobs of requests which never stored their turn
+            while (
+                len(self._pending)
+                > constants.BACKGROUND_HISTORY_COMPRESSION_MAX_PENDING
+            ):
+                self._pending.popitem(last=False)
+
+    def turn_stored(self, user_id: str, conversation_id: str) -> None:
+        """Start compression prepared for the conversation, if any."""
+        key = (user_id, conversation_id)
+        with self._lock:
+            job = self._pending.pop(key, None)
+            if job is None or key in self._running:
+                return
+            future = asyncio.run_coroutine_threadsafe(
+                self._compress(job), self._event_loop()
+            )
+            self._running[key] = future
+        future.add_done_callback(lambda _: self._finished(key))
+
+    async def wait(self, user_id: str, conversation_id: str) -> bool:
+        """Wait for compression of the conversation running in background.
+
+        Compression which does not finish in time is cancelled, as the
+        request compresses the history inline instead.
+
+        Returns:
+            True if compression of the conversation finished, False if none
+            was running, it failed, or it did not finish in time.
+        """
+        with self._lock:
+            future = self._running.get((user_id, conversation_id))
+        if future is None:
+            return False
+        logger.info(
+            "Waiting for background compression of conversation %s",
+            conversation_id,
+        )
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=self.wait_timeout_seconds,
+            )
+        except TimeoutError:
+            logger.warning(
+                "Background compression of conversation %s did not finish in "
+                "%.0fs, cancelling it",
+                conversation_id,
+                self.wait_timeout_seconds,
+            )
+            future.cancel()
+            return False
+        except Exception as e:
+            # the request compresses its history inline instead
+            logger.warning(
+                "Background compression of conversation %s failed: %s",
+                conversation_id,
+                e,
+            )
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Stop the event loop running compressions."""
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return event loop running compressions, must hold the lock."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever,
+                name="history-compressor",
+                daemon=True,
+            ).start()
+        return self._loop
+
+    def _finished(self, key: tuple[str, str]) -> None:
+        """Forget finished compression of the conversation."""
+        with self._lock:
+            future = self._running.pop(key)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                "Background compression of conversation %s failed: %s",
+                key[1],
+                future.exception(),
+            )
+
+    async def _compress(self, job: HistoryCompressionJob) -> None:
+        """Summarize history of the conversation if it crossed the threshold."""
+        token_handler = TokenHandler()
+        cache_entries = _retrieve_previous_input(
+            job.user_id, job.conversation_id, job.skip_user_id_check
+        )
+        trigger_budget = max(
+            1,
+            int(job.available_tokens * HISTORY_TOKEN_BUDGET_RATIO * self.trigger_ratio),
+        )
+        kept_newest_first, overflowed = _split_entries_by_token_budget(
+            cache_entries, trigger_budget, token_handler
+        )
+        if not overflowed:
+            return
+        logger.info(
+            "Conversation %s crossed %.0f%% of history budget, compressing "
+            "it in background",
+            job.conversation_id,
+            self.trigger_ratio * 100,
+        )
+        model_config = config.llm_config.providers[job.provider].models[job.model]
+        bare_llm = load_llm(
+            job.provider,
+            job.model,
+            {
+                constants.GenericLLMParameters.MAX_TOKENS_FOR_RESPONSE: (
+                    model_config.parameters.max_tokens_for_response
+                )
+            },
+        )
+        await compress_conversation_history(
+            job.user_id,
+            job.conversation_id,
+            job.skip_user_id_check,
+            provider=job.provider,
+            model=job.model,
+            bare_llm=bare_llm,
+            full_cache_entries=cache_entries,
+            kept_newest_first=kept_newest_first,
+            keep_appended=True,
+        )
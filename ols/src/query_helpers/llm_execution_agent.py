@@ -15,12 +15,25 @@ from langchain_core.tools.structured import StructuredTool
 from langchain_openai import ChatOpenAI
 
 from ols import constants
-from ols.app.metrics import TokenMetricUpdater
+from ols.app.metrics import (
+    TokenMetricUpdater,
+    llm_inter_token_gap_seconds,
+    llm_output_tokens_per_second,
+    llm_request_time_to_first_token_seconds,
+    llm_time_to_first_token_seconds,
+)
 from ols.app.metrics.token_counter import GenericTokenCounter
 from ols.app.models.config import ModelConfig
 from ols.app.models.models import RagChunk, StreamChunkType, StreamedChunk
 from ols.src.tools.tools import enforce_tool_token_budget, execute_tool_calls_stream
+from ols.utils.stage_timer import Stage, observe_stage
 from ols.utils.token_handler import TokenBudgetTracker, TokenCategory
+from ols.utils.tracing import (
+    add_span_event,
+    is_tracing_enabled,
+    set_span_attributes,
+    start_span,
+)
 
 if TYPE_CHECKING:
     from ols.src.tools.offloaded_content import OffloadManager
@@ -52,6 +65,32 @@ def log_tool_loop_iteration(
         outcome,
         tracker.summary(round_index),
     )
+    if is_tracing_enabled():
+        add_span_event(
+            "tool_loop_iteration",
+            token_budget_attributes(tracker, round_index, outcome),
+        )
+
+
+def token_budget_attributes(
+    tracker: TokenBudgetTracker, round_index: int, outcome: str
+) -> dict[str, str | int]:
+    """Return token usage and budget decision of a tool-loop iteration as span attributes."""
+    attributes: dict[str, str | int] = {
+        f"tokens.{category.value}": tracker.usage(category)
+        for category in TokenCategory
+    }
+    attributes.update(
+        {
+            "round": round_index,
+            "outcome": outcome,
+            "tokens.remaining": tracker.remaining,
+            "tokens.tool_remaining": tracker.tool_budget_remaining,
+        }
+    )
+    if tracker.last_tools_exec_budget is not None:
+        attributes["tokens.tools_exec_budget"] = tracker.last_tools_exec_budget
+    return attributes
 
 
 @dataclass
@@ -66,6 +105,80 @@ class RoundLLMResult:
     should_stop: bool = False
 
 
+class RoundLatencyRecorder:
+    """Record streaming latency metrics of one LLM round.
+
+    Time to first token is measured both from the LLM invocation and from
+    the request arrival, so the provider latency can be told apart from
+    the time spent in pre-processing (and in earlier tool-calling rounds).
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        round_index: int,
+        token_counter: GenericTokenCounter,
+        request_start_time: Optional[float] = None,
+    ) -> None:
+        """Start measuring the round.
+
+        Args:
+            provider: Provider type used as metric label.
+            model: Model name used as metric label.
+            round_index: Index of the tool-calling round used as metric label.
+            token_counter: Request token counter, used to get output tokens
+                produced during the round.
+            request_start_time: Request arrival as returned by `time.time()`.
+        """
+        self._labels = {"provider": provider, "model": model, "round": round_index}
+        self._token_counter = token_counter
+        self._request_start_time = request_start_time
+        self._invoke_time = time.monotonic()
+        self._first_token_time: Optional[float] = None
+        self._last_token_time = self._invoke_time
+        self._start_output_tokens = self._output_tokens()
+
+    def _output_tokens(self) -> int:
+        """Return output and reasoning tokens counted so far in the request."""
+        counter = self._token_counter.token_counter
+        return int(counter.output_tokens) + int(counter.reasoning_tokens)
+
+    def on_token(self) -> None:
+        """Record arrival of a chunk carrying generated content."""
+        now = time.monotonic()
+        if self._first_token_time is None:
+            self._first_token_time = now
+            llm_time_to_first_token_seconds.labels(**self._labels).observe(
+                now - self._invoke_time
+            )
+            if self._request_start_time is not None:
+                llm_request_time_to_first_token_seconds.labels(**self._labels).observe(
+                    time.time() - self._request_start_time
+                )
+        else:
+            llm_inter_token_gap_seconds.labels(**self._labels).observe(
+                now - self._last_token_time
+            )
+        self._last_token_time = now
+
+    def on_chunk(self, chunk: AIMessageChunk) -> None:
+        """Record arrival of a chunk, unless it carries no generated content."""
+        if chunk.content or getattr(chunk, "tool_call_chunks", None):
+            self.on_token()
+
+    def finish(self) -> None:
+        """Record output token throughput of the round."""
+        if self._first_token_time is None:
+            return
+        duration = self._last_token_time - self._first_token_time
+        tokens = self._output_tokens() - self._start_output_tokens
+        if duration > 0 and tokens > 0:
+            llm_output_tokens_per_second.labels(**self._labels).observe(
+                tokens / duration
+            )
+
+
 def skip_special_chunk(
     chunk_text: str,
     chunk_counter: int,
@@ -123,6 +236,7 @@ class LLMExecutionAgent:
         model_config: ModelConfig,
         streaming: bool,
         token_budget_tracker: TokenBudgetTracker,
+        request_start_time: Optional[float] = None,
     ) -> None:
         """Initialize the tool calling agent.
 
@@ -134,6 +248,8 @@ class LLMExecutionAgent:
             model_config: Model configuration (token budgets).
             streaming: Whether the request uses the streaming endpoint.
             token_budget_tracker: Shared per-request token budget tracker.
+            request_start_time: Request arrival as returned by `time.time()`,
+                used for time to first token metrics.
         """
         self.bare_llm = bare_llm
         self.model = model
@@ -142,6 +258,7 @@ class LLMExecutionAgent:
         self.model_config = model_config
         self.streaming = streaming
         self._tracker = token_budget_tracker
+        self.request_start_time = request_start_time
 
     async def execute(
         self,
@@ -172,11 +289,17 @@ class LLMExecutionAgent:
             StreamedChunk objects representing parts of the response,
             ending with a StreamChunkType.END chunk.
         """
-        with TokenMetricUpdater(
-            llm=self.bare_llm,
-            provider=self.provider_type,
-            model=self.model,
-        ) as token_counter:
+        with (
+            start_span(
+                "llm_execution",
+                {"llm.provider": self.provider_type, "llm.model": self.model},
+            ),
+            TokenMetricUpdater(
+                llm=self.bare_llm,
+                provider=self.provider_type,
+                model=self.model,
+            ) as token_counter,
+        ):
             async for chunk in self._iterate_with_tools(
                 messages=messages,
                 max_rounds=max_rounds,
@@ -187,6 +310,15 @@ class LLMExecutionAgent:
                 offload_manager=offload_manager,
             ):
                 yield chunk
+            set_span_attributes(
+                {
+                    "llm.input_tokens": token_counter.token_counter.input_tokens,
+                    "llm.output_tokens": token_counter.token_counter.output_tokens,
+                    "llm.reasoning_tokens": token_counter.token_counter.reasoning_tokens,
+                    "llm.calls": token_counter.token_counter.llm_calls,
+                    "tokens.total_used": self._tracker.total_used,
+                }
+            )
         yield StreamedChunk(
             type=StreamChunkType.END,
             data={
@@ -272,16 +404,17 @@ class LLMExecutionAgent:
             logger.debug("Tool calling round %s (final: %s)", i, is_final_round)
 
             round_result = RoundLLMResult()
-            async for chunk in self._collect_round_llm_chunks(
-                messages=messages,
-                llm_input_values=llm_input_values,
-                all_mcp_tools=all_mcp_tools,
-                is_final_round=is_final_round,
-                token_counter=token_counter,
-                round_index=i,
-                result=round_result,
-            ):
-                yield chunk
+            with start_span("llm_round", {"round": i, "final_round": is_final_round}):
+                async for chunk in self._collect_round_llm_chunks(
+                    messages=messages,
+                    llm_input_values=llm_input_values,
+                    all_mcp_tools=all_mcp_tools,
+                    is_final_round=is_final_round,
+                    token_counter=token_counter,
+                    round_index=i,
+                    result=round_result,
+                ):
+                    yield chunk
             if round_result.should_stop:
                 log_tool_loop_iteration(self._tracker, i, max_rounds, "llm_stream_stop")
                 return
@@ -383,18 +516,22 @@ class LLMExecutionAgent:
             ):
                 yield chunk  # type: ignore [misc]
         except Exception:
+            elapsed = time.monotonic() - llm_start_time
+            observe_stage(Stage.LLM_ROUND, elapsed)
             logger.error(
                 "LLM invocation failed: provider=%s, model=%s, elapsed=%.2fs",
                 self.provider,
                 self.model,
-                time.monotonic() - llm_start_time,
+                elapsed,
             )
             raise
+        elapsed = time.monotonic() - llm_start_time
+        observe_stage(Stage.LLM_ROUND, elapsed)
         logger.debug(
             "LLM invocation completed: provider=%s, model=%s, elapsed=%.2fs",
             self.provider,
             self.model,
-            time.monotonic() - llm_start_time,
+            elapsed,
         )
 
     def _resolve_tool_call_definitions(
@@ -545,6 +682,13 @@ class LLMExecutionAgent:
         stop flag while yielding ``StreamedChunk`` objects to the caller.
         """
         chunk_counter = 0
+        latency = RoundLatencyRecorder(
+            self.provider_type,
+            self.model,
+            round_index,
+            token_counter,
+            self.request_start_time,
+        )
         try:
             async with asyncio.timeout(constants.TOOL_CALL_ROUND_TIMEOUT):
                 async for chunk in self._invoke_llm(
@@ -565,6 +709,7 @@ class LLMExecutionAgent:
 
                     # Fake-LLM (load tests) returns plain strings; emit and exit.
                     if isinstance(chunk, str):
+                        latency.on_token()
                         yield StreamedChunk(type=StreamChunkType.TEXT, text=chunk)
                         break
 
@@ -581,6 +726,7 @@ class LLMExecutionAgent:
                         continue
 
                     result.all_chunks.append(chunk)
+                    latency.on_chunk(chunk)
 
                     # Collect tool-call chunks separately for later assembly.
                     if getattr(chunk, "tool_call_chunks", None):
@@ -621,6 +767,8 @@ class LLMExecutionAgent:
                 ),
             )
             result.should_stop = True
+        finally:
+            latency.finish()
 
     @staticmethod
     def _enrich_with_tool_metadata(
@@ -803,6 +951,7 @@ class LLMExecutionAgent:
                         )
                     )
             else:
+                tools_start_time = time.monotonic()
                 async for execution_event in execute_tool_calls_stream(
                     tool_call_definitions,
                     remaining,
@@ -822,6 +971,7 @@ class LLMExecutionAgent:
                                 "Ignoring unexpected tool execution event: %s",
                                 execution_event,
                             )
+                observe_stage(Stage.TOOL_EXECUTION, time.monotonic() - tools_start_time)
 
         all_tool_messages = skipped_tool_messages + tool_calls_messages
         if remaining > 0:
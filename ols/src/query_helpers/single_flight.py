@@ -0,0 +1,170 @@
+"""Coalescing of concurrent identical LLM generations."""
+
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any, Optional
+
+from ols.app.metrics.metrics import llm_coalesced_requests_total
+from ols.app.models.models import StreamChunkType, StreamedChunk
+
+logger = logging.getLogger(__name__)
+
+_FLIGHT_DONE = object()
+
+
+class SingleFlightAbortedError(RuntimeError):
+    """Generation was cancelled before the response was complete."""
+
+
+class _Flight:
+    """One in-flight generation and the requests waiting for its chunks."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize empty flight running in the given event loop."""
+        self.loop = loop
+        self.task: Optional[asyncio.Task] = None
+        self.chunks: list[StreamedChunk] = []
+        self.subscribers: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.finished = False
+
+
+class SingleFlight:
+    """Fan out one generation to all concurrent requests with the same key.
+
+    The first request for a key (the leader) starts the generation in a
+    detached task of its event loop. The leader and requests arriving while
+    the generation is in flight (followers) are all subscribers: they
+    receive the chunks produced so far followed by the remaining ones as
+    they are produced. The generation keeps running when the leader stops
+    consuming it, as long as any subscriber is left. Errors raised by the
+    generation are re-raised in every subscriber.
+
+    Non-streaming requests run their own event loops in worker threads, so
+    chunks are handed over to subscribers with `call_soon_threadsafe` and
+    the registry is guarded by a thread lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty registry of in-flight generations."""
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return number of generations in flight."""
+        return len(self._flights)
+
+    async def stream(
+        self, key: str, generate: AsyncIterator[StreamedChunk]
+    ) -> AsyncGenerator[StreamedChunk, None]:
+        """Stream chunks of the generation for the given key.
+
+        Args:
+            key: Key identifying effective generation inputs.
+            generate: Generation to run when no identical one is in flight.
+                It is left unstarted when the request joins another flight.
+
+        Yields:
+            Chunks of the generation, ending with the END chunk.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight(loop)
+            backlog = list(flight.chunks)
+            flight.subscribers.append((loop, queue))
+
+        if leader:
+            flight.task = loop.create_task(self._run(key, flight, generate))
+        else:
+            logger.info("Joining in-flight generation of identical request")
+            llm_coalesced_requests_total.inc()
+        try:
+            for chunk in backlog:
+                yield chunk
+            while (item := await queue.get()) is not _FLIGHT_DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self._unsubscribe(key, flight, (loop, queue))
+
+    async def _run(
+        self, key: str, flight: _Flight, generate: AsyncIterator[StreamedChunk]
+    ) -> None:
+        """Run the generation and publish its chunks to subscribers."""
+        try:
+            async for chunk in generate:
+                self._publish(flight, chunk)
+                if chunk.type == StreamChunkType.END:
+                    # subscribers may stop consuming after END, they already
+                    # have everything they need
+                    self._finish(key, flight, _FLIGHT_DONE)
+        except asyncio.CancelledError:
+            self._finish(
+                key,
+                flight,
+                SingleFlightAbortedError("in-flight generation was abandoned"),
+            )
+            raise
+        except Exception as e:
+            self._finish(key, flight, e)
+        self._finish(key, flight, _FLIGHT_DONE)
+
+    def _unsubscribe(
+        self,
+        key: str,
+        flight: _Flight,
+        subscriber: tuple[asyncio.AbstractEventLoop, asyncio.Queue],
+    ) -> None:
+        """Remove subscriber, cancelling generation nobody waits for."""
+        with self._lock:
+            if subscriber in flight.subscribers:
+                flight.subscribers.remove(subscriber)
+            abandoned = not flight.finished and not flight.subscribers
+            if abandoned:
+                flight.finished = True
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+        if abandoned and flight.task is not None:
+            try:
+                flight.loop.call_soon_threadsafe(flight.task.cancel)
+            except RuntimeError:
+                # event loop of the generation is already closed
+                pass
+
+    def _publish(self, flight: _Flight, item: Any) -> None:
+        """Record chunk and hand it over to all subscribers."""
+        with self._lock:
+            if flight.finished:
+                return
+            self._dispatch(flight, item)
+
+    @staticmethod
+    def _dispatch(flight: _Flight, item: Any) -> None:
+        """Hand item over to all subscribers, called with the lock held."""
+        if isinstance(item, StreamedChunk):
+            flight.chunks.append(item)
+        for loop, queue in list(flight.subscribers):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # subscriber's event loop is already closed
+                flight.subscribers.remove((loop, queue))
+
+    def _finish(self, key: str, flight: _Flight, item: Any) -> None:
+        """Terminate subscribers with the given item and forget the flight."""
+        with self._lock:
+            if flight.finished:
+                return
+            flight.finished = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            self._dispatch(flight, item)
+
+
+single_flight = SingleFlight()
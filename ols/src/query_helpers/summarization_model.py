@@ -0,0 +1,134 @@
+"""Dedicated model summarizing conversation history."""
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, Optional
+
+from ols import config
+from ols.app.metrics.metrics import (
+    history_summarization_fallbacks_total,
+    history_summarization_tokens_received_total,
+    history_summarization_tokens_sent_total,
+)
+from ols.app.models.config import HistorySummarizationConfig
+from ols.app.models.models import CacheEntry
+from ols.constants import GenericLLMParameters
+from ols.src.llms.llm_loader import load_llm
+from ols.src.query_helpers.history_support import summarize_entries
+from ols.utils.token_handler import TokenHandler
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_BUSY = "busy"
+FALLBACK_FAILED = "failed"
+
+
+class _MeteredLLM:
+    """LLM client counting tokens of summarization calls into metrics."""
+
+    def __init__(self, llm: Any, provider: str, model: str) -> None:
+        """Initialize the client wrapping the loaded LLM."""
+        self._llm = llm
+        self._labels = {"provider": provider, "model": model}
+        self._token_handler = TokenHandler()
+
+    async def ainvoke(self, messages: list[dict[str, str]]) -> Any:
+        """Invoke the LLM, counting tokens sent and received."""
+        sent = sum(
+            len(self._token_handler.text_to_tokens(message["content"]))
+            for message in messages
+        )
+        history_summarization_tokens_sent_total.labels(**self._labels).inc(sent)
+        response = await self._llm.ainvoke(messages)
+        content = getattr(response, "content", None)
+        if isinstance(content, str):
+            history_summarization_tokens_received_total.labels(**self._labels).inc(
+                len(self._token_handler.text_to_tokens(content))
+            )
+        return response
+
+
+class SummarizationModel:
+    """Model summarizing conversation history instead of the request model.
+
+    At most `max_concurrency` summaries are generated at once. Summaries
+    which can not get a slot, or which the model fails to generate, are left
+    to the model of the request.
+    """
+
+    def __init__(
+        self,
+        summarization_config: HistorySummarizationConfig,
+        llm_loader: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        """Initialize the summarization model.
+
+        Args:
+            summarization_config: Provider, model and limits of summarization.
+            llm_loader: Function loading the LLM, `load_llm` by default.
+        """
+        self.provider = summarization_config.provider
+        self.model = summarization_config.model
+        self.timeout_seconds = summarization_config.timeout_seconds
+        self._slots = threading.BoundedSemaphore(summarization_config.max_concurrency)
+        self._llm_loader = llm_loader or load_llm
+
+    async def summarize(self, entries: list[CacheEntry]) -> Optional[str]:
+        """Summarize conversation entries.
+
+        Returns:
+            Summary text, or None when the entries should be summarized by
+            the model of the request.
+        """
+        if not entries:
+            return None
+        # the slot is not taken in a with block, so that a busy model is
+        # reported instead of waited for
+        # pylint: disable-next=consider-using-with
+        if not self._slots.acquire(blocking=False):
+            logger.info(
+                "Summarization model %s/%s is busy, summarizing with request model",
+                self.provider,
+                self.model,
+            )
+            history_summarization_fallbacks_total.labels(reason=FALLBACK_BUSY).inc()
+            return None
+        summary: Optional[str] = None
+        try:
+            # loaded per summary, as clients are bound to the event loop of
+            # the request or the background compressor
+            llm = _MeteredLLM(self._load_llm(), self.provider, self.model)
+            summary = await summarize_entries(
+                entries, llm, timeout_seconds=self.timeout_seconds
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to load summarization model %s/%s: %s",
+                self.provider,
+                self.model,
+                e,
+            )
+        finally:
+            self._slots.release()
+        if summary is None:
+            logger.warning(
+                "Summarization model %s/%s failed, summarizing with request model",
+                self.provider,
+                self.model,
+            )
+            history_summarization_fallbacks_total.labels(reason=FALLBACK_FAILED).inc()
+        return summary
+
+    def _load_llm(self) -> Any:
+        """Load the LLM of the summarization model."""
+        model_config = config.llm_config.providers[self.provider].models[self.model]
+        return self._llm_loader(
+            self.provider,
+            self.model,
+            {
+                GenericLLMParameters.MAX_TOKENS_FOR_RESPONSE: (
+                    model_config.parameters.max_tokens_for_response
+                )
+            },
+        )
@@ -0,0 +1,325 @@
+"""Quota bookkeeping of all quota limiters in single statements."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from ols import constants
+from ols.app.models.config import QuotaHandlersConfig
+from ols.src.quota.cluster_quota_limiter import ClusterQuotaLimiter
+from ols.src.quota.quota_exceed_error import QuotaExceedError
+from ols.src.quota.revokable_quota_limiter import RevokableQuotaLimiter
+from ols.src.quota.token_usage_history import TokenUsage, TokenUsageHistory
+from ols.src.quota.user_quota_limiter import UserQuotaLimiter
+from ols.utils.postgres import PostgresBase
+
+logger = logging.getLogger(__name__)
+
+# subject type and name reported in available quotas of limiter types
+_LIMITER_TYPES = {
+    constants.USER_QUOTA_LIMITER: ("u", UserQuotaLimiter.__name__),
+    constants.CLUSTER_QUOTA_LIMITER: ("c", ClusterQuotaLimiter.__name__),
+}
+
+
+class _Limiter(NamedTuple):
+    """Quota limiter as seen by the service."""
+
+    name: str
+    subject_type: str
+    initial_quota: int
+
+
+class _QuotaRow(NamedTuple):
+    """Row of quota table shared by limiters of the same subject type."""
+
+    id: str
+    subject_type: str
+    initial_quota: int
+    # number of limiters sharing the row, each of them consumes tokens
+    limiters: int
+
+
+def _limiters(config: QuotaHandlersConfig) -> list[_Limiter]:
+    """Return configured quota limiters."""
+    if config.limiters is None:
+        return []
+    limiters = []
+    for limiter in config.limiters.limiters.values():
+        if limiter.type not in _LIMITER_TYPES:
+            raise ValueError(f"Invalid limiter type: {limiter.type}.")
+        subject_type, name = _LIMITER_TYPES[limiter.type]
+        limiters.append(_Limiter(name, subject_type, limiter.initial_quota or 0))
+    return limiters
+
+
+class QuotaService(PostgresBase):
+    """Check and consume quota of all quota limiters in one round trip.
+
+    Quota of all limiters is read, lazily initialized, or consumed and read
+    back by a single statement. Quota available before a request is served
+    from a local cache for `available_quota_ttl_seconds`, so quota changed
+    by the quota scheduler is noticed after that time at the latest. Token
+    usage history is aggregated in memory and written in background every
+    `token_history_flush_interval_seconds`.
+    """
+
+    SELECT_QUOTAS = """
+        WITH limits (id, subject, quota_limit) AS (
+            SELECT * FROM unnest(%(ids)s::text[], %(subjects)s::char(1)[],
+                                 %(quota_limits)s::int[])
+        ),
+        initialized AS (
+            INSERT INTO quota_limits (id, subject, quota_limit, available, revoked_at)
+            SELECT id, subject, quota_limit, quota_limit, %(now)s FROM limits
+            ON CONFLICT (id, subject) DO NOTHING
+            RETURNING id, subject, available
+        )
+        SELECT id, subject, available FROM initialized
+        UNION ALL
+        SELECT quota_limits.id, quota_limits.subject, quota_limits.available
+          FROM quota_limits
+          JOIN limits ON quota_limits.id = limits.id
+                     AND quota_limits.subject = limits.subject
+        """
+
+    # new rows start at quota_limit - consumed, so consumed tokens of
+    # existing rows are the difference of the excluded values
+    CONSUME_QUOTAS = """
+        INSERT INTO quota_limits
+               (id, subject, quota_limit, available, updated_at, revoked_at)
+        SELECT id, subject, quota_limit, quota_limit - consumed, %(now)s, %(now)s
+          FROM unnest(%(ids)s::text[], %(subjects)s::char(1)[],
+                      %(quota_limits)s::int[], %(consumed)s::int[])
+               AS limits (id, subject, quota_limit, consumed)
+        ON CONFLICT (id, subject)
+        DO UPDATE
+           SET available=quota_limits.available
+                         - (EXCLUDED.quota_limit - EXCLUDED.available),
+               updated_at=EXCLUDED.updated_at
+        RETURNING id, subject, available
+        """
+
+    def __init__(
+        self,
+        config: QuotaHandlersConfig,
+        token_usage_history: Optional[TokenUsageHistory] = None,
+    ) -> None:
+        """Initialize the service and connect to the quota storage.
+
+        Args:
+            config: Configuration of quota storage and limiters.
+            token_usage_history: Storage of token usage history, None when
+                the history is disabled.
+        """
+        self._limiters = _limiters(config)
+        self.available_quota_ttl_seconds = config.available_quota_ttl_seconds
+        self.token_history_flush_interval_seconds = (
+            config.token_history_flush_interval_seconds
+        )
+        self._token_usage_history = token_usage_history
+        self._lock = threading.Lock()
+        self._connection_lock = threading.Lock()
+        # (id, subject) -> (available, read at)
+        self._available: OrderedDict[tuple[str, str], tuple[int, float]] = OrderedDict()
+        self._usage: TokenUsage = {}
+        self._usage_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        PostgresBase.__init__(self, config.storage)
+
+    @property
+    def _ddl_statements(self) -> list[str]:
+        """Return DDL statements for quota limiter tables."""
+        return [RevokableQuotaLimiter.CREATE_QUOTA_TABLE]
+
+    def ensure_available_quota(self, subject_id: str) -> None:
+        """Ensure that there's available quota left in all limiters.
+
+        Raises:
+            QuotaExceedError: When quota of any limiter is exhausted.
+        """
+        rows = self._rows(subject_id)
+        if not rows:
+            return
+        available = self._cached(rows)
+        if available is None:
+            now = datetime.now()
+            available = self._store(
+                self._execute(
+                    QuotaService.SELECT_QUOTAS,
+                    {**self._row_params(rows), "now": now},
+                )
+            )
+        for row in rows:
+            # row inserted meanwhile by another replica is not visible in
+            # the snapshot of the statement, its quota is the initial one
+            value = available.get((row.id, row.subject_type), row.initial_quota)
+            logger.info("Available quota for subject %s is %d", row.id, value)
+            if value <= 0:
+                e = QuotaExceedError(row.id, row.subject_type, value)
+                logger.exception("Quota exceed: %s", e)
+                raise e
+
+    def consume_tokens(  # pylint: disable=too-many-arguments
+        self,
+        subject_id: str,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+    ) -> dict[str, int]:
+        """Consume tokens by given subject and record its token usage.
+
+        Returns:
+            Quota available in each limiter after the consumption.
+        """
+        if self._token_usage_history is not None:
+            self._record_usage(subject_id, provider, model, input_tokens, output_tokens)
+        rows = self._rows(subject_id)
+        if not rows:
+            return {}
+        logger.info(
+            "Consuming %d input and %d output tokens for subject %s",
+            input_tokens,
+            output_tokens,
+            subject_id,
+        )
+        params = self._row_params(rows)
+        params["consumed"] = [
+            (input_tokens + output_tokens) * row.limiters for row in rows
+        ]
+        params["now"] = datetime.now()
+        available = self._store(self._execute(QuotaService.CONSUME_QUOTAS, params))
+        return {
+            limiter.name: available[
+                (self._subject(limiter, subject_id), limiter.subject_type)
+            ]
+            for limiter in self._limiters
+        }
+
+    def flush_token_usage(self) -> None:
+        """Write token usage aggregated since the last flush."""
+        if self._token_usage_history is None:
+            return
+        with self._usage_lock:
+            usage, self._usage = self._usage, {}
+        if not usage:
+            return
+        try:
+            self._token_usage_history.consume_tokens_batch(usage)
+        except Exception as e:
+            logger.error("Failed to write token usage history: %s", e)
+            # keep the usage to be written by the next flush
+            for key, tokens in usage.items():
+                self._add_usage(key, *tokens)
+
+    def stop(self) -> None:
+        """Stop the background flush and write pending token usage."""
+        self._stopped.set()
+        self.flush_token_usage()
+
+    def _flush_periodically(self) -> None:
+        """Flush token usage until the service is stopped."""
+        while not self._stopped.wait(self.token_history_flush_interval_seconds):
+            self.flush_token_usage()
+
+    def _record_usage(
+        self,
+        user_id: str,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+    ) -> None:
+        """Aggregate token usage to be written in background."""
+        self._add_usage((user_id, provider, model), input_tokens, output_tokens)
+        with self._usage_lock:
+            if self._flusher is None and not self._stopped.is_set():
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="token-usage-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+    def _add_usage(
+        self, key: tuple[str, str, str], input_tokens: int, output_tokens: int
+    ) -> None:
+        """Add tokens to the aggregated usage."""
+        with self._usage_lock:
+            pending_input, pending_output = self._usage.get(key, (0, 0))
+            self._usage[key] = (
+                pending_input + input_tokens,
+                pending_output + output_tokens,
+            )
+
+    @staticmethod
+    def _subject(limiter: _Limiter, subject_id: str) -> str:
+        """Return ID of the quota row of the limiter, empty for the cluster."""
+        return "" if limiter.subject_type == "c" else subject_id
+
+    def _rows(self, subject_id: str) -> list[_QuotaRow]:
+        """Return quota rows of all limiters for the subject."""
+        rows: dict[tuple[str, str], _QuotaRow] = {}
+        for limiter in self._limiters:
+            key = (self._subject(limiter, subject_id), limiter.subject_type)
+            row = rows.get(key)
+            rows[key] = (
+                _QuotaRow(*key, limiter.initial_quota, 1)
+                if row is None
+                else row._replace(limiters=row.limiters + 1)
+            )
+        return list(rows.values())
+
+    @staticmethod
+    def _row_params(rows: list[_QuotaRow]) -> dict[str, Any]:
+        """Return statement parameters identifying the rows."""
+        return {
+            "ids": [row.id for row in rows],
+            "subjects": [row.subject_type for row in rows],
+            "quota_limits": [row.initial_quota for row in rows],
+        }
+
+    def _cached(self, rows: list[_QuotaRow]) -> Optional[dict[tuple[str, str], int]]:
+        """Return cached available quota of the rows, None if any is stale."""
+        now = time.monotonic()
+        available = {}
+        with self._lock:
+            for row in rows:
+                key = (row.id, row.subject_type)
+                cached = self._available.get(key)
+                if cached is None or now - cached[1] > self.available_quota_ttl_seconds:
+                    return None
+                available[key] = cached[0]
+        return available
+
+    def _store(self, results: list[tuple]) -> dict[tuple[str, str], int]:
+        """Cache available quota returned by the storage."""
+        now = time.monotonic()
+        available = {(row_id, subject): value for row_id, subject, value in results}
+        with self._lock:
+            for key, value in available.items():
+                self._available[key] = (value, now)
+                self._available.move_to_end(key)
+            while len(self._available) > constants.QUOTA_AVAILABLE_CACHE_MAX_ENTRIES:
+                self._available.popitem(last=False)
+        return available
+
+    def _execute(self, statement: str, params: dict[str, Any]) -> list[tuple]:
+        """Execute the statement and return its rows.
+
+        Unlike the `connection` decorator, the connection is not checked by
+        an extra query; a closed connection is re-established before the
+        statement runs. Statements failing on a broken connection are not
+        retried, as they may have been applied already.
+        """
+        with self._connection_lock:
+            if self.connection is None or self.connection.closed:
+                self.connect()
+            with self.connection.cursor() as cursor:
+                cursor.execute(statement, params)
+                return cursor.fetchall()
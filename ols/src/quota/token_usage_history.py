@@ -8,6 +8,9 @@ from ols.utils.postgres import PostgresBase, connection
 
 logger = logging.getLogger(__name__)
 
+# (user_id, provider, model) -> (input_tokens, output_tokens)
+TokenUsage = dict[tuple[str, str, str], tuple[int, int]]
+
 
 class TokenUsageHistory(PostgresBase):
     """Class with implementation of storage for token usage history."""
@@ -42,6 +45,19 @@ class TokenUsageHistory(PostgresBase):
            AND token_usage.model=%(model)s
         """  # noqa: E501
 
+    CONSUME_TOKENS_BATCH = """
+        INSERT INTO token_usage (user_id, provider, model, input_tokens, output_tokens, updated_at)
+        SELECT user_id, provider, model, input_tokens, output_tokens, %(updated_at)s
+          FROM unnest(%(user_ids)s::text[], %(providers)s::text[], %(models)s::text[],
+                      %(input_tokens)s::int[], %(output_tokens)s::int[])
+               AS usage (user_id, provider, model, input_tokens, output_tokens)
+        ON CONFLICT (user_id, provider, model)
+        DO UPDATE
+           SET input_tokens=token_usage.input_tokens+EXCLUDED.input_tokens,
+               output_tokens=token_usage.output_tokens+EXCLUDED.output_tokens,
+               updated_at=EXCLUDED.updated_at
+        """
+
     def __init__(self, config: PostgresConfig) -> None:
         """Initialize token usage history storage."""
         PostgresBase.__init__(self, config)
@@ -83,3 +99,26 @@ class TokenUsageHistory(PostgresBase):
                     "updated_at": updated_at,
                 },
             )
+
+    @connection
+    def consume_tokens_batch(self, usage: TokenUsage) -> None:
+        """Consume tokens by multiple users, providers and models at once.
+
+        Args:
+            usage: Input and output tokens keyed by user, provider and model.
+        """
+        logger.info("Token usage changed for %d users and models", len(usage))
+        updated_at = datetime.now()
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                TokenUsageHistory.CONSUME_TOKENS_BATCH,
+                {
+                    "user_ids": [user_id for user_id, _, _ in usage],
+                    "providers": [provider for _, provider, _ in usage],
+                    "models": [model for _, _, model in usage],
+                    "input_tokens": [tokens[0] for tokens in usage.values()],
+                    "output_tokens": [tokens[1] for tokens in usage.values()],
+                    "updated_at": updated_at,
+                },
+            )
@@ -3,19 +3,13 @@
 import re
 import uuid
 from collections.abc import Callable
-from typing import Any
-
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    Distance,
-    FieldCondition,
-    Filter,
-    MatchAny,
-    PointIdsList,
-    PointStruct,
-    VectorParams,
-)
-from rank_bm25 import BM25Okapi
+from typing import TYPE_CHECKING, Any
+
+# qdrant_client and rank_bm25 are imported when the store or index is built,
+# importing them takes about a second and they are needed only when tool
+# filtering or skills are configured
+if TYPE_CHECKING:
+    from rank_bm25 import BM25Okapi
 
 _NON_ALPHA = re.compile(r"[^a-z0-9\s]")
 
@@ -133,6 +127,10 @@ class QdrantStore:
         Args:
             collection: Name of the Qdrant collection.
         """
+        from qdrant_client import (  # pylint: disable=import-outside-toplevel
+            QdrantClient,
+        )
+
         self._collection = collection
         self.client = QdrantClient(location=":memory:")
         self._collection_ready = False
@@ -141,6 +139,11 @@ class QdrantStore:
         """Lazily create the vector collection on first upsert."""
         if self._collection_ready:
             return
+        from qdrant_client.models import (  # pylint: disable=import-outside-toplevel
+            Distance,
+            VectorParams,
+        )
+
         self.client.create_collection(
             self._collection,
             vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
@@ -169,6 +172,10 @@ class QdrantStore:
         """
         if not vectors:
             return
+        from qdrant_client.models import (  # pylint: disable=import-outside-toplevel
+            PointStruct,
+        )
+
         self._ensure_collection(len(vectors[0]))
 
         points = []
@@ -203,6 +210,12 @@ class QdrantStore:
 
         query_filter = None
         if allowed_servers is not None and allowed_servers:
+            from qdrant_client.models import (  # pylint: disable=import-outside-toplevel
+                FieldCondition,
+                Filter,
+                MatchAny,
+            )
+
             query_filter = Filter(
                 must=[
                     FieldCondition(
@@ -236,6 +249,9 @@ class QdrantStore:
         """
         if not self._collection_ready:
             return
+        from qdrant_client.models import (  # pylint: disable=import-outside-toplevel
+            PointIdsList,
+        )
 
         point_ids = [self._point_id(str_id) for str_id in ids]
         self.client.delete(
@@ -293,7 +309,7 @@ class HybridRAGBase:
         self.top_k = top_k
         self.threshold = threshold
         self._encode = encode_fn
-        self.bm25: BM25Okapi | None = None
+        self.bm25: "BM25Okapi | None" = None
         self.store = QdrantStore(collection)
 
     def _index_documents(
@@ -320,6 +336,8 @@ class HybridRAGBase:
         if not all_data["documents"]:
             self.bm25 = None
             return
+        from rank_bm25 import BM25Okapi  # pylint: disable=import-outside-toplevel
+
         sparse_docs = [_tokenize(doc) for doc in all_data["documents"]]
         self.bm25 = BM25Okapi(sparse_docs)
 
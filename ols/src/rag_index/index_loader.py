@@ -1,12 +1,18 @@
 # type: ignore
 """Module for loading index."""
 
+import json
 import logging
+import uuid
 from pathlib import Path
 from typing import Any, Optional
 
-from ols.app.models.config import ReferenceContent
-from ols.constants import EMBEDDINGS_MODEL_BYOK_SUBDIR, RAG_CONTENT_LIMIT
+from ols.app.models.config import ReferenceContent, ReferenceContentIndex
+from ols.constants import (
+    EMBEDDINGS_MODEL_BYOK_SUBDIR,
+    FAISS_SEARCH_PARAMS_FILENAME,
+    RAG_CONTENT_LIMIT,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +130,9 @@ class IndexLoader:
         self._indexes = None
         self._retriever = None
         self._loaded_index_configs = None
+        self._generation = None
+        self._retrieval_cache = None
+        self._query_embedder = None
 
         self._index_config = index_config
         logger.debug("Config used for index load: %s", str(self._index_config))
@@ -139,6 +148,7 @@ class IndexLoader:
             )
             self._embed_model = self._get_embed_model()
             self._load_index()
+            self._init_retrieval_cache()
 
     @staticmethod
     def _resolve_embeddings_path(path: object) -> Optional[str]:
@@ -179,6 +189,58 @@ class IndexLoader:
         logger.warning("Embedding model is set to default")
         return "local:sentence-transformers/all-mpnet-base-v2"
 
+    @staticmethod
+    def _read_search_params(index_config: ReferenceContentIndex) -> dict[str, int]:
+        """Collect FAISS search parameters for an index.
+
+        Parameters stored next to the index by the offline ANN conversion tool
+        are used as defaults and can be overridden from the configuration.
+        """
+        params = {}
+        params_file = (
+            Path(str(index_config.product_docs_index_path))
+            / FAISS_SEARCH_PARAMS_FILENAME
+        )
+        if params_file.is_file():
+            try:
+                params.update(json.loads(params_file.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as err:
+                logger.warning("Cannot read %s: %s", params_file, err)
+        params.update(index_config.product_docs_search_params or {})
+        return params
+
+    def _apply_search_params(
+        self, vector_store: Any, index_config: ReferenceContentIndex
+    ) -> None:
+        """Apply query-time search parameters (efSearch, nprobe) to ANN indexes.
+
+        Flat indexes have no tunable parameters, so nothing is done for them
+        unless parameters were explicitly provided.
+        """
+        params = self._read_search_params(index_config)
+        if not params:
+            return
+        import faiss  # pylint: disable=C0415
+
+        faiss_index = vector_store.client
+        parameter_space = faiss.ParameterSpace()
+        for name, value in params.items():
+            try:
+                parameter_space.set_index_parameter(faiss_index, name, value)
+                logger.info(
+                    "FAISS search parameter %s=%s set for index %s",
+                    name,
+                    value,
+                    index_config.product_docs_index_path,
+                )
+            except RuntimeError as err:
+                logger.warning(
+                    "FAISS search parameter %s is not supported by %s index: %s",
+                    name,
+                    type(faiss_index).__name__,
+                    err,
+                )
+
     def _load_index(self) -> None:
         """Load vector index."""
         logger.debug("Using %s as embedding model for index", str(self._embed_model))
@@ -195,10 +257,12 @@ class IndexLoader:
             try:
                 # pylint: disable=W0201
                 logger.info("Setting up storage context for index #%d...", i)
+                vector_store = FaissVectorStore.from_persist_dir(
+                    index_config.product_docs_index_path
+                )
+                self._apply_search_params(vector_store, index_config)
                 storage_context = StorageContext.from_defaults(
-                    vector_store=FaissVectorStore.from_persist_dir(
-                        index_config.product_docs_index_path
-                    ),
+                    vector_store=vector_store,
                     persist_dir=index_config.product_docs_index_path,
                 )
                 logger.info(
@@ -234,6 +298,28 @@ class IndexLoader:
             logger.info("All indexes are loaded.")
         self._indexes = indexes
         self._loaded_index_configs = loaded_configs
+        # token identifying this set of loaded indexes, part of retrieval cache keys
+        self._generation = uuid.uuid4().hex
+
+    def _init_retrieval_cache(self) -> None:
+        """Create retrieval result cache when enabled in configuration."""
+        # pylint: disable=C0415
+        from ols.src.rag_index.retrieval_cache import QueryEmbedder, RetrievalCache
+
+        self._retrieval_cache = RetrievalCache.from_config(
+            self._index_config.retrieval_cache
+        )
+        if self._embed_model is not None and not isinstance(self._embed_model, str):
+            self._query_embedder = QueryEmbedder(
+                self._embed_model,
+                RetrievalCache.from_config(self._index_config.retrieval_cache),
+            )
+        if self._retrieval_cache is not None:
+            logger.info(
+                "Retrieval cache enabled (max_entries=%d, ttl_seconds=%d)",
+                self._retrieval_cache.max_entries,
+                self._retrieval_cache.ttl_seconds,
+            )
 
     @property
     def vector_indexes(self) -> Optional[list[BaseIndex]]:
@@ -254,6 +340,16 @@ class IndexLoader:
         """
         return getattr(self, "_embed_model", None)
 
+    def query_embedding(self, query: str) -> Optional[list[float]]:
+        """Embed the query, None without embedding model.
+
+        Embeddings computed for retrieval are reused when the retrieval cache
+        is enabled.
+        """
+        if self._query_embedder is None:
+            return None
+        return self._query_embedder.embed(query)
+
     def get_retriever(
         self, similarity_top_k=RAG_CONTENT_LIMIT
     ) -> Optional[BaseRetriever]:
@@ -293,5 +389,16 @@ class IndexLoader:
             use_async=False,
             verbose=False,
         )
+        if self._retrieval_cache is not None:
+            # pylint: disable=C0415
+            from ols.src.rag_index.retrieval_cache import CachedRetriever
+
+            retriever = CachedRetriever(
+                retriever,
+                self._retrieval_cache,
+                self._indexes,
+                self._generation,
+                self._query_embedder,
+            )
         self._retriever = retriever
         return self._retriever
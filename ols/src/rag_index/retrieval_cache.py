@@ -0,0 +1,210 @@
+"""Cache of RAG retrieval results."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+from ols.app.metrics.metrics import (
+    rag_retrieval_cache_hits_total,
+    rag_retrieval_cache_misses_total,
+)
+from ols.app.models.config import RetrievalCacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CachedNode(NamedTuple):
+    """Retrieved node reference stored in the cache."""
+
+    node_id: str
+    score: Optional[float]
+    index_id: str
+    index_origin: str
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different queries share a cache entry."""
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+
+class RetrievalCache:
+    """Bounded LRU cache with TTL for retrieval results or query embeddings."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached queries.
+            ttl_seconds: Time after which a cached result expires.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, cache_config: Optional[RetrievalCacheConfig]
+    ) -> Optional["RetrievalCache"]:
+        """Create the cache when enabled in configuration."""
+        if cache_config is None or not cache_config.enabled:
+            return None
+        return cls(cache_config.max_entries, cache_config.ttl_seconds)
+
+    def get(self, key: tuple) -> Optional[list]:
+        """Return cached value for the key, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, nodes = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return nodes
+
+    def put(self, key: tuple, value: list) -> None:
+        """Store value for the key, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return number of cached entries."""
+        return len(self._entries)
+
+
+class QueryEmbedder:
+    """Embedding of queries shared by retrieval and response cache lookup.
+
+    Embeddings are cached by normalized query when the cache is set, so
+    a query is embedded once even when its retrieval is served from the
+    retrieval cache and the response cache needs its embedding.
+    """
+
+    def __init__(self, embed_model: Any, cache: Optional[RetrievalCache]) -> None:
+        """Initialize the embedder.
+
+        Args:
+            embed_model: Embedding model of the indexes.
+            cache: Cache of query embeddings, None to embed every query.
+        """
+        self._embed_model = embed_model
+        self._cache = cache
+
+    def embed(self, query: str) -> list[float]:
+        """Return embedding of the query."""
+        if self._cache is None:
+            return self._embed_model.get_query_embedding(query)
+        key = (normalize_query(query),)
+        embedding = self._cache.get(key)
+        if embedding is None:
+            embedding = self._embed_model.get_query_embedding(query)
+            self._cache.put(key, embedding)
+        return embedding
+
+
+class CachedRetriever:
+    """Retriever wrapper serving repeated queries from the retrieval cache.
+
+    Only node ids and scores are cached; nodes are read back from the index
+    docstores on a hit, so the expensive part (query embedding and vector
+    search) is skipped while the returned nodes are fresh objects.
+    """
+
+    def __init__(
+        self,
+        retriever: Any,
+        cache: RetrievalCache,
+        indexes: list[Any],
+        generation: str,
+        embedder: Optional[QueryEmbedder] = None,
+    ) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            retriever: Retriever used on cache miss.
+            cache: Cache of retrieval results.
+            indexes: Loaded indexes whose docstores hold the cached nodes.
+            generation: Token identifying the loaded index set; it changes
+                whenever indexes are (re)loaded, invalidating older entries.
+            embedder: Embedder of queries retrieved on cache miss, the
+                wrapped retriever embeds queries itself when not set.
+        """
+        self._retriever = retriever
+        self._cache = cache
+        self._indexes = indexes
+        self._generation = generation
+        self._embedder = embedder
+
+    @property
+    def similarity_top_k(self) -> int:
+        """Number of nodes retrieved by the wrapped retriever."""
+        return self._retriever.similarity_top_k
+
+    def _cache_key(self, query: str) -> tuple:
+        """Construct cache key for the query."""
+        return (normalize_query(query), self.similarity_top_k, self._generation)
+
+    def _load_nodes(self, cached_nodes: list[CachedNode]) -> Optional[list[Any]]:
+        """Read cached nodes back from the docstores, None if any is missing."""
+        from llama_index.core.schema import (  # pylint: disable=import-outside-toplevel
+            NodeWithScore,
+        )
+
+        nodes = []
+        for cached_node in cached_nodes:
+            node = None
+            for index in self._indexes:
+                node = index.docstore.get_node(cached_node.node_id, raise_error=False)
+                if node is not None:
+                    break
+            if node is None:
+                return None
+            node.metadata["index_id"] = cached_node.index_id
+            node.metadata["index_origin"] = cached_node.index_origin
+            nodes.append(NodeWithScore(node=node, score=cached_node.score))
+        return nodes
+
+    def _query_bundle(self, query: str) -> Any:
+        """Return query for the wrapped retriever, embedded by the embedder."""
+        if self._embedder is None:
+            return query
+        from llama_index.core.schema import (  # pylint: disable=import-outside-toplevel
+            QueryBundle,
+        )
+
+        return QueryBundle(query_str=query, embedding=self._embedder.embed(query))
+
+    def retrieve(self, query: str) -> list[Any]:
+        """Retrieve nodes for the query, using cached results when available."""
+        key = self._cache_key(query)
+        cached_nodes = self._cache.get(key)
+        if cached_nodes is not None:
+            nodes = self._load_nodes(cached_nodes)
+            if nodes is not None:
+                rag_retrieval_cache_hits_total.inc()
+                logger.debug("Retrieval cache hit for query '%s'", key[0])
+                return nodes
+            logger.warning("Cached nodes not found in docstore, retrieving again")
+
+        rag_retrieval_cache_misses_total.inc()
+        nodes = self._retriever.retrieve(self._query_bundle(query))
+        self._cache.put(
+            key,
+            [
+                CachedNode(
+                    node_id=n.node.node_id,
+                    score=n.score,
+                    index_id=n.node.metadata.get("index_id", ""),
+                    index_origin=n.node.metadata.get("index_origin", ""),
+                )
+                for n in nodes
+            ],
+        )
+        return nodes
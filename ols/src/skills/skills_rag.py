@@ -5,7 +5,6 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import frontmatter
 from langchain_core.tools.structured import StructuredTool
 
 from ols.src.rag.hybrid_rag import HybridRAGBase
@@ -43,6 +42,8 @@ class Skill:
             ``SkillLoadResult`` with prompt text (or ``None``), manifest flag,
             and success flag.
         """
+        import frontmatter  # pylint: disable=import-outside-toplevel
+
         skill_dir = Path(self.source_path)
         try:
             raw = (skill_dir / _SKILL_MD).read_text(encoding="utf-8").strip()
@@ -110,6 +111,8 @@ class Skill:
         Raises:
             OSError: If the skill directory or its files cannot be read.
         """
+        import frontmatter  # pylint: disable=import-outside-toplevel
+
         skill_dir = Path(self.source_path)
         parts: list[str] = []
 
@@ -239,6 +242,8 @@ def _parse_skill_directory(skill_dir: Path, skill_file: Path) -> Skill | None:
         Parsed Skill with source_path pointing to the directory,
         or None if the file is malformed.
     """
+    import frontmatter  # pylint: disable=import-outside-toplevel
+
     try:
         post = frontmatter.load(str(skill_file))
     except Exception:
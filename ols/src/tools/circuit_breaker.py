@@ -0,0 +1,257 @@
+"""Circuit breakers tracking health of MCP servers."""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Optional
+
+import httpx
+from langchain_core.tools import ToolException
+
+from ols.app.metrics.metrics import (
+    mcp_server_circuit_state,
+    mcp_server_failure_rate,
+    mcp_server_rejected_calls_total,
+)
+from ols.app.models.config import MCPCircuitBreakerConfig, MCPServerConfig
+from ols.utils.mcp_utils import mcp_ssl_context
+
+logger = logging.getLogger(__name__)
+
+# probe called with URL of the server and timeout, returns True if the server
+# is reachable
+Probe = Callable[[str, float], bool]
+
+
+class CircuitState(StrEnum):
+    """State of circuit breaker of MCP server."""
+
+    # calls reach the server, their outcomes are tracked
+    CLOSED = "closed"
+    # calls are rejected, the server is probed in background
+    OPEN = "open"
+    # probe succeeded, one trial call decides whether to close the breaker
+    HALF_OPEN = "half_open"
+
+
+def probe_mcp_server(url: str, timeout: float) -> bool:
+    """Check that MCP server responds to HTTP requests.
+
+    Any response other than server error means the server is up, the probe
+    carries no credentials so it is usually rejected by the server.
+    """
+    try:
+        with (
+            httpx.Client(verify=mcp_ssl_context() or True, timeout=timeout) as client,
+            client.stream("GET", url) as response,
+        ):
+            return response.status_code < 500
+    except httpx.HTTPError as e:
+        logger.debug("Probe of MCP server %s failed: %s", url, e)
+        return False
+
+
+@dataclass
+class _ServerBreaker:
+    """Circuit breaker of one MCP server."""
+
+    name: str
+    url: str
+    # True for each failed or slow call, oldest first
+    outcomes: deque[bool]
+    state: CircuitState = CircuitState.CLOSED
+    trial_in_flight: bool = False
+    opened_at: float = 0.0
+
+
+class MCPCircuitBreakers:
+    """Circuit breakers of all configured MCP servers.
+
+    Outcomes of tool discovery and tool calls are tracked in a window of
+    recent calls per server. Calls slower than `slow_call_seconds` count as
+    failed. When the failure rate in the window reaches the threshold, the
+    breaker opens and calls to the server are rejected immediately. A
+    background thread probes servers with open breakers; once a server
+    responds, its breaker becomes half-open and lets one trial call through,
+    which closes the breaker on success and opens it again on failure.
+
+    Errors reported by tools themselves mean the server is up and are not
+    counted as failures. Calls to unknown servers are always allowed.
+
+    The breakers are shared by all requests and are thread-safe.
+    """
+
+    def __init__(
+        self,
+        breaker_config: MCPCircuitBreakerConfig,
+        servers: list[MCPServerConfig],
+        probe: Probe = probe_mcp_server,
+    ) -> None:
+        """Initialize the breakers.
+
+        Args:
+            breaker_config: Thresholds and probe settings.
+            servers: MCP servers to track.
+            probe: Function checking that a server is reachable.
+        """
+        self._config = breaker_config
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        self._breakers = {
+            server.name: _ServerBreaker(
+                name=server.name,
+                url=server.url,
+                outcomes=deque(maxlen=breaker_config.window_size),
+            )
+            for server in servers
+        }
+        for breaker in self._breakers.values():
+            self._set_state(breaker, CircuitState.CLOSED)
+            mcp_server_failure_rate.labels(server=breaker.name).set(0)
+
+    def state(self, server: str) -> CircuitState:
+        """Return state of breaker of the server, closed for unknown servers."""
+        with self._lock:
+            breaker = self._breakers.get(server)
+            return breaker.state if breaker is not None else CircuitState.CLOSED
+
+    def allow(self, server: str) -> bool:
+        """Return True if a call to the server may proceed.
+
+        In half-open state, only one trial call is allowed at a time; its
+        outcome must be recorded or the trial released.
+        """
+        with self._lock:
+            breaker = self._breakers.get(server)
+            if breaker is None or breaker.state is CircuitState.CLOSED:
+                return True
+            if breaker.state is CircuitState.HALF_OPEN and not breaker.trial_in_flight:
+                breaker.trial_in_flight = True
+                return True
+        mcp_server_rejected_calls_total.labels(server=server).inc()
+        return False
+
+    def record(self, server: str, duration: float, failed: bool) -> None:
+        """Record outcome of a call to the server.
+
+        Args:
+            server: Name of the server.
+            duration: Duration of the call in seconds.
+            failed: True if the server did not respond properly.
+        """
+        failed = failed or duration > self._config.slow_call_seconds
+        with self._lock:
+            breaker = self._breakers.get(server)
+            if breaker is None:
+                return
+            if breaker.state is CircuitState.HALF_OPEN:
+                breaker.trial_in_flight = False
+                if failed:
+                    self._open(breaker)
+                else:
+                    breaker.outcomes.clear()
+                    self._set_state(breaker, CircuitState.CLOSED)
+                    mcp_server_failure_rate.labels(server=server).set(0)
+                    logger.info("Circuit breaker of MCP server '%s' closed", server)
+            elif breaker.state is CircuitState.CLOSED:
+                breaker.outcomes.append(failed)
+                failure_rate = sum(breaker.outcomes) / len(breaker.outcomes)
+                mcp_server_failure_rate.labels(server=server).set(failure_rate)
+                if (
+                    len(breaker.outcomes) >= self._config.min_calls
+                    and failure_rate >= self._config.failure_rate_threshold
+                ):
+                    self._open(breaker)
+            # outcomes of calls started before the breaker opened are ignored
+
+    def release(self, server: str) -> None:
+        """Release trial call of half-open breaker without recording outcome."""
+        with self._lock:
+            breaker = self._breakers.get(server)
+            if breaker is not None:
+                breaker.trial_in_flight = False
+
+    @contextmanager
+    def track(self, server: str) -> Iterator[None]:
+        """Record outcome and duration of the call made in the context.
+
+        Tool errors count as successful calls. Cancelled calls are not
+        recorded.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        except ToolException:
+            self.record(server, time.monotonic() - start, failed=False)
+            raise
+        except Exception:
+            self.record(server, time.monotonic() - start, failed=True)
+            raise
+        except BaseException:
+            self.release(server)
+            raise
+        self.record(server, time.monotonic() - start, failed=False)
+
+    def stop(self) -> None:
+        """Stop probing servers in background."""
+        self._stopped.set()
+
+    def _open(self, breaker: _ServerBreaker) -> None:
+        """Open the breaker and make sure it is probed, must hold the lock."""
+        self._set_state(breaker, CircuitState.OPEN)
+        breaker.opened_at = time.monotonic()
+        logger.warning(
+            "Circuit breaker of MCP server '%s' opened, the server is skipped "
+            "until it responds to probes",
+            breaker.name,
+        )
+        if self._prober is None and not self._stopped.is_set():
+            self._prober = threading.Thread(
+                target=self._probe_open_servers,
+                name="mcp-circuit-prober",
+                daemon=True,
+            )
+            self._prober.start()
+
+    def _probe_open_servers(self) -> None:
+        """Probe servers with open breakers until all of them are half-open."""
+        while not self._stopped.wait(self._config.probe_interval_seconds):
+            with self._lock:
+                open_breakers = [
+                    breaker
+                    for breaker in self._breakers.values()
+                    if breaker.state is CircuitState.OPEN
+                ]
+                if not open_breakers:
+                    self._prober = None
+                    return
+            for breaker in open_breakers:
+                if not self._probe(breaker.url, self._config.probe_timeout_seconds):
+                    continue
+                with self._lock:
+                    if breaker.state is CircuitState.OPEN:
+                        self._set_state(breaker, CircuitState.HALF_OPEN)
+                        logger.info(
+                            "MCP server '%s' responded to probe after %.0fs, "
+                            "circuit breaker is half-open",
+                            breaker.name,
+                            time.monotonic() - breaker.opened_at,
+                        )
+        with self._lock:
+            self._prober = None
+
+    @staticmethod
+    def _set_state(breaker: _ServerBreaker, state: CircuitState) -> None:
+        """Set state of the breaker and export it."""
+        breaker.state = state
+        for known_state in CircuitState:
+            mcp_server_circuit_state.labels(
+                server=breaker.name, state=known_state.value
+            ).set(1 if known_state is state else 0)
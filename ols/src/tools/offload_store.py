@@ -0,0 +1,127 @@
+"""In-memory store of offloaded tool outputs compressed with zstd."""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Optional
+
+import zstandard
+
+from ols.app.metrics.metrics import (
+    offload_compression_ratio,
+    offload_memory_bytes,
+    offload_spills_total,
+)
+from ols.app.models.config import OffloadMemoryStoreConfig
+
+logger = logging.getLogger(__name__)
+
+# callback writing content of offloaded output to disk, called with its
+# ref_id and content when the output is spilled from memory; returns False
+# if the output is not needed anymore and was not written
+SpillCallback = Callable[[str, bytes], bool]
+
+
+class OffloadMemoryStore:
+    """Hold offloaded tool outputs of all requests in memory under a byte budget.
+
+    Outputs are kept as zstd compressed blobs. When the compressed blobs take
+    more than the budget, the least recently used ones are spilled, ie.
+    decompressed and handed over to the spill callbacks of their owners,
+    which write them to files. Spilling runs outside of the store lock, so
+    outputs are readable from memory until their files are written.
+
+    The store is shared by all requests and is thread-safe.
+    """
+
+    def __init__(self, store_config: OffloadMemoryStoreConfig) -> None:
+        """Initialize the store.
+
+        Args:
+            store_config: Byte budget and compression level.
+        """
+        self._budget_bytes = store_config.budget_bytes
+        self._compression_level = store_config.compression_level
+        self._lock = threading.Lock()
+        # compressed blobs and spill callbacks, least recently used first
+        self._blobs: OrderedDict[str, tuple[bytes, SpillCallback]] = OrderedDict()
+        # blobs being spilled, still readable from memory
+        self._spilling: dict[str, bytes] = {}
+        self._bytes_held = 0
+
+    @property
+    def bytes_held(self) -> int:
+        """Return number of compressed bytes counted into the budget."""
+        return self._bytes_held
+
+    def put(self, ref_id: str, data: bytes, spill: SpillCallback) -> None:
+        """Compress and store the output, spill outputs over the budget.
+
+        Args:
+            ref_id: Unique reference of the output.
+            data: Content of the output.
+            spill: Callback writing the output to disk when it is spilled.
+        """
+        # compressor instances can not be shared between threads
+        blob = zstandard.ZstdCompressor(level=self._compression_level).compress(data)
+        offload_compression_ratio.observe(len(data) / max(1, len(blob)))
+        with self._lock:
+            self._blobs[ref_id] = (blob, spill)
+            self._bytes_held += len(blob)
+            offload_memory_bytes.inc(len(blob))
+            victims = self._evict()
+        for victim in victims:
+            self._spill(*victim)
+
+    def get(self, ref_id: str) -> Optional[bytes]:
+        """Return compressed output, None if it is not held in memory."""
+        with self._lock:
+            if ref_id in self._spilling:
+                return self._spilling[ref_id]
+            entry = self._blobs.get(ref_id)
+            if entry is None:
+                return None
+            self._blobs.move_to_end(ref_id)
+            return entry[0]
+
+    def discard(self, ref_ids: Iterable[str]) -> None:
+        """Drop the outputs from memory, they will not be spilled."""
+        with self._lock:
+            for ref_id in ref_ids:
+                self._spilling.pop(ref_id, None)
+                entry = self._blobs.pop(ref_id, None)
+                if entry is not None:
+                    self._release(len(entry[0]))
+
+    def _evict(self) -> list[tuple[str, bytes, SpillCallback]]:
+        """Move least recently used blobs over the budget to spilling ones.
+
+        Must be called with the lock held.
+        """
+        victims = []
+        while self._bytes_held > self._budget_bytes and self._blobs:
+            ref_id, (blob, spill) = self._blobs.popitem(last=False)
+            self._spilling[ref_id] = blob
+            self._release(len(blob))
+            victims.append((ref_id, blob, spill))
+        return victims
+
+    def _release(self, size: int) -> None:
+        """Stop counting blob of given size into the budget."""
+        self._bytes_held -= size
+        offload_memory_bytes.dec(size)
+
+    def _spill(self, ref_id: str, blob: bytes, spill: SpillCallback) -> None:
+        """Write the blob to disk by its callback and drop it from memory."""
+        try:
+            if spill(ref_id, zstandard.ZstdDecompressor().decompress(blob)):
+                offload_spills_total.inc()
+        except OSError:
+            logger.warning(
+                "Failed to spill offloaded content '%s' to disk, dropping it",
+                ref_id,
+                exc_info=True,
+            )
+        with self._lock:
+            self._spilling.pop(ref_id, None)
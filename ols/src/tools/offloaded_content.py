@@ -1,12 +1,22 @@
-"""Offload large tool outputs to disk with search + read retrieval."""
+"""Offload large tool outputs to disk or memory with search + read retrieval."""
 
+import asyncio
+import io
+import itertools
 import logging
+import mmap
+import multiprocessing
 import os
 import re
 import shutil
-import signal
 import tempfile
-from typing import Optional
+import threading
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from multiprocessing import forkserver
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Optional, Union
 from uuid import uuid4
 
 from langchain_core.tools.structured import StructuredTool
@@ -14,6 +24,9 @@ from pydantic import BaseModel, Field
 
 from ols import constants
 
+if TYPE_CHECKING:
+    from ols.src.tools.offload_store import OffloadMemoryStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,19 +71,37 @@ class OffloadManager:
     Security properties:
     - Files are created with ``O_CREAT | O_EXCL`` to prevent symlink attacks.
     - A ref_id allowlist prevents the LLM from accessing arbitrary paths.
+
+    Offsets of lines of each file are indexed when it is written, so reading
+    a line range maps only the range of the file.
+
+    With a memory store, outputs are kept compressed in the store shared by
+    all requests instead, and written to the session directory only when
+    the store spills them.
     """
 
-    def __init__(self, storage_path: str) -> None:
+    def __init__(
+        self,
+        storage_path: str,
+        memory_store: Optional["OffloadMemoryStore"] = None,
+    ) -> None:
         """Initialize the offload manager.
 
         Args:
             storage_path: Parent directory under which the per-session
                 temp directory will be created.
+            memory_store: Store keeping offloaded outputs in memory, files
+                are used when not set.
         """
         self._base_path = storage_path
+        self._memory_store = memory_store
         self._session_dir: Optional[str] = None
-        self._allowlist: dict[str, str] = {}
+        # file paths of offloaded outputs, None for outputs in memory store
+        self._allowlist: dict[str, Optional[str]] = {}
+        self._line_offsets: dict[str, array] = {}
         self._retrieval_tools_built = False
+        # serializes spilling from memory store with cleanup
+        self._lock = threading.Lock()
 
     @property
     def has_offloaded_content(self) -> bool:
@@ -115,7 +146,8 @@ class OffloadManager:
         if estimated_tokens <= tools_token_budget:
             return text
 
-        byte_size = len(text.encode("utf-8"))
+        data = text.encode("utf-8")
+        byte_size = len(data)
         if byte_size > constants.OFFLOAD_MAX_FILE_SIZE_BYTES:
             logger.warning(
                 "Tool '%s' output exceeds 50 MB hard cap (%d bytes); "
@@ -126,32 +158,78 @@ class OffloadManager:
             return text
 
         ref_id = str(uuid4())
-        try:
-            self._ensure_session_dir()
-            file_path = os.path.join(self._session_dir, f"{ref_id}.txt")  # type: ignore[arg-type]
-            fd = os.open(
-                file_path,
-                os.O_WRONLY | os.O_CREAT | os.O_EXCL,
-                0o600,
-            )
+        if self._memory_store is not None:
+            self._allowlist[ref_id] = None
+            self._line_offsets[ref_id] = _index_lines(data)
+            self._memory_store.put(ref_id, data, self._spill)
+        else:
             try:
-                os.write(fd, text.encode("utf-8"))
-            finally:
-                os.close(fd)
-        except OSError:
-            logger.warning(
-                "Failed to write offloaded content for tool '%s'; "
-                "falling back to truncation",
-                tool_name,
-                exc_info=True,
-            )
-            return text
+                file_path = self._write_file(ref_id, data)
+            except OSError:
+                logger.warning(
+                    "Failed to write offloaded content for tool '%s'; "
+                    "falling back to truncation",
+                    tool_name,
+                    exc_info=True,
+                )
+                return text
+            self._allowlist[ref_id] = file_path
+            self._line_offsets[ref_id] = _index_lines(data)
 
-        self._allowlist[ref_id] = file_path
         line_count = text.count("\n") + 1
 
         return _build_placeholder(ref_id, tool_name, line_count, byte_size)
 
+    def _write_file(self, ref_id: str, data: bytes) -> str:
+        """Write offloaded content to the session directory, return its path.
+
+        Raises:
+            OSError: If the file can not be written.
+        """
+        self._ensure_session_dir()
+        file_path = os.path.join(self._session_dir, f"{ref_id}.txt")  # type: ignore[arg-type]
+        fd = os.open(
+            file_path,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+            0o600,
+        )
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return file_path
+
+    def _spill(self, ref_id: str, data: bytes) -> bool:
+        """Write content spilled from memory store to disk.
+
+        Returns:
+            False if the content was cleaned up meanwhile and was not written.
+
+        Raises:
+            OSError: If the file can not be written.
+        """
+        with self._lock:
+            if ref_id not in self._allowlist:
+                return False
+            self._allowlist[ref_id] = self._write_file(ref_id, data)
+            return True
+
+    def _content_source(self, ref_id: str) -> Optional[Union[str, bytes]]:
+        """Return file path or zstd compressed content of offloaded output.
+
+        Returns:
+            None if the content is not available, ie. it was dropped by the
+            memory store.
+        """
+        file_path = self._allowlist.get(ref_id)
+        if file_path is not None or self._memory_store is None:
+            return file_path
+        blob = self._memory_store.get(ref_id)
+        if blob is not None:
+            return blob
+        # spilled after the path was looked up
+        return self._allowlist.get(ref_id)
+
     def cleanup(self) -> None:
         """Delete the session directory and all offloaded files.
 
@@ -159,17 +237,21 @@ class OffloadManager:
         per-session directory for atomic cleanup that cannot leak files
         from concurrent requests.
         """
-        if self._session_dir is not None and os.path.isdir(self._session_dir):
-            try:
-                shutil.rmtree(self._session_dir)
-            except OSError:
-                logger.warning(
-                    "Failed to remove offload session directory: %s",
-                    self._session_dir,
-                    exc_info=True,
-                )
-        self._session_dir = None
-        self._allowlist.clear()
+        with self._lock:
+            if self._memory_store is not None:
+                self._memory_store.discard(list(self._allowlist))
+            if self._session_dir is not None and os.path.isdir(self._session_dir):
+                try:
+                    shutil.rmtree(self._session_dir)
+                except OSError:
+                    logger.warning(
+                        "Failed to remove offload session directory: %s",
+                        self._session_dir,
+                        exc_info=True,
+                    )
+            self._session_dir = None
+            self._allowlist.clear()
+            self._line_offsets.clear()
 
     def build_retrieval_tools(self) -> list[StructuredTool]:
         """Build the search and read retrieval tools.
@@ -202,7 +284,8 @@ class OffloadManager:
             return _search_offloaded(manager, **kwargs)
 
         async def _search_async(**kwargs: object) -> str:
-            return _search_offloaded(manager, **kwargs)
+            # the search waits for a worker process, keep the event loop free
+            return await asyncio.to_thread(_search_offloaded, manager, **kwargs)
 
         def _read_sync(**kwargs: object) -> str:
             return _read_offloaded(manager, **kwargs)
@@ -256,65 +339,191 @@ def _build_placeholder(
     )
 
 
-def _load_lines_or_error(
+def _index_lines(data: bytes) -> array:
+    """Return byte offsets of starts of lines and of the end of data.
+
+    Lines end with universal newlines, the same way as in files opened
+    in text mode.
+    """
+    return array(
+        "I", itertools.accumulate(map(len, data.splitlines(keepends=True)), initial=0)
+    )
+
+
+def _resolve_ref_or_error(
     manager: OffloadManager, ref_id: str
-) -> tuple[Optional[list[str]], Optional[str]]:
-    """Validate ref_id and load lines, returning (lines, None) or (None, error_message)."""
+) -> tuple[Optional[tuple[Union[str, bytes], array]], Optional[str]]:
+    """Validate ref_id, returning ((source, line offsets), None) or (None, error).
+
+    Source of the content is a file path or zstd compressed content.
+    """
     if ref_id not in manager._allowlist:
         available = list(manager._allowlist.keys())
         return None, (
             f"Error: unknown reference '{ref_id}'. "
             f"Available references: {available}"
         )
-    file_path = manager._allowlist[ref_id]
-    try:
-        with open(file_path, encoding="utf-8") as f:
-            return f.readlines(), None
-    except OSError as e:
-        return None, f"Error: could not read offloaded content for '{ref_id}': {e}"
+    source = manager._content_source(ref_id)
+    if source is None:
+        return None, f"Error: offloaded content for '{ref_id}' is not available."
+    return (source, manager._line_offsets[ref_id]), None
 
 
-def _find_matches_with_timeout(
-    lines: list[str], compiled: re.Pattern[str], pattern: str
-) -> tuple[Optional[list[int]], Optional[str]]:
-    """Run regex search with SIGALRM timeout. Return (indices, None) or (None, error)."""
+def _decompress(blob: bytes) -> bytes:
+    """Return content of offloaded output compressed by memory store."""
+    import zstandard  # pylint: disable=import-outside-toplevel
+
+    return zstandard.ZstdDecompressor().decompress(blob)
+
+
+@contextmanager
+def _open_content(source: Union[str, bytes]) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Provide content of offloaded output from file path or compressed blob.
+
+    Files are mapped, so only the ranges read are loaded.
+
+    Raises:
+        OSError: If the file can not be read.
+    """
+    if isinstance(source, bytes):
+        yield _decompress(source)
+        return
+    with (
+        open(source, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        yield mapped
+
+
+def _read_lines(
+    content: Union[bytes, mmap.mmap], line_offsets: array, start: int, end: int
+) -> list[str]:
+    """Read lines from start to end (exclusive) without line endings."""
+    return [
+        content[line_offsets[i] : line_offsets[i + 1]].decode("utf-8").rstrip("\n\r")
+        for i in range(start, end)
+    ]
 
-    def _timeout_handler(signum: int, frame: object) -> None:
-        raise TimeoutError()
 
+def _find_matching_lines(
+    source: Union[str, bytes], pattern: str, limit: int
+) -> tuple[int, list[int]]:
+    """Return number of lines matching pattern and indices of the first ones."""
+    compiled = re.compile(pattern)
+    total = 0
     match_indices: list[int] = []
-    old_handler = signal.signal(signal.SIGALRM, _timeout_handler)
-    signal.alarm(constants.OFFLOAD_REGEX_TIMEOUT_SECONDS)
-    try:
-        for i, line in enumerate(lines):
+    # blobs are read the same way as files in text mode, with universal newlines
+    with (
+        io.TextIOWrapper(io.BytesIO(_decompress(source)), encoding="utf-8")
+        if isinstance(source, bytes)
+        else open(source, encoding="utf-8")
+    ) as f:
+        for i, line in enumerate(f):
             if compiled.search(line):
-                match_indices.append(i)
-    except TimeoutError:
-        return None, (
-            f"Error: search pattern '{pattern}' timed out. Try a simpler pattern."
+                total += 1
+                if len(match_indices) < limit:
+                    match_indices.append(i)
+    return total, match_indices
+
+
+def _search_worker(
+    conn: Connection, source: Union[str, bytes], pattern: str, limit: int
+) -> None:
+    """Search content in worker process and send result or error to the parent."""
+    try:
+        conn.send(_find_matching_lines(source, pattern, limit))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+# Regex search runs in worker processes, which can be killed when the search
+# times out; signals can not interrupt regex matching in threads. Workers are
+# forked from a forkserver with the main module and this module preloaded, so
+# they start fast and do not inherit the threads of the service.
+_search_slots = threading.BoundedSemaphore(constants.OFFLOAD_SEARCH_MAX_WORKERS)
+_search_context = multiprocessing.get_context("forkserver")
+
+
+def start_search_workers() -> None:
+    """Start forkserver of the search workers unless it is running.
+
+    Called at service startup, so that modules are preloaded before the
+    first search is requested.
+    """
+    _search_context.set_forkserver_preload(["__main__", __name__])
+    forkserver.ensure_running()
+
+
+def _find_matches_with_timeout(
+    source: Union[str, bytes], pattern: str, limit: int
+) -> tuple[Optional[tuple[int, list[int]]], Optional[str]]:
+    """Run regex search in worker process with timeout.
+
+    At most ``OFFLOAD_SEARCH_MAX_WORKERS`` searches run at once, both
+    waiting for a free worker and the search in the started worker are
+    limited by the timeout. Content held in memory is sent to the worker
+    compressed.
+
+    Returns:
+        ((number of matching lines, indices of up to limit of them), None)
+        or (None, error).
+    """
+    timeout_error = (
+        f"Error: search pattern '{pattern}' timed out. Try a simpler pattern."
+    )
+    # the slot is released explicitly once the worker exits
+    # pylint: disable-next=consider-using-with
+    if not _search_slots.acquire(timeout=constants.OFFLOAD_REGEX_TIMEOUT_SECONDS):
+        return None, timeout_error
+    try:
+        start_search_workers()
+        receiver, sender = _search_context.Pipe(duplex=False)
+        worker = _search_context.Process(
+            target=_search_worker,
+            args=(sender, source, pattern, limit),
+            daemon=True,
         )
+        # start returns once the worker is forked, so a cold start of the
+        # forkserver does not count into the timeout
+        worker.start()
+        sender.close()
+        try:
+            if not receiver.poll(constants.OFFLOAD_REGEX_TIMEOUT_SECONDS):
+                return None, timeout_error
+            result = receiver.recv()
+        except EOFError:
+            return None, f"Error: search of '{pattern}' failed."
+        finally:
+            receiver.close()
+            worker.kill()
+            worker.join()
     finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
-    return match_indices, None
+        _search_slots.release()
+    if isinstance(result, Exception):
+        return None, f"Error: search of '{pattern}' failed: {result}"
+    return result, None
 
 
 def _format_search_results(
-    lines: list[str],
+    content: Union[bytes, mmap.mmap],
+    line_offsets: array,
     match_indices: list[int],
+    total_matches: int,
     ref_id: str,
     pattern: str,
     context_lines: int,
 ) -> str:
     """Format matched lines with context into grep-style output."""
-    total_matches = len(match_indices)
+    line_count = len(line_offsets) - 1
     capped = match_indices[: constants.OFFLOAD_MAX_SEARCH_MATCHES]
     shown = len(capped)
 
     included: set[int] = set()
     for idx in capped:
         start = max(0, idx - context_lines)
-        end = min(len(lines), idx + context_lines + 1)
+        end = min(line_count, idx + context_lines + 1)
         included.update(range(start, end))
 
     match_set = set(match_indices)
@@ -325,66 +534,96 @@ def _format_search_results(
     ]
 
     sorted_included = sorted(included)
+    # read only the included lines, one range per context window
+    lines: dict[int, str] = {}
+    for _, run in itertools.groupby(
+        enumerate(sorted_included), lambda item: item[1] - item[0]
+    ):
+        run_indices = [line_idx for _, line_idx in run]
+        start, end = run_indices[0], run_indices[-1] + 1
+        lines.update(
+            zip(range(start, end), _read_lines(content, line_offsets, start, end))
+        )
+
     prev_line_idx = -2
     for line_idx in sorted_included:
         if line_idx != prev_line_idx + 1 and prev_line_idx >= 0:
             result_parts.append("--")
-        line_text = lines[line_idx].rstrip("\n\r")
         marker = ":" if line_idx in match_set else "-"
-        result_parts.append(f"{line_idx + 1}{marker}{line_text}")
+        result_parts.append(f"{line_idx + 1}{marker}{lines[line_idx]}")
         prev_line_idx = line_idx
 
     return "\n".join(result_parts)
 
 
 def _search_offloaded(manager: OffloadManager, **kwargs: object) -> str:
-    """Execute a regex search against an offloaded file."""
+    """Execute a regex search against offloaded content."""
     ref_id = str(kwargs.get("ref_id", ""))
     pattern = str(kwargs.get("pattern", ""))
     context_lines = int(str(kwargs.get("context_lines", 3)))
 
-    lines, error = _load_lines_or_error(manager, ref_id)
-    if error is not None or lines is None:
+    offloaded, error = _resolve_ref_or_error(manager, ref_id)
+    if error is not None or offloaded is None:
         return error or f"Error: unknown reference '{ref_id}'."
+    source, line_offsets = offloaded
 
     try:
-        compiled = re.compile(pattern)
+        re.compile(pattern)
     except re.error as e:
         return f"Error: invalid search pattern '{pattern}': {e}"
 
-    match_indices, timeout_error = _find_matches_with_timeout(lines, compiled, pattern)
-    if timeout_error is not None or match_indices is None:
-        return timeout_error or f"Error: search failed for '{ref_id}'."
+    # matches shown and the ones in context of the last shown match
+    limit = constants.OFFLOAD_MAX_SEARCH_MATCHES + context_lines
+    result, search_error = _find_matches_with_timeout(source, pattern, limit)
+    if search_error is not None or result is None:
+        return search_error or f"Error: search failed for '{ref_id}'."
+    total_matches, match_indices = result
 
-    if len(match_indices) == 0:
+    if total_matches == 0:
         return (
             f"No matches found for pattern '{pattern}' in "
-            f"{ref_id} ({len(lines)} lines)"
+            f"{ref_id} ({len(line_offsets) - 1} lines)"
         )
 
-    return _format_search_results(lines, match_indices, ref_id, pattern, context_lines)
+    try:
+        with _open_content(source) as content:
+            return _format_search_results(
+                content,
+                line_offsets,
+                match_indices,
+                total_matches,
+                ref_id,
+                pattern,
+                context_lines,
+            )
+    except OSError as e:
+        return f"Error: could not read offloaded content for '{ref_id}': {e}"
 
 
 def _read_offloaded(manager: OffloadManager, **kwargs: object) -> str:
-    """Read a line range from an offloaded file."""
+    """Read a line range from offloaded content."""
     ref_id = str(kwargs.get("ref_id", ""))
     start_line = int(str(kwargs.get("start_line", 1)))
     end_line = int(str(kwargs.get("end_line", 1)))
 
-    lines, error = _load_lines_or_error(manager, ref_id)
-    if error is not None or lines is None:
+    offloaded, error = _resolve_ref_or_error(manager, ref_id)
+    if error is not None or offloaded is None:
         return error or f"Error: unknown reference '{ref_id}'."
+    source, line_offsets = offloaded
 
-    total_lines = len(lines)
+    total_lines = len(line_offsets) - 1
     start_idx = max(0, start_line - 1)
     end_idx = min(total_lines, end_line)
 
     if end_idx - start_idx > constants.OFFLOAD_MAX_READ_LINES:
         end_idx = start_idx + constants.OFFLOAD_MAX_READ_LINES
 
-    result_parts: list[str] = []
-    for i in range(start_idx, end_idx):
-        line_text = lines[i].rstrip("\n\r")
-        result_parts.append(f"{i + 1}:{line_text}")
+    try:
+        with _open_content(source) as content:
+            lines = _read_lines(content, line_offsets, start_idx, end_idx)
+    except OSError as e:
+        return f"Error: could not read offloaded content for '{ref_id}': {e}"
 
-    return "\n".join(result_parts)
+    return "\n".join(
+        f"{start_idx + i + 1}:{line_text}" for i, line_text in enumerate(lines)
+    )
@@ -0,0 +1,136 @@
+"""Cache of results of read-only MCP tools."""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from ols.app.metrics.metrics import (
+    tool_result_cache_hits_total,
+    tool_result_cache_misses_total,
+)
+from ols.app.models.config import ToolResultCacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CachedToolResult(NamedTuple):
+    """Tool result stored in the cache."""
+
+    output: str
+    structured_content: Optional[dict]
+    stored_at: float
+    size: int
+
+
+class ToolResultCache:
+    """Bounded LRU cache with TTL for results of read-only tools.
+
+    Results are keyed by the scope of the call, ie. identity of the user and
+    conversation, and by the server, tool and canonical arguments, so they
+    are never shared across users or conversations.
+    """
+
+    def __init__(self, cache_config: ToolResultCacheConfig) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_config: TTL and size limits of the cache.
+        """
+        self.ttl_seconds = cache_config.ttl_seconds
+        self.max_size_bytes = cache_config.max_size_bytes
+        self.max_entry_size_bytes = cache_config.max_entry_size_bytes
+        self._entries: OrderedDict[str, CachedToolResult] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def construct_key(
+        scope: str, server: str, tool_name: str, tool_args: dict[str, object]
+    ) -> str:
+        """Construct cache key for tool call, equal for reordered arguments."""
+        key = json.dumps(
+            [scope, server, tool_name, tool_args],
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(
+        self, scope: str, server: str, tool_name: str, tool_args: dict[str, object]
+    ) -> Optional[CachedToolResult]:
+        """Return cached result of the call, or None when missing or expired."""
+        key = self.construct_key(scope, server, tool_name, tool_args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and time.monotonic() - entry.stored_at > self.ttl_seconds
+            ):
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            tool_result_cache_misses_total.labels(server=server).inc()
+            return None
+        tool_result_cache_hits_total.labels(server=server).inc()
+        logger.debug("Tool result cache hit for tool '%s' of '%s'", tool_name, server)
+        # structured content is handed to the client of each request
+        return entry._replace(
+            structured_content=copy.deepcopy(entry.structured_content)
+        )
+
+    def put(  # pylint: disable=too-many-arguments
+        self,
+        scope: str,
+        server: str,
+        tool_name: str,
+        tool_args: dict[str, object],
+        output: str,
+        structured_content: Optional[dict],
+    ) -> None:
+        """Store result of the call, evicting least recently used results.
+
+        Results larger than the maximum entry size are not stored.
+        """
+        size = len(output.encode("utf-8"))
+        if structured_content is not None:
+            size += len(json.dumps(structured_content, default=str).encode("utf-8"))
+        if size > self.max_entry_size_bytes:
+            logger.debug(
+                "Result of tool '%s' of '%s' is too large to cache (%d bytes)",
+                tool_name,
+                server,
+                size,
+            )
+            return
+        key = self.construct_key(scope, server, tool_name, tool_args)
+        entry = CachedToolResult(
+            output=output,
+            structured_content=copy.deepcopy(structured_content),
+            stored_at=time.monotonic(),
+            size=size,
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_size_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        """Remove entry if present, must be called with the lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def __len__(self) -> int:
+        """Return number of cached results."""
+        return len(self._entries)
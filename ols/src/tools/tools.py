@@ -1,10 +1,14 @@
 """Functions/Tools definition."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import time
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Literal, TypeAlias, TypedDict
+from typing import TYPE_CHECKING, Any, Literal, Optional, TypeAlias, TypedDict
 from uuid import uuid4
 
 from aiostream import stream
@@ -20,6 +24,7 @@ from ols.src.tools.approval import (
     register_pending_approval,
 )
 from ols.utils.token_handler import TokenHandler
+from ols.utils.tracing import set_span_attributes, start_span
 
 if TYPE_CHECKING:
     from ols.src.tools.offloaded_content import OffloadManager
@@ -40,6 +45,30 @@ _TRUNCATION_WARNING_TOKENS = TokenHandler._get_token_count(
     TokenHandler().text_to_tokens(_TRUNCATION_WARNING)
 )
 
+_CACHE_HIT_MARKER = "[Cached result of an identical call made {age:.0f}s ago]\n"
+
+# identity of the user and conversation tools are called for; tool results
+# are reused only within the same scope
+_tool_result_cache_scope: ContextVar[Optional[str]] = ContextVar(
+    "tool_result_cache_scope", default=None
+)
+
+
+def set_tool_result_cache_scope(
+    user_id: Optional[str], conversation_id: Optional[str], credentials: object
+) -> None:
+    """Set scope of cached tool results for tool calls in the current context.
+
+    Cached results are shared only by calls for the same user and
+    conversation, made with the same credentials for MCP servers. Results
+    are not cached when the user or conversation is not known.
+    """
+    if user_id is None or conversation_id is None:
+        _tool_result_cache_scope.set(None)
+        return
+    scope = json.dumps([user_id, conversation_id, credentials], default=str)
+    _tool_result_cache_scope.set(hashlib.sha256(scope.encode("utf-8")).hexdigest())
+
 
 class ApprovalRequiredPayload(TypedDict):
     """Payload for approval_required events."""
@@ -77,6 +106,10 @@ class _ApprovalNotGrantedError(Exception):
     """Internal control-flow signal when approval is denied or times out."""
 
 
+class _ServerUnavailableError(Exception):
+    """MCP server of the tool is skipped by its open circuit breaker."""
+
+
 def _is_transient_tool_error(error: Exception) -> bool:
     """Return true if a tool execution error is likely transient."""
     if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
@@ -219,6 +252,83 @@ def get_tool_by_name(
     return tool[0]
 
 
+def _result_cache_server(tool: StructuredTool) -> Optional[str]:
+    """Return MCP server of the tool if results of the tool can be cached."""
+    tool_metadata = tool.metadata if isinstance(tool.metadata, dict) else {}
+    if normalize_tool_annotation(tool_metadata).get("readOnlyHint") is not True:
+        return None
+    server_config = config.mcp_servers_dict.get(str(tool_metadata.get("mcp_server")))
+    if server_config is None or not server_config.cache_read_only_tools:
+        return None
+    return server_config.name
+
+
+async def _call_tool(
+    tool: StructuredTool, tool_args: dict[str, object]
+) -> tuple[Any, dict | None]:
+    """Call the tool, return its raw output and structured content.
+
+    Raises:
+        _ServerUnavailableError: If circuit breaker of the MCP server of
+            the tool is open.
+    """
+    structured_content: dict | None = None
+    breakers = config.services.mcp_circuit_breakers
+    tool_metadata = tool.metadata if isinstance(tool.metadata, dict) else {}
+    server = tool_metadata.get("mcp_server")
+    if breakers is None or server is None:
+        result = await tool.coroutine(**tool_args)  # type: ignore[misc]
+    else:
+        if not breakers.allow(server):
+            raise _ServerUnavailableError(
+                f"MCP server '{server}' is unavailable, calls to it are "
+                "suspended after repeated failures"
+            )
+        with breakers.track(server):
+            result = await tool.coroutine(**tool_args)  # type: ignore[misc]
+
+    raw_output = result[0] if isinstance(result, tuple) and len(result) == 2 else result
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], dict):
+        raw = result[1].get("structured_content")
+        structured_content = raw if isinstance(raw, dict) else None
+    return raw_output, structured_content
+
+
+async def _call_tool_cached(
+    tool: StructuredTool, tool_args: dict[str, object]
+) -> tuple[Any, dict | None, str]:
+    """Call the tool or reuse result of identical call of read-only tool.
+
+    Returns:
+        Tuple of (raw output, structured content, cache hit marker), the
+        marker is empty unless the result comes from the cache.
+    """
+    cache = config.services.tool_result_cache
+    scope = _tool_result_cache_scope.get()
+    server = None
+    if cache is not None and scope is not None:
+        server = _result_cache_server(tool)
+    if cache is None or scope is None or server is None:
+        raw_output, structured_content = await _call_tool(tool, tool_args)
+        return raw_output, structured_content, ""
+
+    cached = cache.get(scope, server, tool.name, tool_args)
+    if cached is not None:
+        marker = _CACHE_HIT_MARKER.format(age=time.monotonic() - cached.stored_at)
+        return cached.output, cached.structured_content, marker
+
+    raw_output, structured_content = await _call_tool(tool, tool_args)
+    cache.put(
+        scope,
+        server,
+        tool.name,
+        tool_args,
+        _convert_tool_output_to_text(raw_output),
+        structured_content,
+    )
+    return raw_output, structured_content, ""
+
+
 async def execute_tool_call(
     tool: StructuredTool,
     tool_args: dict[str, object],
@@ -227,6 +337,9 @@ async def execute_tool_call(
 ) -> tuple[str, str, bool, dict | None]:
     """Execute a tool call and return output, status, truncation flag, and structured content.
 
+    Results of read-only tools are reused when the tool result cache is
+    configured, their output starts with a cache hit marker.
+
     Args:
         tool: Tool instance to execute.
         tool_args: Arguments to pass to the tool.
@@ -236,14 +349,10 @@ async def execute_tool_call(
     Returns:
         Tuple of (status, tool_output, was_truncated, structured_content).
     """
-    structured_content: dict | None = None
     tool_name = tool.name
-    result = await tool.coroutine(**tool_args)  # type: ignore[misc]
-
-    raw_output = result[0] if isinstance(result, tuple) and len(result) == 2 else result
-    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], dict):
-        raw = result[1].get("structured_content")
-        structured_content = raw if isinstance(raw, dict) else None
+    raw_output, structured_content, cache_hit_marker = await _call_tool_cached(
+        tool, tool_args
+    )
 
     if offload_manager is not None:
         raw_text = _convert_tool_output_to_text(raw_output)
@@ -259,6 +368,7 @@ async def execute_tool_call(
         tool_output, was_truncated = _extract_text_from_tool_output(
             raw_output, tools_token_budget
         )
+    tool_output = cache_hit_marker + tool_output
 
     status = "success"
     logger.debug(
@@ -402,10 +512,12 @@ async def _evaluate_and_emit_approval_event(
         tool_args=tool_args,
         tool_annotation=tool_annotation,
     )
-    outcome = await get_approval_decision(
-        approval_id=approval_id,
-        timeout_seconds=config.tools_approval.approval_timeout,
-    )
+    with start_span("tool_approval_wait", {"tool.name": tool_name}):
+        outcome = await get_approval_decision(
+            approval_id=approval_id,
+            timeout_seconds=config.tools_approval.approval_timeout,
+        )
+        set_span_attributes({"approval.outcome": outcome})
     if outcome != "approved":
         yield _approval_rejection_event(
             tool_name=tool_name,
@@ -439,16 +551,19 @@ async def _execute_with_retries(
 
     for attempt in range(attempts):
         try:
-            _status, tool_output, was_truncated, structured_content = (
-                await execute_tool_call(
-                    tool, tool_args, tools_token_budget, offload_manager
+            with start_span("tool_call_attempt", {"attempt": attempt + 1}):
+                _status, tool_output, was_truncated, structured_content = (
+                    await execute_tool_call(
+                        tool, tool_args, tools_token_budget, offload_manager
+                    )
                 )
-            )
             return "success", tool_output, was_truncated, structured_content
         except Exception as error:
             last_error_text = str(error)
             is_rate_limited_error = _is_rate_limited_tool_error(error)
-            should_retry = _is_transient_tool_error(error) or is_rate_limited_error
+            should_retry = not isinstance(error, _ServerUnavailableError) and (
+                _is_transient_tool_error(error) or is_rate_limited_error
+            )
             if attempt < MAX_TOOL_CALL_RETRIES and should_retry:
                 logger.warning(
                     "Retrying tool '%s' after transient error on attempt %d/%d: %s",
@@ -504,14 +619,23 @@ async def _execute_single_tool_call_stream(
     except _ApprovalNotGrantedError:
         return
 
-    status, tool_output, was_truncated, structured_content = (
-        await _execute_with_retries(
-            tool=tool,
-            tool_args=tool_args,
-            tools_token_budget=tools_token_budget,
-            offload_manager=offload_manager,
+    tool_metadata = tool.metadata if isinstance(tool.metadata, dict) else {}
+    with start_span(
+        "tool_call",
+        {
+            "tool.name": tool.name,
+            "tool.server": str(tool_metadata.get("mcp_server", "")),
+        },
+    ):
+        status, tool_output, was_truncated, structured_content = (
+            await _execute_with_retries(
+                tool=tool,
+                tool_args=tool_args,
+                tools_token_budget=tools_token_budget,
+                offload_manager=offload_manager,
+            )
         )
-    )
+        set_span_attributes({"tool.status": status, "tool.truncated": was_truncated})
     yield _tool_result_event(
         content=tool_output,
         status=status,
@@ -14,12 +14,6 @@ import ols.app.models.config as config_model
 from ols.src.cache.cache_factory import CacheFactory
 from ols.src.quota.quota_limiter_factory import QuotaLimiterFactory
 from ols.src.quota.token_usage_history import TokenUsageHistory
-
-# as the index_loader.py is excluded from type checks, it confuses
-# mypy a bit, hence the [attr-defined] bellow
-from ols.src.rag_index.index_loader import IndexLoader  # type: ignore [attr-defined]
-from ols.src.skills.skills_rag import SkillsRAG, load_skills_from_directory
-from ols.src.tools.tools_rag.hybrid_tools_rag import ToolsRAG
 from ols.utils.redactor import Redactor
 
 logger = logging.getLogger(__name__)
@@ -28,8 +22,222 @@ if TYPE_CHECKING:
     from io import TextIOBase
 
     from ols.src.cache.cache import Cache
+    from ols.src.cache.response_cache import ResponseCache
+    from ols.src.diagnostics.event_loop_monitor import EventLoopMonitor
+    from ols.src.diagnostics.memory_profiler import MemoryProfiler
+    from ols.src.diagnostics.sampling_profiler import SamplingProfiler
+    from ols.src.query_helpers.admission_controller import AdmissionController
+    from ols.src.query_helpers.history_support import HistoryCompressor
+    from ols.src.query_helpers.summarization_model import SummarizationModel
     from ols.src.quota.quota_limiter import QuotaLimiter
+    from ols.src.quota.quota_service import QuotaService
+
+    # as the index_loader.py is excluded from type checks, it confuses
+    # mypy a bit, hence the [attr-defined] bellow
+    from ols.src.rag_index.index_loader import (  # type: ignore [attr-defined]
+        IndexLoader,
+    )
+    from ols.src.skills.skills_rag import SkillsRAG
     from ols.src.tools.approval import PendingApprovalStoreBase
+    from ols.src.tools.circuit_breaker import MCPCircuitBreakers
+    from ols.src.tools.offload_store import OffloadMemoryStore
+    from ols.src.tools.tool_result_cache import ToolResultCache
+    from ols.src.tools.tools_rag.hybrid_tools_rag import ToolsRAG
+
+
+class Services:
+    """Optional services created on first use from the OLS configuration.
+
+    Each service is None when it is not configured.
+    """
+
+    def __init__(self, app_config: "AppConfig") -> None:
+        """Initialize the class instance."""
+        self._app_config = app_config
+        self._response_cache: Optional[ResponseCache] = None
+        self._admission_controller: Optional[AdmissionController] = None
+        self._history_compressor: Optional[HistoryCompressor] = None
+        self._summarization_model: Optional[SummarizationModel] = None
+        self._offload_memory_store: Optional[OffloadMemoryStore] = None
+        self._tool_result_cache: Optional[ToolResultCache] = None
+        self._mcp_circuit_breakers: Optional[MCPCircuitBreakers] = None
+        self._event_loop_monitor: Optional[EventLoopMonitor] = None
+        self._sampling_profiler: Optional[SamplingProfiler] = None
+        self._memory_profiler: Optional[MemoryProfiler] = None
+        self._quota_service: Optional[QuotaService] = None
+
+    @property
+    def _ols_config(self) -> config_model.OLSConfig:
+        """Return the OLS configuration."""
+        return self._app_config.ols_config
+
+    @property
+    def response_cache(self) -> Optional["ResponseCache"]:
+        """Return the LLM response cache, None when it is not configured."""
+        if self._ols_config.response_cache is None:
+            return None
+        if self._response_cache is None:
+            self._response_cache = CacheFactory.response_cache(
+                self._ols_config.response_cache
+            )
+        return self._response_cache
+
+    @property
+    def admission_controller(self) -> Optional["AdmissionController"]:
+        """Return the admission controller, None when it is not configured."""
+        if self._ols_config.admission_control is None:
+            return None
+        if self._admission_controller is None:
+            from ols.src.query_helpers.admission_controller import (  # pylint: disable=import-outside-toplevel
+                AdmissionController,
+            )
+
+            self._admission_controller = AdmissionController(
+                self._ols_config.admission_control
+            )
+        return self._admission_controller
+
+    @property
+    def history_compressor(self) -> Optional["HistoryCompressor"]:
+        """Return the background history compressor, None when not configured."""
+        if self._ols_config.background_history_compression is None:
+            return None
+        if self._history_compressor is None:
+            from ols.src.query_helpers.history_support import (  # pylint: disable=import-outside-toplevel
+                HistoryCompressor,
+            )
+
+            self._history_compressor = HistoryCompressor(
+                self._ols_config.background_history_compression
+            )
+        return self._history_compressor
+
+    @property
+    def summarization_model(self) -> Optional["SummarizationModel"]:
+        """Return the dedicated history summarization model, None if not configured."""
+        if self._ols_config.history_summarization is None:
+            return None
+        if self._summarization_model is None:
+            from ols.src.query_helpers.summarization_model import (  # pylint: disable=import-outside-toplevel
+                SummarizationModel,
+            )
+
+            self._summarization_model = SummarizationModel(
+                self._ols_config.history_summarization
+            )
+        return self._summarization_model
+
+    @property
+    def offload_memory_store(self) -> Optional["OffloadMemoryStore"]:
+        """Return the in-memory store of offloaded tool outputs, None if not configured."""
+        if self._ols_config.offload_memory_store is None:
+            return None
+        if self._offload_memory_store is None:
+            from ols.src.tools.offload_store import (  # pylint: disable=import-outside-toplevel
+                OffloadMemoryStore,
+            )
+
+            self._offload_memory_store = OffloadMemoryStore(
+                self._ols_config.offload_memory_store
+            )
+        return self._offload_memory_store
+
+    @property
+    def tool_result_cache(self) -> Optional["ToolResultCache"]:
+        """Return the cache of read-only tool results, None when not configured."""
+        if self._ols_config.tool_result_cache is None:
+            return None
+        if self._tool_result_cache is None:
+            from ols.src.tools.tool_result_cache import (  # pylint: disable=import-outside-toplevel
+                ToolResultCache,
+            )
+
+            self._tool_result_cache = ToolResultCache(
+                self._ols_config.tool_result_cache
+            )
+        return self._tool_result_cache
+
+    @property
+    def mcp_circuit_breakers(self) -> Optional["MCPCircuitBreakers"]:
+        """Return circuit breakers of MCP servers, None when not configured."""
+        if self._ols_config.mcp_circuit_breaker is None:
+            return None
+        if self._mcp_circuit_breakers is None:
+            from ols.src.tools.circuit_breaker import (  # pylint: disable=import-outside-toplevel
+                MCPCircuitBreakers,
+            )
+
+            self._mcp_circuit_breakers = MCPCircuitBreakers(
+                self._ols_config.mcp_circuit_breaker,
+                self._app_config.mcp_servers.servers,
+            )
+        return self._mcp_circuit_breakers
+
+    @property
+    def event_loop_monitor(self) -> Optional["EventLoopMonitor"]:
+        """Return the event loop monitor, None when it is disabled."""
+        if not self._ols_config.event_loop_monitor.enabled:
+            return None
+        if self._event_loop_monitor is None:
+            from ols.src.diagnostics.event_loop_monitor import (  # pylint: disable=import-outside-toplevel
+                EventLoopMonitor,
+            )
+
+            self._event_loop_monitor = EventLoopMonitor(
+                self._ols_config.event_loop_monitor
+            )
+        return self._event_loop_monitor
+
+    @property
+    def sampling_profiler(self) -> Optional["SamplingProfiler"]:
+        """Return the on-demand CPU profiler, None when profiling is disabled."""
+        if not self._ols_config.profiling.enabled:
+            return None
+        if self._sampling_profiler is None:
+            from ols.src.diagnostics.sampling_profiler import (  # pylint: disable=import-outside-toplevel
+                SamplingProfiler,
+            )
+
+            self._sampling_profiler = SamplingProfiler(self._ols_config.profiling)
+        return self._sampling_profiler
+
+    @property
+    def memory_profiler(self) -> Optional["MemoryProfiler"]:
+        """Return the on-demand memory profiler, None when profiling is disabled."""
+        if not self._ols_config.profiling.enabled:
+            return None
+        if self._memory_profiler is None:
+            from ols.src.diagnostics.memory_profiler import (  # pylint: disable=import-outside-toplevel
+                MemoryProfiler,
+            )
+
+            self._memory_profiler = MemoryProfiler(self._ols_config.profiling)
+        return self._memory_profiler
+
+    @property
+    def quota_service(self) -> Optional["QuotaService"]:
+        """Return the quota service, None when quota storage is not configured."""
+        quota_handlers = self._ols_config.quota_handlers
+        if quota_handlers is None or quota_handlers.storage is None:
+            return None
+        if self._quota_service is None:
+            from ols.src.quota.quota_service import (  # pylint: disable=import-outside-toplevel
+                QuotaService,
+            )
+
+            self._quota_service = QuotaService(
+                quota_handlers, self._app_config.token_usage_history
+            )
+        return self._quota_service
+
+    def stop(self) -> None:
+        """Stop background work of the created services."""
+        if self._history_compressor is not None:
+            self._history_compressor.stop()
+        if self._quota_service is not None:
+            self._quota_service.stop()
+        if self._mcp_circuit_breakers is not None:
+            self._mcp_circuit_breakers.stop()
 
 
 class AppConfig:
@@ -47,6 +255,7 @@ class AppConfig:
         """Initialize the class instance."""
         self.config = config_model.Config()
         self._query_filters: Optional[Redactor] = None
+        self.services = Services(self)
         self._rag_index_loader: Optional[IndexLoader] = None
         self._conversation_cache: Optional[Cache] = None
         self._quota_limiters: Optional[list[QuotaLimiter]] = None
@@ -154,6 +363,11 @@ class AppConfig:
     def rag_index_loader(self) -> IndexLoader:
         """Return the RAG index loader."""
         if self._rag_index_loader is None:
+            # pylint: disable-next=import-outside-toplevel
+            from ols.src.rag_index.index_loader import (  # type: ignore [attr-defined]
+                IndexLoader,
+            )
+
             self._rag_index_loader = IndexLoader(self.ols_config.reference_content)
         return self._rag_index_loader
 
@@ -211,6 +425,10 @@ class AppConfig:
                     "tool filtering disabled"
                 )
                 return None
+            from ols.src.tools.tools_rag.hybrid_tools_rag import (  # pylint: disable=import-outside-toplevel
+                ToolsRAG,
+            )
+
             return ToolsRAG(
                 encode_fn=embed_model.get_text_embedding,
                 alpha=tool_config.alpha,
@@ -229,6 +447,10 @@ class AppConfig:
         skills_config = self.config.ols_config.skills
         if skills_config is None:
             return None
+        from ols.src.skills.skills_rag import (  # pylint: disable=import-outside-toplevel
+            SkillsRAG,
+            load_skills_from_directory,
+        )
 
         skills_dir = Path(skills_config.skills_dir)
         if not skills_dir.is_dir():
@@ -294,6 +516,8 @@ class AppConfig:
             # values
             self._query_filters = None
             self._rag_index_loader = None
+            self.services.stop()
+            self.services = Services(self)
             self._tools_approval = None
             self._pending_approval_store = None
             # Clear cached_property if it exists
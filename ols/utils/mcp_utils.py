@@ -1,10 +1,11 @@
 """Utilities for parsing and validating MCP client headers."""
 
+import contextlib
 import functools
 import logging
 import os
 import ssl
-from typing import Optional, TypeAlias, TypedDict
+from typing import Any, Optional, TypeAlias, TypedDict
 
 import httpx
 from langchain_core.tools.structured import StructuredTool
@@ -13,6 +14,8 @@ from langchain_mcp_adapters.sessions import McpHttpClientFactory
 
 from ols import config, constants
 from ols.app.models.config import MCPServerConfig, MCPServers
+from ols.utils.stage_timer import Stage, timed_stage
+from ols.utils.tracing import inject_trace_context, is_tracing_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -182,7 +185,8 @@ async def gather_mcp_tools(
     """Gather tools from multiple MCP servers with failure isolation.
 
     Load tools from each MCP server individually so that if one server
-    is unreachable, tools from other servers are still available.
+    is unreachable, tools from other servers are still available. Servers
+    with open circuit breaker are skipped without being contacted.
 
     Args:
         mcp_servers: Dictionary mapping server names to their configurations.
@@ -195,10 +199,21 @@ async def gather_mcp_tools(
     """
     all_tools: list[StructuredTool] = []
     mcp_client = MultiServerMCPClient(mcp_servers)
+    breakers = config.services.mcp_circuit_breakers
 
     for server_name in mcp_servers:
+        if breakers is not None and not breakers.allow(server_name):
+            logger.warning(
+                "Skipping MCP server '%s', its circuit breaker is open", server_name
+            )
+            continue
         try:
-            server_tools = await mcp_client.get_tools(server_name=server_name)
+            with (
+                breakers.track(server_name)
+                if breakers is not None
+                else contextlib.nullcontext()
+            ):
+                server_tools = await mcp_client.get_tools(server_name=server_name)
 
             # Filter immediately if we have an allowlist
             if allowed_tool_names:
@@ -332,6 +347,7 @@ async def _populate_tools_rag(
                 )
 
 
+@timed_stage(Stage.MCP_DISCOVERY)
 async def get_mcp_tools(
     query: str,
     user_token: Optional[str] = None,
@@ -432,6 +448,47 @@ async def get_mcp_tools(
     return []
 
 
+async def _propagate_trace_context(request: httpx.Request) -> None:
+    """Add trace context of the current span to request sent to MCP server."""
+    inject_trace_context(request.headers)
+
+
+def mcp_ssl_context() -> ssl.SSLContext | None:
+    """Return SSL context verifying MCP servers against the custom CA bundle.
+
+    Returns:
+        SSL context, or None when there is no custom CA bundle and the
+        default verification applies.
+    """
+    if not config.ols_config.certificate_directory:
+        return None
+    ca_bundle = os.path.join(
+        config.ols_config.certificate_directory,
+        constants.CERTIFICATE_STORAGE_FILENAME,
+    )
+    if not os.path.isfile(ca_bundle):
+        return None
+    logger.debug("MCP connections will use custom CA bundle: %s", ca_bundle)
+    return ssl.create_default_context(cafile=ca_bundle)
+
+
+def _http_client_factory() -> McpHttpClientFactory | None:
+    """Return factory of HTTP clients for MCP servers, None to use the default one.
+
+    A custom factory is needed when MCP servers are verified against the
+    custom CA bundle, or when trace context is propagated to MCP servers.
+    """
+    client_kwargs: dict[str, Any] = {}
+    ssl_context = mcp_ssl_context()
+    if ssl_context is not None:
+        client_kwargs["verify"] = ssl_context
+    if is_tracing_enabled():
+        client_kwargs["event_hooks"] = {"request": [_propagate_trace_context]}
+    if not client_kwargs:
+        return None
+    return functools.partial(httpx.AsyncClient, **client_kwargs)
+
+
 def build_mcp_config(
     servers_list: list[MCPServerConfig],
     user_token: Optional[str],
@@ -456,16 +513,7 @@ def build_mcp_config(
 
     servers_config: MCPServersDict = {}
 
-    httpx_factory: McpHttpClientFactory | None = None
-    if config.ols_config.certificate_directory:
-        ca_bundle = os.path.join(
-            config.ols_config.certificate_directory,
-            constants.CERTIFICATE_STORAGE_FILENAME,
-        )
-        if os.path.isfile(ca_bundle):
-            ssl_context = ssl.create_default_context(cafile=ca_bundle)
-            httpx_factory = functools.partial(httpx.AsyncClient, verify=ssl_context)
-            logger.debug("MCP connections will use custom CA bundle: %s", ca_bundle)
+    httpx_factory = _http_client_factory()
 
     try:
         for server in servers_list:
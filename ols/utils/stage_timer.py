@@ -0,0 +1,109 @@
+"""Timing of query processing stages exported as Prometheus histograms.
+
+Stage durations are labelled by provider and query mode. The labels are
+kept in a context variable, so they are set once per request and picked
+up by all stages timed within the request, including the ones in helper
+modules that do not know about provider or mode.
+"""
+
+import functools
+import time
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import Any, ParamSpec, TypeVar
+
+from prometheus_client import Histogram
+
+from ols import config
+from ols.utils.tracing import start_span
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# defined here rather than in the metrics module, which depends on the
+# authentication modules timed by this one; re-exported by the metrics module
+stage_duration_seconds = Histogram(
+    "ols_stage_duration_seconds",
+    "Durations of query processing stages",
+    ["stage", "provider", "mode"],
+)
+
+
+class Stage(StrEnum):
+    """Query processing stages."""
+
+    AUTH = "auth"
+    REQUEST_PROCESSING = "request_processing"
+    RAG_RETRIEVAL = "rag_retrieval"
+    HISTORY_RETRIEVAL = "history_retrieval"
+    HISTORY_COMPRESSION = "history_compression"
+    MCP_DISCOVERY = "mcp_discovery"
+    LLM_ROUND = "llm_round"
+    TOOL_EXECUTION = "tool_execution"
+    PERSISTENCE = "persistence"
+
+
+# stages that run before the request is parsed are recorded with empty labels
+_stage_labels: ContextVar[tuple[str, str]] = ContextVar(
+    "stage_labels", default=("", "")
+)
+
+
+def set_stage_labels(provider: str, mode: str) -> None:
+    """Set provider and mode labels for stages timed in the current context."""
+    _stage_labels.set((provider, str(mode)))
+
+
+def observe_stage(stage: Stage, duration: float) -> None:
+    """Record duration of a stage measured by the caller.
+
+    Args:
+        stage: Name of the stage.
+        duration: Duration of the stage in seconds.
+    """
+    if not config.ols_config.stage_metrics_enabled:
+        return
+    provider, mode = _stage_labels.get()
+    stage_duration_seconds.labels(
+        stage=stage.value, provider=provider, mode=mode
+    ).observe(duration)
+
+
+@contextmanager
+def stage_timer(stage: Stage) -> Iterator[None]:
+    """Measure duration of the enclosed block as the given stage.
+
+    The duration is recorded also when the block raises an exception. The
+    block is recorded as a span named after the stage when tracing is enabled.
+    """
+    with start_span(stage.value):
+        if not config.ols_config.stage_metrics_enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            observe_stage(stage, time.perf_counter() - start)
+
+
+def timed_stage(
+    stage: Stage,
+) -> Callable[
+    [Callable[P, Coroutine[Any, Any, T]]], Callable[P, Coroutine[Any, Any, T]]
+]:
+    """Measure duration of the decorated coroutine function as the given stage."""
+
+    def decorator(
+        func: Callable[P, Coroutine[Any, Any, T]],
+    ) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with stage_timer(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
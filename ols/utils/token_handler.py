@@ -3,9 +3,9 @@
 import logging
 from enum import Enum
 from math import ceil
+from typing import TYPE_CHECKING
 
 from langchain_core.messages import BaseMessage
-from llama_index.core.schema import NodeWithScore
 from tiktoken import get_encoding
 
 from ols.app.models.models import RagChunk
@@ -16,6 +16,10 @@ from ols.constants import (
     TOKEN_BUFFER_WEIGHT,
 )
 
+# llama_index is imported only when RAG is configured
+if TYPE_CHECKING:
+    from llama_index.core.schema import NodeWithScore
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,7 +90,7 @@ class TokenHandler:
         return ceil(len(tokens) * TOKEN_BUFFER_WEIGHT)
 
     def truncate_rag_context(
-        self, retrieved_nodes: list[NodeWithScore], max_tokens: int = 500
+        self, retrieved_nodes: list["NodeWithScore"], max_tokens: int = 500
     ) -> list[RagChunk]:
         """Process retrieved node text and truncate if required.
 
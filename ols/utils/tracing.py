@@ -0,0 +1,135 @@
+"""Optional OpenTelemetry tracing of query processing.
+
+Tracing is enabled by the `tracing` section of `ols_config`. The
+OpenTelemetry SDK is imported only when tracing is configured, so it is not
+a required dependency. When tracing is disabled, or the SDK is not
+installed, all helpers in this module are no-ops.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from ols import constants
+from ols.app.models.config import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+AttributeValue = str | bool | int | float
+
+# tracer and context propagation function, both set by setup_tracing, so
+# they are module state rather than constants
+# pylint: disable=invalid-name
+_tracer: Any = None
+_inject: Optional[Callable[[MutableMapping[str, str]], None]] = None
+# pylint: enable=invalid-name
+
+
+def setup_tracing(tracing_config: Optional[TracingConfig]) -> None:
+    """Configure tracer provider and span exporter.
+
+    Args:
+        tracing_config: Tracing configuration, tracing stays disabled when
+            it is not set.
+    """
+    global _tracer, _inject  # pylint: disable=global-statement
+
+    if tracing_config is None:
+        return
+    try:
+        # pylint: disable=import-outside-toplevel
+        from opentelemetry import propagate, trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+        from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    except ImportError:
+        logger.warning(
+            "Tracing is configured, but OpenTelemetry SDK is not installed; "
+            "tracing is disabled"
+        )
+        return
+
+    if tracing_config.exporter == constants.TRACING_EXPORTER_FILE:
+        exporter = ConsoleSpanExporter(
+            service_name=tracing_config.service_name,
+            out=open(  # pylint: disable=consider-using-with
+                tracing_config.file_path, "a", encoding="utf-8"  # type: ignore [arg-type]
+            ),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    else:
+        try:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "OTLP tracing exporter is configured, but "
+                "opentelemetry-exporter-otlp-proto-http is not installed; "
+                "tracing is disabled"
+            )
+            return
+        exporter = OTLPSpanExporter(endpoint=tracing_config.otlp_endpoint)
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": tracing_config.service_name}),
+        sampler=ParentBasedTraceIdRatio(tracing_config.sample_ratio),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+    _inject = propagate.inject
+    logger.info("Tracing enabled, spans are exported by %s", tracing_config.exporter)
+
+
+def is_tracing_enabled() -> bool:
+    """Return True when spans are recorded."""
+    return _tracer is not None
+
+
+@contextmanager
+def start_span(
+    name: str, attributes: Optional[Mapping[str, AttributeValue]] = None
+) -> Iterator[None]:
+    """Record the enclosed block as a span, which becomes the current span.
+
+    Exceptions raised in the block are recorded in the span.
+    """
+    if _tracer is None:
+        yield
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+def set_span_attributes(attributes: Mapping[str, AttributeValue]) -> None:
+    """Set attributes of the current span."""
+    if _tracer is None:
+        return
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry import trace
+
+    trace.get_current_span().set_attributes(attributes)
+
+
+def add_span_event(name: str, attributes: Mapping[str, AttributeValue]) -> None:
+    """Add event with attributes to the current span."""
+    if _tracer is None:
+        return
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry import trace
+
+    trace.get_current_span().add_event(name, attributes)
+
+
+def inject_trace_context(headers: MutableMapping[str, str]) -> None:
+    """Add headers propagating the current trace context to outgoing request."""
+    if _inject is not None:
+        _inject(headers)
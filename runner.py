@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 import threading
+import tracemalloc
 from pathlib import Path
 
 from ols.constants import (
@@ -58,6 +59,12 @@ if __name__ == "__main__":
     logger.info("Running on Python version %s", sys.version)
     configure_hugging_face_envs(config.ols_config)
 
+    if config.ols_config.profiling.trace_memory_at_startup:
+        # memory can be attributed only to allocations traced since they
+        # were made, so the index and embedding model need tracing from start
+        tracemalloc.start(config.ols_config.profiling.tracemalloc_frames)
+        logger.info("Tracing memory allocations since startup")
+
     # generate certificates file from all certificates from certifi package
     # merged with explicitly specified certificates
     generate_certificates_file(logger, config.ols_config)
@@ -74,6 +81,11 @@ if __name__ == "__main__":
     # init loading of query redactor
     config.query_redactor  # pylint: disable=W0104
 
+    # import SDKs of the configured LLM providers only
+    from ols.src.llms.llm_loader import import_configured_providers
+
+    import_configured_providers(config.llm_config)
+
     if config.dev_config.pyroscope_url:
         start_with_pyroscope_enabled(config, logger)
     else:
@@ -0,0 +1,268 @@
+"""Utility script for converting a flat FAISS vector store to an ANN index.
+
+The flat (exact) FAISS index persisted by llama_index is rebuilt as HNSW or
+IVF-PQ index. Vector positions are preserved, so the docstore/index store of
+the original vector store stay valid and are copied unchanged. Query-time
+search parameters are stored next to the index and applied by IndexLoader.
+
+Optionally recall@k and query latency of the new index are compared with the
+flat index, using the same question set as `query_rag.py`.
+
+Usage:
+    python -m scripts.evaluation.ann_index -p ./vector_db/ocp_product_docs/4.15 \
+        -d ./vector_db/ocp_product_docs/4.15-hnsw -t hnsw --benchmark
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import time
+
+import faiss
+import numpy as np
+
+from ols.constants import FAISS_SEARCH_PARAMS_FILENAME
+
+# llama_index stores the default FAISS vector store under this file name
+VECTOR_STORE_FILENAME = "default__vector_store.json"
+
+INDEX_TYPE_HNSW = "hnsw"
+INDEX_TYPE_IVFPQ = "ivfpq"
+
+
+def load_flat_index(db_path: str) -> faiss.Index:
+    """Load the persisted flat FAISS index."""
+    index = faiss.read_index(os.path.join(db_path, VECTOR_STORE_FILENAME))
+    if not isinstance(index, faiss.IndexFlat):
+        raise ValueError(
+            f"Expected flat FAISS index in {db_path}, got {type(index).__name__}"
+        )
+    return index
+
+
+def build_ann_index(
+    flat_index: faiss.IndexFlat, index_type: str, args: argparse.Namespace
+) -> tuple[faiss.Index, dict[str, int]]:
+    """Build an ANN index holding the same vectors as the flat index.
+
+    Returns:
+        Tuple of the new index and its query-time search parameters.
+    """
+    vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+    dimension = flat_index.d
+    metric = flat_index.metric_type
+
+    match index_type:
+        case "hnsw":
+            index = faiss.index_factory(dimension, f"HNSW{args.hnsw_m},Flat", metric)
+            index.hnsw.efConstruction = args.ef_construction
+            search_params = {"efSearch": args.ef_search}
+        case "ivfpq":
+            if dimension % args.pq_m != 0:
+                raise ValueError(
+                    f"PQ sub-quantizers ({args.pq_m}) must divide dimension ({dimension})"
+                )
+            nlist = args.nlist or max(1, int(4 * np.sqrt(flat_index.ntotal)))
+            index = faiss.index_factory(
+                dimension, f"IVF{nlist},PQ{args.pq_m}x{args.pq_bits}", metric
+            )
+            index.train(vectors)
+            search_params = {"nprobe": min(args.nprobe, nlist)}
+        case _:
+            raise ValueError(f"Unknown index type {index_type}")
+
+    # sequential add keeps vector positions (= llama_index node ids) unchanged
+    index.add(vectors)
+    parameter_space = faiss.ParameterSpace()
+    for name, value in search_params.items():
+        parameter_space.set_index_parameter(index, name, value)
+    return index, search_params
+
+
+def persist_ann_index(
+    db_path: str, output_path: str, index: faiss.Index, search_params: dict
+) -> None:
+    """Store the ANN index together with unchanged docstore and index store."""
+    os.makedirs(output_path, exist_ok=True)
+    for file_name in os.listdir(db_path):
+        source = os.path.join(db_path, file_name)
+        if file_name != VECTOR_STORE_FILENAME and os.path.isfile(source):
+            shutil.copy2(source, os.path.join(output_path, file_name))
+    faiss.write_index(index, os.path.join(output_path, VECTOR_STORE_FILENAME))
+    with open(
+        os.path.join(output_path, FAISS_SEARCH_PARAMS_FILENAME), "w", encoding="utf-8"
+    ) as f:
+        json.dump(search_params, f)
+
+
+def recall_at_k(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Compute recall of ANN results against exact results for one query."""
+    expected_ids = {i for i in expected if i >= 0}
+    if not expected_ids:
+        return 1.0
+    return len(expected_ids.intersection(actual)) / len(expected_ids)
+
+
+def search_latencies(
+    index: faiss.Index, queries: np.ndarray, k: int
+) -> tuple[np.ndarray, list[float]]:
+    """Search queries one by one (as the service does) and time each search."""
+    results = []
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        _, ids = index.search(query[np.newaxis, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(ids[0])
+    return np.array(results), latencies
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """Summarize per-query latencies in milliseconds."""
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": ordered[int(0.50 * (len(ordered) - 1))],
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+    }
+
+
+def benchmark(
+    flat_index: faiss.Index,
+    ann_index: faiss.Index,
+    queries: np.ndarray,
+    top_k_values: list[int],
+) -> list[dict]:
+    """Compare recall@k and latency of ANN index against the flat index."""
+    report = []
+    for k in top_k_values:
+        # warm up both indexes before timing
+        flat_index.search(queries[:1], k)
+        ann_index.search(queries[:1], k)
+        expected, flat_latencies = search_latencies(flat_index, queries, k)
+        actual, ann_latencies = search_latencies(ann_index, queries, k)
+        recalls = [recall_at_k(e, a) for e, a in zip(expected, actual)]
+        report.append(
+            {
+                "k": k,
+                "queries": len(queries),
+                "recall": statistics.fmean(recalls),
+                "min_recall": min(recalls),
+                "flat": latency_summary(flat_latencies),
+                "ann": latency_summary(ann_latencies),
+            }
+        )
+    return report
+
+
+def embed_queries(model_path: str, queries: list[str]) -> np.ndarray:
+    """Embed queries with the same model that was used for the index."""
+    # pylint: disable=import-outside-toplevel
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    os.environ["TRANSFORMERS_CACHE"] = model_path
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    embed_model = HuggingFaceEmbedding(model_name=model_path)
+    return np.array(
+        [embed_model.get_query_embedding(q) for q in queries], dtype="float32"
+    )
+
+
+def _args_parser() -> argparse.Namespace:
+    """Arguments parser."""
+    # pylint: disable=import-outside-toplevel
+    from scripts.evaluation.query_rag import QNA_QUERIES
+
+    parser = argparse.ArgumentParser(
+        description="Convert flat FAISS vector store to HNSW/IVF-PQ index"
+    )
+    parser.add_argument(
+        "-p",
+        "--db-path",
+        help="path to the flat vector db",
+        default="./vector_db/ocp_product_docs/4.15",
+    )
+    parser.add_argument(
+        "-d", "--output-path", required=True, help="path for the converted vector db"
+    )
+    parser.add_argument(
+        "-t",
+        "--index-type",
+        choices=[INDEX_TYPE_HNSW, INDEX_TYPE_IVFPQ],
+        default=INDEX_TYPE_HNSW,
+        help="type of the ANN index",
+    )
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW graph degree")
+    parser.add_argument(
+        "--ef-construction", type=int, default=200, help="HNSW efConstruction"
+    )
+    parser.add_argument("--ef-search", type=int, default=64, help="HNSW efSearch")
+    parser.add_argument(
+        "--nlist",
+        type=int,
+        default=None,
+        help="IVF lists, 4*sqrt(number of vectors) by default",
+    )
+    parser.add_argument("--nprobe", type=int, default=16, help="IVF nprobe")
+    parser.add_argument("--pq-m", type=int, default=16, help="PQ sub-quantizers")
+    parser.add_argument("--pq-bits", type=int, default=8, help="PQ bits per code")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="compare recall@k and latency with the flat index",
+    )
+    parser.add_argument(
+        "-m",
+        "--model-path",
+        help="path to the embedding model (needed for benchmark)",
+        default="./embeddings_model/all-mpnet-base-v2",
+    )
+    parser.add_argument(
+        "-q", "--queries", nargs="+", default=QNA_QUERIES, help="queries to run"
+    )
+    parser.add_argument(
+        "-k",
+        "--top-k",
+        type=int,
+        nargs="+",
+        default=[5, 10],
+        help="similarity_top_k values to benchmark",
+    )
+    parser.add_argument(
+        "-o",
+        "--output_dir",
+        type=str,
+        help="Directory, where the benchmark result will stored as json file",
+        default=None,
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _args_parser()
+
+    flat = load_flat_index(args.db_path)
+    print(f"Loaded flat index with {flat.ntotal} vectors of dimension {flat.d}")
+    ann, params = build_ann_index(flat, args.index_type, args)
+    persist_ann_index(args.db_path, args.output_path, ann, params)
+    print(f"Stored {args.index_type} index to {args.output_path}, params {params}")
+
+    if args.benchmark:
+        query_vectors = embed_queries(args.model_path, args.queries)
+        result = {
+            "index_type": args.index_type,
+            "search_params": params,
+            "results": benchmark(flat, ann, query_vectors, args.top_k),
+        }
+        print(json.dumps(result, indent=2))
+
+        result_dir = os.path.join(
+            (args.output_dir or os.path.dirname(__file__)), "eval_result"
+        )
+        os.makedirs(result_dir, exist_ok=True)
+        with open(
+            os.path.join(result_dir, "ann_benchmark.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(result, f, indent=2)
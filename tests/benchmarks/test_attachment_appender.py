@@ -3,11 +3,13 @@
 # pylint: disable=W0621
 
 import pytest
+import yaml
 
 from ols.app.models.models import Attachment
 from ols.src.query_helpers.attachment_appender import (
     append_attachments_to_query,
     format_attachment,
+    retrieve_resources_from_yaml,
 )
 
 
@@ -53,6 +55,63 @@ numbers:
 """ + numbers
 
 
+def resource_yaml(index: int, containers: int) -> str:
+    """Generate YAML of deployment with managed fields and status."""
+    resource = {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": f"deployment-{index}",
+            "namespace": "default",
+            "managedFields": [
+                {
+                    "manager": "kube-controller-manager",
+                    "operation": "Update",
+                    "fieldsV1": {f"f:container-{i}": {} for i in range(containers)},
+                }
+            ],
+        },
+        "spec": {
+            "template": {
+                "spec": {
+                    "containers": [
+                        {
+                            "name": f"container-{i}",
+                            "image": f"registry.example.com/app-{i}:1.0",
+                            "env": [
+                                {"name": f"VAR_{j}", "value": str(j)} for j in range(10)
+                            ],
+                        }
+                        for i in range(containers)
+                    ]
+                }
+            }
+        },
+        "status": {
+            "conditions": [
+                {
+                    "type": "Available",
+                    "status": "True",
+                    "reason": "MinimumReplicasAvailable",
+                }
+            ]
+        },
+    }
+    return yaml.safe_dump(resource, sort_keys=False)
+
+
+@pytest.fixture(scope="module")
+def huge_yaml_content():
+    """YAML of one resource of several megabytes."""
+    return resource_yaml(0, containers=5000)
+
+
+@pytest.fixture(scope="module")
+def multi_document_yaml_content():
+    """YAML stream of many resources."""
+    return "---\n".join(resource_yaml(i, containers=2) for i in range(500))
+
+
 def test_format_attachment_empty_text_plain_format(benchmark):
     """Benchmark the function to format one attachment that is empty."""
     attachment = Attachment(
@@ -156,3 +215,42 @@ def test_append_attachments_to_query_long_query(benchmark, long_query):
         attachment_type="log", content_type="text/plain", content=content
     )
     benchmark(append_attachments_to_query, long_query, [attachment])
+
+
+def test_format_huge_attachment_yaml(huge_yaml_content, benchmark):
+    """Benchmark the function to format YAML attachment of several megabytes."""
+    attachment = Attachment(
+        attachment_type="api object",
+        content_type="application/yaml",
+        content=huge_yaml_content,
+    )
+    benchmark(format_attachment, attachment)
+
+
+def test_retrieve_resources_from_huge_yaml(huge_yaml_content, benchmark):
+    """Benchmark retrieving kind and name from YAML of several megabytes."""
+    benchmark.extra_info["size_bytes"] = len(huge_yaml_content)
+    resources = benchmark(retrieve_resources_from_yaml, huge_yaml_content)
+    assert resources == [("Deployment", "deployment-0")]
+
+
+def test_retrieve_resources_from_multi_document_yaml(
+    multi_document_yaml_content, benchmark
+):
+    """Benchmark retrieving kinds and names from YAML stream of many resources."""
+    benchmark.extra_info["size_bytes"] = len(multi_document_yaml_content)
+    resources = benchmark(retrieve_resources_from_yaml, multi_document_yaml_content)
+    assert len(resources) == 500
+
+
+@pytest.mark.parametrize("loader", ["SafeLoader", "CSafeLoader"])
+def test_full_parse_of_multi_document_yaml(
+    multi_document_yaml_content, benchmark, loader
+):
+    """Benchmark full parsing of YAML stream, for comparison with retrieval."""
+    benchmark.pedantic(
+        lambda: list(
+            yaml.load_all(multi_document_yaml_content, Loader=getattr(yaml, loader))
+        ),
+        rounds=3,
+    )
@@ -0,0 +1,357 @@
+"""Benchmarks for conversation cache backends.
+
+Every benchmark runs against the in-memory cache and against the Postgres
+cache. Postgres benchmarks run against a throwaway server spawned locally
+with `initdb` and `pg_ctl`; they are skipped when the server binaries are
+not available.
+
+Conversation lengths follow a long tailed distribution: most conversations
+have a few turns and a few have close to a hundred.
+"""
+
+# pylint: disable=W0621
+
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess  # nosec
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from psycopg2.extras import execute_values
+
+from ols.app.models.config import InMemoryCacheConfig, PostgresConfig
+from ols.app.models.models import CacheEntry, MessageEncoder
+from ols.src.cache.cache import Cache
+from ols.src.cache.in_memory_cache import InMemoryCache
+from ols.src.cache.postgres_cache import PostgresCache
+from ols.src.query_helpers import history_support
+from ols.utils import suid
+
+CONVERSATION_LENGTHS = [1, 10, 50, 200]
+TOTAL_ENTRIES = [1_000, 10_000, 50_000]
+CONCURRENCY = [1, 8, 32]
+BACKGROUND_ENTRIES = 10_000
+MAX_CONVERSATION_LENGTH = 100
+USERS = 100
+REQUESTS_PER_ROUND = 64
+ROUNDS = 20
+# effectively unlimited capacity for benchmarks which should not evict
+NO_EVICTION = 10_000_000
+
+Conversation = tuple[str, str, int]
+
+
+def cache_entry(rng: random.Random, index: int) -> CacheEntry:
+    """Create cache entry of a typical size, some with tool calls."""
+    query = f"Question {index}: " + "how do I scale my deployment " * rng.randint(1, 5)
+    response = "You can scale the deployment with oc scale. " * rng.randint(5, 40)
+    tool_calls = []
+    tool_results = []
+    if rng.random() < 0.3:
+        tool_calls = [
+            {"name": "get_resources", "args": {"kind": "Deployment"}, "id": str(index)}
+        ]
+        tool_results = [
+            {"id": str(index), "status": "success", "content": "nginx 3/3 " * 50}
+        ]
+    return CacheEntry(
+        query=HumanMessage(query),
+        response=AIMessage(response),
+        tool_calls=tool_calls,
+        tool_results=tool_results,
+    )
+
+
+def conversation_length(rng: random.Random) -> int:
+    """Draw conversation length with median of about three turns."""
+    return min(MAX_CONVERSATION_LENGTH, int(rng.lognormvariate(1.0, 1.0)) + 1)
+
+
+def free_port() -> int:
+    """Return TCP port nobody listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def postgres_binary(name: str) -> str | None:
+    """Find Postgres server binary on PATH or in the pg_config bin directory."""
+    if path := shutil.which(name):
+        return path
+    if pg_config := shutil.which("pg_config"):
+        bindir = subprocess.run(  # noqa: S603 # nosec
+            [pg_config, "--bindir"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        if (candidate := Path(bindir) / name).exists():
+            return str(candidate)
+    return None
+
+
+@pytest.fixture(scope="session")
+def postgres_server(tmp_path_factory) -> Iterator[PostgresConfig]:
+    """Spawn a Postgres server for the benchmark session."""
+    initdb, pg_ctl = postgres_binary("initdb"), postgres_binary("pg_ctl")
+    if initdb is None or pg_ctl is None:
+        pytest.skip("Postgres server binaries (initdb, pg_ctl) not found")
+    if os.geteuid() == 0:
+        pytest.skip("Postgres server refuses to run as root")
+
+    data_dir = tmp_path_factory.mktemp("postgres")
+    port = free_port()
+    subprocess.run(  # noqa: S603 # nosec
+        [initdb, "-D", str(data_dir), "-U", "postgres", "--auth=trust"],
+        capture_output=True,
+        check=True,
+    )
+    options = f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 -F"
+    log = str(data_dir / "log")
+    subprocess.run(  # noqa: S603 # nosec
+        [pg_ctl, "-D", str(data_dir), "-o", options, "-l", log, "-w", "start"],
+        capture_output=True,
+        check=True,
+    )
+    try:
+        yield PostgresConfig(
+            host="127.0.0.1",
+            port=port,
+            user="postgres",
+            dbname="postgres",
+            ssl_mode="disable",
+            gss_encmode="disable",
+        )
+    finally:
+        subprocess.run(  # noqa: S603 # nosec
+            [pg_ctl, "-D", str(data_dir), "-m", "fast", "stop"],
+            capture_output=True,
+            check=False,
+        )
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def make_cache(request) -> Iterator[Callable[[int], Cache]]:
+    """Return factory of empty caches of the given capacity."""
+    if request.param == "memory":
+
+        def make_in_memory_cache(capacity: int) -> Cache:
+            InMemoryCache._instance = None
+            return InMemoryCache(InMemoryCacheConfig({"max_entries": capacity}))
+
+        yield make_in_memory_cache
+        InMemoryCache._instance = None
+        return
+
+    server = request.getfixturevalue("postgres_server")
+    caches = []
+
+    def make_postgres_cache(capacity: int) -> Cache:
+        cache = PostgresCache(server.model_copy(update={"max_entries": capacity}))
+        with cache.connection.cursor() as cursor:
+            cursor.execute("TRUNCATE cache, conversations")
+        caches.append(cache)
+        return cache
+
+    yield make_postgres_cache
+    for cache in caches:
+        cache.connection.close()
+
+
+def fill(
+    cache: Cache, entries: list[CacheEntry], conversations: list[Conversation]
+) -> None:
+    """Store conversations, entries of each are taken from the given list."""
+    if isinstance(cache, PostgresCache):
+        values = [
+            (
+                user_id,
+                conversation_id,
+                json.dumps(
+                    [entry.to_dict() for entry in entries[:length]], cls=MessageEncoder
+                ).encode("utf-8"),
+            )
+            for user_id, conversation_id, length in conversations
+        ]
+        with cache.connection.cursor() as cursor:
+            execute_values(
+                cursor,
+                "INSERT INTO cache(user_id, conversation_id, value, updated_at) "
+                "VALUES %s",
+                values,
+                template="(%s, %s, %s, clock_timestamp())",
+            )
+            execute_values(
+                cursor,
+                "INSERT INTO conversations(user_id, conversation_id, "
+                "last_message_timestamp, message_count) VALUES %s",
+                [
+                    (user_id, conversation_id, length)
+                    for user_id, conversation_id, length in conversations
+                ],
+                template="(%s, %s, clock_timestamp(), %s)",
+            )
+        return
+    for user_id, conversation_id, length in conversations:
+        for entry in entries[:length]:
+            cache.insert_or_append(user_id, conversation_id, entry)
+
+
+def background(users: list[str], total_entries: int, seed: int) -> list[Conversation]:
+    """Generate conversations of the given users with the given number of entries."""
+    rng = random.Random(seed)  # noqa: S311 # nosec: B311
+    conversations = []
+    remaining = total_entries
+    while remaining > 0:
+        length = min(remaining, conversation_length(rng))
+        conversations.append((rng.choice(users), suid.get_suid(), length))
+        remaining -= length
+    return conversations
+
+
+@pytest.fixture(scope="module")
+def users() -> list[str]:
+    """Return IDs of users owning the conversations."""
+    return [suid.get_suid() for _ in range(USERS)]
+
+
+@pytest.fixture(scope="module")
+def entries() -> list[CacheEntry]:
+    """Return entries of the longest conversation."""
+    rng = random.Random(0)  # noqa: S311 # nosec: B311
+    return [cache_entry(rng, index) for index in range(max(CONVERSATION_LENGTHS) + 1)]
+
+
+@pytest.mark.parametrize("length", CONVERSATION_LENGTHS)
+def test_get(benchmark, make_cache, users, entries, length):
+    """Benchmark reading history of the least recently used conversation."""
+    cache = make_cache(NO_EVICTION)
+    conversation = (users[0], suid.get_suid(), length)
+    fill(cache, entries, [conversation, *background(users, BACKGROUND_ENTRIES, 1)])
+
+    history = benchmark(cache.get, conversation[0], conversation[1])
+    assert len(history) == length
+
+
+@pytest.mark.parametrize("length", CONVERSATION_LENGTHS)
+def test_insert_or_append(benchmark, make_cache, users, entries, length):
+    """Benchmark appending an entry to a conversation of the given length."""
+    cache = make_cache(NO_EVICTION)
+    user_id, conversation_id = users[0], suid.get_suid()
+    fill(cache, entries, [(user_id, conversation_id, length)])
+    fill(cache, entries, background(users, BACKGROUND_ENTRIES, 1))
+
+    benchmark.pedantic(
+        cache.insert_or_append,
+        args=(user_id, conversation_id, entries[-1]),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("total_entries", TOTAL_ENTRIES)
+def test_list(benchmark, make_cache, users, entries, total_entries):
+    """Benchmark listing conversations of one user."""
+    cache = make_cache(NO_EVICTION)
+    fill(cache, entries, background(users, total_entries, 1))
+
+    benchmark(cache.list, users[0])
+
+
+@pytest.mark.parametrize("length", CONVERSATION_LENGTHS)
+def test_delete(benchmark, make_cache, users, entries, length):
+    """Benchmark deleting a conversation of the given length."""
+    cache = make_cache(NO_EVICTION)
+    fill(cache, entries, background(users, BACKGROUND_ENTRIES, 1))
+
+    def setup():
+        conversation = (users[0], suid.get_suid(), length)
+        fill(cache, entries, [conversation])
+        return conversation[:2], {}
+
+    benchmark.pedantic(cache.delete, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.parametrize("length", CONVERSATION_LENGTHS)
+def test_history_rewrite(benchmark, make_cache, users, entries, length):
+    """Benchmark replacing history of a conversation compressed into a summary."""
+    cache = make_cache(NO_EVICTION)
+    fill(cache, entries, background(users, BACKGROUND_ENTRIES, 1))
+    summary = CacheEntry(
+        query=HumanMessage("Summarize the conversation"),
+        response=AIMessage("The user scaled a deployment. " * 20),
+    )
+    compressed = [
+        summary,
+        *entries[:length][-history_support.DEFAULT_ENTRIES_TO_KEEP :],
+    ]
+
+    def setup():
+        conversation = (users[0], suid.get_suid(), length)
+        fill(cache, entries, [conversation])
+        return (*conversation[:2], False, compressed, "benchmark"), {}
+
+    with patch.object(
+        history_support, "config", SimpleNamespace(conversation_cache=cache)
+    ):
+        rewritten = benchmark.pedantic(
+            history_support._rewrite_cache, setup=setup, rounds=ROUNDS
+        )
+    assert len(rewritten) == len(compressed)
+
+
+@pytest.mark.parametrize("total_entries", TOTAL_ENTRIES)
+def test_insert_at_capacity(benchmark, make_cache, users, entries, total_entries):
+    """Benchmark appending an entry when the oldest entry has to be evicted."""
+    cache = make_cache(total_entries)
+    conversations = background(users, total_entries, 1)
+    fill(cache, entries, conversations)
+    user_id, conversation_id, _ = conversations[-1]
+
+    benchmark.pedantic(
+        cache.insert_or_append,
+        args=(user_id, conversation_id, entries[0]),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("total_entries", TOTAL_ENTRIES)
+def test_postgres_cleanup(benchmark, postgres_server, users, entries, total_entries):
+    """Benchmark Postgres cache cleanup which evicts one entry when over capacity."""
+    cache = PostgresCache(postgres_server.model_copy(update={"max_entries": 1}))
+    try:
+        with cache.connection.cursor() as cursor:
+            cursor.execute("TRUNCATE cache, conversations")
+            fill(cache, entries, background(users, total_entries, 1))
+            benchmark.pedantic(
+                PostgresCache._cleanup,
+                args=(cursor, total_entries - ROUNDS - 1),
+                rounds=ROUNDS,
+            )
+    finally:
+        cache.connection.close()
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+def test_concurrent_requests(benchmark, make_cache, users, entries, concurrency):
+    """Benchmark concurrent requests, each reading and appending history."""
+    cache = make_cache(NO_EVICTION)
+    conversations = background(users, BACKGROUND_ENTRIES, 1)
+    fill(cache, entries, conversations)
+    rng = random.Random(2)  # noqa: S311 # nosec: B311
+    requested = [rng.choice(conversations) for _ in range(REQUESTS_PER_ROUND)]
+
+    def request(conversation: Conversation) -> None:
+        user_id, conversation_id, _ = conversation
+        cache.get(user_id, conversation_id)
+        cache.insert_or_append(user_id, conversation_id, entries[0])
+
+    benchmark.extra_info["requests_per_round"] = REQUESTS_PER_ROUND
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        benchmark.pedantic(
+            lambda: list(executor.map(request, requested)), rounds=ROUNDS // 4
+        )
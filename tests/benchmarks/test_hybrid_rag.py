@@ -0,0 +1,261 @@
+"""Benchmarks for hybrid tool and skill retrieval at catalogue scale.
+
+Catalogues are synthetic and embeddings come from a deterministic stub
+encoder, so the benchmarks run offline. Besides timing, the benchmarks
+record into `extra_info` of the results:
+
+- `retained_bytes` and `peak_bytes`: memory held by the index after
+  populating it and peak memory while populating it,
+- `top_k_agreement`: share of the exact hybrid top-k (dense similarity of
+  all documents fused with BM25 over the whole catalogue) returned by the
+  retrieval.
+"""
+
+# pylint: disable=W0621
+
+import functools
+import random
+import tracemalloc
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.tools.structured import StructuredTool
+from rank_bm25 import BM25Okapi
+
+from ols.src.rag.hybrid_rag import _tokenize
+from ols.src.skills.skills_rag import Skill, SkillsRAG
+from ols.src.tools.tools_rag.hybrid_tools_rag import ToolsRAG
+
+CATALOGUE_SIZES = [100, 1000, 5000, 20000]
+TOOLS_PER_SERVER = 50
+DIMENSION = 64
+ALPHA = 0.8
+TOP_K = 10
+QUERIES = 20
+# servers are always allowed plus the ones requested by the client
+DEFAULT_SERVERS = 2
+CLIENT_SERVERS = 3
+
+_SYLLABLES = [
+    "ku", "ber", "net", "pod", "no", "de", "log", "met", "ric", "rou", "te",
+    "ser", "vi", "ce", "con", "fig", "map", "sec", "ret", "vol", "ume", "dep",
+    "loy", "ga", "te", "way", "clu", "ster", "ope", "ra",
+]  # fmt: skip
+_VOCABULARY = sorted({a + b for a in _SYLLABLES for b in _SYLLABLES})
+
+
+def stub_encode(text: str) -> list[float]:
+    """Encode text by hashing its tokens into a normalized vector."""
+    vector = [0.0] * DIMENSION
+    for token in _tokenize(text):
+        digest = zlib.crc32(token.encode())
+        vector[digest % DIMENSION] += 1.0 if digest & 1 << 31 else -1.0
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+
+def _description(rng: random.Random) -> str:
+    """Generate description of a tool or skill."""
+    return " ".join(rng.choices(_VOCABULARY, k=rng.randint(8, 24)))
+
+
+@functools.cache
+def tool_catalogue(size: int) -> tuple[StructuredTool, ...]:
+    """Generate tools spread over servers of `TOOLS_PER_SERVER` tools."""
+    rng = random.Random(size)  # noqa: S311 # nosec: B311
+    schema = {
+        "type": "object",
+        "properties": {
+            "namespace": {"type": "string", "description": "Namespace"},
+            "name": {"type": "string", "description": "Name of the resource"},
+        },
+    }
+    return tuple(
+        StructuredTool(
+            name=f"{rng.choice(_VOCABULARY)}_{rng.choice(_VOCABULARY)}_{index}",
+            description=_description(rng),
+            args_schema=schema,
+            func=lambda **kwargs: "",
+            metadata={"mcp_server": f"server-{index // TOOLS_PER_SERVER}"},
+        )
+        for index in range(size)
+    )
+
+
+@functools.cache
+def skill_catalogue(size: int) -> tuple[Skill, ...]:
+    """Generate skills."""
+    rng = random.Random(size)  # noqa: S311 # nosec: B311
+    return tuple(
+        Skill(
+            name=f"{rng.choice(_VOCABULARY)}-{index}",
+            description=_description(rng),
+            source_path=f"/skills/{index}",
+        )
+        for index in range(size)
+    )
+
+
+def queries(documents: list[str], seed: int) -> list[str]:
+    """Generate queries paraphrasing parts of random documents."""
+    rng = random.Random(seed)  # noqa: S311 # nosec: B311
+    result = []
+    for document in rng.sample(documents, min(QUERIES, len(documents))):
+        words = document.split()
+        result.append(" ".join(rng.sample(words, max(1, len(words) // 3))))
+    return result
+
+
+def servers(size: int) -> tuple[list[str], list[str]]:
+    """Return default servers and servers requested by the client."""
+    names = [f"server-{index}" for index in range(-(-size // TOOLS_PER_SERVER))]
+    rng = random.Random(size)  # noqa: S311 # nosec: B311
+    chosen = rng.sample(names, min(len(names), DEFAULT_SERVERS + CLIENT_SERVERS))
+    return chosen[:DEFAULT_SERVERS], chosen[DEFAULT_SERVERS:]
+
+
+class ExactHybrid:
+    """Exact hybrid ranking over the whole catalogue, used as reference."""
+
+    def __init__(self, ids: list[str], documents: list[str]) -> None:
+        """Index all documents."""
+        self.ids = ids
+        self.vectors = np.array([stub_encode(document) for document in documents])
+        self.bm25 = BM25Okapi([_tokenize(document) for document in documents])
+
+    def top_k(self, query: str, k: int, allowed: set[int] | None = None) -> set[str]:
+        """Return IDs of the top k documents, optionally only allowed ones."""
+        dense = self.vectors @ np.array(stub_encode(query))
+        sparse = np.clip(self.bm25.get_scores(_tokenize(query)), 0, None)
+        sparse = sparse / (sparse.max() or 1.0)
+        fused = ALPHA * dense + (1 - ALPHA) * sparse
+        if allowed is not None:
+            mask = np.full(len(self.ids), -np.inf)
+            mask[list(allowed)] = 0
+            fused = fused + mask
+        return {self.ids[index] for index in np.argsort(-fused)[:k]}
+
+
+def measure_populate(populate, *args) -> dict[str, int]:
+    """Populate index while tracing memory, return retained and peak memory."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        index = populate(*args)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del index
+    return {"retained_bytes": after - before, "peak_bytes": peak - before}
+
+
+def populated_tools_rag(tools: tuple[StructuredTool, ...]) -> ToolsRAG:
+    """Create tools RAG and populate it."""
+    rag = ToolsRAG(encode_fn=stub_encode, alpha=ALPHA, top_k=TOP_K, threshold=0.0)
+    rag.populate_tools(list(tools))
+    return rag
+
+
+def populated_skills_rag(skills: tuple[Skill, ...]) -> SkillsRAG:
+    """Create skills RAG and populate it."""
+    rag = SkillsRAG(encode_fn=stub_encode, alpha=ALPHA, threshold=0.0)
+    rag.populate_skills(list(skills))
+    return rag
+
+
+@functools.cache
+def tools_rag(size: int) -> ToolsRAG:
+    """Return populated tools RAG shared by retrieval benchmarks."""
+    return populated_tools_rag(tool_catalogue(size))
+
+
+@functools.cache
+def skills_rag(size: int) -> SkillsRAG:
+    """Return populated skills RAG shared by retrieval benchmarks."""
+    return populated_skills_rag(skill_catalogue(size))
+
+
+def pedantic_rounds(size: int) -> int:
+    """Return number of rounds for benchmarks too slow for calibration."""
+    return 1 if size >= 5000 else 3
+
+
+@pytest.mark.parametrize("size", CATALOGUE_SIZES)
+def test_populate_tools(benchmark, size):
+    """Benchmark indexing of the tool catalogue."""
+    tools = tool_catalogue(size)
+    benchmark.extra_info.update(measure_populate(populated_tools_rag, tools))
+    benchmark.pedantic(populated_tools_rag, args=(tools,), rounds=pedantic_rounds(size))
+
+
+@pytest.mark.parametrize("filtered", [False, True], ids=["all_servers", "filtered"])
+@pytest.mark.parametrize("size", CATALOGUE_SIZES)
+def test_retrieve_hybrid(benchmark, size, filtered):
+    """Benchmark tool retrieval, with or without a server filter."""
+    tools = tool_catalogue(size)
+    rag = tools_rag(size)
+    default_servers, client_servers = servers(size) if filtered else ([], [])
+    rag.set_default_servers(default_servers)
+    allowed_servers = set(default_servers) | set(client_servers)
+
+    ids = [f"{tool.metadata['mcp_server']}::{tool.name}" for tool in tools]
+    documents = [f"{tool.name} {tool.description}" for tool in tools]
+    allowed = (
+        {
+            index
+            for index, tool in enumerate(tools)
+            if tool.metadata["mcp_server"] in allowed_servers
+        }
+        if filtered
+        else None
+    )
+    exact = ExactHybrid(ids, documents)
+    candidates = [documents[index] for index in allowed] if allowed else documents
+    test_queries = queries(candidates, seed=size)
+
+    agreement = []
+    for query in test_queries:
+        retrieved = {
+            f"{server}::{tool['name']}"
+            for server, server_tools in rag.retrieve_hybrid(
+                query, client_servers=client_servers
+            ).items()
+            for tool in server_tools
+        }
+        expected = exact.top_k(query, TOP_K, allowed)
+        agreement.append(len(retrieved & expected) / len(expected))
+    benchmark.extra_info["top_k_agreement"] = sum(agreement) / len(agreement)
+
+    benchmark(rag.retrieve_hybrid, test_queries[0], client_servers=client_servers)
+    rag.set_default_servers([])
+
+
+@pytest.mark.parametrize("size", CATALOGUE_SIZES)
+def test_populate_skills(benchmark, size):
+    """Benchmark indexing of the skill catalogue."""
+    skills = skill_catalogue(size)
+    benchmark.extra_info.update(measure_populate(populated_skills_rag, skills))
+    benchmark.pedantic(
+        populated_skills_rag, args=(skills,), rounds=pedantic_rounds(size)
+    )
+
+
+@pytest.mark.parametrize("size", CATALOGUE_SIZES)
+def test_retrieve_skill(benchmark, size):
+    """Benchmark selection of the best matching skill."""
+    skills = skill_catalogue(size)
+    rag = skills_rag(size)
+
+    documents = [f"{skill.name} {skill.description}" for skill in skills]
+    exact = ExactHybrid([skill.source_path for skill in skills], documents)
+    test_queries = queries(documents, seed=size)
+
+    matches = 0
+    for query in test_queries:
+        skill, _ = rag.retrieve_skill(query)
+        matches += skill is not None and {skill.source_path} == exact.top_k(query, 1)
+    benchmark.extra_info["top_k_agreement"] = matches / len(test_queries)
+
+    benchmark(rag.retrieve_skill, test_queries[0])
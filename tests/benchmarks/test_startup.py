@@ -0,0 +1,167 @@
+"""Benchmarks for service startup.
+
+The benchmarks record into `extra_info` of the results:
+
+- `import_time_us`: total time of imports made when the app is imported,
+  as reported by `python -X importtime`,
+- `slowest_imports`: modules with the longest own import time.
+"""
+
+# pylint: disable=W0621
+
+import os
+import socket
+import subprocess  # nosec
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+PROJECT_ROOT = Path(__file__).parents[2]
+LIVENESS_TIMEOUT = 120
+SLOWEST_IMPORTS = 15
+
+IMPORT_APP = """
+import sys
+
+from ols import config
+
+config.reload_from_yaml_file(sys.argv[1])
+
+import ols.app.main
+"""
+
+
+def free_port() -> int:
+    """Return TCP port nobody listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def port() -> int:
+    """Return port of the service."""
+    return free_port()
+
+
+@pytest.fixture(scope="module")
+def config_file(tmp_path_factory, port) -> Path:
+    """Write minimal service configuration using the fake LLM provider."""
+    path = tmp_path_factory.mktemp("startup") / "olsconfig.yaml"
+    path.write_text(
+        yaml.dump(
+            {
+                "llm_providers": [
+                    {
+                        "name": "fake",
+                        "type": "fake_provider",
+                        "models": [{"name": "fake_model"}],
+                        "fake_provider_config": {
+                            # required by the provider configuration
+                            "url": "http://127.0.0.1",
+                            "stream": True,
+                            "mcp_tool_call": False,
+                            "response": "Hello",
+                            "chunks": 1,
+                            "sleep": 0,
+                        },
+                    }
+                ],
+                "ols_config": {
+                    "default_provider": "fake",
+                    "default_model": "fake_model",
+                    "authentication_config": {"module": "noop"},
+                    "conversation_cache": {
+                        "type": "memory",
+                        "memory": {"max_entries": 1000},
+                    },
+                    "logging_config": {
+                        "app_log_level": "warning",
+                        "lib_log_level": "warning",
+                        "uvicorn_log_level": "warning",
+                    },
+                },
+                "dev_config": {
+                    "disable_auth": True,
+                    "disable_tls": True,
+                    "uvicorn_port_number": port,
+                    "run_on_localhost": True,
+                },
+            }
+        )
+    )
+    return path
+
+
+def parse_importtime(output: str) -> tuple[int, list[tuple[str, int]]]:
+    """Return total import time and own import time of modules in microseconds.
+
+    Lines of `-X importtime` look like
+    `import time:   self [us] | cumulative | imported package`, nested imports
+    are indented, so the total is the sum of cumulative times of top-level ones.
+    """
+    total = 0
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(own)))
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total, modules
+
+
+def test_app_import_time(benchmark, config_file):
+    """Benchmark importing the app, as done by the service at startup."""
+
+    def import_app() -> str:
+        return subprocess.run(  # noqa: S603 # nosec
+            [sys.executable, "-X", "importtime", "-c", IMPORT_APP, str(config_file)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=PROJECT_ROOT,
+        ).stderr
+
+    output = benchmark.pedantic(import_app, rounds=3)
+
+    total, modules = parse_importtime(output)
+    modules.sort(key=lambda module: module[1], reverse=True)
+    benchmark.extra_info["import_time_us"] = total
+    benchmark.extra_info["slowest_imports"] = dict(modules[:SLOWEST_IMPORTS])
+
+
+def test_time_to_liveness(benchmark, config_file, port):
+    """Benchmark time from starting the service until it responds to liveness probe."""
+    env = os.environ | {"OLS_CONFIG_FILE": str(config_file)}
+    url = f"http://127.0.0.1:{port}/liveness"
+
+    def start_service() -> None:
+        service = subprocess.Popen(  # nosec
+            [sys.executable, "runner.py"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + LIVENESS_TIMEOUT
+            while time.monotonic() < deadline:
+                assert service.poll() is None, "service exited during startup"
+                try:
+                    if httpx.get(url, timeout=1).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.05)
+            pytest.fail("service did not become live in time")
+        finally:
+            service.terminate()
+            service.wait()
+
+    benchmark.pedantic(start_service, rounds=3)
@@ -0,0 +1 @@
+"""Load tests of the service."""
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""Load test of the query endpoints with fake LLM provider and stub MCP server.
+
+The harness starts the service configured with `fake_provider` and a stub MCP
+server, drives `/v1/query` and `/v1/streaming_query` at fixed concurrency
+levels and writes throughput, latency percentiles, time to first token and
+service memory to a JSON file. When a baseline result file is given, the run
+fails if any measured value regressed by more than the tolerance.
+
+Usage:
+    python tests/load/harness.py --concurrency 1 8 32 --requests 200
+        --output load-results.json [--baseline previous-results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+import httpx
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+STUB_MCP_SERVER = Path(__file__).with_name("stub_mcp_server.py")
+
+ENDPOINT_QUERY = "/v1/query"
+ENDPOINT_STREAMING_QUERY = "/v1/streaming_query"
+
+# measured values compared with the baseline, True when higher is better
+COMPARED_VALUES = {
+    "rps": True,
+    "latency_p50": False,
+    "latency_p95": False,
+    "latency_p99": False,
+    "ttft_p50": False,
+    "ttft_p95": False,
+    "rss_peak_bytes": False,
+}
+
+
+@dataclass
+class Sample:
+    """Outcome of one request."""
+
+    latency: float
+    ttft: Optional[float]
+    ok: bool
+
+
+@dataclass
+class LevelResult:
+    """Measurements of one endpoint at one concurrency level."""
+
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    rps: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    ttft_p50: Optional[float]
+    ttft_p95: Optional[float]
+    ttft_p99: Optional[float]
+    rss_start_bytes: Optional[int]
+    rss_end_bytes: Optional[int]
+    rss_peak_bytes: Optional[int]
+
+
+def percentile(values: list[float], fraction: float) -> Optional[float]:
+    """Return percentile of the values (nearest rank), None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def read_rss(pid: int) -> tuple[Optional[int], Optional[int]]:
+    """Return current and peak resident set size of the process in bytes.
+
+    Memory is read from procfs, so it is available on Linux only.
+    """
+    try:
+        status = Path(f"/proc/{pid}/status").read_text(encoding="utf-8")
+    except OSError:
+        return None, None
+    values = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key in {"VmRSS", "VmHWM"}:
+            values[key] = int(value.split()[0]) * 1024
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def service_config(args: argparse.Namespace) -> dict[str, Any]:
+    """Return configuration of the service under test."""
+    fake_provider_config = {
+        # required by the provider configuration, the fake LLM does not use it
+        "url": "http://127.0.0.1",
+        "stream": True,
+        "mcp_tool_call": False,
+        "response": args.response,
+        "chunks": args.chunks,
+        "sleep": args.token_delay,
+        **json.loads(args.fake_provider_config),
+    }
+    return {
+        "llm_providers": [
+            {
+                "name": "fake",
+                "type": "fake_provider",
+                "models": [{"name": "fake_model"}],
+                "fake_provider_config": fake_provider_config,
+            }
+        ],
+        "ols_config": {
+            "default_provider": "fake",
+            "default_model": "fake_model",
+            "conversation_cache": {
+                "type": "memory",
+                "memory": {"max_entries": 100000},
+            },
+            "logging_config": {
+                "app_log_level": "warning",
+                "lib_log_level": "warning",
+                "uvicorn_log_level": "warning",
+            },
+            "authentication_config": {"module": "noop"},
+            "query_validation_method": "disabled",
+            "user_data_collection": {
+                "feedback_disabled": True,
+                "transcripts_disabled": True,
+            },
+        },
+        "mcp_servers": [
+            {"name": "load-test-stub", "url": f"http://127.0.0.1:{args.mcp_port}/mcp"}
+        ],
+        "dev_config": {
+            "disable_auth": True,
+            "disable_tls": True,
+            "enable_dev_ui": False,
+            "uvicorn_port_number": args.port,
+            "run_on_localhost": True,
+        },
+    }
+
+
+@contextmanager
+def running_processes(
+    args: argparse.Namespace, workdir: Path, log: TextIO
+) -> Iterator[subprocess.Popen]:
+    """Run stub MCP server and the service, both logging to the given file.
+
+    Yields the service process, both processes are stopped on exit.
+    """
+    with ExitStack() as stack:
+        mcp_server = stack.enter_context(
+            subprocess.Popen(  # noqa: S603
+                [
+                    sys.executable,
+                    str(STUB_MCP_SERVER),
+                    "--port",
+                    str(args.mcp_port),
+                    "--tools",
+                    str(args.mcp_tools),
+                    "--latency",
+                    str(args.mcp_latency),
+                    "--payload-size",
+                    str(args.mcp_payload_size),
+                ],
+                cwd=PROJECT_ROOT,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        )
+        stack.callback(stop_processes, mcp_server)
+        config_file = workdir / "olsconfig.yaml"
+        config_file.write_text(yaml.safe_dump(service_config(args)), encoding="utf-8")
+        service = stack.enter_context(
+            subprocess.Popen(
+                [sys.executable, "runner.py"],
+                cwd=PROJECT_ROOT,
+                env={**os.environ, "OLS_CONFIG_FILE": str(config_file)},
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        )
+        stack.callback(stop_processes, service)
+        yield service
+
+
+def stop_processes(*processes: subprocess.Popen) -> None:
+    """Terminate processes and wait for them to exit."""
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_until_ready(
+    client: httpx.AsyncClient, service: subprocess.Popen
+) -> None:
+    """Wait until the service answers the liveness probe."""
+    while True:
+        if service.poll() is not None:
+            raise RuntimeError(f"Service exited with code {service.returncode}")
+        try:
+            if (await client.get("/liveness")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+
+
+async def send_query(client: httpx.AsyncClient, endpoint: str, query: str) -> Sample:
+    """Send one query and measure latency and time to first token."""
+    start = time.perf_counter()
+    ttft = None
+    try:
+        if endpoint == ENDPOINT_QUERY:
+            response = await client.post(endpoint, json={"query": query})
+            ok = response.status_code == 200
+        else:
+            request = {"query": query, "media_type": "application/json"}
+            async with client.stream("POST", endpoint, json=request) as response:
+                ok = response.status_code == 200
+                async for line in response.aiter_lines():
+                    if ttft is None and '"event": "token"' in line:
+                        ttft = time.perf_counter() - start
+    except httpx.HTTPError:
+        ok = False
+    return Sample(latency=time.perf_counter() - start, ttft=ttft, ok=ok)
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    concurrency: int,
+    requests: int,
+    query: str,
+) -> tuple[list[Sample], float]:
+    """Send the requests by the given number of concurrent clients."""
+    remaining = iter(range(requests))
+    samples: list[Sample] = []
+
+    async def worker() -> None:
+        """Send queries until all requests are sent."""
+        for _ in remaining:
+            sample = await send_query(client, endpoint, query)
+            samples.append(sample)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def summarize(
+    endpoint: str,
+    concurrency: int,
+    samples: list[Sample],
+    duration: float,
+    rss_start: Optional[int],
+    rss_end: tuple[Optional[int], Optional[int]],
+) -> LevelResult:
+    """Aggregate samples of one concurrency level."""
+    latencies = [sample.latency for sample in samples if sample.ok]
+    ttfts = [sample.ttft for sample in samples if sample.ok and sample.ttft]
+    return LevelResult(
+        endpoint=endpoint,
+        concurrency=concurrency,
+        requests=len(samples),
+        errors=sum(not sample.ok for sample in samples),
+        duration=duration,
+        rps=len(latencies) / duration if duration else 0.0,
+        latency_p50=percentile(latencies, 0.50) or 0.0,
+        latency_p95=percentile(latencies, 0.95) or 0.0,
+        latency_p99=percentile(latencies, 0.99) or 0.0,
+        ttft_p50=percentile(ttfts, 0.50),
+        ttft_p95=percentile(ttfts, 0.95),
+        ttft_p99=percentile(ttfts, 0.99),
+        rss_start_bytes=rss_start,
+        rss_end_bytes=rss_end[0],
+        rss_peak_bytes=rss_end[1],
+    )
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float
+) -> list[str]:
+    """Return regressions of the results against the baseline.
+
+    Values are compared per endpoint and concurrency level. A value
+    regressed when it is worse than the baseline by more than the
+    tolerance (fraction of the baseline value).
+    """
+    baseline_levels = {
+        (level["endpoint"], level["concurrency"]): level for level in baseline
+    }
+    regressions = []
+    for level in results:
+        previous = baseline_levels.get((level["endpoint"], level["concurrency"]))
+        if previous is None:
+            continue
+        for name, higher_is_better in COMPARED_VALUES.items():
+            current, base = level.get(name), previous.get(name)
+            if not current or not base:
+                continue
+            change = (current - base) / base
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{level['endpoint']} @ {level['concurrency']}: {name} "
+                    f"{base:.4g} -> {current:.4g} ({change:+.1%})"
+                )
+    return regressions
+
+
+async def run(args: argparse.Namespace, service: subprocess.Popen) -> list[LevelResult]:
+    """Run all concurrency levels against all endpoints."""
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port}", timeout=args.timeout, limits=limits
+    ) as client:
+        async with asyncio.timeout(args.startup_timeout):
+            await wait_until_ready(client, service)
+        for endpoint in args.endpoints:
+            await run_level(client, endpoint, 1, args.warmup, args.query)
+            for concurrency in args.concurrency:
+                rss_start, _ = read_rss(service.pid)
+                samples, duration = await run_level(
+                    client, endpoint, concurrency, args.requests, args.query
+                )
+                result = summarize(
+                    endpoint,
+                    concurrency,
+                    samples,
+                    duration,
+                    rss_start,
+                    read_rss(service.pid),
+                )
+                print(
+                    f"{endpoint} concurrency={concurrency} rps={result.rps:.1f} "
+                    f"p50={result.latency_p50:.3f}s p99={result.latency_p99:.3f}s "
+                    f"errors={result.errors}"
+                )
+                results.append(result)
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--requests", type=int, default=200, help="requests per concurrency level"
+    )
+    parser.add_argument("--warmup", type=int, default=5, help="warmup requests")
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        default=[ENDPOINT_QUERY, ENDPOINT_STREAMING_QUERY],
+        choices=[ENDPOINT_QUERY, ENDPOINT_STREAMING_QUERY],
+    )
+    parser.add_argument("--query", default="How do I scale a deployment?")
+    parser.add_argument("--port", type=int, default=8089, help="service port")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--response", default="This is a preconfigured fake response.")
+    parser.add_argument("--chunks", type=int, default=200, help="streamed chunks")
+    parser.add_argument(
+        "--token-delay", type=float, default=0.001, help="seconds between chunks"
+    )
+    parser.add_argument(
+        "--fake-provider-config",
+        default="{}",
+        help="JSON object merged into fake_provider_config",
+    )
+    parser.add_argument("--mcp-port", type=int, default=3001)
+    parser.add_argument("--mcp-tools", type=int, default=5)
+    parser.add_argument("--mcp-latency", type=float, default=0.05)
+    parser.add_argument("--mcp-payload-size", type=int, default=4096)
+    parser.add_argument("--output", type=Path, default=Path("load-results.json"))
+    parser.add_argument(
+        "--service-log",
+        type=Path,
+        default=Path("load-service.log"),
+        help="file for output of the service and the stub MCP server",
+    )
+    parser.add_argument("--baseline", type=Path, help="results of a previous run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed regression against the baseline, as a fraction",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the load test and return the exit code."""
+    args = parse_args()
+    with (
+        tempfile.TemporaryDirectory() as workdir,
+        open(args.service_log, "w", encoding="utf-8") as log,
+        running_processes(args, Path(workdir), log) as service,
+    ):
+        results = asyncio.run(run(args, service))
+
+    report = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "arguments": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+            },
+        },
+        "results": [asdict(result) for result in results],
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
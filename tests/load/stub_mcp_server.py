@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Stub MCP server with configurable tool latency and result size.
+
+The server exposes read-only tools over the streamable HTTP transport, so
+tool discovery and tool calls made by the service under load hit a real MCP
+server without any external dependency.
+
+Usage:
+    python tests/load/stub_mcp_server.py --port 3001 --latency 0.05 --payload-size 4096
+"""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+logger = logging.getLogger(__name__)
+
+
+def create_server(
+    host: str, port: int, tools: int, latency: float, payload_size: int
+) -> FastMCP:
+    """Create MCP server with the given number of tools.
+
+    Args:
+        host: Address to listen on.
+        port: Port to listen on.
+        tools: Number of tools exposed by the server.
+        latency: Seconds each tool call takes.
+        payload_size: Size of each tool result in characters.
+
+    Returns:
+        Configured MCP server.
+    """
+    server = FastMCP(
+        "load-test-stub",
+        host=host,
+        port=port,
+        log_level="WARNING",
+        stateless_http=True,
+    )
+
+    def make_tool(index: int) -> Callable[..., Awaitable[str]]:
+        async def get_resources(namespace: str = "default", kind: str = "Pod") -> str:
+            await asyncio.sleep(latency)
+            line = f"{kind.lower()}-{index} {namespace} Running\n"
+            return (line * (payload_size // len(line) + 1))[:payload_size]
+
+        return get_resources
+
+    for index in range(tools):
+        server.add_tool(
+            make_tool(index),
+            name=f"get_resources_{index}",
+            description=f"List cluster resources of a kind in a namespace ({index})",
+            annotations=ToolAnnotations(readOnlyHint=True),
+        )
+    return server
+
+
+def main() -> None:
+    """Parse arguments and run the server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--tools", type=int, default=5, help="number of tools")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="seconds per tool call"
+    )
+    parser.add_argument(
+        "--payload-size", type=int, default=4096, help="tool result size in chars"
+    )
+    args = parser.parse_args()
+
+    logger.info("Starting stub MCP server on %s:%d", args.host, args.port)
+    create_server(
+        args.host, args.port, args.tools, args.latency, args.payload_size
+    ).run(transport="streamable-http")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Unit tests for runtime diagnostics endpoint handlers."""
+
+import json
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from ols import config
+from ols.app.models.config import EventLoopMonitorConfig, ProfilingConfig
+
+# needs to be setup before diagnostics endpoint is imported
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.endpoints import diagnostics  # noqa: E402
+from ols.src.diagnostics.event_loop_monitor import (  # noqa: E402
+    BlockingEvent,
+    EventLoopMonitor,
+)
+from ols.src.diagnostics.memory_profiler import (  # noqa: E402
+    AllocationSite,
+    MemoryReport,
+)
+from ols.src.diagnostics.sampling_profiler import (  # noqa: E402
+    Profile,
+    ProfilerBusyError,
+)
+
+
+@pytest.fixture
+def mock_auth():
+    """Create a mock auth tuple."""
+    return ("test-user-id", "test-username", False, "test-token")
+
+
+@pytest.mark.asyncio
+async def test_event_loop_diagnostics(mock_auth):
+    """Test that lag and blocking events are returned."""
+    monitor = EventLoopMonitor(EventLoopMonitorConfig(lag_threshold_seconds=0.1))
+    monitor.record_lag(0.5)
+    monitor._events[0].task = "Task-1 (handler)"
+    monitor._events[0].stack = ["frame\n"]
+
+    with patch.object(type(config.services), "event_loop_monitor", monitor):
+        response = await diagnostics.get_event_loop_diagnostics(auth=mock_auth)
+
+    assert response.monitor_enabled
+    assert response.max_lag_seconds == 0.5
+    assert response.lag_threshold_seconds == 0.1
+    assert len(response.blocking_events) == 1
+    event = response.blocking_events[0]
+    assert event.lag_seconds == 0.5
+    assert event.task == "Task-1 (handler)"
+    assert event.stack == ["frame\n"]
+
+
+@pytest.mark.asyncio
+async def test_event_loop_diagnostics_monitor_disabled(mock_auth):
+    """Test response when the event loop monitor is disabled."""
+    with patch.object(type(config.services), "event_loop_monitor", None):
+        response = await diagnostics.get_event_loop_diagnostics(auth=mock_auth)
+
+    assert not response.monitor_enabled
+    assert response.blocking_events == []
+
+
+def test_blocking_event_defaults():
+    """Test that blocking event without captured stack has no task and stack."""
+    event = BlockingEvent(timestamp=1.0, lag=0.2)
+    assert event.task is None
+    assert event.stack is None
+
+
+def sampling_profiler():
+    """Create mocked sampling profiler returning one stack."""
+    profiler = MagicMock()
+    profiler.profile.return_value = Profile(
+        duration=1.0,
+        interval=0.01,
+        stacks=Counter({("MainThread", (("run", "main.py", 1),)): 5}),
+    )
+    return profiler
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_collapsed(mock_auth):
+    """Test that CPU profile is returned as collapsed stacks."""
+    profiler = sampling_profiler()
+    with patch.object(type(config.services), "sampling_profiler", profiler):
+        response = await diagnostics.get_cpu_profile(
+            duration_seconds=1.0, output_format="collapsed", auth=mock_auth
+        )
+
+    profiler.profile.assert_called_once_with(1.0)
+    assert response.media_type == "text/plain"
+    assert response.body == b"MainThread;run (main.py:1) 5\n"
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_speedscope(mock_auth):
+    """Test that CPU profile is returned as speedscope JSON."""
+    with patch.object(type(config.services), "sampling_profiler", sampling_profiler()):
+        response = await diagnostics.get_cpu_profile(
+            duration_seconds=1.0, output_format="speedscope", auth=mock_auth
+        )
+
+    body = json.loads(response.body)
+    assert body["profiles"][0]["name"] == "MainThread"
+    assert body["shared"]["frames"] == [{"name": "run", "file": "main.py", "line": 1}]
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_errors(mock_auth):
+    """Test disabled profiling, too long window and concurrent profiling."""
+    with patch.object(type(config.services), "sampling_profiler", None):
+        with pytest.raises(HTTPException) as e:
+            await diagnostics.get_cpu_profile(
+                duration_seconds=1.0, output_format="collapsed", auth=mock_auth
+            )
+    assert e.value.status_code == 403
+
+    profiler = sampling_profiler()
+    with (
+        patch.object(type(config.services), "sampling_profiler", profiler),
+        patch.object(config.ols_config, "profiling", ProfilingConfig()),
+    ):
+        with pytest.raises(HTTPException) as e:
+            await diagnostics.get_cpu_profile(
+                duration_seconds=61, output_format="collapsed", auth=mock_auth
+            )
+        assert e.value.status_code == 400
+
+        profiler.profile.side_effect = ProfilerBusyError("busy")
+        with pytest.raises(HTTPException) as e:
+            await diagnostics.get_cpu_profile(
+                duration_seconds=1.0, output_format="collapsed", auth=mock_auth
+            )
+        assert e.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_memory_report(mock_auth):
+    """Test that memory report is returned with the number of sites capped."""
+    profiler = MagicMock()
+    profiler.report.return_value = MemoryReport(
+        traced_since_startup=True,
+        compared_to="window",
+        traced_memory=1000,
+        traced_memory_peak=2000,
+        top_sites=[AllocationSite(site="a.py:1", size=800, count=2)],
+        top_growth=[
+            AllocationSite(
+                site="b.py:2", size=100, count=1, size_diff=100, count_diff=1
+            )
+        ],
+        packages=[AllocationSite(site="llama_index", size=900, count=3)],
+    )
+
+    with (
+        patch.object(type(config.services), "memory_profiler", profiler),
+        patch.object(
+            config.ols_config, "profiling", ProfilingConfig(max_allocation_sites=10)
+        ),
+    ):
+        response = await diagnostics.get_memory_report(
+            duration_seconds=0, top=50, auth=mock_auth
+        )
+
+    profiler.report.assert_called_once_with(0, 10)
+    assert response.traced_memory_peak_bytes == 2000
+    assert response.top_sites[0].size_bytes == 800
+    assert response.top_growth[0].size_diff_bytes == 100
+    assert response.packages[0].site == "llama_index"
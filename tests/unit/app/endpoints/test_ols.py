@@ -3,8 +3,9 @@
 import json
 import re
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import psycopg2
 import pytest
 from fastapi import HTTPException
 from langchain_core.messages import AIMessage, HumanMessage
@@ -16,7 +17,10 @@ from ols.constants import QueryMode
 config.ols_config.authentication_config.module = "k8s"
 
 from ols.app.endpoints import ols  # noqa:E402
-from ols.app.models.config import UserDataCollection  # noqa:E402
+from ols.app.models.config import (  # noqa:E402
+    AdmissionControlConfig,
+    UserDataCollection,
+)
 from ols.app.models.models import (  # noqa:E402
     Attachment,
     CacheEntry,
@@ -676,6 +680,50 @@ def test_generate_response_on_summarizer_error():
             ols.generate_response(conversation_id, llm_request, previous_input)
 
 
+@pytest.fixture
+def admission_control(_load_config):
+    """Configure admission control allowing one query without queue."""
+    config.ols_config.admission_control = AdmissionControlConfig(
+        max_concurrent_requests=1, max_queue_size=0, retry_after_seconds=3
+    )
+    config.services._admission_controller = None
+    yield config.services.admission_controller
+    config.ols_config.admission_control = None
+    config.services._admission_controller = None
+
+
+def test_admit_request_without_admission_control(_load_config):
+    """Test that queries are not limited when admission control is disabled."""
+    assert ols.admit_request(LLMRequest(query="Tell me about Kubernetes")) is None
+
+
+def test_generate_response_rejected_by_admission_control(admission_control):
+    """Test that query over the concurrency limit is rejected with 429."""
+    llm_request = LLMRequest(query="Tell me about Kubernetes")
+    admission = ols.admit_request(llm_request)
+
+    with pytest.raises(HTTPException) as e:
+        ols.generate_response(suid.get_suid(), llm_request, None)
+    assert e.value.status_code == 429
+    assert e.value.headers == {"Retry-After": "3"}
+
+    admission.release()
+    assert ols.admit_request(llm_request) is not None
+
+
+def test_generate_response_releases_admission_on_error(admission_control):
+    """Test that slots are returned when the query fails."""
+    llm_request = LLMRequest(query="Tell me about Kubernetes")
+    with patch(
+        "ols.src.query_helpers.docs_summarizer.DocsSummarizer.__init__",
+        side_effect=Exception,
+    ):
+        with pytest.raises(HTTPException, match=DEFAULT_ERROR_MESSAGE):
+            ols.generate_response(suid.get_suid(), llm_request, None)
+
+    assert ols.admit_request(llm_request) is not None
+
+
 @pytest.fixture
 def transcripts_location(tmpdir):
     """Fixture sets feedback location to tmpdir and return the path."""
@@ -831,269 +879,64 @@ def test_calc_tokens_for_token_counter():
     assert ols.calc_tokens(token_counter, "reasoning_tokens") == 50
 
 
-def test_consume_tokens_no_quota_limiters():
-    """Test the function consume_tokens if no quota limiters are configured."""
-    quota_limiters = None
-    ols.consume_tokens(quota_limiters, None, "user_id", 1, 1, "", "")
-
-
-def test_consume_tokens_empty_quota_limiters():
-    """Test the function consume_tokens if empty list of quota limiters are configured."""
-    quota_limiters = []
-    ols.consume_tokens(quota_limiters, None, "user_id", 1, 1, "", "")
-
+def test_consume_tokens_no_quota_service():
+    """Test the function consume_tokens if quota storage is not configured."""
+    assert ols.consume_tokens(None, "user_id", 1, 1, "", "") == {}
 
-def test_consume_tokens_with_existing_quota_limiter():
-    """Test the function consume_tokens for configured quota limiter."""
 
-    class MockQuotaLimiter:
-        """Mocked quota limiter."""
-
-        def consume_tokens(self, input_tokens=0, output_tokens=0, subject_id=""):
-            self._input_tokens = input_tokens
-            self._output_tokens = output_tokens
-            self._subject_id = subject_id
-
-    mock_quota_limiter = MockQuotaLimiter()
-
-    quota_limiters = [mock_quota_limiter]
-    token_usage_history = None
-    input_tokens = 1
-    output_tokens = 2
-    user_id = "user_id"
-    provider = "provider"
-    model = "model"
-    ols.consume_tokens(
-        quota_limiters,
-        token_usage_history,
-        user_id,
-        input_tokens,
-        output_tokens,
-        provider,
-        model,
-    )
-    assert mock_quota_limiter._input_tokens == input_tokens
-    assert mock_quota_limiter._output_tokens == output_tokens
-    assert mock_quota_limiter._subject_id == user_id
-
-
-def test_consume_tokens_multiple_quota_limiters():
-    """Test the function consume_tokens for more configured quota limiter."""
-
-    class MockQuotaLimiter:
-        def consume_tokens(self, input_tokens=0, output_tokens=0, subject_id=""):
-            self._input_tokens = input_tokens
-            self._output_tokens = output_tokens
-            self._subject_id = subject_id
-
-    mock_quota_limiter1 = MockQuotaLimiter()
-    mock_quota_limiter2 = MockQuotaLimiter()
-
-    quota_limiters = [mock_quota_limiter1, mock_quota_limiter2]
-    token_usage_history = None
-    input_tokens = 1
-    output_tokens = 2
-    user_id = "user_id"
-    provider = "provider"
-    model = "model"
-    ols.consume_tokens(
-        quota_limiters,
-        token_usage_history,
-        user_id,
-        input_tokens,
-        output_tokens,
-        provider,
-        model,
-    )
+def test_consume_tokens_with_quota_service():
+    """Test that consume_tokens consumes tokens of all limiters at once."""
+    quota_service = MagicMock()
+    quota_service.consume_tokens.return_value = {
+        "UserQuotaLimiter": 10,
+        "ClusterQuotaLimiter": 20,
+    }
 
-    for mock_quota_limiter in [mock_quota_limiter1, mock_quota_limiter2]:
-        assert mock_quota_limiter._input_tokens == input_tokens
-        assert mock_quota_limiter._output_tokens == output_tokens
-        assert mock_quota_limiter._subject_id == user_id
-
-
-def test_consume_tokens_token_usage_history():
-    """Test the function consume_tokens when token_usage_history is setup."""
-
-    class MockTokenUsageHistory:
-        def consume_tokens(
-            self, user_id="", provider="", model="", input_tokens=0, output_tokens=0
-        ):
-            self._user_id = user_id
-            self._provider = provider
-            self._model = model
-            self._input_tokens = input_tokens
-            self._output_tokens = output_tokens
-
-    quota_limiters = []
-    token_usage_history = MockTokenUsageHistory()
-    input_tokens = 1
-    output_tokens = 2
-    user_id = "user_id"
-    provider = "provider"
-    model = "model"
-    ols.consume_tokens(
-        quota_limiters,
-        token_usage_history,
-        user_id,
-        input_tokens,
-        output_tokens,
-        provider,
-        model,
-    )
+    quotas = ols.consume_tokens(quota_service, "user_id", 1, 2, "provider", "model")
 
-    assert token_usage_history._user_id == user_id
-    assert token_usage_history._provider == provider
-    assert token_usage_history._model == model
-    assert token_usage_history._input_tokens == input_tokens
-    assert token_usage_history._output_tokens == output_tokens
-
-
-def test_consume_tokens_token_limiters_and_token_usage_history():
-    """Test the function consume_tokens when token_usage_history is setup."""
-
-    class MockQuotaLimiter:
-        def consume_tokens(self, input_tokens=0, output_tokens=0, subject_id=""):
-            self._input_tokens = input_tokens
-            self._output_tokens = output_tokens
-            self._subject_id = subject_id
-
-    class MockTokenUsageHistory:
-        def consume_tokens(
-            self, user_id="", provider="", model="", input_tokens=0, output_tokens=0
-        ):
-            self._user_id = user_id
-            self._provider = provider
-            self._model = model
-            self._input_tokens = input_tokens
-            self._output_tokens = output_tokens
-
-    mock_quota_limiter1 = MockQuotaLimiter()
-    mock_quota_limiter2 = MockQuotaLimiter()
-
-    quota_limiters = [mock_quota_limiter1, mock_quota_limiter2]
-    token_usage_history = MockTokenUsageHistory()
-    input_tokens = 1
-    output_tokens = 2
-    user_id = "user_id"
-    provider = "provider"
-    model = "model"
-    ols.consume_tokens(
-        quota_limiters,
-        token_usage_history,
-        user_id,
-        input_tokens,
-        output_tokens,
-        provider,
-        model,
+    quota_service.consume_tokens.assert_called_once_with(
+        "user_id", "provider", "model", 1, 2
     )
+    assert quotas == {"UserQuotaLimiter": 10, "ClusterQuotaLimiter": 20}
 
-    assert token_usage_history._user_id == user_id
-    assert token_usage_history._provider == provider
-    assert token_usage_history._model == model
-    assert token_usage_history._input_tokens == input_tokens
-    assert token_usage_history._output_tokens == output_tokens
-
-    for mock_quota_limiter in [mock_quota_limiter1, mock_quota_limiter2]:
-        assert mock_quota_limiter._input_tokens == input_tokens
-        assert mock_quota_limiter._output_tokens == output_tokens
-        assert mock_quota_limiter._subject_id == user_id
-
-
-def test_check_token_available_no_quota_limiters():
-    """Test the function check_tokens_available if no quota limiters are configured."""
-    quota_limiters = None
-    ols.check_tokens_available(quota_limiters, "user_id")
 
+def test_check_token_available_no_quota_service():
+    """Test the function check_tokens_available if quota storage is not configured."""
+    ols.check_tokens_available(None, "user_id")
 
-def test_check_token_available_empty_limiters():
-    """Test the function check_tokens_available if emply list of quota limiters are configured."""
-    quota_limiters = []
-    ols.check_tokens_available(quota_limiters, "user_id")
 
+def test_check_token_available_configured_quota_service():
+    """Test the function check_tokens_available if quota storage is configured."""
+    quota_service = MagicMock()
 
-def test_check_token_available_configured_quota_limiter():
-    """Test the function check_tokens_available if one quota limiter is configured."""
+    ols.check_tokens_available(quota_service, "user_id")
 
-    class MockQuotaLimiter:
-        def ensure_available_quota(self, subject_id=""):
-            self._subject_id = subject_id
-
-    mock_quota_limiter = MockQuotaLimiter()
-    quota_limiters = [mock_quota_limiter]
-    user_id = "user_id"
-
-    ols.check_tokens_available(quota_limiters, user_id)
-    assert mock_quota_limiter._subject_id == user_id
+    quota_service.ensure_available_quota.assert_called_once_with("user_id")
 
 
 def test_check_token_available_on_exceed_error():
     """Test the function check_tokens_available if quota exceed error is thrown."""
-
-    class MockQuotaLimiter:
-        def ensure_available_quota(self, subject_id=""):
-            raise Exception("Raised exception")
-
-    mock_quota_limiter = MockQuotaLimiter()
-    quota_limiters = [mock_quota_limiter]
-    user_id = "user_id"
+    quota_service = MagicMock()
+    quota_service.ensure_available_quota.side_effect = Exception("Raised exception")
 
     expected = (
         "500: {'response': 'The quota has been exceeded', 'cause': 'Raised exception'}"
     )
     with pytest.raises(HTTPException, match=expected):
-        ols.check_tokens_available(quota_limiters, user_id)
-
-
-def test_get_available_quotas_no_quota_limiters():
-    """Test the function get_available_quotas when no quota limiters are setup."""
-    quotas = ols.get_available_quotas(None, "user_id")
-    assert quotas == {}
-
+        ols.check_tokens_available(quota_service, "user_id")
 
-def test_get_available_quotas_one_quota_limiter():
-    """Test the function get_available_quotas when one quota limiter is setup."""
 
-    class MockQuotaLimiter:
-        def __init__(self, available_quota=0):
-            self._available_quota = available_quota
-
-        def available_quota(self, subject_id=""):
-            return self._available_quota
-
-    mock_quota_limiter = MockQuotaLimiter(10)
-    quotas = ols.get_available_quotas([mock_quota_limiter], "user_id")
-    assert quotas == {
-        "MockQuotaLimiter": 10,
-    }
-
-
-def test_get_available_quotas_two_quota_limiters():
-    """Test the function get_available_quotas when two quota limiters are setup."""
-
-    class MockQuotaLimiter1:
-        def __init__(self, available_quota=0):
-            self._available_quota = available_quota
-
-        def available_quota(self, subject_id=""):
-            return self._available_quota
-
-    class MockQuotaLimiter2:
-        def __init__(self, available_quota=0):
-            self._available_quota = available_quota
-
-        def available_quota(self, subject_id=""):
-            return self._available_quota
-
-    mock_quota_limiter_1 = MockQuotaLimiter1(10)
-    mock_quota_limiter_2 = MockQuotaLimiter2(20)
-    quotas = ols.get_available_quotas(
-        [mock_quota_limiter_1, mock_quota_limiter_2], "user_id"
+def test_check_token_available_on_database_error():
+    """Test the function check_tokens_available if quota storage is unreachable."""
+    quota_service = MagicMock()
+    quota_service.ensure_available_quota.side_effect = psycopg2.OperationalError(
+        "connection refused"
     )
-    assert quotas == {
-        "MockQuotaLimiter1": 10,
-        "MockQuotaLimiter2": 20,
-    }
+
+    with pytest.raises(
+        HTTPException, match="Error communicating with quota database backend"
+    ):
+        ols.check_tokens_available(quota_service, "user_id")
 
 
 def test_merge_tools_info():
@@ -12,19 +12,27 @@ from pydantic import ValidationError
 import ols.utils.tls as tls
 from ols import constants
 from ols.app.models.config import (
+    AdmissionControlConfig,
+    AttachmentCompactionConfig,
     AuthenticationConfig,
+    BackgroundHistoryCompressionConfig,
     Config,
     ConversationCacheConfig,
     DevConfig,
+    EventLoopMonitorConfig,
+    HistorySummarizationConfig,
     InMemoryCacheConfig,
     LLMProviders,
     LoggingConfig,
+    MCPCircuitBreakerConfig,
     MCPServerConfig,
     MCPServers,
     ModelConfig,
     ModelParameters,
+    OffloadMemoryStoreConfig,
     OLSConfig,
     PostgresConfig,
+    ProfilingConfig,
     ProviderConfig,
     ProxyConfig,
     QueryFilter,
@@ -33,9 +41,13 @@ from ols.app.models.config import (
     ReasoningSummary,
     ReferenceContent,
     ReferenceContentIndex,
+    ResponseCacheConfig,
+    RetrievalCacheConfig,
     SkillsConfig,
     TLSConfig,
     TLSSecurityProfile,
+    ToolResultCacheConfig,
+    TracingConfig,
     UserDataCollection,
 )
 from ols.utils.checks import InvalidConfigurationError
@@ -2188,6 +2200,69 @@ def test_conversation_cache_config_validation():
         conversation_cache_config.validate_yaml()
 
 
+def test_response_cache_config():
+    """Test the ResponseCacheConfig model."""
+    response_cache_config = ResponseCacheConfig({"type": "memory"})
+    assert response_cache_config.type == "memory"
+    assert (
+        response_cache_config.memory.max_entries
+        == constants.IN_MEMORY_CACHE_MAX_ENTRIES
+    )
+    assert response_cache_config.ttl_seconds == constants.RESPONSE_CACHE_TTL_SECONDS
+    assert (
+        response_cache_config.similarity_threshold
+        == constants.RESPONSE_CACHE_SIMILARITY_THRESHOLD
+    )
+    assert (
+        response_cache_config.max_entry_size == constants.RESPONSE_CACHE_MAX_ENTRY_SIZE
+    )
+
+    response_cache_config = ResponseCacheConfig(
+        {
+            "type": "postgres",
+            "postgres": {"host": "1.2.3.4", "port": 1234},
+            "ttl_seconds": 60,
+            "similarity_threshold": 0.9,
+            "max_entry_size": 1024,
+        }
+    )
+    assert response_cache_config.postgres.host == "1.2.3.4"
+    assert response_cache_config.ttl_seconds == 60
+    assert response_cache_config.similarity_threshold == 0.9
+    assert response_cache_config.max_entry_size == 1024
+
+    with pytest.raises(
+        InvalidConfigurationError,
+        match="Postgres response cache type is specified, but Postgres configuration is missing",
+    ):
+        ResponseCacheConfig({"type": "postgres"})
+
+    with pytest.raises(
+        InvalidConfigurationError, match="unknown response cache type: unknown"
+    ):
+        ResponseCacheConfig({"type": "unknown"})
+
+    with pytest.raises(InvalidConfigurationError, match="need to be numbers"):
+        ResponseCacheConfig({"type": "memory", "ttl_seconds": "forever"})
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "message"),
+    [
+        ("ttl_seconds", 0, "ttl_seconds for response cache"),
+        ("max_entry_size", -1, "max_entry_size for response cache"),
+        ("similarity_threshold", 0.0, "similarity_threshold for response cache"),
+        ("similarity_threshold", 1.5, "similarity_threshold for response cache"),
+    ],
+)
+def test_response_cache_config_validation(field, value, message):
+    """Test the ResponseCacheConfig validation."""
+    ResponseCacheConfig({"type": "memory"}).validate_yaml()
+
+    with pytest.raises(InvalidConfigurationError, match=message):
+        ResponseCacheConfig({"type": "memory", field: value}).validate_yaml()
+
+
 def test_conversation_cache_config_equality():
     """Test the ConversationCacheConfig equality check."""
     conversation_cache_config_1 = ConversationCacheConfig()
@@ -3075,6 +3150,38 @@ def test_reference_content_index_constructor():
     )
     assert reference_content_index.product_docs_index_id == "id"
     assert reference_content_index.product_docs_index_path == "/path/"
+    assert reference_content_index.product_docs_search_params is None
+
+
+def test_reference_content_index_search_params():
+    """Test the ReferenceContentIndex ANN search parameters."""
+    reference_content_index = ReferenceContentIndex(
+        {"product_docs_search_params": {"efSearch": 64}}
+    )
+    assert reference_content_index.product_docs_search_params == {"efSearch": 64}
+    reference_content_index.validate_yaml()
+
+    reference_content_index.product_docs_search_params = {"nprobe": 0}
+    with pytest.raises(
+        InvalidConfigurationError, match="nprobe must be a positive integer"
+    ):
+        reference_content_index.validate_yaml()
+
+
+def test_reference_content_retrieval_cache():
+    """Test the ReferenceContent retrieval cache configuration."""
+    reference_content = ReferenceContent({"indexes": []})
+    assert reference_content.retrieval_cache is None
+
+    reference_content = ReferenceContent({"retrieval_cache": {"ttl_seconds": 60}})
+    assert reference_content.retrieval_cache == RetrievalCacheConfig(
+        enabled=True,
+        max_entries=constants.RETRIEVAL_CACHE_MAX_ENTRIES,
+        ttl_seconds=60,
+    )
+
+    with pytest.raises(ValidationError):
+        ReferenceContent({"retrieval_cache": {"max_entries": 0}})
 
 
 def test_reference_content_index_equality():
@@ -4189,6 +4296,62 @@ def test_ols_config_with_quota_handlers_section_empty_limiters():
     assert ols_config.quota_handlers.limiters is not None
 
 
+def test_quota_handlers_config_cache_and_flush_interval():
+    """Test quota cache TTL and token history flush interval of quota handlers."""
+    data = {
+        "storage": {"host": "", "ssl_mode": "disable"},
+        "scheduler": {"period": 100},
+    }
+    quota_handlers = QuotaHandlersConfig(data)
+    assert (
+        quota_handlers.available_quota_ttl_seconds
+        == constants.QUOTA_AVAILABLE_CACHE_TTL_SECONDS
+    )
+    assert (
+        quota_handlers.token_history_flush_interval_seconds
+        == constants.TOKEN_HISTORY_FLUSH_INTERVAL_SECONDS
+    )
+
+    data["available_quota_ttl_seconds"] = 0
+    data["token_history_flush_interval_seconds"] = 2.5
+    quota_handlers = QuotaHandlersConfig(data)
+    assert quota_handlers.available_quota_ttl_seconds == 0
+    assert quota_handlers.token_history_flush_interval_seconds == 2.5
+
+    data["available_quota_ttl_seconds"] = -1
+    with pytest.raises(
+        InvalidConfigurationError,
+        match="available_quota_ttl_seconds can not be negative",
+    ):
+        QuotaHandlersConfig(data)
+
+    data["available_quota_ttl_seconds"] = 1
+    data["token_history_flush_interval_seconds"] = 0
+    with pytest.raises(
+        InvalidConfigurationError,
+        match="token_history_flush_interval_seconds must be positive",
+    ):
+        QuotaHandlersConfig(data)
+
+
+def test_quota_handlers_config_scheduler_jitter():
+    """Test jitter of quota scheduler period."""
+    data = {
+        "storage": {"host": "", "ssl_mode": "disable"},
+        "scheduler": {"period": 100},
+    }
+    quota_handlers = QuotaHandlersConfig(data)
+    assert quota_handlers.scheduler.jitter == constants.QUOTA_SCHEDULER_JITTER
+
+    data["scheduler"]["jitter"] = 0
+    assert QuotaHandlersConfig(data).scheduler.jitter == 0
+
+    for jitter in (-0.1, 1.5):
+        data["scheduler"]["jitter"] = jitter
+        with pytest.raises(ValidationError):
+            QuotaHandlersConfig(data)
+
+
 def test_ols_config_with_quota_handlesr_missing_name():
     """Test OLSConfig model with quota handlers section specified."""
     with pytest.raises(
@@ -4352,3 +4515,295 @@ def test_skills_config_validation():
         SkillsConfig(alpha=-0.1)
     with pytest.raises(ValidationError, match="less than or equal to 1"):
         SkillsConfig(alpha=1.1)
+
+
+def test_admission_control_config_defaults():
+    """Test AdmissionControlConfig with default values."""
+    cfg = AdmissionControlConfig()
+    assert cfg.max_concurrent_requests == constants.ADMISSION_MAX_CONCURRENT_REQUESTS
+    assert cfg.max_queue_size == constants.ADMISSION_MAX_QUEUE_SIZE
+    assert cfg.queue_timeout_seconds == constants.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    assert cfg.retry_after_seconds == constants.ADMISSION_RETRY_AFTER_SECONDS
+    assert cfg.mode_weights == {
+        constants.QueryMode.ASK: 1,
+        constants.QueryMode.TROUBLESHOOTING: 1,
+    }
+
+
+def test_admission_control_config_mode_weights():
+    """Test that missing mode weights default to one."""
+    cfg = AdmissionControlConfig(mode_weights={"troubleshooting": 3})
+    assert cfg.mode_weights == {
+        constants.QueryMode.ASK: 1,
+        constants.QueryMode.TROUBLESHOOTING: 3,
+    }
+
+
+def test_admission_control_config_validation():
+    """Test AdmissionControlConfig field validation boundaries."""
+    with pytest.raises(ValidationError, match="greater than or equal to 1"):
+        AdmissionControlConfig(max_concurrent_requests=0)
+    with pytest.raises(ValidationError, match="greater than or equal to 0"):
+        AdmissionControlConfig(max_queue_size=-1)
+    with pytest.raises(ValidationError, match="greater than 0"):
+        AdmissionControlConfig(queue_timeout_seconds=0)
+    with pytest.raises(ValidationError, match="mode weights need to be positive"):
+        AdmissionControlConfig(mode_weights={"ask": 0})
+    with pytest.raises(ValidationError):
+        AdmissionControlConfig(mode_weights={"unknown": 1})
+
+
+def test_ols_config_admission_control():
+    """Test that admission control is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).admission_control is None
+
+    data["admission_control"] = {"max_concurrent_requests": 4}
+    assert OLSConfig(data).admission_control.max_concurrent_requests == 4
+
+
+def test_attachment_compaction_config():
+    """Test AttachmentCompactionConfig defaults and validation."""
+    cfg = AttachmentCompactionConfig()
+    assert cfg.token_budget == constants.DEFAULT_ATTACHMENT_TOKEN_BUDGET
+    assert set(cfg.compactors) == constants.ATTACHMENT_COMPACTORS
+
+    assert AttachmentCompactionConfig(compactors=["log"]).compactors == ["log"]
+
+    with pytest.raises(ValidationError, match="greater than or equal to 0"):
+        AttachmentCompactionConfig(token_budget=-1)
+    with pytest.raises(ValidationError, match="unknown attachment compactors"):
+        AttachmentCompactionConfig(compactors=["yaml", "xml"])
+
+
+def test_ols_config_attachment_compaction():
+    """Test that attachment compaction is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).attachment_compaction is None
+
+    data["attachment_compaction"] = {"token_budget": 100}
+    assert OLSConfig(data).attachment_compaction.token_budget == 100
+
+
+def test_offload_memory_store_config():
+    """Test OffloadMemoryStoreConfig defaults and validation."""
+    cfg = OffloadMemoryStoreConfig()
+    assert cfg.budget_bytes == constants.DEFAULT_OFFLOAD_MEMORY_BUDGET_BYTES
+    assert cfg.compression_level == constants.DEFAULT_OFFLOAD_COMPRESSION_LEVEL
+
+    with pytest.raises(ValidationError, match="greater than or equal to 0"):
+        OffloadMemoryStoreConfig(budget_bytes=-1)
+    with pytest.raises(ValidationError, match="less than or equal to 22"):
+        OffloadMemoryStoreConfig(compression_level=23)
+
+
+def test_ols_config_offload_memory_store():
+    """Test that offload memory store is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).offload_memory_store is None
+
+    data["offload_memory_store"] = {"budget_bytes": 1024}
+    assert OLSConfig(data).offload_memory_store.budget_bytes == 1024
+
+
+def test_tool_result_cache_config():
+    """Test ToolResultCacheConfig defaults and validation."""
+    cfg = ToolResultCacheConfig()
+    assert cfg.ttl_seconds == constants.TOOL_RESULT_CACHE_TTL_SECONDS
+    assert cfg.max_size_bytes == constants.TOOL_RESULT_CACHE_MAX_SIZE_BYTES
+    assert cfg.max_entry_size_bytes == constants.TOOL_RESULT_CACHE_MAX_ENTRY_SIZE_BYTES
+
+    with pytest.raises(ValidationError, match="greater than 0"):
+        ToolResultCacheConfig(ttl_seconds=0)
+    with pytest.raises(ValidationError, match="greater than or equal to 0"):
+        ToolResultCacheConfig(max_size_bytes=-1)
+
+
+def test_ols_config_tool_result_cache():
+    """Test that tool result cache is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).tool_result_cache is None
+
+    data["tool_result_cache"] = {"ttl_seconds": 5}
+    assert OLSConfig(data).tool_result_cache.ttl_seconds == 5
+
+
+def test_mcp_server_config_cache_read_only_tools():
+    """Test that caching of tool results is disabled by default."""
+    assert not MCPServerConfig(name="server", url="http://server").cache_read_only_tools
+    assert MCPServerConfig(
+        name="server", url="http://server", cache_read_only_tools=True
+    ).cache_read_only_tools
+
+
+def test_background_history_compression_config():
+    """Test BackgroundHistoryCompressionConfig defaults and validation."""
+    cfg = BackgroundHistoryCompressionConfig()
+    assert cfg.trigger_ratio == constants.BACKGROUND_HISTORY_COMPRESSION_TRIGGER_RATIO
+    assert (
+        cfg.wait_timeout_seconds
+        == constants.BACKGROUND_HISTORY_COMPRESSION_WAIT_TIMEOUT_SECONDS
+    )
+
+    with pytest.raises(ValidationError, match="greater than 0"):
+        BackgroundHistoryCompressionConfig(trigger_ratio=0)
+    with pytest.raises(ValidationError, match="less than or equal to 1"):
+        BackgroundHistoryCompressionConfig(trigger_ratio=1.5)
+
+
+def test_ols_config_background_history_compression():
+    """Test that background history compression is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).background_history_compression is None
+
+    data["background_history_compression"] = {"trigger_ratio": 0.5}
+    assert OLSConfig(data).background_history_compression.trigger_ratio == 0.5
+
+
+def test_history_summarization_config():
+    """Test HistorySummarizationConfig defaults and validation."""
+    cfg = HistorySummarizationConfig(provider="p", model="m")
+    assert cfg.max_concurrency == constants.HISTORY_SUMMARIZATION_MAX_CONCURRENCY
+    assert cfg.timeout_seconds == constants.HISTORY_SUMMARIZATION_TIMEOUT_SECONDS
+
+    with pytest.raises(ValidationError, match="Field required"):
+        HistorySummarizationConfig(provider="p")
+    with pytest.raises(ValidationError, match="greater than 0"):
+        HistorySummarizationConfig(provider="p", model="m", max_concurrency=0)
+
+
+@pytest.mark.parametrize(
+    ("summarization", "error"),
+    [
+        (
+            {"provider": "unknown", "model": "m1"},
+            "history_summarization specifies an unknown provider unknown",
+        ),
+        (
+            {"provider": "p1", "model": "unknown"},
+            "history_summarization specifies an unknown model unknown",
+        ),
+        ({"provider": "p1", "model": "m2"}, None),
+    ],
+)
+def test_config_history_summarization_model(summarization, error):
+    """Test that summarization model must be one of configured models."""
+    config = Config(
+        {
+            "llm_providers": [
+                {
+                    "name": "p1",
+                    "type": "openai",
+                    "credentials_path": "tests/config/secret/apitoken",
+                    "models": [{"name": "m1"}, {"name": "m2"}],
+                }
+            ],
+            "ols_config": {
+                "default_provider": "p1",
+                "default_model": "m1",
+                "conversation_cache": {
+                    "type": "memory",
+                    "memory": {"max_entries": 100},
+                },
+                "history_summarization": summarization,
+            },
+            "dev_config": {"disable_tls": "true"},
+        }
+    )
+    if error is None:
+        config.validate_yaml()
+        assert config.ols_config.history_summarization.model == "m2"
+    else:
+        with pytest.raises(InvalidConfigurationError, match=error):
+            config.validate_yaml()
+
+
+def test_mcp_circuit_breaker_config():
+    """Test MCPCircuitBreakerConfig defaults and validation."""
+    cfg = MCPCircuitBreakerConfig()
+    assert cfg.window_size == constants.MCP_CIRCUIT_BREAKER_WINDOW_SIZE
+    assert cfg.min_calls == constants.MCP_CIRCUIT_BREAKER_MIN_CALLS
+    assert (
+        cfg.failure_rate_threshold
+        == constants.MCP_CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD
+    )
+    assert cfg.slow_call_seconds == constants.MCP_CIRCUIT_BREAKER_SLOW_CALL_SECONDS
+
+    with pytest.raises(ValidationError, match="less than or equal to 1"):
+        MCPCircuitBreakerConfig(failure_rate_threshold=1.5)
+    with pytest.raises(ValidationError, match="greater than 0"):
+        MCPCircuitBreakerConfig(probe_interval_seconds=0)
+    with pytest.raises(ValidationError, match="min_calls must not be greater"):
+        MCPCircuitBreakerConfig(window_size=5, min_calls=10)
+
+
+def test_ols_config_mcp_circuit_breaker():
+    """Test that MCP circuit breaker is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).mcp_circuit_breaker is None
+
+    data["mcp_circuit_breaker"] = {"slow_call_seconds": 3}
+    assert OLSConfig(data).mcp_circuit_breaker.slow_call_seconds == 3
+
+
+def test_tracing_config():
+    """Test TracingConfig defaults and validation."""
+    cfg = TracingConfig()
+    assert cfg.exporter == constants.TRACING_EXPORTER_OTLP
+    assert cfg.otlp_endpoint == constants.TRACING_OTLP_ENDPOINT
+    assert cfg.sample_ratio == 1.0
+
+    cfg = TracingConfig(exporter="file", file_path="/tmp/traces.jsonl")  # noqa: S108
+    assert cfg.file_path == "/tmp/traces.jsonl"  # noqa: S108
+
+    with pytest.raises(ValidationError, match="file_path is required"):
+        TracingConfig(exporter="file")
+    with pytest.raises(ValidationError):
+        TracingConfig(exporter="jaeger")
+    with pytest.raises(ValidationError, match="less than or equal to 1"):
+        TracingConfig(sample_ratio=2)
+
+
+def test_ols_config_tracing():
+    """Test that tracing is parsed only when configured."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    assert OLSConfig(data).tracing is None
+
+    data["tracing"] = {"exporter": "otlp", "otlp_endpoint": "http://collector:4318"}
+    assert OLSConfig(data).tracing.otlp_endpoint == "http://collector:4318"
+
+
+def test_event_loop_monitor_config():
+    """Test that event loop monitor is enabled by default and validated."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    cfg = OLSConfig(data).event_loop_monitor
+    assert cfg.enabled
+    assert not cfg.capture_stacks
+    assert cfg.interval_seconds == constants.EVENT_LOOP_MONITOR_INTERVAL_SECONDS
+
+    data["event_loop_monitor"] = {"enabled": False}
+    assert not OLSConfig(data).event_loop_monitor.enabled
+
+    with pytest.raises(ValidationError, match="greater than 0"):
+        EventLoopMonitorConfig(lag_threshold_seconds=0)
+    with pytest.raises(ValidationError, match="greater than or equal to 1"):
+        EventLoopMonitorConfig(max_offenders=0)
+
+
+def test_profiling_config():
+    """Test that profiling is enabled by default with limits validated."""
+    data = {"conversation_cache": {"type": "memory", "memory": {"max_entries": 10}}}
+    cfg = OLSConfig(data).profiling
+    assert cfg.enabled
+    assert not cfg.trace_memory_at_startup
+    assert cfg.max_duration_seconds == constants.PROFILING_MAX_DURATION_SECONDS
+
+    data["profiling"] = {"enabled": False, "max_stacks": 10}
+    cfg = OLSConfig(data).profiling
+    assert not cfg.enabled
+    assert cfg.max_stacks == 10
+
+    with pytest.raises(ValidationError, match="greater than 0"):
+        ProfilingConfig(max_duration_seconds=0)
+    with pytest.raises(ValidationError, match="greater than or equal to 1"):
+        ProfilingConfig(tracemalloc_frames=0)
@@ -8,6 +8,7 @@ config.ols_config.authentication_config.module = "k8s"
 from ols.app.endpoints import (  # noqa:E402
     authorized,
     conversations,
+    diagnostics,
     feedback,
     health,
     mcp_apps,
@@ -38,9 +39,10 @@ def test_include_routers():
     include_routers(app)
 
     # are all routers added?
-    assert len(app.routers) == 10
+    assert len(app.routers) == 11
     assert authorized.router in app.routers
     assert conversations.router in app.routers
+    assert diagnostics.router in app.routers
     assert feedback.router in app.routers
     assert health.router in app.routers
     assert mcp_apps.router in app.routers
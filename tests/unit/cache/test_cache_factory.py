@@ -5,11 +5,13 @@ from unittest.mock import patch
 import pytest
 
 from ols import constants
-from ols.app.models.config import ConversationCacheConfig
+from ols.app.models.config import ConversationCacheConfig, ResponseCacheConfig
 from ols.src.cache.cache_factory import (
     CacheFactory,
     InMemoryCache,
+    InMemoryResponseCache,
     PostgresCache,
+    PostgresResponseCache,
 )
 
 
@@ -66,3 +68,32 @@ def test_conversation_cache_wrong_cache(invalid_cache_type_config):
     """Check if wrong cache configuration is detected properly."""
     with pytest.raises(ValueError, match="Invalid cache type"):
         CacheFactory.conversation_cache(invalid_cache_type_config)
+
+
+def test_response_cache_in_memory():
+    """Check if InMemoryResponseCache is returned by factory."""
+    config = ResponseCacheConfig({"type": constants.CACHE_TYPE_MEMORY})
+    cache = CacheFactory.response_cache(config)
+    assert isinstance(cache, InMemoryResponseCache)
+
+
+def test_response_cache_in_postgres():
+    """Check if PostgresResponseCache is returned by factory."""
+    config = ResponseCacheConfig(
+        {
+            "type": constants.CACHE_TYPE_POSTGRES,
+            constants.CACHE_TYPE_POSTGRES: {"host": "localhost", "port": 5432},
+        }
+    )
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect"):
+        cache = CacheFactory.response_cache(config)
+    assert isinstance(cache, PostgresResponseCache)
+
+
+def test_response_cache_wrong_cache():
+    """Check if wrong response cache configuration is detected properly."""
+    config = ResponseCacheConfig()
+    config.type = "foo bar baz"
+    with pytest.raises(ValueError, match="Invalid response cache type"):
+        CacheFactory.response_cache(config)
@@ -0,0 +1,219 @@
+"""Unit tests for LLM response cache implementations."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+
+from ols import constants
+from ols.app.models.config import ResponseCacheConfig
+from ols.src.cache.cache_error import CacheError
+from ols.src.cache.in_memory_response_cache import InMemoryResponseCache
+from ols.src.cache.postgres_response_cache import PostgresResponseCache
+from ols.src.cache.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cosine_similarity,
+)
+
+
+def cached_response(query, embedding=None, text="answer"):
+    """Create cached response with a single text chunk."""
+    return CachedResponse(
+        query=query, embedding=embedding, chunks=[{"type": "text", "text": text}]
+    )
+
+
+@pytest.fixture
+def cache():
+    """Fixture with in-memory response cache."""
+    return InMemoryResponseCache(
+        ResponseCacheConfig(
+            {
+                "type": constants.CACHE_TYPE_MEMORY,
+                constants.CACHE_TYPE_MEMORY: {"max_entries": 2},
+                "similarity_threshold": 0.9,
+                "ttl_seconds": 60,
+            }
+        )
+    )
+
+
+def test_construct_key():
+    """Test that every part of the generation context changes the key."""
+    key = ResponseCache.construct_key("p", "m", "prompt", ["doc1", "doc2"])
+    assert key == ResponseCache.construct_key("p", "m", "prompt", ["doc1", "doc2"])
+    assert key != ResponseCache.construct_key("p2", "m", "prompt", ["doc1", "doc2"])
+    assert key != ResponseCache.construct_key("p", "m2", "prompt", ["doc1", "doc2"])
+    assert key != ResponseCache.construct_key("p", "m", "prompt2", ["doc1", "doc2"])
+    assert key != ResponseCache.construct_key("p", "m", "prompt", ["doc2", "doc1"])
+
+
+def test_cosine_similarity():
+    """Test cosine similarity computation."""
+    assert cosine_similarity([1.0, 0.0], [2.0, 0.0]) == pytest.approx(1.0)
+    assert cosine_similarity([1.0, 0.0], [0.0, 1.0]) == pytest.approx(0.0)
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+    assert cosine_similarity([1.0], [1.0, 0.0]) == 0.0
+
+
+def test_cached_response_serialization():
+    """Test conversion of cached response to and from dictionary."""
+    response = cached_response("query", [0.1, 0.2], text="ünicode")
+    assert CachedResponse.from_dict(response.to_dict()) == response
+    assert response.size == len("ünicode".encode("utf-8"))
+
+
+def test_in_memory_exact_and_similar_match(cache):
+    """Test lookup by exact query and by similar embedding."""
+    cache.insert("key", cached_response("what is a pod", [1.0, 0.0]))
+
+    assert cache.get("key", "what is a pod", None).query == "what is a pod"
+    assert cache.get("key", "what's a pod", [0.99, 0.05]).query == "what is a pod"
+    assert cache.get("key", "how to scale", [0.0, 1.0]) is None
+    assert cache.get("other-key", "what is a pod", [1.0, 0.0]) is None
+
+
+def test_in_memory_best_match(cache):
+    """Test that the most similar response is returned."""
+    cache.insert("key", cached_response("first", [1.0, 0.0], text="1"))
+    cache.insert("key", cached_response("second", [0.95, 0.3], text="2"))
+
+    assert cache.get("key", "query", [0.94, 0.32]).chunks[0]["text"] == "2"
+
+
+def test_in_memory_ttl(cache):
+    """Test that expired responses are not returned."""
+    with patch("ols.src.cache.in_memory_response_cache.time.time") as time:
+        time.return_value = 1000.0
+        cache.insert("key", cached_response("query"))
+        time.return_value = 1059.0
+        assert cache.get("key", "query", None) is not None
+        time.return_value = 1061.0
+        assert cache.get("key", "query", None) is None
+
+
+def test_in_memory_lru_eviction(cache):
+    """Test that least recently used response is evicted."""
+    cache.insert("key", cached_response("a"))
+    cache.insert("key", cached_response("b"))
+    assert cache.get("key", "a", None) is not None
+    cache.insert("key", cached_response("c"))
+
+    assert cache.get("key", "b", None) is None
+    assert cache.get("key", "a", None) is not None
+    assert cache.get("key", "c", None) is not None
+    assert cache.ready()
+
+
+def test_in_memory_similarity_candidates_bounded(cache):
+    """Test that only the most recent responses are compared by embedding."""
+    cache.capacity = 10
+    cache.insert("key", cached_response("old", [1.0, 0.0]))
+    cache.insert("key", cached_response("new", [0.0, 1.0]))
+
+    with patch.object(constants, "RESPONSE_CACHE_MAX_CANDIDATES", 1):
+        assert cache.get("key", "query", [1.0, 0.0]) is None
+        # exact query match is not limited
+        assert cache.get("key", "old", [1.0, 0.0]).query == "old"
+        assert cache.get("key", "query", [0.0, 1.0]).query == "new"
+
+
+@pytest.fixture
+def postgres_cache():
+    """Fixture with Postgres response cache using mocked connection."""
+    mock_cursor = MagicMock()
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresResponseCache(
+            ResponseCacheConfig(
+                {
+                    "type": constants.CACHE_TYPE_POSTGRES,
+                    constants.CACHE_TYPE_POSTGRES: {"max_entries": 10},
+                    "similarity_threshold": 0.9,
+                    "ttl_seconds": 60,
+                }
+            )
+        )
+    return cache, mock_cursor
+
+
+def test_postgres_get(postgres_cache):
+    """Test lookup of responses stored in Postgres by exact query."""
+    cache, mock_cursor = postgres_cache
+    stored = cached_response("what is a pod", [1.0, 0.0])
+    value = json.dumps({**stored.to_dict(), "embedding": None}).encode("utf-8")
+    mock_cursor.fetchone.return_value = (memoryview(value), [1.0, 0.0])
+
+    assert cache.get("key", "what is a pod", [1.0, 0.0]) == stored
+    mock_cursor.execute.assert_called_with(
+        PostgresResponseCache.SELECT_RESPONSE_STATEMENT, ("key", "what is a pod", 60)
+    )
+
+    mock_cursor.fetchone.return_value = None
+    assert cache.get("key", "what is a pod", None) is None
+
+
+def test_postgres_get_similar(postgres_cache):
+    """Test that only embeddings of recent responses are scanned."""
+    cache, mock_cursor = postgres_cache
+    stored = cached_response("what is a pod", [1.0, 0.0])
+    value = json.dumps({**stored.to_dict(), "embedding": None}).encode("utf-8")
+    mock_cursor.fetchone.side_effect = [None, (memoryview(value), [1.0, 0.0])]
+    mock_cursor.fetchall.return_value = [
+        ("how to scale", [0.0, 1.0]),
+        ("what is a pod", [1.0, 0.0]),
+    ]
+
+    assert cache.get("key", "what's a pod", [0.99, 0.05]) == stored
+
+    calls = mock_cursor.execute.call_args_list[-3:]
+    assert [c.args for c in calls] == [
+        (PostgresResponseCache.SELECT_RESPONSE_STATEMENT, ("key", "what's a pod", 60)),
+        (
+            PostgresResponseCache.SELECT_EMBEDDINGS_STATEMENT,
+            ("key", 60, constants.RESPONSE_CACHE_MAX_CANDIDATES),
+        ),
+        (PostgresResponseCache.SELECT_RESPONSE_STATEMENT, ("key", "what is a pod", 60)),
+    ]
+
+    mock_cursor.fetchone.side_effect = [None]
+    mock_cursor.fetchall.return_value = [("how to scale", [0.0, 1.0])]
+    assert cache.get("key", "what's a pod", [0.99, 0.05]) is None
+
+
+@pytest.mark.parametrize("over_capacity", [True, False])
+def test_postgres_insert(postgres_cache, over_capacity):
+    """Test that insert upserts the response and cleans up old entries."""
+    cache, mock_cursor = postgres_cache
+    mock_cursor.fetchone.return_value = (over_capacity,)
+    response = cached_response("query", [1.0, 0.0])
+
+    cache.insert("key", response)
+
+    statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    upsert = statements.index(PostgresResponseCache.UPSERT_RESPONSE_STATEMENT)
+    assert statements[upsert:] == [
+        PostgresResponseCache.UPSERT_RESPONSE_STATEMENT,
+        PostgresResponseCache.DELETE_EXPIRED_STATEMENT,
+        PostgresResponseCache.OVER_CAPACITY_STATEMENT,
+    ] + ([PostgresResponseCache.DELETE_OLDEST_STATEMENT] if over_capacity else [])
+    params = mock_cursor.execute.call_args_list[upsert].args[1]
+    assert params[3] == [1.0, 0.0]
+    assert json.loads(params[2])["embedding"] is None
+    assert mock_cursor.execute.call_args_list[-1].args[1] == (10,)
+    cache.connection.commit.assert_called()
+    assert cache.connection.autocommit is True
+
+
+def test_postgres_insert_error(postgres_cache):
+    """Test that database errors are rolled back and reported as CacheError."""
+    cache, mock_cursor = postgres_cache
+    mock_cursor.execute.side_effect = [None, psycopg2.DatabaseError("boom")]
+
+    with pytest.raises(CacheError, match=r"PostgresResponseCache\.insert"):
+        cache.insert("key", cached_response("query"))
+    cache.connection.rollback.assert_called_once()
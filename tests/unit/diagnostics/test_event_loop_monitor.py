@@ -0,0 +1,72 @@
+"""Unit tests for the event loop lag monitor."""
+
+import asyncio
+import time
+
+import pytest
+
+from ols import config
+from ols.app.models.config import EventLoopMonitorConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.diagnostics.event_loop_monitor import EventLoopMonitor  # noqa: E402
+
+
+def test_record_lag_keeps_only_blocking_events():
+    """Test that only lags above the threshold are kept as blocking events."""
+    monitor = EventLoopMonitor(
+        EventLoopMonitorConfig(lag_threshold_seconds=0.1, max_offenders=2)
+    )
+
+    for lag in (0.01, 0.2, 0.05, 0.3, 0.4):
+        monitor.record_lag(lag)
+
+    assert [event.lag for event in monitor.blocking_events()] == [0.3, 0.4]
+    assert monitor.last_lag == 0.4
+    assert monitor.max_lag == 0.4
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_detected():
+    """Test that a blocking call in a coroutine is measured as lag."""
+    monitor = EventLoopMonitor(
+        EventLoopMonitorConfig(interval_seconds=0.01, lag_threshold_seconds=0.05)
+    )
+    monitor.start()
+    await asyncio.sleep(0.03)
+    time.sleep(0.15)  # noqa: ASYNC251
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    events = monitor.blocking_events()
+    assert len(events) == 1
+    assert events[0].lag >= 0.1
+    assert events[0].stack is None
+
+
+@pytest.mark.asyncio
+async def test_stack_of_blocking_coroutine_is_captured():
+    """Test that debug mode captures the stack of the code holding the loop."""
+    monitor = EventLoopMonitor(
+        EventLoopMonitorConfig(
+            interval_seconds=0.01, lag_threshold_seconds=0.05, capture_stacks=True
+        )
+    )
+
+    async def blocking_coroutine():
+        time.sleep(0.3)  # noqa: ASYNC251
+
+    monitor.start()
+    await asyncio.sleep(0.03)
+    await asyncio.create_task(blocking_coroutine(), name="blocker")
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    events = monitor.blocking_events()
+    assert len(events) == 1
+    assert events[0].lag >= 0.25
+    assert events[0].task.startswith("blocker (")
+    assert events[0].task.endswith("blocking_coroutine)")
+    assert "blocking_coroutine" in "".join(events[0].stack)
@@ -0,0 +1,85 @@
+"""Unit tests for attribution of memory to allocation sites."""
+
+import threading
+import tracemalloc
+
+import pytest
+
+from ols.app.models.config import ProfilingConfig
+from ols.src.diagnostics import code_paths
+from ols.src.diagnostics.code_paths import package_name, short_path
+from ols.src.diagnostics.memory_profiler import MemoryProfiler
+from ols.src.diagnostics.sampling_profiler import ProfilerBusyError
+
+SITE_PREFIX = "tests/unit/diagnostics/test_memory_profiler.py:"
+
+
+def allocate_in_background(stop: threading.Event, allocated: list) -> None:
+    """Allocate memory until stopped."""
+    while not stop.wait(0.001):
+        allocated.append(bytearray(10_000))
+
+
+def test_report_traces_allocations_during_window():
+    """Test that allocations made during the window are attributed to their site."""
+    stop = threading.Event()
+    allocated: list = []
+    thread = threading.Thread(target=allocate_in_background, args=(stop, allocated))
+    profiler = MemoryProfiler(ProfilingConfig(tracemalloc_frames=5))
+
+    thread.start()
+    try:
+        report = profiler.report(0.1, top=5)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert not tracemalloc.is_tracing()
+    assert not report.traced_since_startup
+    assert report.compared_to == "window"
+    assert len(report.top_growth) <= 5
+    assert any(
+        site.site.startswith(SITE_PREFIX) and site.size_diff > 0
+        for site in report.top_growth
+    )
+    assert report.packages
+
+
+def test_report_compares_to_previous_snapshot():
+    """Test zero length window when memory is traced continuously."""
+    profiler = MemoryProfiler(ProfilingConfig())
+    tracemalloc.start()
+    try:
+        first = profiler.report(0, top=3)
+        _allocated = [bytearray(100_000) for _ in range(5)]
+        second = profiler.report(0, top=3)
+    finally:
+        tracemalloc.stop()
+
+    assert first.traced_since_startup
+    assert first.compared_to == "window"
+    assert second.compared_to == "previous_snapshot"
+    assert second.top_growth[0].site.startswith(SITE_PREFIX)
+    assert second.top_growth[0].size_diff >= 500_000
+
+
+def test_only_one_report_at_a_time():
+    """Test that report cannot be made while another one is made."""
+    profiler = MemoryProfiler(ProfilingConfig())
+    profiler._lock.acquire()
+
+    with pytest.raises(ProfilerBusyError):
+        profiler.report(0, top=1)
+
+
+def test_code_paths():
+    """Test short file names and package attribution."""
+    installed = "/usr/lib/python3.11/site-packages/llama_index/core/docstore.py"
+    assert short_path(installed) == "llama_index/core/docstore.py"
+    assert package_name(installed) == "llama_index"
+    assert package_name("/venv/lib/site-packages/six.py") == "six"
+    assert package_name(code_paths.__file__) == "ols.src.diagnostics"
+    assert package_name("/usr/lib/python3.11/json/decoder.py") is None
+    assert short_path("/usr/lib/python3.11/json/decoder.py") == (
+        "/usr/lib/python3.11/json/decoder.py"
+    )
@@ -0,0 +1,120 @@
+"""Unit tests for the in-process sampling profiler."""
+
+import threading
+from collections import Counter
+
+import pytest
+
+from ols.app.models.config import ProfilingConfig
+from ols.src.diagnostics.sampling_profiler import (
+    SPEEDSCOPE_SCHEMA,
+    TRUNCATED_FRAME,
+    Profile,
+    ProfilerBusyError,
+    SamplingProfiler,
+    to_collapsed,
+    to_speedscope,
+)
+
+
+def busy_waiting(stop: threading.Event) -> None:
+    """Keep the thread alive until stopped."""
+    while not stop.wait(0.001):
+        pass
+
+
+@pytest.fixture
+def sampled_threads():
+    """Run two threads which are sampled by the profiler."""
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=busy_waiting, args=(stop,), name=f"sampled-{i}")
+        for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    yield threads
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_profile_samples_other_threads(sampled_threads):
+    """Test that stacks of other threads are sampled."""
+    profiler = SamplingProfiler(ProfilingConfig(sampling_interval_seconds=0.005))
+
+    profile = profiler.profile(0.05)
+
+    stacks = [frames for (thread, frames) in profile.stacks if thread == "sampled-0"]
+    assert stacks
+    assert any(frame[0] == "busy_waiting" for frames in stacks for frame in frames)
+    assert sum(profile.stacks.values()) > 1
+
+
+def test_profile_limits_stack_depth_and_count(sampled_threads):
+    """Test that deep stacks are truncated and distinct stacks are limited."""
+    profiler = SamplingProfiler(
+        ProfilingConfig(
+            sampling_interval_seconds=0.005, max_stacks=1, max_stack_depth=2
+        )
+    )
+
+    profile = profiler.profile(0.05)
+
+    assert len(profile.stacks) == 1
+    ((_thread, frames),) = profile.stacks
+    assert len(frames) == 3
+    assert frames[0] == TRUNCATED_FRAME
+    assert profile.dropped_samples > 0
+
+
+def test_only_one_profile_at_a_time():
+    """Test that profile cannot be taken while another one is taken."""
+    profiler = SamplingProfiler(ProfilingConfig())
+    profiler._lock.acquire()
+
+    with pytest.raises(ProfilerBusyError):
+        profiler.profile(0.01)
+
+
+def sample_profile():
+    """Create profile with two threads."""
+    outer = ("run", "asyncio/runners.py", 86)
+    inner = ("handler;x", "ols/app/endpoints/ols.py", 10)
+    return Profile(
+        duration=1.0,
+        interval=0.01,
+        stacks=Counter(
+            {
+                ("MainThread", (outer, inner)): 3,
+                ("worker", (outer,)): 1,
+            }
+        ),
+    )
+
+
+def test_to_collapsed():
+    """Test collapsed stack format."""
+    assert to_collapsed(sample_profile()) == (
+        "MainThread;run (asyncio/runners.py:86);"
+        "handler:x (ols/app/endpoints/ols.py:10) 3\n"
+        "worker;run (asyncio/runners.py:86) 1\n"
+    )
+    assert to_collapsed(Profile(duration=1.0, interval=0.01)) == ""
+
+
+def test_to_speedscope():
+    """Test speedscope format with one profile per thread and shared frames."""
+    speedscope = to_speedscope(sample_profile())
+
+    assert speedscope["$schema"] == SPEEDSCOPE_SCHEMA
+    assert speedscope["shared"]["frames"] == [
+        {"name": "run", "file": "asyncio/runners.py", "line": 86},
+        {"name": "handler;x", "file": "ols/app/endpoints/ols.py", "line": 10},
+    ]
+    main, worker = speedscope["profiles"]
+    assert main["name"] == "MainThread"
+    assert main["samples"] == [[0, 1]]
+    assert main["weights"] == [pytest.approx(0.03)]
+    assert worker["samples"] == [[0]]
+    assert worker["endValue"] == 1.0
@@ -1,13 +1,26 @@
 """Unit tests for fake provider."""
 
+import time
 from unittest.mock import MagicMock, patch
 
+import openai
 import pytest
 from langchain_community.llms import FakeListLLM
 from langchain_community.llms.fake import FakeStreamingListLLM
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.tools import tool
 
+from ols import config
 from ols.app.models.config import ProviderConfig
-from ols.src.llms.providers.fake_provider import FakeProvider
+from ols.src.llms.providers.fake_provider import FakeProvider, SimulatedChatModel
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.query_helpers.llm_execution_agent import (  # noqa: E402
+    tool_calls_from_tool_calls_chunks,
+)
 
 
 @pytest.fixture
@@ -140,3 +153,165 @@ def test_streaming_interface(provider_streaming_config):
     assert fake.default_params.get("response") == "Hello"
     assert len(llm.responses[0]) == fake.default_params.get("chunks")
     assert llm.sleep == 0.1
+
+
+def simulated_llm(**simulation):
+    """Load simulated chat model with given simulation settings."""
+    config = ProviderConfig(
+        {
+            "name": "some_provider",
+            "type": "fake_provider",
+            "models": [{"name": "fake_model"}],
+            "fake_provider_config": {
+                "url": "http://example.com",
+                "stream": True,
+                "mcp_tool_call": False,
+                "response": "Kubernetes is great",
+                "chunks": 30,
+                "sleep": 0.1,
+                "simulation": {"seed": 42, **simulation},
+            },
+        }
+    )
+    return FakeProvider(model="fake_model", params={}, provider_config=config).load()
+
+
+@tool
+def get_pods(namespace: str, limit: int) -> str:
+    """List pods in namespace."""
+    return namespace * limit
+
+
+async def collect(llm, messages=None):
+    """Stream the model and return all chunks."""
+    return [chunk async for chunk in llm.astream(messages or [HumanMessage("hello")])]
+
+
+def finish_reason(chunks):
+    """Return finish reason reported by the streamed chunks."""
+    return next(
+        chunk.response_metadata["finish_reason"]
+        for chunk in chunks
+        if "finish_reason" in chunk.response_metadata
+    )
+
+
+@pytest.mark.asyncio
+async def test_simulated_text_response():
+    """Test that response is streamed word by word after time to first token."""
+    llm = simulated_llm(response_tokens=5, time_to_first_token=0.05)
+    assert isinstance(llm, SimulatedChatModel)
+
+    start = time.monotonic()
+    chunks = await collect(llm)
+
+    assert time.monotonic() - start >= 0.05
+    assert all(isinstance(chunk, AIMessageChunk) for chunk in chunks)
+    assert "".join(chunk.content for chunk in chunks) == (
+        "Kubernetes is great Kubernetes is"
+    )
+    assert finish_reason(chunks) == "stop"
+    assert llm.invoke("hello").content == "Kubernetes is great Kubernetes is"
+
+
+@pytest.mark.asyncio
+async def test_simulated_token_delays():
+    """Test distributions of delays between tokens."""
+    for distribution in ("constant", "uniform", "exponential"):
+        llm = simulated_llm(token_delay=0.01, delay_distribution=distribution)
+        delays = [llm._token_delay() for _ in range(200)]
+        assert all(delay >= 0 for delay in delays)
+        assert sum(delays) / len(delays) == pytest.approx(0.01, rel=0.3)
+    assert simulated_llm()._token_delay() == 0
+
+
+@pytest.mark.asyncio
+async def test_simulated_scripted_tool_calls():
+    """Test that scripted tool call rounds are followed by text answer."""
+    llm = simulated_llm(
+        response_tokens=1,
+        tool_call_rounds=[
+            [
+                {"name": "get_pods", "args": {"namespace": "ns1", "limit": 1}},
+                {"name": "get_pods", "args": {"namespace": "ns2", "limit": 2}},
+            ]
+        ],
+    )
+    bound = llm.bind_tools([get_pods])
+
+    chunks = await collect(bound)
+    tool_calls = tool_calls_from_tool_calls_chunks(
+        [chunk for chunk in chunks if chunk.tool_call_chunks]
+    )
+    assert [call["args"] for call in tool_calls] == [
+        {"namespace": "ns1", "limit": 1},
+        {"namespace": "ns2", "limit": 2},
+    ]
+    assert finish_reason(chunks) == "tool_calls"
+
+    # second round sees the tool calls in history and answers with text
+    history = [HumanMessage("hello"), AIMessage(content="", tool_calls=tool_calls)]
+    chunks = await collect(bound, history)
+    assert not any(chunk.tool_call_chunks for chunk in chunks)
+    assert chunks[0].content == "Kubernetes"
+
+    # no tool calls when tools are not allowed in the final round
+    final = llm.bind_tools([get_pods], tool_choice="none")
+    assert not any(chunk.tool_call_chunks for chunk in await collect(final))
+
+
+@pytest.mark.asyncio
+async def test_simulated_random_tool_calls():
+    """Test random tool calls with arguments generated from tool schema."""
+    llm = simulated_llm(
+        random_tool_call_rounds=1,
+        random_tool_calls_per_round=3,
+        tool_call_payload_size=100,
+    )
+
+    chunks = await collect(llm.bind_tools([get_pods]))
+    tool_calls = tool_calls_from_tool_calls_chunks(chunks)
+
+    assert len(tool_calls) == 3
+    assert len({call["id"] for call in tool_calls}) == 3
+    for call in tool_calls:
+        assert call["name"] == "get_pods"
+        assert len(call["args"]["namespace"]) == 100
+        assert isinstance(call["args"]["limit"], int)
+
+
+@pytest.mark.asyncio
+async def test_simulated_failures():
+    """Test injected rate limit and timeout errors."""
+    with pytest.raises(openai.RateLimitError) as e:
+        await collect(simulated_llm(rate_limit_error_rate=1))
+    assert e.value.status_code == 429
+
+    with pytest.raises(openai.APITimeoutError):
+        await collect(simulated_llm(timeout_error_rate=1, timeout_seconds=0))
+
+    with pytest.raises(openai.RateLimitError):
+        simulated_llm(rate_limit_error_rate=1).invoke("hello")
+
+
+class TokenCollector(AsyncCallbackHandler):
+    """Callback handler collecting streamed tokens."""
+
+    def __init__(self):
+        """Initialize the handler."""
+        self.tokens = []
+
+    async def on_llm_new_token(self, token, **kwargs):
+        """Collect the token."""
+        self.tokens.append(token)
+
+
+@pytest.mark.asyncio
+async def test_simulated_tokens_are_counted():
+    """Test that streamed tokens reach callbacks like with real providers."""
+    handler = TokenCollector()
+    llm = simulated_llm(response_tokens=3)
+
+    await collect(llm.with_config(callbacks=[handler]))
+
+    assert "".join(handler.tokens) == "Kubernetes is great"
@@ -1,10 +1,13 @@
 """Unit tests for the providers module."""
 
+from unittest.mock import patch
+
 import pytest
 from langchain_core.language_models.fake_chat_models import FakeChatModel
 
 from ols import config, constants
 from ols.app.models.config import ProviderConfig, TLSSecurityProfile
+from ols.src.llms import import_providers
 from ols.src.llms.providers.provider import LLMProvider
 from ols.src.llms.providers.registry import (
     LLMProvidersRegistry,
@@ -14,6 +17,8 @@ from ols.src.llms.providers.registry import (
 
 def test_providers_are_registered():
     """Test providers are auto registered."""
+    import_providers()
+
     assert constants.PROVIDER_OPENAI in LLMProvidersRegistry.llm_providers
     assert constants.PROVIDER_WATSONX in LLMProvidersRegistry.llm_providers
     assert constants.PROVIDER_FAKE in LLMProvidersRegistry.llm_providers
@@ -54,6 +59,27 @@ def test_providers_are_registered():
     assert LLMProvidersRegistry.llm_providers[constants.PROVIDER_BEDROCK] == Bedrock
 
 
+def test_import_provider():
+    """Test that provider module is imported when its type is first needed."""
+    with (
+        patch.dict(LLMProvidersRegistry.llm_providers, clear=True),
+        patch("ols.src.llms.providers.registry.importlib.import_module") as importer,
+    ):
+        LLMProvidersRegistry.import_provider(constants.PROVIDER_OPENAI)
+        importer.assert_called_once_with("ols.src.llms.providers.openai")
+
+        # unknown types are left to the caller to report
+        importer.reset_mock()
+        LLMProvidersRegistry.import_provider("unknown")
+        importer.assert_not_called()
+
+    # registered types are not imported again
+    LLMProvidersRegistry.import_provider(constants.PROVIDER_OPENAI)
+    with patch("ols.src.llms.providers.registry.importlib.import_module") as importer:
+        LLMProvidersRegistry.import_provider(constants.PROVIDER_OPENAI)
+        importer.assert_not_called()
+
+
 def test_valid_provider_is_registered():
     """Test valid (`LLMProvider` subclass) is registered."""
 
@@ -12,6 +12,7 @@ from ols.src.llms.llm_loader import (
     ModelConfigMissingError,
     UnknownProviderError,
     UnsupportedProviderError,
+    import_configured_providers,
     load_llm,
 )
 from ols.src.llms.providers.provider import LLMProvider
@@ -101,3 +102,24 @@ def test_load_llm_no_provider_config():
         match=f"Providers configuration missing in {constants.DEFAULT_CONFIGURATION_FILE}",
     ):
         load_llm(provider="fake-provider", model="model")
+
+
+def test_import_configured_providers():
+    """Test that only configured provider types are imported."""
+    providers = LLMProviders(
+        [
+            {"name": "p1", "type": "openai", "models": [{"name": "model"}]},
+            {"name": "p2", "type": "fake_provider", "models": [{"name": "model"}]},
+        ]
+    )
+
+    with patch(
+        "ols.src.llms.llm_loader.LLMProvidersRegistry.import_provider"
+    ) as import_provider:
+        import_configured_providers(providers)
+        import_configured_providers(None)
+
+    assert [call.args for call in import_provider.call_args_list] == [
+        (constants.PROVIDER_OPENAI,),
+        (constants.PROVIDER_FAKE,),
+    ]
@@ -0,0 +1,164 @@
+"""Unit tests for admission control of LLM queries."""
+
+import gc
+import threading
+import time
+
+import pytest
+
+from ols import config
+from ols.app.models.config import AdmissionControlConfig
+from ols.constants import QueryMode
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.query_helpers.admission_controller import (  # noqa: E402
+    REJECTION_QUEUE_FULL,
+    REJECTION_TIMEOUT,
+    AdmissionController,
+    AdmissionRejectedError,
+)
+
+
+def controller(**kwargs):
+    """Create admission controller with given configuration."""
+    return AdmissionController(AdmissionControlConfig(**kwargs))
+
+
+def slots_in_use(admission_controller, provider="p", model="m"):
+    """Return slots in use for provider and model."""
+    return admission_controller._limiters[(provider, model)].in_use
+
+
+def test_acquire_and_release():
+    """Test that slots are taken and returned."""
+    admission_controller = controller(max_concurrent_requests=2)
+    first = admission_controller.acquire("p", "m", QueryMode.ASK)
+    second = admission_controller.acquire("p", "m", QueryMode.ASK)
+    assert slots_in_use(admission_controller) == 2
+
+    first.release()
+    first.release()
+    assert slots_in_use(admission_controller) == 1
+    second.release()
+    assert slots_in_use(admission_controller) == 0
+
+
+def test_limits_are_per_provider_and_model():
+    """Test that each provider and model has its own slots."""
+    admission_controller = controller(max_concurrent_requests=1, max_queue_size=0)
+    _admissions = [
+        admission_controller.acquire("p", "m", QueryMode.ASK),
+        admission_controller.acquire("p", "m2", QueryMode.ASK),
+        admission_controller.acquire("p2", "m", QueryMode.ASK),
+    ]
+
+    with pytest.raises(AdmissionRejectedError):
+        admission_controller.acquire("p", "m", QueryMode.ASK)
+
+
+def test_reject_when_queue_is_full():
+    """Test fast rejection with retry hint when no query can wait."""
+    admission_controller = controller(
+        max_concurrent_requests=1, max_queue_size=0, retry_after_seconds=7
+    )
+    _admission = admission_controller.acquire("p", "m", QueryMode.ASK)
+
+    with pytest.raises(AdmissionRejectedError) as e:
+        admission_controller.acquire("p", "m", QueryMode.ASK)
+    assert e.value.reason == REJECTION_QUEUE_FULL
+    assert e.value.retry_after == 7
+
+
+def test_reject_after_queue_timeout():
+    """Test that queued query is rejected when it does not get a slot in time."""
+    admission_controller = controller(
+        max_concurrent_requests=1, queue_timeout_seconds=0.05
+    )
+    _admission = admission_controller.acquire("p", "m", QueryMode.ASK)
+
+    start = time.monotonic()
+    with pytest.raises(AdmissionRejectedError) as e:
+        admission_controller.acquire("p", "m", QueryMode.ASK)
+    assert e.value.reason == REJECTION_TIMEOUT
+    assert time.monotonic() - start >= 0.05
+    assert len(admission_controller._limiters[("p", "m")].queue) == 0
+
+
+def test_queued_query_is_admitted_after_release():
+    """Test that waiting query gets the slot released by a running one."""
+    admission_controller = controller(max_concurrent_requests=1)
+    running = admission_controller.acquire("p", "m", QueryMode.ASK)
+    admitted = []
+
+    thread = threading.Thread(
+        target=lambda: admitted.append(
+            admission_controller.acquire("p", "m", QueryMode.ASK)
+        )
+    )
+    thread.start()
+    while not admission_controller._limiters[("p", "m")].queue:
+        time.sleep(0.001)
+    assert not admitted
+
+    running.release()
+    thread.join(timeout=5)
+    assert len(admitted) == 1
+    assert slots_in_use(admission_controller) == 1
+
+
+def test_mode_weights():
+    """Test that troubleshooting queries can take more slots."""
+    admission_controller = controller(
+        max_concurrent_requests=3,
+        max_queue_size=0,
+        mode_weights={"troubleshooting": 2},
+    )
+    _admissions = [
+        admission_controller.acquire("p", "m", QueryMode.TROUBLESHOOTING),
+        admission_controller.acquire("p", "m", QueryMode.ASK),
+    ]
+    assert slots_in_use(admission_controller) == 3
+
+    with pytest.raises(AdmissionRejectedError):
+        admission_controller.acquire("p", "m", QueryMode.ASK)
+
+
+def test_weight_is_capped_by_concurrency_limit():
+    """Test that query heavier than the limit can still run alone."""
+    admission_controller = controller(
+        max_concurrent_requests=1, mode_weights={"troubleshooting": 5}
+    )
+    _admission = admission_controller.acquire("p", "m", QueryMode.TROUBLESHOOTING)
+    assert slots_in_use(admission_controller) == 1
+
+
+@pytest.mark.asyncio
+async def test_hold_releases_after_stream():
+    """Test that slots are held until the stream is consumed."""
+    admission_controller = controller(max_concurrent_requests=1)
+
+    async def stream():
+        yield "a"
+        yield "b"
+
+    held = admission_controller.acquire("p", "m", QueryMode.ASK).hold(stream())
+    assert await anext(held) == "a"
+    assert slots_in_use(admission_controller) == 1
+    assert [item async for item in held] == ["b"]
+    assert slots_in_use(admission_controller) == 0
+
+
+def test_unused_admission_is_released_on_garbage_collection():
+    """Test that slots are returned when a held stream is never consumed."""
+    admission_controller = controller(max_concurrent_requests=1)
+
+    async def stream():
+        yield "a"
+
+    held = admission_controller.acquire("p", "m", QueryMode.ASK).hold(stream())
+    assert slots_in_use(admission_controller) == 1
+    del held
+    gc.collect()
+    assert slots_in_use(admission_controller) == 0
@@ -1,13 +1,17 @@
 """Unit tests for attachment appender."""
 
+from unittest.mock import patch
+
 import pytest
 
+from ols import constants
 from ols.app.models.models import Attachment
 from ols.src.query_helpers.attachment_appender import (
     append_attachments_to_query,
     construct_intro_message,
     format_attachment,
     retrieve_kind_name_from_yaml,
+    retrieve_resources_from_yaml,
 )
 
 
@@ -286,3 +290,77 @@ def test_retrieve_kind_name_from__broken_yaml(broken_yaml):
     kind, name = retrieve_kind_name_from_yaml(broken_yaml)
     assert kind is None
     assert name is None
+
+
+def test_retrieve_resources_from_multi_document_yaml():
+    """Check that kind and name are retrieved from all documents in YAML stream."""
+    content = """
+kind: Pod
+metadata:
+  name: private-reg
+---
+apiVersion: v1
+metadata:
+  labels:
+    name: not-a-name
+  name: private-svc
+kind: Service
+--- {kind: ConfigMap}
+---
+- not a resource
+"""
+    assert retrieve_resources_from_yaml(content) == [
+        ("Pod", "private-reg"),
+        ("Service", "private-svc"),
+        ("ConfigMap", None),
+    ]
+    assert retrieve_kind_name_from_yaml(content) == ("Pod", "private-reg")
+
+
+def test_retrieve_resources_from_yaml_with_trailing_separator():
+    """Check that empty documents are not counted as resources."""
+    content = "kind: Pod\nmetadata:\n  name: foo\n---\n"
+    assert retrieve_resources_from_yaml(content) == [("Pod", "foo")]
+    assert (
+        construct_intro_message(content)
+        == "For reference, here is the full resource YAML for Pod 'foo':"
+    )
+
+    content = "---\nkind: Pod\nmetadata:\n  name: foo\n---\n---\n"
+    assert retrieve_resources_from_yaml(content) == [("Pod", "foo")]
+
+
+def test_retrieve_resources_from_yaml_stops_after_kind_and_name():
+    """Check that the rest of document is not read once kind and name are found."""
+    content = "kind: Pod\nmetadata:\n  name: private-reg\nspec: [unterminated\n"
+    assert retrieve_resources_from_yaml(content) == [("Pod", "private-reg")]
+
+
+def test_retrieve_resources_from_yaml_size_bound():
+    """Check that only the beginning of large YAML stream is read."""
+    document = "kind: Pod\nmetadata:\n  name: pod-{}\n"
+    content = "---\n".join(document.format(i) for i in range(3))
+    with patch.object(
+        constants, "ATTACHMENT_YAML_SNIFF_MAX_SIZE", len(document.format(0)) + 7
+    ):
+        assert retrieve_resources_from_yaml(content) == [
+            ("Pod", "pod-0"),
+            (None, None),
+        ]
+
+
+def test_retrieve_resources_from_yaml_time_bound():
+    """Check that reading of YAML stream stops after timeout."""
+    content = "kind: Pod\nmetadata:\n  name: a\n---\nkind: Pod\nmetadata:\n  name: b\n"
+    with patch.object(constants, "ATTACHMENT_YAML_SNIFF_TIMEOUT_SECONDS", -1):
+        assert retrieve_resources_from_yaml(content) == [(None, None)]
+
+
+def test_construct_intro_message_multi_document_yaml(test_yaml):
+    """Check the intro message for YAML stream with more documents."""
+    message = construct_intro_message(test_yaml + "---\nkind: Service\n")
+    expected = "For reference, here are the full resource YAMLs for Pod 'private-reg':"
+    assert message == expected
+
+    message = construct_intro_message("foo: bar\n---\nkind: Service\n")
+    assert message == "For reference, here are the full resource YAMLs:"
@@ -0,0 +1,224 @@
+"""Unit tests for attachment compactor."""
+
+import pytest
+import yaml
+
+from ols import config
+from ols.app.models.config import AttachmentCompactionConfig
+from ols.app.models.models import Attachment
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    attachment_compacted_tokens_total,
+    attachment_original_tokens_total,
+)
+from ols.src.query_helpers.attachment_compactor import (  # noqa: E402
+    AttachmentCompactor,
+    LogCompactor,
+    YAMLCompactor,
+    compact_attachments,
+    compactors,
+    register_compactor_as,
+)
+
+POD_YAML = """
+apiVersion: v1
+kind: Pod
+metadata:
+  name: private-reg
+  namespace: default
+  uid: 3c1f4d2e-8a3b-4c5d-9e6f-7a8b9c0d1e2f
+  resourceVersion: "123456"
+  generation: 1
+  annotations:
+    kubectl.kubernetes.io/last-applied-configuration: '{"apiVersion":"v1"}'
+    openshift.io/scc: restricted
+  managedFields:
+  - manager: kubectl
+    operation: Update
+    fieldsV1:
+      f:spec:
+        f:containers: {}
+spec:
+  containers:
+  - name: app
+    image: private/app:1.0
+    resources: {}
+    securityContext: {}
+status:
+  phase: Pending
+  conditions:
+  - type: PodScheduled
+    status: "True"
+    lastProbeTime: null
+"""
+
+POD_LOG = """\
+2024-05-01T10:00:00Z Starting server on port 8080
+2024-05-01T10:00:01Z Connected to database
+2024-05-01T10:00:02Z Request 1 from 10.0.0.1 took 12ms
+2024-05-01T10:00:03Z Request 2 from 10.0.0.2 took 15ms
+2024-05-01T10:00:04Z Request 3 from 10.0.0.3 took 9ms
+Back-off restarting failed container
+Back-off restarting failed container
+Back-off restarting failed container
+2024-05-01T10:00:05Z Error: connection refused
+2024-05-01T10:00:06Z Request 4 from 10.0.0.4 took 11ms"""
+
+
+def test_yaml_compactor_drops_noise_fields():
+    """Test that fields without signal are dropped from resource."""
+    compacted = yaml.safe_load(YAMLCompactor().compact(POD_YAML))
+
+    assert compacted == {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "name": "private-reg",
+            "namespace": "default",
+            "annotations": {"openshift.io/scc": "restricted"},
+        },
+        "spec": {"containers": [{"name": "app", "image": "private/app:1.0"}]},
+        "status": {
+            "phase": "Pending",
+            "conditions": [{"type": "PodScheduled", "status": "True"}],
+        },
+    }
+
+
+def test_yaml_compactor_list_and_multiple_documents():
+    """Test that resources in list items and in all documents are compacted."""
+    pod = yaml.safe_load(POD_YAML)
+    content = yaml.safe_dump_all([{"kind": "List", "items": [pod, pod]}, pod])
+
+    documents = list(yaml.safe_load_all(YAMLCompactor().compact(content)))
+
+    assert len(documents) == 2
+    for resource in [*documents[0]["items"], documents[1]]:
+        assert "managedFields" not in resource["metadata"]
+        assert resource["metadata"]["name"] == "private-reg"
+
+
+@pytest.mark.parametrize("content", ["foo: [bar", "just text", ""])
+def test_yaml_compactor_invalid_or_plain(content):
+    """Test that content which is not a resource is kept."""
+    compacted = YAMLCompactor().compact(content)
+    if content == "foo: [bar":
+        assert compacted == content
+    else:
+        assert yaml.safe_load(compacted) == yaml.safe_load(content)
+
+
+def test_log_compactor():
+    """Test that runs of repeated and similar log lines are collapsed in order."""
+    assert LogCompactor().compact(POD_LOG).splitlines() == [
+        "2024-05-01T10:00:00Z Starting server on port 8080",
+        "2024-05-01T10:00:01Z Connected to database",
+        "2024-05-01T10:00:02Z Request 1 from 10.0.0.1 took 12ms",
+        "[1 similar lines]",
+        "2024-05-01T10:00:04Z Request 3 from 10.0.0.3 took 9ms",
+        "Back-off restarting failed container [repeated 3 times]",
+        "2024-05-01T10:00:05Z Error: connection refused",
+        "2024-05-01T10:00:06Z Request 4 from 10.0.0.4 took 11ms",
+    ]
+
+
+def test_log_compactor_keeps_two_similar_lines():
+    """Test that a run of two similar lines is kept unchanged."""
+    log = "10:00:01 Request 1 took 12ms\n10:00:02 Request 2 took 15ms"
+    assert LogCompactor().compact(log) == log
+
+
+def test_compactors_apply_to_attachments():
+    """Test which attachments are handled by compactors."""
+    yaml_attachment = Attachment(
+        attachment_type="api object", content_type="application/yaml", content=""
+    )
+    log_attachment = Attachment(
+        attachment_type="log", content_type="text/plain", content=""
+    )
+    assert YAMLCompactor().applies_to(yaml_attachment)
+    assert not YAMLCompactor().applies_to(log_attachment)
+    assert LogCompactor().applies_to(log_attachment)
+    assert not LogCompactor().applies_to(yaml_attachment)
+    assert not LogCompactor().applies_to(
+        Attachment(attachment_type="stack trace", content_type="text/plain", content="")
+    )
+
+
+def test_register_compactor():
+    """Test registration of compactors."""
+
+    @register_compactor_as("upper")
+    class UpperCompactor(AttachmentCompactor):
+        def applies_to(self, attachment):
+            return True
+
+        def compact(self, content):
+            return content.upper()
+
+    try:
+        assert compactors["upper"] is UpperCompactor
+    finally:
+        del compactors["upper"]
+
+    with pytest.raises(TypeError, match="AttachmentCompactor subclass required"):
+        register_compactor_as("bad")(str)
+
+
+def test_compact_attachments_within_budget():
+    """Test that attachments fitting into the budget are not compacted."""
+    attachments = [
+        Attachment(attachment_type="log", content_type="text/plain", content=POD_LOG)
+    ]
+
+    compacted = compact_attachments(
+        attachments, AttachmentCompactionConfig(token_budget=10_000)
+    )
+
+    assert compacted == attachments
+
+
+def test_compact_attachments_over_budget():
+    """Test that attachments are compacted largest first until they fit."""
+    # every line repeated, as in a log of a crash looping container
+    content = "\n".join(line for line in POD_LOG.splitlines() for _ in range(20))
+    log = Attachment(attachment_type="log", content_type="text/plain", content=content)
+    small_yaml = Attachment(
+        attachment_type="api object",
+        content_type="application/yaml",
+        content=POD_YAML,
+    )
+    plain = Attachment(
+        attachment_type="error message", content_type="text/plain", content="x " * 300
+    )
+    original_before = attachment_original_tokens_total._value.get()
+    compacted_before = attachment_compacted_tokens_total._value.get()
+
+    compacted = compact_attachments(
+        [small_yaml, log, plain], AttachmentCompactionConfig(token_budget=800)
+    )
+
+    # the log is the largest compactable attachment and compacting it is enough
+    assert compacted[0] is small_yaml
+    assert compacted[1].content == LogCompactor().compact(log.content)
+    assert compacted[1].attachment_type == "log"
+    assert compacted[2] is plain
+    original = attachment_original_tokens_total._value.get() - original_before
+    after = attachment_compacted_tokens_total._value.get() - compacted_before
+    assert 0 < after <= 800 < original
+
+
+def test_compact_attachments_enabled_compactors():
+    """Test that only configured compactors are used."""
+    attachments = [
+        Attachment(attachment_type="log", content_type="text/plain", content=POD_LOG)
+    ]
+
+    compacted = compact_attachments(
+        attachments, AttachmentCompactionConfig(token_budget=0, compactors=["yaml"])
+    )
+
+    assert compacted == attachments
@@ -1,5 +1,6 @@
 """Unit tests for DocsSummarizer PR2 class."""
 
+import asyncio
 import logging
 from typing import ClassVar
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
@@ -9,8 +10,8 @@ from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.messages.ai import AIMessageChunk
 
 from ols import config
-from ols.app.models.config import LoggingConfig, MCPServerConfig
-from ols.app.models.models import StreamChunkType, StreamedChunk
+from ols.app.models.config import LoggingConfig, MCPServerConfig, ResponseCacheConfig
+from ols.app.models.models import StreamChunkType, StreamedChunk, TokenCounter
 from ols.constants import (
     DEFAULT_MAX_ITERATIONS,
     DEFAULT_MAX_ITERATIONS_TROUBLESHOOTING,
@@ -707,3 +708,150 @@ async def test_generate_response_creates_and_cleans_offload_manager():
         assert any(
             c.type == StreamChunkType.END for c in chunks
         ), f"Expected END chunk (streaming={streaming})"
+
+
+@pytest.fixture
+def response_cache():
+    """Configure in-memory response cache for the test."""
+    config.ols_config.response_cache = ResponseCacheConfig({"type": "memory"})
+    config.services._response_cache = None
+    with patch.object(DocsSummarizer, "_query_embedding", return_value=None):
+        yield config.services.response_cache
+    config.ols_config.response_cache = None
+    config.services._response_cache = None
+
+
+@pytest.mark.asyncio
+async def test_response_generator_uses_response_cache(response_cache):
+    """Test that repeated first-turn query is replayed from response cache."""
+    summarizer = DocsSummarizer(
+        llm_loader=mock_llm_loader(mock_langchain_interface("test response")())
+    )
+    question = "What's the ultimate question with answer 42?"
+
+    first = [chunk async for chunk in summarizer.generate_response(question)]
+    with patch.object(summarizer._llm_agent, "execute") as mock_execute:
+        second = [chunk async for chunk in summarizer.generate_response(question)]
+
+    mock_execute.assert_not_called()
+    assert [(c.type, c.text) for c in second[:-1]] == [
+        (c.type, c.text) for c in first[:-1]
+    ]
+    assert "".join(c.text for c in second[:-1]) == question
+    assert second[-1].type == StreamChunkType.END
+    assert second[-1].data["token_counter"].llm_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_response_generator_does_not_cache_tool_calls(response_cache):
+    """Test that responses involving tool calls are not stored."""
+    summarizer = DocsSummarizer(
+        llm_loader=mock_llm_loader(mock_langchain_interface("test response")())
+    )
+
+    async def mock_execute(**kwargs):
+        yield StreamedChunk(type=StreamChunkType.TEXT, text="partial")
+        yield StreamedChunk(type=StreamChunkType.TOOL_CALL, data={"name": "tool"})
+        yield StreamedChunk(type=StreamChunkType.TEXT, text="answer")
+        yield StreamedChunk(type=StreamChunkType.END, data={})
+
+    with patch.object(summarizer._llm_agent, "execute", side_effect=mock_execute):
+        _ = [chunk async for chunk in summarizer.generate_response("query")]
+
+    assert len(response_cache._entries) == 0
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "history"),
+    [
+        ({"mode": QueryMode.TROUBLESHOOTING}, []),
+        ({"has_attachments": True}, []),
+        ({}, [HumanMessage(content="previous question")]),
+    ],
+)
+def test_response_cache_key_not_eligible(response_cache, kwargs, history):
+    """Test that only first-turn ask queries without attachments are cached."""
+    with patch(
+        "ols.src.query_helpers.docs_summarizer.K8sClientSingleton.get_cluster_version",
+        return_value="4.18",
+    ):
+        summarizer = DocsSummarizer(llm_loader=mock_llm_loader(None), **kwargs)
+
+    assert summarizer._response_cache_key(history, None, []) is None
+    assert DocsSummarizer(llm_loader=mock_llm_loader(None))._response_cache_key(
+        [], None, []
+    )
+
+
+@pytest.fixture
+def request_coalescing():
+    """Enable coalescing of identical in-flight requests for the test."""
+    config.ols_config.request_coalescing_enabled = True
+    yield
+    config.ols_config.request_coalescing_enabled = False
+
+
+@pytest.mark.asyncio
+async def test_response_generator_coalesces_identical_requests(request_coalescing):
+    """Test that concurrent identical requests share one LLM generation."""
+    started, release = asyncio.Event(), asyncio.Event()
+    calls = []
+
+    async def mock_execute(**kwargs):
+        calls.append(kwargs)
+        started.set()
+        yield StreamedChunk(type=StreamChunkType.TEXT, text="shared")
+        await release.wait()
+        yield StreamedChunk(
+            type=StreamChunkType.END,
+            data={
+                "rag_chunks": [],
+                "truncated": False,
+                "token_counter": TokenCounter(input_tokens=10, llm_calls=1),
+            },
+        )
+
+    async def collect(summarizer):
+        with patch.object(summarizer._llm_agent, "execute", side_effect=mock_execute):
+            return [chunk async for chunk in summarizer.generate_response("query")]
+
+    summarizers = [DocsSummarizer(llm_loader=mock_llm_loader(None)) for _ in range(2)]
+    leader = asyncio.create_task(collect(summarizers[0]))
+    await started.wait()
+    follower = asyncio.create_task(collect(summarizers[1]))
+    for _ in range(10):
+        await asyncio.sleep(0)
+    release.set()
+    leader_chunks, follower_chunks = await leader, await follower
+
+    assert len(calls) == 1
+    assert [c.text for c in follower_chunks] == [c.text for c in leader_chunks]
+    leader_counter = leader_chunks[-1].data["token_counter"]
+    follower_counter = follower_chunks[-1].data["token_counter"]
+    assert follower_counter == leader_counter
+    assert follower_counter is not leader_counter
+
+
+def test_single_flight_key():
+    """Test that only requests with identical effective inputs share a key."""
+    summarizer = DocsSummarizer(llm_loader=mock_llm_loader(None))
+    assert summarizer._single_flight_key("query", [], None, []) is None
+
+    config.ols_config.request_coalescing_enabled = True
+    try:
+        key = summarizer._single_flight_key("query", [], None, [])
+        assert key is not None
+        assert key == DocsSummarizer(
+            llm_loader=mock_llm_loader(None)
+        )._single_flight_key("query", [], None, [])
+        assert key != summarizer._single_flight_key("other query", [], None, [])
+        assert (
+            summarizer._single_flight_key(
+                "query", [HumanMessage(content="previous question")], None, []
+            )
+            is None
+        )
+        summarizer._has_attachments = True
+        assert summarizer._single_flight_key("query", [], None, []) is None
+    finally:
+        config.ols_config.request_coalescing_enabled = False
@@ -1,15 +1,27 @@
 """Unit tests for history support helpers."""
 
+import asyncio
+import concurrent.futures
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
 
 from ols import config
-from ols.app.models.models import CacheEntry
+from ols.app.models.config import (
+    BackgroundHistoryCompressionConfig,
+    HistorySummarizationConfig,
+    InMemoryCacheConfig,
+)
+from ols.app.models.models import CacheEntry, StreamedChunk
+from ols.src.cache.in_memory_cache import InMemoryCache
 from ols.src.query_helpers.history_support import (
     DEFAULT_ENTRIES_TO_KEEP,
+    HistoryCompressionJob,
+    HistoryCompressor,
     compress_conversation_history,
+    conversation_lock,
     prepare_history,
     summarize_entries,
 )
@@ -416,3 +428,320 @@ async def test_prepare_history_skips_compression_when_disabled():
     history, truncated = items[-1]
     assert history == CacheEntry.cache_entries_to_history(cache_entries[-2:])
     assert truncated is True
+
+
+@pytest.fixture
+def conversation_cache():
+    """Fixture with emptied in memory conversation cache used by config."""
+    mc = InMemoryCacheConfig({"max_entries": "1000"})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    with patch.object(config, "_conversation_cache", cache):
+        yield cache
+
+
+def _entries(count: int, start: int = 0) -> list[CacheEntry]:
+    """Return conversation entries with numbered queries and responses."""
+    return [
+        CacheEntry(
+            query=HumanMessage(content=f"Query {i}"),
+            response=AIMessage(content=f"Response {i}"),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _store(user_id: str, conversation_id: str, entries: list[CacheEntry]) -> None:
+    """Store entries into the conversation cache."""
+    for entry in entries:
+        config.conversation_cache.insert_or_append(
+            user_id, conversation_id, entry, True
+        )
+
+
+def _job(conversation_id: str, available_tokens: int) -> HistoryCompressionJob:
+    """Return compression job of the conversation of the test user."""
+    return HistoryCompressionJob(
+        user_id="test_user",
+        conversation_id=conversation_id,
+        skip_user_id_check=True,
+        provider="p1",
+        model="m1",
+        available_tokens=available_tokens,
+    )
+
+
+def _summarizing_llm() -> MagicMock:
+    """Return LLM responding with a summary."""
+    return MagicMock(ainvoke=AsyncMock(return_value=AIMessage(content="summary")))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+@pytest.mark.parametrize(
+    ("dedicated_summary", "summary", "provider", "model"),
+    [
+        ("dedicated summary", "dedicated summary", "p1", "m2"),
+        # summarization model is busy or failed
+        (None, "summary", "p", "m"),
+    ],
+)
+async def test_compress_conversation_history_with_summarization_model(
+    dedicated_summary, summary, provider, model
+):
+    """Test that summarization model summarizes with fallback to request model."""
+    conversation_id = suid.get_suid()
+    cache_entries = _entries(8)
+    _store("test_user", conversation_id, cache_entries)
+    summarization_model = MagicMock(
+        provider="p1",
+        model="m2",
+        summarize=AsyncMock(return_value=dedicated_summary),
+    )
+    bare_llm = _summarizing_llm()
+
+    with (
+        patch.object(config.services, "_summarization_model", summarization_model),
+        patch.object(
+            config.ols_config,
+            "history_summarization",
+            HistorySummarizationConfig(provider="p1", model="m2"),
+        ),
+    ):
+        result = await compress_conversation_history(
+            "test_user",
+            conversation_id,
+            True,
+            provider="p",
+            model="m",
+            bare_llm=bare_llm,
+            full_cache_entries=cache_entries,
+            kept_newest_first=list(reversed(cache_entries[-2:])),
+        )
+
+    summarization_model.summarize.assert_awaited_once_with(cache_entries[:7])
+    assert bare_llm.ainvoke.called == (dedicated_summary is None)
+    assert result[0].response.content == summary
+    assert result[0].response.response_metadata["provider"] == provider
+    assert result[0].response.response_metadata["model"] == model
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+async def test_compress_conversation_history_keeps_appended_entries():
+    """Test that entries stored during summarization are kept after compression."""
+    conversation_id = suid.get_suid()
+    user_id = "test_user"
+    cache_entries = _entries(8)
+    _store(user_id, conversation_id, cache_entries)
+
+    async def _summarize_while_turn_stored(messages):
+        _store(user_id, conversation_id, _entries(1, start=8))
+        return AIMessage(content="summary")
+
+    await compress_conversation_history(
+        user_id,
+        conversation_id,
+        True,
+        provider="p",
+        model="m",
+        bare_llm=MagicMock(ainvoke=_summarize_while_turn_stored),
+        full_cache_entries=cache_entries,
+        kept_newest_first=list(reversed(cache_entries[-2:])),
+        keep_appended=True,
+    )
+
+    stored = config.conversation_cache.get(user_id, conversation_id, True)
+    assert [entry.query.content for entry in stored] == [
+        "[Previous conversation summary]",
+        "Query 7",
+        "Query 8",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+async def test_compress_conversation_history_keeps_history_rewritten_meanwhile():
+    """Test that history rewritten during summarization is not overwritten."""
+    conversation_id = suid.get_suid()
+    user_id = "test_user"
+    cache_entries = _entries(8)
+    _store(user_id, conversation_id, cache_entries)
+    rewritten = _entries(2, start=100)
+
+    async def _summarize_while_rewritten(messages):
+        config.conversation_cache.delete(user_id, conversation_id, True)
+        _store(user_id, conversation_id, rewritten)
+        return AIMessage(content="summary")
+
+    await compress_conversation_history(
+        user_id,
+        conversation_id,
+        True,
+        provider="p",
+        model="m",
+        bare_llm=MagicMock(ainvoke=_summarize_while_rewritten),
+        full_cache_entries=cache_entries,
+        kept_newest_first=list(reversed(cache_entries[-2:])),
+        keep_appended=True,
+    )
+
+    assert config.conversation_cache.get(user_id, conversation_id, True) == rewritten
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+async def test_history_compressor_compresses_after_turn_stored():
+    """Test that conversation over the threshold is compressed in background."""
+    compressor = HistoryCompressor(BackgroundHistoryCompressionConfig())
+    conversation_id = suid.get_suid()
+    _store("test_user", conversation_id, _entries(20))
+    llm = _summarizing_llm()
+    try:
+        with patch(
+            "ols.src.query_helpers.history_support.load_llm", return_value=llm
+        ) as mock_load_llm:
+            # no compression is prepared for the conversation
+            compressor.turn_stored("test_user", conversation_id)
+            assert not await compressor.wait("test_user", conversation_id)
+
+            compressor.expect_turn(_job(conversation_id, available_tokens=200))
+            compressor.turn_stored("test_user", conversation_id)
+            assert await compressor.wait("test_user", conversation_id)
+    finally:
+        compressor.stop()
+
+    mock_load_llm.assert_called_once()
+    assert mock_load_llm.call_args.args[:2] == ("p1", "m1")
+    stored = config.conversation_cache.get("test_user", conversation_id, True)
+    assert stored[0].query.content == "[Previous conversation summary]"
+    assert stored[0].response.content == "summary"
+    assert stored[-1].query.content == "Query 19"
+    assert len(stored) < 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+async def test_history_compressor_skips_history_under_threshold():
+    """Test that conversation under the threshold is left intact."""
+    compressor = HistoryCompressor(BackgroundHistoryCompressionConfig())
+    conversation_id = suid.get_suid()
+    cache_entries = _entries(3)
+    _store("test_user", conversation_id, cache_entries)
+    try:
+        with patch("ols.src.query_helpers.history_support.load_llm") as mock_load_llm:
+            compressor.expect_turn(_job(conversation_id, available_tokens=10_000))
+            compressor.turn_stored("test_user", conversation_id)
+            assert await compressor.wait("test_user", conversation_id)
+    finally:
+        compressor.stop()
+
+    mock_load_llm.assert_not_called()
+    assert (
+        config.conversation_cache.get("test_user", conversation_id, True)
+        == cache_entries
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("conversation_cache")
+async def test_prepare_history_waits_for_background_compression():
+    """Test that overflowing history waits for compression running in background."""
+    compressor = HistoryCompressor(BackgroundHistoryCompressionConfig())
+    conversation_id = suid.get_suid()
+    _store("test_user", conversation_id, _entries(20))
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    async def _slow_summary(messages):
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(release.wait(), loop)
+        )
+        return AIMessage(content="summary")
+
+    try:
+        with (
+            patch(
+                "ols.src.query_helpers.history_support.load_llm",
+                return_value=MagicMock(ainvoke=_slow_summary),
+            ),
+            patch.object(config.services, "_history_compressor", compressor),
+            patch.object(
+                config.ols_config,
+                "background_history_compression",
+                BackgroundHistoryCompressionConfig(),
+            ),
+        ):
+            compressor.expect_turn(_job(conversation_id, available_tokens=200))
+            compressor.turn_stored("test_user", conversation_id)
+            loop.call_later(0.1, release.set)
+            bare_llm = _summarizing_llm()
+
+            items = [
+                item
+                async for item in prepare_history(
+                    user_id="test_user",
+                    conversation_id=conversation_id,
+                    skip_user_id_check=True,
+                    available_tokens=200,
+                    provider="p1",
+                    model="m1",
+                    bare_llm=bare_llm,
+                    token_handler=TokenHandler(),
+                )
+            ]
+    finally:
+        compressor.stop()
+
+    # no inline compression, the summary from background is used
+    bare_llm.ainvoke.assert_not_called()
+    assert all(not isinstance(item, StreamedChunk) for item in items)
+    history, _ = items[-1]
+    assert history[0].content == "[Previous conversation summary]"
+
+
+@pytest.mark.asyncio
+async def test_history_compressor_wait_failed_compression():
+    """Test that failed background compression leaves history to the request."""
+    compressor = HistoryCompressor(BackgroundHistoryCompressionConfig())
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    future.set_exception(RuntimeError("cache down"))
+    compressor._running[("test_user", "conversation")] = future
+
+    assert not await compressor.wait("test_user", "conversation")
+
+
+@pytest.mark.asyncio
+async def test_history_compressor_wait_timeout_cancels_compression():
+    """Test that compression not finished in time is cancelled."""
+    compressor = HistoryCompressor(
+        BackgroundHistoryCompressionConfig(wait_timeout_seconds=0.01)
+    )
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    compressor._running[("test_user", "conversation")] = future
+
+    assert not await compressor.wait("test_user", "conversation")
+    assert future.cancelled()
+
+
+def test_conversation_lock_is_per_conversation():
+    """Test that writes to other conversations are not blocked."""
+
+    def write(conversation_id: str, written: threading.Event) -> threading.Thread:
+        def _write():
+            with conversation_lock("test_user", conversation_id):
+                written.set()
+
+        thread = threading.Thread(target=_write)
+        thread.start()
+        return thread
+
+    other_written, same_written = threading.Event(), threading.Event()
+    with conversation_lock("test_user", "c1"):
+        write("c2", other_written).join(timeout=5)
+        assert other_written.is_set()
+
+        same = write("c1", same_written)
+        assert not same_written.wait(timeout=0.1)
+    same.join(timeout=5)
+    assert same_written.is_set()
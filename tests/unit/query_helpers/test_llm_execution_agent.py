@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -19,6 +20,7 @@ from ols.app.models.models import StreamChunkType, StreamedChunk  # noqa: E402
 from ols.src.query_helpers.llm_execution_agent import (  # noqa: E402
     LLMExecutionAgent,
     RoundLLMResult,
+    token_budget_attributes,
 )
 from ols.src.tools.tools import ApprovalRequiredEvent, ToolResultEvent  # noqa: E402
 from ols.utils.token_handler import (  # noqa: E402
@@ -343,6 +345,83 @@ async def test_collect_round_llm_chunks_handles_string_chunk():
     assert streamed[0].text == "plain-string-chunk"
 
 
+@pytest.mark.asyncio
+async def test_collect_round_llm_chunks_records_latency_metrics():
+    """Test time to first token, inter-token gaps and throughput are recorded."""
+    agent = _make_agent(request_start_time=time.time() - 1)
+    token_counter = MagicMock()
+    token_counter.token_counter.output_tokens = 0
+    token_counter.token_counter.reasoning_tokens = 0
+
+    async def _fake_invoke(*args, **kwargs):
+        yield AIMessageChunk(content="", response_metadata={})
+        for text in ("hello", " there", " world"):
+            await asyncio.sleep(0.01)
+            token_counter.token_counter.output_tokens += 1
+            yield AIMessageChunk(content=text, response_metadata={})
+
+    module = "ols.src.query_helpers.llm_execution_agent"
+    with (
+        patch.object(agent, "_invoke_llm", side_effect=_fake_invoke),
+        patch(f"{module}.llm_time_to_first_token_seconds") as ttft,
+        patch(f"{module}.llm_request_time_to_first_token_seconds") as request_ttft,
+        patch(f"{module}.llm_inter_token_gap_seconds") as gap,
+        patch(f"{module}.llm_output_tokens_per_second") as throughput,
+    ):
+        _ = [
+            chunk
+            async for chunk in agent._collect_round_llm_chunks(
+                messages=[],
+                llm_input_values={},
+                all_mcp_tools=mock_tools_map,
+                is_final_round=False,
+                token_counter=token_counter,
+                round_index=2,
+                result=RoundLLMResult(),
+            )
+        ]
+
+    labels = {"provider": "mock_type", "model": "mock_model", "round": 2}
+    ttft.labels.assert_called_once_with(**labels)
+    assert ttft.labels.return_value.observe.call_args.args[0] >= 0.01
+    assert request_ttft.labels.return_value.observe.call_args.args[0] >= 1
+    # the empty first chunk carries no token, so three tokens give two gaps
+    assert gap.labels.return_value.observe.call_count == 2
+    tokens_per_second = throughput.labels.return_value.observe.call_args.args[0]
+    assert 0 < tokens_per_second <= 3 / 0.02
+
+
+@pytest.mark.asyncio
+async def test_collect_round_llm_chunks_without_tokens_records_no_latency():
+    """Test that a round without generated content records no latency."""
+    agent = _make_agent()
+
+    async def _stop_immediately(*args, **kwargs):
+        yield AIMessageChunk(content="", response_metadata={"finish_reason": "stop"})
+
+    module = "ols.src.query_helpers.llm_execution_agent"
+    with (
+        patch.object(agent, "_invoke_llm", side_effect=_stop_immediately),
+        patch(f"{module}.llm_time_to_first_token_seconds") as ttft,
+        patch(f"{module}.llm_output_tokens_per_second") as throughput,
+    ):
+        _ = [
+            chunk
+            async for chunk in agent._collect_round_llm_chunks(
+                messages=[],
+                llm_input_values={},
+                all_mcp_tools=mock_tools_map,
+                is_final_round=False,
+                token_counter=AsyncMock(),
+                round_index=0,
+                result=RoundLLMResult(),
+            )
+        ]
+
+    ttft.labels.assert_not_called()
+    throughput.labels.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_collect_round_llm_chunks_with_reasoning_list_content():
     """Test _collect_round_llm_chunks processes list content with reasoning blocks."""
@@ -723,3 +802,22 @@ async def test_execute_emits_end_chunk_with_rag_and_truncated():
     assert chunks[1].data["rag_chunks"] is rag_chunks
     assert chunks[1].data["truncated"] is True
     assert "token_counter" in chunks[1].data
+
+
+def test_token_budget_attributes():
+    """Test that token usage and budget decisions are exported as span attributes."""
+    agent = _make_agent()
+    agent._tracker.charge(TokenCategory.PROMPT, 100)
+    agent._tracker.charge(TokenCategory.TOOL_RESULT, 50)
+    agent._tracker.summary(1)
+
+    attributes = token_budget_attributes(agent._tracker, 1, "after_tool_execution")
+
+    assert attributes["tokens.prompt"] == 100
+    assert attributes["tokens.tool_result"] == 50
+    assert attributes["round"] == 1
+    assert attributes["outcome"] == "after_tool_execution"
+    assert attributes["tokens.tool_remaining"] == 50000 - 50
+    assert attributes["tokens.tools_exec_budget"] == (
+        agent._tracker.last_tools_exec_budget
+    )
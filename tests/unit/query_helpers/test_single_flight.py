@@ -0,0 +1,185 @@
+"""Unit tests for coalescing of identical in-flight generations."""
+
+import asyncio
+import threading
+
+import pytest
+
+from ols import config
+from ols.app.models.models import StreamChunkType, StreamedChunk
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.query_helpers.single_flight import SingleFlight  # noqa: E402
+
+
+async def generation(started: asyncio.Event, release: asyncio.Event, calls: list):
+    """Generate two text chunks and END, pausing after the first chunk."""
+    calls.append(1)
+    yield StreamedChunk(type=StreamChunkType.TEXT, text="Hello")
+    started.set()
+    await release.wait()
+    yield StreamedChunk(type=StreamChunkType.TEXT, text=" world")
+    yield StreamedChunk(type=StreamChunkType.END, data={"token_counter": None})
+
+
+async def collect(stream):
+    """Collect texts and types of streamed chunks."""
+    return [(chunk.type, chunk.text) async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_followers_share_leading_generation():
+    """Test that concurrent requests with same key run one generation."""
+    flight = SingleFlight()
+    started, release, calls = asyncio.Event(), asyncio.Event(), []
+
+    leader = asyncio.create_task(
+        collect(flight.stream("key", generation(started, release, calls)))
+    )
+    await started.wait()
+    follower = asyncio.create_task(
+        collect(flight.stream("key", generation(started, release, calls)))
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await leader == await follower
+    assert [text for _, text in await follower] == ["Hello", " world", ""]
+    assert len(calls) == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    """Test that requests with different keys run separate generations."""
+    flight = SingleFlight()
+    release, calls = asyncio.Event(), []
+    release.set()
+
+    await asyncio.gather(
+        collect(flight.stream("a", generation(asyncio.Event(), release, calls))),
+        collect(flight.stream("b", generation(asyncio.Event(), release, calls))),
+    )
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_propagated_to_followers():
+    """Test that failure of leading generation is raised in followers."""
+    flight = SingleFlight()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def failing_generation():
+        yield StreamedChunk(type=StreamChunkType.TEXT, text="Hello")
+        started.set()
+        await release.wait()
+        raise ValueError("LLM failed")
+
+    leader = asyncio.create_task(collect(flight.stream("key", failing_generation())))
+    await started.wait()
+    follower = asyncio.create_task(collect(flight.stream("key", failing_generation())))
+    await asyncio.sleep(0)
+    release.set()
+
+    for task in (leader, follower):
+        with pytest.raises(ValueError, match="LLM failed"):
+            await task
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_leader_does_not_abort_followers():
+    """Test that followers are served when the leader stops consuming."""
+    flight = SingleFlight()
+    started, release, calls = asyncio.Event(), asyncio.Event(), []
+
+    leader = flight.stream("key", generation(started, release, calls))
+    await anext(leader)
+    follower = asyncio.create_task(
+        collect(flight.stream("key", generation(started, release, calls)))
+    )
+    await asyncio.sleep(0)
+    await leader.aclose()
+    release.set()
+
+    assert [text for _, text in await follower] == ["Hello", " world", ""]
+    assert (await follower)[-1][0] == StreamChunkType.END
+    assert len(calls) == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_generation_without_subscribers_is_cancelled():
+    """Test that generation is cancelled when all subscribers are gone."""
+    flight = SingleFlight()
+    started, release, calls = asyncio.Event(), asyncio.Event(), []
+
+    leader = flight.stream("key", generation(started, release, calls))
+    await anext(leader)
+    await leader.aclose()
+    await asyncio.sleep(0)
+
+    assert len(flight) == 0
+    # the next request starts a new generation
+    release.set()
+    await collect(flight.stream("key", generation(started, release, calls)))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_leader_stopping_after_end_completes_followers():
+    """Test that followers complete when the leader stops consuming at END."""
+    flight = SingleFlight()
+    started, release, calls = asyncio.Event(), asyncio.Event(), []
+
+    async def consume_until_end():
+        async for chunk in flight.stream("key", generation(started, release, calls)):
+            if chunk.type == StreamChunkType.END:
+                break
+
+    leader = asyncio.create_task(consume_until_end())
+    await started.wait()
+    follower = asyncio.create_task(
+        collect(flight.stream("key", generation(started, release, calls)))
+    )
+    await asyncio.sleep(0)
+    release.set()
+    await leader
+
+    assert (await follower)[-1][0] == StreamChunkType.END
+
+
+@pytest.mark.asyncio
+async def test_follower_in_other_event_loop():
+    """Test that follower running its own event loop in a thread is served."""
+    flight = SingleFlight()
+    started, release, calls = asyncio.Event(), asyncio.Event(), []
+    result = []
+
+    leader = asyncio.create_task(
+        collect(flight.stream("key", generation(started, release, calls)))
+    )
+    await started.wait()
+    joined = threading.Event()
+
+    def follow():
+        async def run():
+            stream = flight.stream("key", generation(started, release, calls))
+            result.append(await anext(stream))
+            joined.set()
+            result.extend([chunk async for chunk in stream])
+
+        asyncio.run(run())
+
+    thread = threading.Thread(target=follow)
+    thread.start()
+    await asyncio.to_thread(joined.wait)
+    release.set()
+    await leader
+    await asyncio.to_thread(thread.join)
+
+    assert [chunk.text for chunk in result] == ["Hello", " world", ""]
+    assert len(calls) == 1
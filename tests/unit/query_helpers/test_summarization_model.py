@@ -0,0 +1,130 @@
+"""Unit tests for the dedicated history summarization model."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols import config
+from ols.app.models.config import HistorySummarizationConfig
+from ols.app.models.models import CacheEntry
+from ols.constants import GenericLLMParameters
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    history_summarization_fallbacks_total,
+    history_summarization_tokens_received_total,
+    history_summarization_tokens_sent_total,
+)
+from ols.src.query_helpers.summarization_model import (  # noqa: E402
+    FALLBACK_BUSY,
+    FALLBACK_FAILED,
+    SummarizationModel,
+)
+
+ENTRIES = [
+    CacheEntry(
+        query=HumanMessage(content="How do I scale a deployment?"),
+        response=AIMessage(content="Use oc scale deployment/name --replicas=3."),
+    )
+]
+
+
+@pytest.fixture(scope="function", autouse=True)
+def _setup():
+    """Set up config for tests."""
+    config.reload_from_yaml_file("tests/config/valid_config_without_mcp.yaml")
+
+
+def _model(llm_loader, **kwargs) -> SummarizationModel:
+    """Create summarization model using the second model of the first provider."""
+    return SummarizationModel(
+        HistorySummarizationConfig(provider="p1", model="m2", **kwargs),
+        llm_loader=llm_loader,
+    )
+
+
+def _fallbacks(reason: str) -> float:
+    """Return number of fallbacks to the request model for the reason."""
+    return history_summarization_fallbacks_total.labels(reason=reason)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_summarize_counts_tokens():
+    """Test that summary is generated by the model with tokens counted."""
+    llm = MagicMock(ainvoke=AsyncMock(return_value=AIMessage(content="scaling")))
+    llm_loader = MagicMock(return_value=llm)
+    sent = history_summarization_tokens_sent_total.labels(provider="p1", model="m2")
+    received = history_summarization_tokens_received_total.labels(
+        provider="p1", model="m2"
+    )
+    sent_before, received_before = sent._value.get(), received._value.get()
+
+    assert await _model(llm_loader).summarize(ENTRIES) == "scaling"
+
+    llm_loader.assert_called_once()
+    provider, model, params = llm_loader.call_args.args
+    assert (provider, model) == ("p1", "m2")
+    assert GenericLLMParameters.MAX_TOKENS_FOR_RESPONSE in params
+    assert sent._value.get() - sent_before > 10
+    assert received._value.get() - received_before == 1
+
+
+@pytest.mark.asyncio
+async def test_busy_model_falls_back():
+    """Test that summaries over the concurrency limit are left to request model."""
+    release = asyncio.Event()
+
+    async def _slow_summary(messages):
+        await release.wait()
+        return AIMessage(content="summary")
+
+    summarization_model = _model(
+        MagicMock(return_value=MagicMock(ainvoke=_slow_summary)), max_concurrency=1
+    )
+    fallbacks_before = _fallbacks(FALLBACK_BUSY)
+
+    first = asyncio.create_task(summarization_model.summarize(ENTRIES))
+    await asyncio.sleep(0)
+    assert await summarization_model.summarize(ENTRIES) is None
+    assert _fallbacks(FALLBACK_BUSY) - fallbacks_before == 1
+
+    release.set()
+    assert await first == "summary"
+    # the slot is free again
+    assert await summarization_model.summarize(ENTRIES) == "summary"
+
+
+@pytest.mark.asyncio
+async def test_failed_model_falls_back():
+    """Test that summaries the model fails to generate are left to request model."""
+    llm = MagicMock(ainvoke=AsyncMock(side_effect=ValueError("invalid request")))
+    summarization_model = _model(MagicMock(return_value=llm), max_concurrency=1)
+    fallbacks_before = _fallbacks(FALLBACK_FAILED)
+
+    assert await summarization_model.summarize(ENTRIES) is None
+    assert await summarization_model.summarize(ENTRIES) is None
+
+    assert _fallbacks(FALLBACK_FAILED) - fallbacks_before == 2
+
+
+@pytest.mark.asyncio
+async def test_model_failing_to_load_falls_back():
+    """Test that summaries are left to request model when the model can't load."""
+    summarization_model = _model(MagicMock(side_effect=ValueError("bad config")))
+    fallbacks_before = _fallbacks(FALLBACK_FAILED)
+
+    assert await summarization_model.summarize(ENTRIES) is None
+    assert _fallbacks(FALLBACK_FAILED) - fallbacks_before == 1
+
+
+@pytest.mark.asyncio
+async def test_nothing_to_summarize():
+    """Test that empty history is not sent to the model."""
+    llm_loader = MagicMock()
+
+    assert await _model(llm_loader).summarize([]) is None
+    llm_loader.assert_not_called()
@@ -0,0 +1,226 @@
+"""Unit tests for QuotaService class."""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ols.app.models.config import QuotaHandlersConfig
+from ols.src.quota.quota_exceed_error import QuotaExceedError
+from ols.src.quota.quota_service import QuotaService
+
+USER_ID = "1234"
+
+
+def quota_handlers_config(**kwargs):
+    """Return configuration of user and cluster quota limiters."""
+    return QuotaHandlersConfig(
+        {
+            "storage": {"host": "", "ssl_mode": "disable"},
+            "scheduler": {"period": 100},
+            "limiters": [
+                {
+                    "name": "user_monthly_limits",
+                    "type": "user_limiter",
+                    "initial_quota": 1000,
+                    "quota_increase": 10,
+                    "period": "5 minutes",
+                },
+                {
+                    "name": "cluster_monthly_limits",
+                    "type": "cluster_limiter",
+                    "initial_quota": 2000,
+                    "quota_increase": 100,
+                    "period": "5 minutes",
+                },
+            ],
+            **kwargs,
+        }
+    )
+
+
+@pytest.fixture
+def mock_connect():
+    """Do not use connection to real PostgreSQL instance."""
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.closed = 0
+        yield mock_connect
+
+
+@pytest.fixture
+def mock_cursor(mock_connect):
+    """Cursor executing statements of the quota service."""
+    cursor = MagicMock()
+    mock_connect.return_value.cursor.return_value.__enter__.return_value = cursor
+    return cursor
+
+
+def test_ensure_available_quota_reads_all_limiters_at_once(mock_cursor):
+    """Test that quota of all limiters is read by one cached statement."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 10), ("", "c", 20)]
+    timestamp = datetime.datetime(2000, 1, 1, 12, 0, 0)
+    service = QuotaService(quota_handlers_config())
+
+    with patch("ols.src.quota.quota_service.datetime") as mock_datetime:
+        mock_datetime.now = lambda: timestamp
+        service.ensure_available_quota(USER_ID)
+        service.ensure_available_quota(USER_ID)
+
+    mock_cursor.execute.assert_called_once_with(
+        QuotaService.SELECT_QUOTAS,
+        {
+            "ids": [USER_ID, ""],
+            "subjects": ["u", "c"],
+            "quota_limits": [1000, 2000],
+            "now": timestamp,
+        },
+    )
+
+
+def test_ensure_available_quota_exceeded(mock_cursor):
+    """Test that exhausted quota of any limiter is reported."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 10), ("", "c", 0)]
+    service = QuotaService(quota_handlers_config())
+
+    with pytest.raises(QuotaExceedError, match="Cluster has no available tokens"):
+        service.ensure_available_quota(USER_ID)
+
+
+def test_ensure_available_quota_row_inserted_concurrently(mock_cursor):
+    """Test that quota row initialized by another replica has initial quota."""
+    # the cluster row was inserted by concurrent statement, which is not
+    # visible in the snapshot of the statement
+    mock_cursor.fetchall.side_effect = [[(USER_ID, "u", 10)], [(USER_ID, "u", 10)]]
+    service = QuotaService(quota_handlers_config())
+
+    service.ensure_available_quota(USER_ID)
+
+    # the row missing in the result is not cached
+    service.ensure_available_quota(USER_ID)
+    assert mock_cursor.execute.call_count == 2
+
+
+def test_available_quota_cache_expires(mock_cursor):
+    """Test that available quota is read again once the cache expires."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 10), ("", "c", 20)]
+    service = QuotaService(quota_handlers_config(available_quota_ttl_seconds=5))
+
+    with patch("ols.src.quota.quota_service.time.monotonic") as mock_monotonic:
+        mock_monotonic.return_value = 100
+        service.ensure_available_quota(USER_ID)
+        mock_monotonic.return_value = 105
+        service.ensure_available_quota(USER_ID)
+        assert mock_cursor.execute.call_count == 1
+
+        mock_monotonic.return_value = 106
+        service.ensure_available_quota(USER_ID)
+        assert mock_cursor.execute.call_count == 2
+
+
+def test_consume_tokens_in_one_statement(mock_cursor):
+    """Test that tokens are consumed and quota read back by one statement."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 970), ("", "c", 0)]
+    service = QuotaService(quota_handlers_config())
+
+    quotas = service.consume_tokens(USER_ID, "p", "m", 10, 20)
+
+    assert quotas == {"UserQuotaLimiter": 970, "ClusterQuotaLimiter": 0}
+    mock_cursor.execute.assert_called_once()
+    statement, params = mock_cursor.execute.call_args.args
+    assert statement == QuotaService.CONSUME_QUOTAS
+    assert params["ids"] == [USER_ID, ""]
+    assert params["consumed"] == [30, 30]
+    # quota read back is used by the next check
+    with pytest.raises(QuotaExceedError):
+        service.ensure_available_quota(USER_ID)
+    mock_cursor.execute.assert_called_once()
+
+
+def test_consume_tokens_of_limiters_sharing_quota(mock_cursor):
+    """Test that limiters of the same type consume tokens of the same quota."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 940)]
+    config = quota_handlers_config()
+    config.limiters.limiters["cluster_monthly_limits"].type = "user_limiter"
+    service = QuotaService(config)
+
+    quotas = service.consume_tokens(USER_ID, "p", "m", 10, 20)
+
+    assert quotas == {"UserQuotaLimiter": 940}
+    params = mock_cursor.execute.call_args.args[1]
+    assert params["ids"] == [USER_ID]
+    assert params["consumed"] == [60]
+
+
+def test_no_limiters(mock_cursor):
+    """Test that nothing is read or consumed without limiters."""
+    service = QuotaService(
+        QuotaHandlersConfig(
+            {
+                "storage": {"host": "", "ssl_mode": "disable"},
+                "scheduler": {"period": 100},
+            }
+        )
+    )
+
+    service.ensure_available_quota(USER_ID)
+    assert service.consume_tokens(USER_ID, "p", "m", 10, 20) == {}
+    mock_cursor.execute.assert_not_called()
+
+
+def test_token_usage_written_behind(mock_cursor):
+    """Test that token usage is aggregated and written in one batch."""
+    mock_cursor.fetchall.side_effect = [
+        [(USER_ID, "u", 970), ("", "c", 1970)],
+        [(USER_ID, "u", 967), ("", "c", 1967)],
+        [("5678", "u", 993), ("", "c", 1960)],
+    ]
+    token_usage_history = MagicMock()
+    service = QuotaService(quota_handlers_config(), token_usage_history)
+    try:
+        service.consume_tokens(USER_ID, "p", "m", 10, 20)
+        service.consume_tokens(USER_ID, "p", "m", 1, 2)
+        service.consume_tokens("5678", "p", "m", 3, 4)
+        token_usage_history.consume_tokens_batch.assert_not_called()
+
+        service.flush_token_usage()
+    finally:
+        service.stop()
+
+    token_usage_history.consume_tokens_batch.assert_called_once_with(
+        {(USER_ID, "p", "m"): (11, 22), ("5678", "p", "m"): (3, 4)}
+    )
+
+
+def test_failed_token_usage_write_retried(mock_cursor):
+    """Test that token usage failed to be written is kept for the next flush."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 10), ("", "c", 20)]
+    token_usage_history = MagicMock()
+    token_usage_history.consume_tokens_batch.side_effect = [
+        Exception("connection refused"),
+        None,
+    ]
+    service = QuotaService(quota_handlers_config(), token_usage_history)
+    service.consume_tokens(USER_ID, "p", "m", 10, 20)
+    service.flush_token_usage()
+    service.consume_tokens(USER_ID, "p", "m", 1, 2)
+
+    # pending usage is written when the service stops
+    service.stop()
+
+    assert token_usage_history.consume_tokens_batch.call_count == 2
+    token_usage_history.consume_tokens_batch.assert_called_with(
+        {(USER_ID, "p", "m"): (11, 22)}
+    )
+
+
+def test_closed_connection_reestablished(mock_connect, mock_cursor):
+    """Test that closed connection is re-established without health check."""
+    mock_cursor.fetchall.return_value = [(USER_ID, "u", 10), ("", "c", 20)]
+    service = QuotaService(quota_handlers_config(available_quota_ttl_seconds=0))
+    assert mock_connect.call_count == 1
+
+    mock_connect.return_value.closed = 2
+    service.consume_tokens(USER_ID, "p", "m", 10, 20)
+
+    assert mock_connect.call_count == 2
+    assert "SELECT 1" not in [c.args[0] for c in mock_cursor.execute.call_args_list]
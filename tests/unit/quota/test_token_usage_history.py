@@ -121,3 +121,38 @@ def test_consume_tokens_on_disconnected_db():
         call("SELECT 1"),
     ]
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
+
+
+def test_consume_tokens_batch():
+    """Test the operation to consume tokens of multiple users at once."""
+    mock_cursor = MagicMock()
+
+    # mock for real timestamp
+    timestamp = datetime.datetime(2000, 1, 1, 12, 0, 0)
+
+    # do not use connection to real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+
+        # mock the datetime class in order to use constant timestamps
+        with patch("ols.src.quota.token_usage_history.datetime") as mock_datetime:
+            mock_datetime.now = lambda: timestamp
+
+            q = TokenUsageHistory(PostgresConfig())
+            q.consume_tokens_batch(
+                {("1234", "X", "Y"): (10, 20), ("5678", "X", "Z"): (1, 2)}
+            )
+
+    mock_cursor.execute.assert_called_with(
+        TokenUsageHistory.CONSUME_TOKENS_BATCH,
+        {
+            "user_ids": ["1234", "5678"],
+            "providers": ["X", "X"],
+            "models": ["Y", "Z"],
+            "input_tokens": [10, 1],
+            "output_tokens": [20, 2],
+            "updated_at": timestamp,
+        },
+    )
@@ -1,11 +1,13 @@
 """Unit test for the index loader module."""
 
 import os
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import ols.src.rag_index.index_loader as il
 from ols import config
 from ols.app.models.config import ReferenceContent, ReferenceContentIndex
+from ols.constants import FAISS_SEARCH_PARAMS_FILENAME
 from tests.mock_classes.mock_llama_index import MockLlamaIndex
 from tests.mock_classes.mock_retrievers import MockRetriever
 
@@ -145,3 +147,58 @@ def test_custom_weight_function():
     assert round(sorted_result[5].score, 4) == round(
         0.735 * (1 - (1 * 0.05)), 4
     )  # 0.6982
+
+
+def test_apply_search_params_from_file_and_config(tmp_path):
+    """Test that ANN search params are read from index dir and overridden by config."""
+    import faiss
+    import numpy as np
+
+    faiss_index = faiss.index_factory(8, "HNSW16,Flat", faiss.METRIC_INNER_PRODUCT)
+    faiss_index.add(np.random.default_rng(42).random((10, 8), dtype="float32"))
+    vector_store = SimpleNamespace(client=faiss_index)
+
+    (tmp_path / FAISS_SEARCH_PARAMS_FILENAME).write_text('{"efSearch": 40}')
+    index_config = ReferenceContentIndex({"product_docs_index_path": str(tmp_path)})
+
+    index_loader_obj = il.IndexLoader(None)
+    index_loader_obj._apply_search_params(vector_store, index_config)
+    assert faiss_index.hnsw.efSearch == 40
+
+    index_config.product_docs_search_params = {"efSearch": 80}
+    index_loader_obj._apply_search_params(vector_store, index_config)
+    assert faiss_index.hnsw.efSearch == 80
+
+
+def test_apply_search_params_unsupported(tmp_path, caplog):
+    """Test that unsupported search params are skipped with a warning."""
+    import faiss
+
+    vector_store = SimpleNamespace(client=faiss.IndexFlatIP(8))
+    index_config = ReferenceContentIndex(
+        {
+            "product_docs_index_path": str(tmp_path),
+            "product_docs_search_params": {"nprobe": 4},
+        }
+    )
+
+    il.IndexLoader(None)._apply_search_params(vector_store, index_config)
+    assert "FAISS search parameter nprobe is not supported" in caplog.text
+
+
+def test_get_retriever_with_retrieval_cache():
+    """Test that retriever is wrapped by retrieval cache when enabled."""
+    from ols.src.rag_index.retrieval_cache import CachedRetriever, RetrievalCache
+
+    index_loader_obj = il.IndexLoader(None)
+    index_loader_obj._indexes = [MockLlamaIndex()]
+    index_loader_obj._generation = "gen"
+    index_loader_obj._retrieval_cache = RetrievalCache(max_entries=1, ttl_seconds=1)
+
+    with patch.object(il, "QueryFusionRetrieverCustom") as fusion_retriever:
+        fusion_retriever.return_value.similarity_top_k = 3
+        retriever = index_loader_obj.get_retriever(similarity_top_k=3)
+
+    assert isinstance(retriever, CachedRetriever)
+    assert retriever.similarity_top_k == 3
+    assert index_loader_obj.get_retriever(similarity_top_k=3) is retriever
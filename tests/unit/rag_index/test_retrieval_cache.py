@@ -0,0 +1,198 @@
+"""Unit tests for the retrieval result cache."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.storage.docstore import SimpleDocumentStore
+
+from ols import config
+from ols.app.models.config import RetrievalCacheConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.rag_index.retrieval_cache import (  # noqa: E402
+    CachedNode,
+    CachedRetriever,
+    QueryEmbedder,
+    RetrievalCache,
+    normalize_query,
+)
+
+
+@pytest.fixture
+def index():
+    """Create index with docstore holding two nodes."""
+    docstore = SimpleDocumentStore()
+    docstore.add_documents(
+        [
+            TextNode(id_="node-1", text="first", metadata={"title": "First"}),
+            TextNode(id_="node-2", text="second", metadata={"title": "Second"}),
+        ]
+    )
+    return SimpleNamespace(docstore=docstore)
+
+
+@pytest.fixture
+def retriever():
+    """Create retriever returning two nodes with fusion metadata."""
+    retriever = MagicMock()
+    retriever.similarity_top_k = 5
+    retriever.retrieve.side_effect = lambda query: [
+        NodeWithScore(
+            node=TextNode(
+                id_="node-1",
+                text="first",
+                metadata={"index_id": "ocp", "index_origin": "default"},
+            ),
+            score=0.9,
+        ),
+        NodeWithScore(
+            node=TextNode(
+                id_="node-2",
+                text="second",
+                metadata={"index_id": "ocp", "index_origin": "default"},
+            ),
+            score=0.7,
+        ),
+    ]
+    return retriever
+
+
+def test_normalize_query():
+    """Test that whitespace, case and trailing punctuation are ignored."""
+    assert normalize_query("  How do I  scale a Deployment? ") == (
+        "how do i scale a deployment"
+    )
+    assert normalize_query("how do i scale a deployment") == (
+        normalize_query("How do I scale a deployment?!")
+    )
+
+
+def test_from_config():
+    """Test that cache is created only when enabled."""
+    assert RetrievalCache.from_config(None) is None
+    assert RetrievalCache.from_config(RetrievalCacheConfig(enabled=False)) is None
+
+    cache = RetrievalCache.from_config(
+        RetrievalCacheConfig(max_entries=10, ttl_seconds=60)
+    )
+    assert cache.max_entries == 10
+    assert cache.ttl_seconds == 60
+
+
+def test_lru_eviction():
+    """Test that least recently used entry is evicted."""
+    cache = RetrievalCache(max_entries=2, ttl_seconds=60)
+    node = CachedNode("id", 0.5, "", "")
+    cache.put(("a",), [node])
+    cache.put(("b",), [node])
+    assert cache.get(("a",)) == [node]  # "a" is now most recently used
+
+    cache.put(("c",), [node])
+    assert len(cache) == 2
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == [node]
+    assert cache.get(("c",)) == [node]
+
+
+def test_ttl_expiration():
+    """Test that expired entries are not returned."""
+    cache = RetrievalCache(max_entries=2, ttl_seconds=60)
+    with patch("ols.src.rag_index.retrieval_cache.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        cache.put(("a",), [])
+        monotonic.return_value = 159.0
+        assert cache.get(("a",)) == []
+        monotonic.return_value = 161.0
+        assert cache.get(("a",)) is None
+    assert len(cache) == 0
+
+
+def test_cached_retriever_hit_and_miss(retriever, index):
+    """Test that repeated normalized query is served from cache."""
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cached_retriever = CachedRetriever(retriever, cache, [index], "gen-1")
+    assert cached_retriever.similarity_top_k == 5
+
+    with (
+        patch("ols.src.rag_index.retrieval_cache.rag_retrieval_cache_hits_total") as h,
+        patch(
+            "ols.src.rag_index.retrieval_cache.rag_retrieval_cache_misses_total"
+        ) as m,
+    ):
+        first = cached_retriever.retrieve("What is a Pod?")
+        second = cached_retriever.retrieve("  what is a pod ")
+
+    assert retriever.retrieve.call_count == 1
+    h.inc.assert_called_once()
+    m.inc.assert_called_once()
+    assert [(n.node.node_id, n.score) for n in second] == [
+        (n.node.node_id, n.score) for n in first
+    ]
+    assert second[0].node.get_content() == "first"
+    assert second[0].node.metadata["index_id"] == "ocp"
+    assert second[0].node.metadata["index_origin"] == "default"
+
+
+def test_cached_retriever_generation_change(retriever, index):
+    """Test that entries of previously loaded indexes are not used."""
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    CachedRetriever(retriever, cache, [index], "gen-1").retrieve("query")
+    CachedRetriever(retriever, cache, [index], "gen-2").retrieve("query")
+
+    assert retriever.retrieve.call_count == 2
+
+
+def test_cached_retriever_missing_node(retriever):
+    """Test that cache hit with nodes missing in docstore falls back to retrieval."""
+    index = SimpleNamespace(docstore=SimpleDocumentStore())
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cached_retriever = CachedRetriever(retriever, cache, [index], "gen-1")
+
+    cached_retriever.retrieve("query")
+    nodes = cached_retriever.retrieve("query")
+
+    assert retriever.retrieve.call_count == 2
+    assert len(nodes) == 2
+
+
+def test_query_embedder_caches_normalized_query():
+    """Test that query is embedded once for its normalized form."""
+    embed_model = MagicMock()
+    embed_model.get_query_embedding.return_value = [0.1, 0.2]
+    embedder = QueryEmbedder(
+        embed_model, RetrievalCache(max_entries=10, ttl_seconds=60)
+    )
+
+    assert embedder.embed("What is a Pod?") == [0.1, 0.2]
+    assert embedder.embed("  what is a pod ") == [0.1, 0.2]
+    embed_model.get_query_embedding.assert_called_once_with("What is a Pod?")
+
+    # without cache every query is embedded
+    embedder = QueryEmbedder(embed_model, None)
+    embedder.embed("What is a Pod?")
+    embedder.embed("What is a Pod?")
+    assert embed_model.get_query_embedding.call_count == 3
+
+
+def test_cached_retriever_shares_query_embedding(retriever, index):
+    """Test that retrieval on cache miss uses embedding of the embedder."""
+    embed_model = MagicMock()
+    embed_model.get_query_embedding.return_value = [0.1, 0.2]
+    embedder = QueryEmbedder(
+        embed_model, RetrievalCache(max_entries=10, ttl_seconds=60)
+    )
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cached_retriever = CachedRetriever(retriever, cache, [index], "gen-1", embedder)
+
+    cached_retriever.retrieve("What is a Pod?")
+
+    query_bundle = retriever.retrieve.call_args.args[0]
+    assert query_bundle.query_str == "What is a Pod?"
+    assert query_bundle.embedding == [0.1, 0.2]
+    # the embedding is reused by response cache lookup
+    assert embedder.embed("what is a pod") == [0.1, 0.2]
+    embed_model.get_query_embedding.assert_called_once()
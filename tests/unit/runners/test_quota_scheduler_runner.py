@@ -4,6 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from ols import config as app_config
 from ols import constants
 from ols.app.models.config import (
     Config,
@@ -13,15 +14,27 @@ from ols.app.models.config import (
     QuotaHandlersConfig,
     SchedulerConfig,
 )
-from ols.runners.quota_scheduler import (
-    INCREASE_QUOTA_STATEMENT,
-    RESET_QUOTA_STATEMENT,
+
+# needs to be setup before importing metrics
+app_config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    quota_scheduler_last_run_affected_rows,
+    quota_scheduler_last_run_duration_seconds,
+    quota_scheduler_leader,
+)
+from ols.runners.quota_scheduler import (  # noqa: E402
+    REVOKE_QUOTAS_STATEMENT,
+    TRY_LOCK_STATEMENT,
+    RevocationAction,
+    acquire_leadership,
     connect,
     get_subject_id,
-    increase_quota,
+    jittered_period,
     quota_revocation,
     quota_scheduler,
-    reset_quota,
+    revocation_actions,
+    revoke_quotas,
     start_quota_scheduler,
 )
 
@@ -239,64 +252,160 @@ def test_get_subject_id():
     assert get_subject_id("foobar") == "?"
 
 
-def test_increase_quota():
-    """Check the function that increases quota for given subject."""
-    # mock the query result - no data
-    mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+def test_revocation_actions():
+    """Check that increases and resets of all valid limiters are collected."""
+    limiters = LimitersConfig(
+        [
+            {
+                "name": "user_limits",
+                "type": constants.USER_QUOTA_LIMITER,
+                "initial_quota": 1000,
+                "quota_increase": 10,
+                "period": "5 days",
+            },
+            {
+                "name": "cluster_limits",
+                "type": constants.CLUSTER_QUOTA_LIMITER,
+                "initial_quota": 0,
+                "quota_increase": 100,
+                "period": "1 day",
+            },
+            {
+                "name": "invalid_limits",
+                "type": constants.USER_QUOTA_LIMITER,
+                "initial_quota": 1000,
+                "quota_increase": None,
+                "period": None,
+            },
+        ]
+    ).limiters
 
-    # connection won't be established
-    config = PostgresConfig()
+    # invalid limiter is skipped, reset to zero quota is not applied
+    assert revocation_actions(limiters) == [
+        RevocationAction("u", 10, False, "5 days"),
+        RevocationAction("u", 1000, True, "5 days"),
+        RevocationAction("c", 100, False, "1 day"),
+    ]
 
-    # parameters for increasing quota
-    subject_id = "u"
-    increase_by = 10
-    period = "5 days"
 
-    # don't connect to real PostgreSQL instance
-    with patch("psycopg2.connect") as mock_connect:
-        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
-            mock_cursor
-        )
+def test_revoke_quotas_in_one_statement():
+    """Check that all limiters are applied by one statement."""
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 42
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = mock_cursor
+    actions = [
+        RevocationAction("u", 10, False, "5 days"),
+        RevocationAction("c", 1000, True, "1 day"),
+    ]
+
+    assert revoke_quotas(connection, actions) == 42
+
+    mock_cursor.execute.assert_called_once_with(
+        REVOKE_QUOTAS_STATEMENT,
+        {
+            "subjects": ["u", "c"],
+            "amounts": [10, 1000],
+            "resets": [False, True],
+            "periods": ["5 days", "1 day"],
+        },
+    )
+    assert quota_scheduler_last_run_affected_rows._value.get() == 42
+    assert quota_scheduler_last_run_duration_seconds._value.get() >= 0
 
-        # try to connect to mocked Postgres
-        connection = connect(config)
 
-        increase_quota(connection, subject_id, increase_by, period)
+def test_revoke_quotas_without_actions():
+    """Check that nothing is executed when no limiter revokes quota."""
+    connection = MagicMock()
 
-        # quota should be increased in mocked database
-        mock_cursor.execute.assert_called_once_with(
-            INCREASE_QUOTA_STATEMENT, (increase_by, subject_id, period)
-        )
+    assert revoke_quotas(connection, []) == 0
+    connection.cursor.assert_not_called()
 
 
-def test_reset_quota():
-    """Check the function that resets quota for given subject."""
-    # mock the query result - no data
+@pytest.mark.parametrize("locked", [True, False])
+def test_acquire_leadership(locked):
+    """Check that leadership is given by the scheduler advisory lock."""
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.fetchone.return_value = (locked,)
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = mock_cursor
 
-    # connection won't be established
-    config = PostgresConfig()
+    assert acquire_leadership(connection) is locked
+    mock_cursor.execute.assert_called_once_with(
+        TRY_LOCK_STATEMENT, (constants.QUOTA_SCHEDULER_LOCK_ID,)
+    )
 
-    # parameters for resetting quota
-    subject_id = "u"
-    reset_to = 1000
-    period = "5 days"
 
-    # don't connect to real PostgreSQL instance
-    with patch("psycopg2.connect") as mock_connect:
-        # try to connect to mocked Postgres
-        connection = connect(config)
-        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
-            mock_cursor
-        )
-        reset_quota(connection, subject_id, reset_to, period)
+def _scheduler_config() -> QuotaHandlersConfig:
+    """Return configuration of scheduler with one limiter."""
+    config = QuotaHandlersConfig()
+    config.storage = PostgresConfig()
+    config.scheduler = SchedulerConfig(period=10)
+    config.limiters = LimitersConfig(
+        [
+            {
+                "name": "foo",
+                "type": "cluster_limiter",
+                "initial_quota": 1000,
+                "quota_increase": 10,
+                "period": "5 days",
+            }
+        ]
+    )
+    return config
 
-        # quota should be reset in mocked database
-        mock_cursor.execute.assert_called_once_with(
-            RESET_QUOTA_STATEMENT, (reset_to, subject_id, period)
-        )
+
+@pytest.mark.parametrize("locked", [True, False])
+def test_quota_scheduler_revokes_quota_only_as_leader(locked):
+    """Check that only the replica holding the lock revokes quota."""
+    with (
+        patch("psycopg2.connect") as mock_connect,
+        patch("ols.runners.quota_scheduler.acquire_leadership", return_value=locked),
+        patch("ols.runners.quota_scheduler.revoke_quotas") as mock_revoke_quotas,
+        patch("ols.runners.quota_scheduler.sleep", side_effect=[None, Exception()]),
+    ):
+        mock_connect.return_value.closed = 0
+        with pytest.raises(Exception):
+            quota_scheduler(_scheduler_config())
+
+    assert mock_revoke_quotas.call_count == (2 if locked else 0)
+    assert quota_scheduler_leader._value.get() == (1 if locked else 0)
+
+
+def test_quota_scheduler_keeps_lock_of_open_session():
+    """Check that the leader does not try to take the lock again."""
+    with (
+        patch("psycopg2.connect") as mock_connect,
+        patch(
+            "ols.runners.quota_scheduler.acquire_leadership", return_value=True
+        ) as mock_acquire_leadership,
+        patch("ols.runners.quota_scheduler.revoke_quotas"),
+        patch("ols.runners.quota_scheduler.sleep", side_effect=[None, Exception()]),
+    ):
+        mock_connect.return_value.closed = 0
+        with pytest.raises(Exception):
+            quota_scheduler(_scheduler_config())
+
+        mock_acquire_leadership.assert_called_once()
+
+        # lock is lost with the closed session, so it's taken again
+        mock_connect.return_value.closed = 2
+        with (
+            patch("ols.runners.quota_scheduler.sleep", side_effect=[None, Exception()]),
+            pytest.raises(Exception),
+        ):
+            quota_scheduler(_scheduler_config())
+
+        assert mock_acquire_leadership.call_count == 3
+
+
+def test_jittered_period():
+    """Check that the period is randomly changed within the jitter ratio."""
+    periods = [jittered_period(100, 0.1) for _ in range(100)]
+
+    assert all(90 <= period <= 110 for period in periods)
+    assert len(set(periods)) > 1
+    assert jittered_period(100, 0) == 100
 
 
 def test_quota_revocation_no_limiter_type():
@@ -309,7 +418,7 @@ def test_quota_revocation_no_limiter_type():
     # exception should be raised
     expected = "Limiter type not set, skipping revocation"
     with pytest.raises(Exception, match=expected):
-        quota_revocation(None, "u", quota_limiter)
+        quota_revocation("u", quota_limiter)
 
 
 def test_quota_revocation_no_limiter_period():
@@ -325,7 +434,7 @@ def test_quota_revocation_no_limiter_period():
     # exception should be raised
     expected = "Limiter period not set, skipping revocation"
     with pytest.raises(Exception, match=expected):
-        quota_revocation(None, "u", quota_limiter)
+        quota_revocation("u", quota_limiter)
 
 
 @pytest.fixture
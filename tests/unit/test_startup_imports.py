@@ -0,0 +1,83 @@
+"""Test that heavy dependencies are not imported at startup."""
+
+import json
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+import yaml
+
+# dependencies needed only when the feature using them is configured
+LAZY_DEPENDENCIES = (
+    "llama_index",  # RAG index
+    "qdrant_client",  # tool filtering and skills
+    "rank_bm25",  # tool filtering and skills
+    "frontmatter",  # skills
+    "gradio",  # dev UI
+    "langchain_google_vertexai",  # google_vertex_anthropic provider
+    "langchain_google_genai",  # google_vertex provider
+    "langchain_aws",  # bedrock provider
+    "langchain_ibm",  # watsonx provider
+    "azure.identity",  # azure_openai provider
+)
+
+IMPORT_APP = """
+import json
+import sys
+
+from ols import config
+
+config.reload_from_yaml_file(sys.argv[1])
+
+import ols.app.main
+
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_app_import_does_not_load_lazy_dependencies(tmp_path):
+    """Test that importing the app loads none of the lazily imported dependencies."""
+    config_file = tmp_path / "olsconfig.yaml"
+    config_file.write_text(
+        yaml.dump(
+            {
+                "llm_providers": [
+                    {
+                        "name": "openai",
+                        "type": "openai",
+                        "url": "http://localhost:1234",
+                        "models": [{"name": "model"}],
+                    }
+                ],
+                "ols_config": {
+                    "default_provider": "openai",
+                    "default_model": "model",
+                    "authentication_config": {"module": "noop"},
+                    "conversation_cache": {
+                        "type": "memory",
+                        "memory": {"max_entries": 1000},
+                    },
+                },
+                "dev_config": {"disable_auth": True, "disable_tls": True},
+            }
+        )
+    )
+
+    result = subprocess.run(  # noqa: S603 # nosec
+        [sys.executable, "-c", IMPORT_APP, str(config_file)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[2],
+    )
+
+    modules = json.loads(result.stdout.splitlines()[-1])
+    loaded = [
+        module
+        for module in modules
+        if any(
+            module == dependency or module.startswith(f"{dependency}.")
+            for dependency in LAZY_DEPENDENCIES
+        )
+    ]
+    assert loaded == []
@@ -0,0 +1,229 @@
+"""Unit tests for the circuit_breaker module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.tools import ToolException
+
+from ols import config
+from ols.app.models.config import MCPCircuitBreakerConfig, MCPServerConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    mcp_server_circuit_state,
+    mcp_server_failure_rate,
+    mcp_server_rejected_calls_total,
+)
+from ols.src.tools.circuit_breaker import (  # noqa: E402
+    CircuitState,
+    MCPCircuitBreakers,
+    probe_mcp_server,
+)
+
+SERVER = MCPServerConfig(name="server", url="http://server/mcp")
+
+
+class FakeProbe:
+    """Probe reporting servers as reachable once they are up."""
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.up = threading.Event()
+        self.probed = threading.Event()
+
+    def __call__(self, url: str, timeout: float) -> bool:
+        """Probe the server."""
+        self.probed.set()
+        return self.up.is_set()
+
+
+def _breakers(probe=None, **kwargs) -> MCPCircuitBreakers:
+    """Create breakers of the test server."""
+    breaker_config = MCPCircuitBreakerConfig(
+        **{
+            "window_size": 4,
+            "min_calls": 2,
+            "failure_rate_threshold": 0.5,
+            "probe_interval_seconds": 0.01,
+            **kwargs,
+        }
+    )
+    return MCPCircuitBreakers(breaker_config, [SERVER], probe or FakeProbe())
+
+
+def _wait_for_state(breakers: MCPCircuitBreakers, state: CircuitState) -> None:
+    """Wait until breaker of the test server gets into the state."""
+    deadline = time.monotonic() + 5
+    while breakers.state("server") is not state:
+        assert time.monotonic() < deadline, f"breaker did not get {state}"
+        time.sleep(0.01)
+
+
+def _state_gauge(state: CircuitState) -> float:
+    """Return value of state gauge of the test server."""
+    return mcp_server_circuit_state.labels(server="server", state=state)._value.get()
+
+
+def test_breaker_opens_over_failure_rate():
+    """Test that breaker opens when failure rate reaches the threshold."""
+    breakers = _breakers(min_calls=3)
+    try:
+        breakers.record("server", 0.1, failed=False)
+        breakers.record("server", 0.1, failed=True)
+        # not enough calls yet
+        assert breakers.state("server") is CircuitState.CLOSED
+        assert breakers.allow("server")
+
+        breakers.record("server", 0.1, failed=True)
+
+        assert breakers.state("server") is CircuitState.OPEN
+        assert _state_gauge(CircuitState.OPEN) == 1
+        assert _state_gauge(CircuitState.CLOSED) == 0
+        assert mcp_server_failure_rate.labels(server="server")._value.get() == 2 / 3
+    finally:
+        breakers.stop()
+
+
+def test_failures_leaving_window_forgotten():
+    """Test that only calls in the window count into the failure rate."""
+    breakers = _breakers(window_size=3, min_calls=3, failure_rate_threshold=0.6)
+    try:
+        breakers.record("server", 0.1, failed=True)
+        for _ in range(3):
+            breakers.record("server", 0.1, failed=False)
+        breakers.record("server", 0.1, failed=True)
+
+        assert breakers.state("server") is CircuitState.CLOSED
+    finally:
+        breakers.stop()
+
+
+def test_slow_calls_count_as_failed():
+    """Test that successful calls over the latency threshold count as failed."""
+    breakers = _breakers(slow_call_seconds=1)
+    try:
+        breakers.record("server", 2, failed=False)
+        breakers.record("server", 2, failed=False)
+
+        assert breakers.state("server") is CircuitState.OPEN
+    finally:
+        breakers.stop()
+
+
+def test_open_breaker_rejects_calls():
+    """Test that calls are rejected and counted while the breaker is open."""
+    breakers = _breakers()
+    rejected = mcp_server_rejected_calls_total.labels(server="server")
+    rejected_before = rejected._value.get()
+    try:
+        breakers.record("server", 0.1, failed=True)
+        breakers.record("server", 0.1, failed=True)
+
+        assert not breakers.allow("server")
+        assert rejected._value.get() - rejected_before == 1
+    finally:
+        breakers.stop()
+
+
+def test_unknown_server_allowed():
+    """Test that calls to servers without breaker are not tracked."""
+    breakers = _breakers()
+    try:
+        for _ in range(5):
+            breakers.record("unknown", 0.1, failed=True)
+
+        assert breakers.allow("unknown")
+        assert breakers.state("unknown") is CircuitState.CLOSED
+    finally:
+        breakers.stop()
+
+
+def test_probe_half_opens_and_trial_closes():
+    """Test recovery of the server through probe and successful trial call."""
+    probe = FakeProbe()
+    breakers = _breakers(probe)
+    try:
+        breakers.record("server", 0.1, failed=True)
+        breakers.record("server", 0.1, failed=True)
+        assert probe.probed.wait(5)
+        assert breakers.state("server") is CircuitState.OPEN
+
+        probe.up.set()
+        _wait_for_state(breakers, CircuitState.HALF_OPEN)
+
+        # only one trial call at a time
+        assert breakers.allow("server")
+        assert not breakers.allow("server")
+        breakers.record("server", 0.1, failed=False)
+
+        assert breakers.state("server") is CircuitState.CLOSED
+        assert breakers.allow("server")
+        assert mcp_server_failure_rate.labels(server="server")._value.get() == 0
+    finally:
+        breakers.stop()
+
+
+def test_failed_trial_opens_again():
+    """Test that failed trial call opens the breaker again."""
+    probe = FakeProbe()
+    probe.up.set()
+    breakers = _breakers(probe)
+    try:
+        breakers.record("server", 0.1, failed=True)
+        breakers.record("server", 0.1, failed=True)
+        _wait_for_state(breakers, CircuitState.HALF_OPEN)
+        probe.up.clear()
+
+        assert breakers.allow("server")
+        breakers.record("server", 0.1, failed=True)
+
+        assert breakers.state("server") is CircuitState.OPEN
+        assert not breakers.allow("server")
+    finally:
+        breakers.stop()
+
+
+def test_track_records_outcomes():
+    """Test that tool errors are successes and other errors are failures."""
+    breakers = _breakers()
+    try:
+        for _ in range(2):
+            with pytest.raises(ToolException), breakers.track("server"):
+                raise ToolException("no such pod")
+        assert breakers.state("server") is CircuitState.CLOSED
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError), breakers.track("server"):
+                raise ConnectionError("connection refused")
+        assert breakers.state("server") is CircuitState.OPEN
+    finally:
+        breakers.stop()
+
+
+def test_cancelled_trial_released():
+    """Test that cancelled trial call lets another trial through."""
+    probe = FakeProbe()
+    probe.up.set()
+    breakers = _breakers(probe)
+    try:
+        breakers.record("server", 0.1, failed=True)
+        breakers.record("server", 0.1, failed=True)
+        _wait_for_state(breakers, CircuitState.HALF_OPEN)
+
+        assert breakers.allow("server")
+        with pytest.raises(asyncio.CancelledError), breakers.track("server"):
+            raise asyncio.CancelledError
+
+        assert breakers.state("server") is CircuitState.HALF_OPEN
+        assert breakers.allow("server")
+    finally:
+        breakers.stop()
+
+
+def test_probe_of_unreachable_server():
+    """Test that server refusing connections is reported as unreachable."""
+    assert not probe_mcp_server("http://127.0.0.1:1/mcp", 1)
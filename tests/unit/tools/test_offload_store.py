@@ -0,0 +1,155 @@
+"""Unit tests for the offload_store module."""
+
+import threading
+
+import zstandard
+
+from ols import config
+from ols.app.models.config import OffloadMemoryStoreConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    offload_compression_ratio,
+    offload_memory_bytes,
+    offload_spills_total,
+)
+from ols.src.tools.offload_store import OffloadMemoryStore  # noqa: E402
+
+
+def _content(seed: int, size: int = 10_000) -> bytes:
+    """Return content of given size compressing to a few hundred bytes."""
+    return (f"{seed}: the same line over and over\n" * size)[:size].encode()
+
+
+class SpillRecorder:
+    """Spill callback recording spilled content."""
+
+    def __init__(self, written: bool = True) -> None:
+        """Initialize the recorder."""
+        self.spilled: dict[str, bytes] = {}
+        self.written = written
+
+    def __call__(self, ref_id: str, data: bytes) -> bool:
+        """Record spilled content."""
+        self.spilled[ref_id] = data
+        return self.written
+
+
+def _blob_size(data: bytes) -> int:
+    """Return size of content compressed by the store."""
+    return len(zstandard.ZstdCompressor(level=3).compress(data))
+
+
+def test_put_and_get():
+    """Test that content is stored compressed and counted into budget."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig())
+    data = _content(1)
+    gauge_before = offload_memory_bytes._value.get()
+    ratio_sum_before = offload_compression_ratio._sum.get()
+
+    store.put("a", data, SpillRecorder())
+
+    blob = store.get("a")
+    assert zstandard.ZstdDecompressor().decompress(blob) == data
+    assert len(blob) < len(data)
+    assert store.bytes_held == len(blob)
+    assert offload_memory_bytes._value.get() - gauge_before == len(blob)
+    assert offload_compression_ratio._sum.get() > ratio_sum_before
+    assert store.get("unknown") is None
+
+
+def test_least_recently_used_spilled():
+    """Test that least recently used content is spilled over the budget."""
+    size = _blob_size(_content(1))
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=2 * size + 10))
+    spill = SpillRecorder()
+    spills_before = offload_spills_total._value.get()
+
+    store.put("a", _content(1), spill)
+    store.put("b", _content(2), spill)
+    # "a" becomes the most recently used one
+    store.get("a")
+    store.put("c", _content(3), spill)
+
+    assert spill.spilled == {"b": _content(2)}
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+    assert store.bytes_held <= 2 * size + 10
+    assert offload_spills_total._value.get() - spills_before == 1
+
+
+def test_content_over_budget_spilled_at_once():
+    """Test that content not fitting into the budget goes to disk directly."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+    spill = SpillRecorder()
+
+    store.put("a", _content(1), spill)
+
+    assert spill.spilled == {"a": _content(1)}
+    assert store.bytes_held == 0
+
+
+def test_spill_not_counted_when_not_written():
+    """Test that content cleaned up before spilling is not counted as spilled."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+    spills_before = offload_spills_total._value.get()
+
+    store.put("a", _content(1), SpillRecorder(written=False))
+
+    assert offload_spills_total._value.get() == spills_before
+
+
+def test_spill_failure_drops_content():
+    """Test that content which can not be spilled is dropped from memory."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+
+    def failing_spill(ref_id, data):
+        raise OSError("disk full")
+
+    store.put("a", _content(1), failing_spill)
+
+    assert store.get("a") is None
+    assert store.bytes_held == 0
+
+
+def test_content_readable_while_spilling():
+    """Test that content is served from memory until its file is written."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+    spilling = threading.Event()
+    release = threading.Event()
+
+    def slow_spill(ref_id, data):
+        spilling.set()
+        release.wait(5)
+        return True
+
+    putter = threading.Thread(target=store.put, args=("a", _content(1), slow_spill))
+    putter.start()
+    try:
+        assert spilling.wait(5)
+        blob = store.get("a")
+        assert zstandard.ZstdDecompressor().decompress(blob) == _content(1)
+    finally:
+        release.set()
+        putter.join()
+    assert store.get("a") is None
+
+
+def test_discard():
+    """Test that discarded content is released and never spilled."""
+    store = OffloadMemoryStore(OffloadMemoryStoreConfig())
+    spill = SpillRecorder()
+    gauge_before = offload_memory_bytes._value.get()
+    store.put("a", _content(1), spill)
+    store.put("b", _content(2), spill)
+
+    store.discard(["a", "b", "unknown"])
+
+    assert store.get("a") is None
+    assert store.get("b") is None
+    assert store.bytes_held == 0
+    assert offload_memory_bytes._value.get() == gauge_before
+    assert spill.spilled == {}
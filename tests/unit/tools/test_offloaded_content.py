@@ -3,13 +3,24 @@
 import os
 import re
 import shutil
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
 
-from ols.src.tools.offloaded_content import (
+from ols import config, constants
+from ols.app.models.config import OffloadMemoryStoreConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.tools.offload_store import OffloadMemoryStore  # noqa: E402
+from ols.src.tools.offloaded_content import (  # noqa: E402
     OffloadManager,
     _build_placeholder,
+    _find_matches_with_timeout,
+    _index_lines,
     _read_offloaded,
     _search_offloaded,
     cleanup_offload_storage,
@@ -390,42 +401,184 @@ class TestSearchThenRead:
 class TestFindMatchesWithTimeout:
     """Tests for _find_matches_with_timeout."""
 
-    def test_successful_match(self):
+    @pytest.fixture
+    def file_path(self, tmp_path):
+        """Return path of file to search."""
+        path = tmp_path / "offloaded.txt"
+        path.write_text("foo\nbar\nfoo\nfoo\n", encoding="utf-8")
+        return str(path)
+
+    def test_successful_match(self, file_path):
         """Test normal regex matching returns indices."""
-        from ols.src.tools.offloaded_content import _find_matches_with_timeout
+        result, error = _find_matches_with_timeout(file_path, "foo", 10)
+        assert error is None
+        assert result == (3, [0, 2, 3])
 
-        lines = ["foo\n", "bar\n", "foo\n"]
-        compiled = re.compile("foo")
-        indices, error = _find_matches_with_timeout(lines, compiled, "foo")
+    def test_match_indices_limited(self, file_path):
+        """Test that all matches are counted but only first indices returned."""
+        result, error = _find_matches_with_timeout(file_path, "foo", 2)
         assert error is None
-        assert indices == [0, 2]
+        assert result == (3, [0, 2])
 
-    def test_no_match(self):
+    def test_no_match(self, file_path):
         """Test no matches returns empty list."""
-        from ols.src.tools.offloaded_content import _find_matches_with_timeout
-
-        lines = ["foo\n", "bar\n"]
-        compiled = re.compile("baz")
-        indices, error = _find_matches_with_timeout(lines, compiled, "baz")
+        result, error = _find_matches_with_timeout(file_path, "baz", 10)
         assert error is None
-        assert indices == []
+        assert result == (0, [])
+
+    def test_timeout_kills_search(self, tmp_path):
+        """Test that a search running too long is stopped and reported."""
+        path = tmp_path / "offloaded.txt"
+        path.write_text("a" * 40 + "b\n", encoding="utf-8")
 
-    def test_timeout_returns_error(self):
-        """Test that a timeout in regex matching returns an error string."""
-        from ols.src.tools.offloaded_content import _find_matches_with_timeout
+        with patch.object(constants, "OFFLOAD_REGEX_TIMEOUT_SECONDS", 0.5):
+            started = time.monotonic()
+            result, error = _find_matches_with_timeout(str(path), "(a+)+$", 10)
 
-        class TimeoutPattern:
-            """Fake compiled pattern that triggers TimeoutError on search."""
+        assert result is None
+        assert "timed out" in error
+        assert time.monotonic() - started < 5
+
+    def test_timeout_waiting_for_worker(self, file_path):
+        """Test that search times out when all workers are busy."""
+        with (
+            patch.object(constants, "OFFLOAD_REGEX_TIMEOUT_SECONDS", 0.1),
+            patch(
+                "ols.src.tools.offloaded_content._search_slots",
+                threading.BoundedSemaphore(1),
+            ) as slots,
+        ):
+            slots.acquire()
+            result, error = _find_matches_with_timeout(file_path, "foo", 10)
 
-            def search(self, text):
-                raise TimeoutError()
+        assert result is None
+        assert "timed out" in error
 
-        indices, error = _find_matches_with_timeout(
-            ["line\n"] * 10, TimeoutPattern(), "line"  # type: ignore[arg-type]
+    def test_worker_error(self, tmp_path):
+        """Test that errors in worker process are reported."""
+        result, error = _find_matches_with_timeout(
+            str(tmp_path / "missing.txt"), "foo", 10
         )
-        assert indices is None
-        assert error is not None
-        assert "timed out" in error
+        assert result is None
+        assert "failed" in error
+
+
+class TestLineIndex:
+    """Tests for line offset index of offloaded files."""
+
+    def test_index_lines(self):
+        """Test that offsets of all lines and of the end are indexed."""
+        assert list(_index_lines(b"a\nbb\r\nccc\rd")) == [0, 2, 6, 10, 11]
+        assert list(_index_lines(b"a\n")) == [0, 2]
+        assert list(_index_lines(b"")) == [0]
+
+    def test_read_lines_with_universal_newlines(self, manager):
+        """Test that lines are read the same as from file in text mode."""
+        text = "caf\u00e9\r\nsecond\rthird\n" + "x\n" * 500
+        manager.try_offload(text, "tool", _SMALL_BUDGET)
+        ref_id = next(iter(manager._allowlist.keys()))
+
+        result = _read_offloaded(manager, ref_id=ref_id, start_line=1, end_line=4)
+        assert result == "1:caf\u00e9\n2:second\n3:third\n4:x"
+
+        result = _search_offloaded(
+            manager, ref_id=ref_id, pattern="^third$", context_lines=1
+        )
+        assert result.splitlines()[2:] == ["2-second", "3:third", "4-x"]
+
+    def test_index_released_on_cleanup(self, manager):
+        """Test that line index is dropped together with the files."""
+        manager.try_offload(_large_text(500), "tool", _SMALL_BUDGET)
+        assert len(manager._line_offsets) == 1
+        manager.cleanup()
+        assert manager._line_offsets == {}
+
+
+class TestMemoryStore:
+    """Tests for offloading into the in-memory store."""
+
+    @pytest.fixture
+    def memory_store(self):
+        """Return a memory store with budget for a few outputs."""
+        return OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=10_000))
+
+    def test_offload_kept_in_memory(self, storage_path, memory_store):
+        """Test that offloaded output is readable without writing files."""
+        manager = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        text = _large_text(500)
+        manager.try_offload(text, "tool", _SMALL_BUDGET)
+        ref_id = next(iter(manager._allowlist.keys()))
+
+        assert manager._allowlist[ref_id] is None
+        assert manager._session_dir is None
+        assert memory_store.bytes_held > 0
+
+        result = _read_offloaded(manager, ref_id=ref_id, start_line=10, end_line=11)
+        assert result == "10:line 10: content here\n11:line 11: content here"
+        result = _search_offloaded(
+            manager, ref_id=ref_id, pattern="^line 250:", context_lines=1
+        )
+        assert result.splitlines()[2:] == [
+            "249-line 249: content here",
+            "250:line 250: content here",
+            "251-line 251: content here",
+        ]
+
+    def test_spilled_output_read_from_disk(self, storage_path):
+        """Test that outputs over the budget are spilled to session directory."""
+        memory_store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+        manager = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        text = _large_text(500)
+        manager.try_offload(text, "tool", _SMALL_BUDGET)
+        ref_id = next(iter(manager._allowlist.keys()))
+
+        file_path = manager._allowlist[ref_id]
+        assert os.path.dirname(file_path) == manager._session_dir
+        with open(file_path, encoding="utf-8") as f:
+            assert f.read() == text
+        assert memory_store.get(ref_id) is None
+
+        result = _read_offloaded(manager, ref_id=ref_id, start_line=1, end_line=1)
+        assert result == "1:line 1: content here"
+        result = _search_offloaded(manager, ref_id=ref_id, pattern="^line 500:")
+        assert "500:line 500: content here" in result
+
+    def test_dropped_output_reported(self, storage_path):
+        """Test that output dropped by the store is reported as not available."""
+        memory_store = OffloadMemoryStore(OffloadMemoryStoreConfig(budget_bytes=0))
+        manager = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        with patch("os.open", side_effect=OSError("disk full")):
+            manager.try_offload(_large_text(500), "tool", _SMALL_BUDGET)
+        ref_id = next(iter(manager._allowlist.keys()))
+
+        result = _read_offloaded(manager, ref_id=ref_id, start_line=1, end_line=1)
+        assert "not available" in result
+
+    def test_cleanup_releases_memory(self, storage_path, memory_store):
+        """Test that cleanup drops outputs of the request from the store."""
+        manager = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        other = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        manager.try_offload(_large_text(500), "tool", _SMALL_BUDGET)
+        other.try_offload(_large_text(600), "tool", _SMALL_BUDGET)
+        held = memory_store.bytes_held
+
+        manager.cleanup()
+
+        assert 0 < memory_store.bytes_held < held
+        assert not manager.has_offloaded_content
+        assert other.has_offloaded_content
+
+    def test_output_cleaned_up_before_spilling_not_written(
+        self, storage_path, memory_store
+    ):
+        """Test that output spilled after cleanup is not written."""
+        manager = OffloadManager(storage_path=storage_path, memory_store=memory_store)
+        manager.try_offload(_large_text(500), "tool", _SMALL_BUDGET)
+        ref_id = next(iter(manager._allowlist.keys()))
+        manager.cleanup()
+
+        assert not manager._spill(ref_id, b"content")
+        assert manager._session_dir is None
 
 
 class TestRetrievalToolRegistration:
@@ -0,0 +1,84 @@
+"""Unit tests for the tool_result_cache module."""
+
+from unittest.mock import patch
+
+from ols import config
+from ols.app.models.config import ToolResultCacheConfig
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics.metrics import (  # noqa: E402
+    tool_result_cache_hits_total,
+    tool_result_cache_misses_total,
+)
+from ols.src.tools.tool_result_cache import ToolResultCache  # noqa: E402
+
+
+def test_construct_key():
+    """Test that key does not depend on order of arguments."""
+    key = ToolResultCache.construct_key("scope", "server", "tool", {"a": 1, "b": 2})
+    assert key == ToolResultCache.construct_key(
+        "scope", "server", "tool", {"b": 2, "a": 1}
+    )
+    assert key != ToolResultCache.construct_key("scope", "server", "tool", {"a": 1})
+    assert key != ToolResultCache.construct_key(
+        "other", "server", "tool", {"a": 1, "b": 2}
+    )
+
+
+def test_get_and_put():
+    """Test that stored results are returned and counted in metrics."""
+    cache = ToolResultCache(ToolResultCacheConfig())
+    hits = tool_result_cache_hits_total.labels(server="server")
+    misses = tool_result_cache_misses_total.labels(server="server")
+    hits_before, misses_before = hits._value.get(), misses._value.get()
+
+    assert cache.get("scope", "server", "tool", {}) is None
+    cache.put("scope", "server", "tool", {}, "output", {"items": [1]})
+    cached = cache.get("scope", "server", "tool", {})
+
+    assert cached.output == "output"
+    assert cached.structured_content == {"items": [1]}
+    assert hits._value.get() - hits_before == 1
+    assert misses._value.get() - misses_before == 1
+
+    # returned structured content is a copy
+    cached.structured_content["items"].append(2)
+    assert cache.get("scope", "server", "tool", {}).structured_content == {"items": [1]}
+
+
+def test_expired_result_removed():
+    """Test that results expire after TTL."""
+    cache = ToolResultCache(ToolResultCacheConfig(ttl_seconds=10))
+    with patch("ols.src.tools.tool_result_cache.time.monotonic", return_value=100):
+        cache.put("scope", "server", "tool", {}, "output", None)
+    with patch("ols.src.tools.tool_result_cache.time.monotonic", return_value=109):
+        assert cache.get("scope", "server", "tool", {}) is not None
+    with patch("ols.src.tools.tool_result_cache.time.monotonic", return_value=111):
+        assert cache.get("scope", "server", "tool", {}) is None
+    assert len(cache) == 0
+
+
+def test_size_limits():
+    """Test that large results are skipped and LRU results evicted."""
+    cache = ToolResultCache(
+        ToolResultCacheConfig(max_size_bytes=20, max_entry_size_bytes=10)
+    )
+
+    cache.put("scope", "server", "tool", {"n": 0}, "x" * 11, None)
+    assert len(cache) == 0
+
+    cache.put("scope", "server", "tool", {"n": 1}, "x" * 10, None)
+    cache.put("scope", "server", "tool", {"n": 2}, "x" * 10, None)
+    cache.get("scope", "server", "tool", {"n": 1})
+    cache.put("scope", "server", "tool", {"n": 3}, "x" * 10, None)
+
+    assert cache.get("scope", "server", "tool", {"n": 1}) is not None
+    assert cache.get("scope", "server", "tool", {"n": 2}) is None
+    assert cache.get("scope", "server", "tool", {"n": 3}) is not None
+
+    # replacing result does not count the old one
+    cache.put("scope", "server", "tool", {"n": 3}, "y" * 10, None)
+    assert len(cache) == 2
+    assert cache.get("scope", "server", "tool", {"n": 3}).output == "y" * 10
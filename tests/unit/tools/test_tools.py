@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from collections.abc import Iterator
 from typing import Any
 
 import pytest
@@ -10,8 +11,20 @@ from langchain_core.messages import ToolMessage
 from langchain_core.tools.structured import StructuredTool
 from pydantic import BaseModel
 
-from ols.src.tools import tools as tools_module
-from ols.src.tools.tools import (
+from ols import config
+from ols.app.models.config import (
+    MCPCircuitBreakerConfig,
+    MCPServerConfig,
+    ToolResultCacheConfig,
+)
+
+# needs to be setup before importing metrics
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.src.tools import tools as tools_module  # noqa: E402
+from ols.src.tools.circuit_breaker import MCPCircuitBreakers  # noqa: E402
+from ols.src.tools.tool_result_cache import ToolResultCache  # noqa: E402
+from ols.src.tools.tools import (  # noqa: E402
     ToolResultEvent,
     _extract_text_from_tool_output,
     _is_transient_tool_error,
@@ -19,8 +32,9 @@ from ols.src.tools.tools import (
     execute_tool_call,
     execute_tool_calls_stream,
     get_tool_by_name,
+    set_tool_result_cache_scope,
 )
-from ols.utils.token_handler import TokenHandler
+from ols.utils.token_handler import TokenHandler  # noqa: E402
 
 _LARGE_TOKEN_BUDGET = 100_000
 
@@ -781,3 +795,178 @@ async def test_execute_tool_calls_stream_divides_budget_per_tool(
             f"Tool received budget {budget}, expected {expected_per_tool} "
             f"(total {total_budget} / 3 tools)"
         )
+
+
+class CountingTool(StructuredTool):
+    """Tool counting its calls."""
+
+    def __init__(self, name: str, metadata: dict[str, Any]):
+        """Initialize the tool."""
+        calls = []
+
+        async def _counting_coro(**kwargs: Any) -> tuple[str, dict]:
+            calls.append(kwargs)
+            return f"call {len(calls)}", {"structured_content": {"n": len(calls)}}
+
+        super().__init__(
+            name=name,
+            description=f"Counting tool {name}",
+            func=lambda **kwargs: "unused",
+            coroutine=_counting_coro,
+            args_schema=FakeSchema,
+            metadata=metadata,
+        )
+        self.metadata["calls"] = calls
+
+
+@pytest.fixture
+def tool_result_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[ToolResultCache]:
+    """Configure tool result cache with caching enabled for server 'cached'."""
+    cache_config = ToolResultCacheConfig(ttl_seconds=60)
+    cache = ToolResultCache(cache_config)
+    monkeypatch.setattr(config.ols_config, "tool_result_cache", cache_config)
+    monkeypatch.setattr(config.services, "_tool_result_cache", cache)
+    monkeypatch.setitem(
+        config.__dict__,
+        "mcp_servers_dict",
+        {
+            "cached": MCPServerConfig(
+                name="cached", url="http://cached", cache_read_only_tools=True
+            ),
+            "uncached": MCPServerConfig(name="uncached", url="http://uncached"),
+        },
+    )
+    set_tool_result_cache_scope("user", "conversation", ["token", {}])
+    yield cache
+    set_tool_result_cache_scope(None, None, None)
+
+
+def _read_only_tool(server: str = "cached", read_only: bool = True) -> CountingTool:
+    """Return counting tool of given server."""
+    return CountingTool(
+        "list_pods",
+        metadata={"mcp_server": server, "annotations": {"readOnlyHint": read_only}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_call_reuses_cached_result(tool_result_cache) -> None:
+    """Test that identical read-only calls are served from the cache."""
+    tool = _read_only_tool()
+
+    _, first, _, first_structured = await execute_tool_call(
+        tool, {"namespace": "ns", "limit": 5}, _LARGE_TOKEN_BUDGET
+    )
+    _, second, _, second_structured = await execute_tool_call(
+        tool, {"limit": 5, "namespace": "ns"}, _LARGE_TOKEN_BUDGET
+    )
+    _, other, _, _ = await execute_tool_call(
+        tool, {"namespace": "other"}, _LARGE_TOKEN_BUDGET
+    )
+
+    assert len(tool.metadata["calls"]) == 2
+    assert first == "call 1"
+    assert second == "[Cached result of an identical call made 0s ago]\ncall 1"
+    assert first_structured == second_structured == {"n": 1}
+    assert other == "call 2"
+    assert len(tool_result_cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_call_cache_scoped_to_conversation(
+    tool_result_cache,
+) -> None:
+    """Test that cached results are not shared across conversations."""
+    tool = _read_only_tool()
+
+    await execute_tool_call(tool, {}, _LARGE_TOKEN_BUDGET)
+    set_tool_result_cache_scope("user", "another conversation", ["token", {}])
+    _, output, _, _ = await execute_tool_call(tool, {}, _LARGE_TOKEN_BUDGET)
+    set_tool_result_cache_scope(None, "conversation", ["token", {}])
+    await execute_tool_call(tool, {}, _LARGE_TOKEN_BUDGET)
+
+    assert output == "call 2"
+    assert len(tool.metadata["calls"]) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "server, read_only", [("uncached", True), ("cached", False), ("unknown", True)]
+)
+async def test_execute_tool_call_not_cacheable(
+    tool_result_cache, server, read_only
+) -> None:
+    """Test that only read-only tools of enabled servers are cached."""
+    tool = _read_only_tool(server, read_only)
+
+    await execute_tool_call(tool, {}, _LARGE_TOKEN_BUDGET)
+    _, output, _, _ = await execute_tool_call(tool, {}, _LARGE_TOKEN_BUDGET)
+
+    assert output == "call 2"
+    assert len(tool_result_cache) == 0
+
+
+class UnreachableServerTool(StructuredTool):
+    """Tool of MCP server refusing connections, counting its calls."""
+
+    def __init__(self, server: str):
+        """Initialize the tool."""
+        calls = []
+
+        async def _unreachable_coro(**kwargs: Any) -> str:
+            calls.append(kwargs)
+            raise ConnectionError("connection refused")
+
+        super().__init__(
+            name="list_pods",
+            description="Tool of unreachable server",
+            func=lambda **kwargs: "unused",
+            coroutine=_unreachable_coro,
+            args_schema=FakeSchema,
+            metadata={"mcp_server": server, "calls": calls},
+        )
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_stream_skips_server_with_open_breaker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that calls fail fast without retries once the breaker opens."""
+    breaker_config = MCPCircuitBreakerConfig(window_size=2, min_calls=2)
+    breakers = MCPCircuitBreakers(
+        breaker_config,
+        [MCPServerConfig(name="down", url="http://down")],
+        probe=lambda url, timeout: False,
+    )
+    monkeypatch.setattr(config.ols_config, "mcp_circuit_breaker", breaker_config)
+    monkeypatch.setattr(config.services, "_mcp_circuit_breakers", breakers)
+    monkeypatch.setattr(tools_module, "need_validation", lambda **kwargs: False)
+
+    async def _no_sleep(*args: Any, **kwargs: Any) -> None:
+        return None
+
+    monkeypatch.setattr(tools_module.asyncio, "sleep", _no_sleep)
+    tool = UnreachableServerTool("down")
+
+    try:
+        first = [
+            event
+            async for event in execute_tool_calls_stream(
+                [("call_1", {}, tool)], tools_token_budget=_LARGE_TOKEN_BUDGET
+            )
+        ]
+        second = [
+            event
+            async for event in execute_tool_calls_stream(
+                [("call_2", {}, tool)], tools_token_budget=_LARGE_TOKEN_BUDGET
+            )
+        ]
+    finally:
+        breakers.stop()
+
+    # the breaker opened after two attempts of the first call, its last
+    # retry and the second call did not reach the server
+    assert len(tool.metadata["calls"]) == 2
+    for events in (first, second):
+        assert events[0].data.status == "error"
+        assert "MCP server 'down' is unavailable" in events[0].data.content
@@ -1,7 +1,10 @@
 """Unit tests for MCP utilities."""
 
+import asyncio
+import contextlib
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from langchain_core.tools.structured import StructuredTool
 
@@ -342,6 +345,23 @@ class TestBuildMcpConfig:
             verify=mock_ssl, headers={"X-Test": "1"}
         )
 
+    def test_httpx_factory_propagates_trace_context(self, mock_file_server):
+        """Test that trace context is added to MCP requests when tracing is on."""
+        with (
+            patch("ols.utils.mcp_utils.config") as mock_config,
+            patch("ols.utils.mcp_utils.is_tracing_enabled", return_value=True),
+            patch("ols.utils.mcp_utils.httpx.AsyncClient") as mock_client_cls,
+        ):
+            mock_config.ols_config.certificate_directory = None
+            result = build_mcp_config([mock_file_server], None, None)
+            result["file-server"]["httpx_client_factory"]()
+
+        event_hooks = mock_client_cls.call_args.kwargs["event_hooks"]
+        request = httpx.Request("POST", "http://mcp.example.com")
+        with patch("ols.utils.mcp_utils.inject_trace_context") as mock_inject:
+            asyncio.run(event_hooks["request"][0](request))
+        mock_inject.assert_called_once_with(request.headers)
+
     def test_httpx_factory_absent_when_no_certificate_directory(self, mock_file_server):
         """Test that httpx_client_factory is absent when certificate_directory is None."""
         with patch("ols.utils.mcp_utils.config") as mock_config:
@@ -440,6 +460,34 @@ class TestGatherMcpTools:
             assert result[0].name == "good_tool"
             assert result[0].metadata["mcp_server"] == "good-server"
 
+    async def test_server_with_open_circuit_breaker_skipped(self):
+        """Test that servers with open circuit breaker are not contacted."""
+        with (
+            patch("ols.utils.mcp_utils.MultiServerMCPClient") as mock_client_cls,
+            patch("ols.utils.mcp_utils.config") as mock_config,
+        ):
+            tool = MagicMock(spec=StructuredTool)
+            tool.name = "good_tool"
+            tool.metadata = {}
+            tool.args_schema = {"type": "object", "properties": {}}
+
+            mock_client = AsyncMock()
+            mock_client.get_tools.return_value = [tool]
+            mock_client_cls.return_value = mock_client
+            breakers = mock_config.services.mcp_circuit_breakers
+            breakers.allow.side_effect = lambda server: server != "bad-server"
+            breakers.track.return_value = contextlib.nullcontext()
+
+            servers = {
+                "bad-server": {"transport": "streamable_http", "url": "http://bad"},
+                "good-server": {"transport": "streamable_http", "url": "http://good"},
+            }
+            result = await gather_mcp_tools(servers)
+
+            assert [tool.name for tool in result] == ["good_tool"]
+            mock_client.get_tools.assert_called_once_with(server_name="good-server")
+            breakers.track.assert_called_once_with("good-server")
+
     async def test_tool_filtering_with_allowlist(self):
         """Test filtering tools by allowed names."""
         with patch("ols.utils.mcp_utils.MultiServerMCPClient") as mock_client_cls:
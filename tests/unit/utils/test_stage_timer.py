@@ -0,0 +1,87 @@
+"""Unit tests for timing of query processing stages."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from ols import config
+from ols.utils import stage_timer as stage_timer_module
+from ols.utils.stage_timer import (
+    Stage,
+    observe_stage,
+    set_stage_labels,
+    stage_timer,
+    timed_stage,
+)
+
+
+@pytest.fixture
+def stage_metrics_enabled():
+    """Enable stage metrics for the duration of a test."""
+    config.ols_config.stage_metrics_enabled = True
+    yield
+    config.ols_config.stage_metrics_enabled = False
+
+
+def test_disabled_stage_timer_records_nothing():
+    """Test that nothing is recorded when stage metrics are disabled."""
+    with patch.object(stage_timer_module, "stage_duration_seconds") as histogram:
+        with stage_timer(Stage.RAG_RETRIEVAL):
+            pass
+        observe_stage(Stage.PERSISTENCE, 1.0)
+    histogram.labels.assert_not_called()
+
+
+@pytest.mark.usefixtures("stage_metrics_enabled")
+def test_stage_timer_records_labelled_duration():
+    """Test that duration is recorded with stage, provider and mode labels."""
+    set_stage_labels("openai", "ask")
+    with patch.object(stage_timer_module, "stage_duration_seconds") as histogram:
+        with stage_timer(Stage.RAG_RETRIEVAL):
+            pass
+    histogram.labels.assert_called_once_with(
+        stage="rag_retrieval", provider="openai", mode="ask"
+    )
+    assert histogram.labels.return_value.observe.call_args.args[0] >= 0
+
+
+@pytest.mark.usefixtures("stage_metrics_enabled")
+def test_stage_timer_records_duration_on_error():
+    """Test that duration of failed stage is recorded too."""
+    with patch.object(stage_timer_module, "stage_duration_seconds") as histogram:
+        with pytest.raises(ValueError, match="failed"):
+            with stage_timer(Stage.HISTORY_RETRIEVAL):
+                raise ValueError("failed")
+    histogram.labels.return_value.observe.assert_called_once()
+
+
+@pytest.mark.usefixtures("stage_metrics_enabled")
+def test_timed_stage_decorator():
+    """Test that decorated coroutine function is timed and returns its result."""
+
+    @timed_stage(Stage.MCP_DISCOVERY)
+    async def discover(value):
+        return value
+
+    with patch.object(stage_timer_module, "stage_duration_seconds") as histogram:
+        assert asyncio.run(discover(42)) == 42
+    assert histogram.labels.call_args.kwargs["stage"] == "mcp_discovery"
+
+
+@pytest.mark.usefixtures("stage_metrics_enabled")
+def test_labels_are_scoped_to_context():
+    """Test that labels set in a task do not leak into other contexts."""
+
+    async def run_request():
+        set_stage_labels("watsonx", "troubleshooting")
+        observe_stage(Stage.LLM_ROUND, 0.5)
+
+    set_stage_labels("openai", "ask")
+    with patch.object(stage_timer_module, "stage_duration_seconds") as histogram:
+        asyncio.run(run_request())
+        observe_stage(Stage.LLM_ROUND, 0.5)
+    assert [call.kwargs for call in histogram.labels.call_args_list] == [
+        {"stage": "llm_round", "provider": "watsonx", "mode": "troubleshooting"},
+        {"stage": "llm_round", "provider": "openai", "mode": "ask"},
+    ]
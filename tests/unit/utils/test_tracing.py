@@ -0,0 +1,66 @@
+"""Unit tests for optional OpenTelemetry tracing."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ols.app.models.config import TracingConfig
+from ols.utils import tracing
+
+
+@pytest.fixture
+def tracer():
+    """Enable tracing with a mocked tracer."""
+    mock_tracer = MagicMock()
+    with patch.object(tracing, "_tracer", mock_tracer):
+        yield mock_tracer
+
+
+def test_disabled_tracing_is_noop():
+    """Test that helpers do nothing when tracing is not set up."""
+    assert not tracing.is_tracing_enabled()
+    with tracing.start_span("span", {"key": "value"}):
+        tracing.set_span_attributes({"key": "value"})
+        tracing.add_span_event("event", {"key": "value"})
+    headers = {}
+    tracing.inject_trace_context(headers)
+    assert headers == {}
+
+
+def test_setup_without_config_keeps_tracing_disabled():
+    """Test that tracing is not enabled without configuration."""
+    tracing.setup_tracing(None)
+    assert not tracing.is_tracing_enabled()
+
+
+def test_setup_without_sdk_keeps_tracing_disabled():
+    """Test that missing OpenTelemetry SDK is reported, not raised."""
+    with (
+        patch.dict(sys.modules, {"opentelemetry": None}),
+        patch.object(tracing, "logger") as mock_logger,
+    ):
+        tracing.setup_tracing(TracingConfig())
+    assert not tracing.is_tracing_enabled()
+    assert "OpenTelemetry SDK is not installed" in mock_logger.warning.call_args.args[0]
+
+
+def test_start_span_with_tracer(tracer):
+    """Test that span is started as the current span."""
+    with tracing.start_span("span", {"key": "value"}):
+        pass
+    tracer.start_as_current_span.assert_called_once_with(
+        "span", attributes={"key": "value"}
+    )
+
+
+def test_inject_trace_context():
+    """Test that trace context is added to headers."""
+
+    def inject(headers):
+        headers["traceparent"] = "00-trace-span-01"
+
+    headers = {}
+    with patch.object(tracing, "_inject", inject):
+        tracing.inject_trace_context(headers)
+    assert headers == {"traceparent": "00-trace-span-01"}